@@ -0,0 +1,98 @@
+"""
+Бенчмарк холодного запуска CLI на основе `python -X importtime`.
+
+Запускает простой запрос несколько раз в отдельных процессах и выводит
+медиану времени запуска, суммарное время импортов (всех и модулей src)
+и самые тяжелые импорты верхнего уровня.
+
+Пример:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 20 -- phones.csv --where "brand=apple"
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_QUERY = ["phones.csv", "--aggregate", "price=avg"]
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """
+    Разбирает вывод -X importtime: (модуль с отступом, собственное время, суммарное время) в мкс.
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        entries.append((name.rstrip(), int(self_us), int(cumulative_us)))
+    return entries
+
+
+def run_once(query: List[str]) -> Tuple[float, List[Tuple[str, int, int]]]:
+    """
+    Один запуск main.py в новом процессе: время выполнения (с) и импорты.
+    """
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "main.py", *query],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=False,
+    )
+    elapsed = time.perf_counter() - started
+    return elapsed, parse_importtime(completed.stderr)
+
+
+def summarize(entries: List[Tuple[str, int, int]]) -> Dict[str, int]:
+    """
+    Суммарное время импортов верхнего уровня (всех и модулей src) в мкс.
+    """
+    top_level = [(name.strip(), cumulative) for name, _, cumulative in entries if not name.startswith("  ")]
+    return {
+        "total": sum(cumulative for _, cumulative in top_level),
+        "src": sum(cumulative for name, cumulative in top_level if name.split(".")[0] == "src"),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарк холодного запуска CLI")
+    parser.add_argument("--runs", type=int, default=10, help="Количество запусков (по умолчанию 10)")
+    parser.add_argument("--top", type=int, default=10, help="Сколько самых тяжелых импортов показать")
+    parser.add_argument("query", nargs="*", help="Аргументы main.py (по умолчанию простая агрегация)")
+    options = parser.parse_args()
+    query = options.query or DEFAULT_QUERY
+
+    # Первый запуск прогревает кеш байткода и файловой системы
+    run_once(query)
+    timings, totals, src_totals = [], [], []
+    heaviest: Dict[str, List[int]] = {}
+    for _ in range(options.runs):
+        elapsed, entries = run_once(query)
+        summary = summarize(entries)
+        timings.append(elapsed)
+        totals.append(summary["total"])
+        src_totals.append(summary["src"])
+        for name, _, cumulative in entries:
+            if not name.startswith("  "):
+                heaviest.setdefault(name.strip(), []).append(cumulative)
+
+    print(f"Запрос: main.py {' '.join(query)}")
+    print(f"Запуск процесса (медиана): {statistics.median(timings) * 1000:.1f} мс")
+    print(f"Импорты всего (медиана): {statistics.median(totals) / 1000:.1f} мс")
+    print(f"Импорты src (медиана): {statistics.median(src_totals) / 1000:.1f} мс")
+    print("Самые тяжелые импорты верхнего уровня:")
+    ranked = sorted(heaviest.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+    for name, values in ranked[: options.top]:
+        print(f"  {statistics.median(values) / 1000:8.1f} мс  {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
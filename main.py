@@ -13,6 +13,24 @@ def main() -> int:
     Главная функция приложения
     """
     try:
+        argv = sys.argv[1:]
+        if argv and argv[0] == "serve":
+            from src.server import run_serve_command
+
+            return run_serve_command(argv[1:])
+        if argv and argv[0] == "client":
+            from src.server import run_client_command
+
+            return run_client_command(argv[1:])
+        if argv and argv[0] == "worker":
+            from src.distributed import run_worker_command
+
+            return run_worker_command(argv[1:])
+        if argv and argv[0] == "partition":
+            from src.partitioning import run_partition_command
+
+            return run_partition_command(argv[1:])
+
         args = parse_arguments()
         handler = CommandHandler()
         handler.execute(args)
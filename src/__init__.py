@@ -1,3 +1,12 @@
-
+__all__ = ["Query", "open_csv"]
 __version__ = "1.0.0"
-__author__ = "Sergey Antonov" 
\ No newline at end of file
+__author__ = "Sergey Antonov"
+
+
+def __getattr__(name):
+    # API импортируется при первом обращении: запуск CLI не загружает агрегатор
+    if name in __all__:
+        from . import api
+
+        return getattr(api, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,433 @@
+"""
+Аккумуляторы функций агрегации.
+
+Каждая функция агрегации — класс с жизненным циклом
+init (конструктор) / update / merge / finalize. Все функции считаются
+за один проход, состояние частей (чанков, файлов) сливается через merge
+и сериализуется через to_state/from_state.
+
+Новая функция добавляется декоратором register_accumulator без изменения
+кода диспетчеризации в Aggregator.
+"""
+
+import math
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Optional, Set, Type
+
+if TYPE_CHECKING:
+    from .memory import Reservation
+
+DEFAULT_RELATIVE_ERROR = 0.01
+# Оценка памяти аккумулятора (объект и его атрибуты) и значения в множестве count_distinct
+ACCUMULATOR_BYTES = 256
+DISTINCT_VALUE_BYTES = 96
+
+ACCUMULATORS: Dict[str, Type["Accumulator"]] = {}
+
+
+def register_accumulator(name: str) -> Callable[[Type["Accumulator"]], Type["Accumulator"]]:
+    """
+    Декоратор регистрации класса аккумулятора под именем функции агрегации.
+    """
+
+    def decorator(cls: Type["Accumulator"]) -> Type["Accumulator"]:
+        cls.name = name
+        ACCUMULATORS[name] = cls
+        return cls
+
+    return decorator
+
+
+def get_accumulator_class(name: str) -> Type["Accumulator"]:
+    """
+    Возвращает класс аккумулятора по имени функции.
+
+    Raises:
+        ValueError: Если функция не зарегистрирована
+    """
+    try:
+        return ACCUMULATORS[name.lower()]
+    except KeyError:
+        raise ValueError(
+            f"Неподдерживаемая функция агрегации: '{name}'. "
+            f"Поддерживаются: {', '.join(ACCUMULATORS)}"
+        )
+
+
+def create_accumulator(
+    name: str,
+    argument: Optional[float] = None,
+    relative_error: float = DEFAULT_RELATIVE_ERROR,
+) -> "Accumulator":
+    """
+    Создает аккумулятор зарегистрированной функции.
+    """
+    return get_accumulator_class(name)(argument=argument, relative_error=relative_error)
+
+
+def restore_accumulator(state: Dict[str, Any]) -> "Accumulator":
+    """
+    Восстанавливает аккумулятор из словаря Accumulator.to_state().
+    """
+    return get_accumulator_class(state["name"]).from_state(state)
+
+
+class Accumulator:
+    """
+    Базовый класс аккумулятора.
+
+    Атрибуты класса:
+        numeric: принимает числа (иначе — непустые строки)
+        accepts_argument: функция принимает параметр ("column=func:argument")
+        allow_empty: результат определен и без единого значения
+    """
+
+    name: str = ""
+    numeric = True
+    accepts_argument = False
+    allow_empty = False
+    # Резервирование памяти запроса (--memory-limit), на которое относится рост состояния
+    reservation: Optional["Reservation"] = None
+
+    def __init__(self, argument: Optional[float] = None, relative_error: float = DEFAULT_RELATIVE_ERROR):
+        self.check_argument(argument)
+        self.argument = argument
+        self.relative_error = relative_error
+        self.count = 0
+
+    @classmethod
+    def check_argument(cls, argument: Optional[float]) -> None:
+        """
+        Проверка параметра функции.
+
+        Raises:
+            ValueError: Если параметр недопустим
+        """
+        if argument is not None and not cls.accepts_argument:
+            raise ValueError(f"Функция агрегации '{cls.name}' не принимает параметр")
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Оценка памяти состояния в байтах (для --memory-limit).
+        """
+        return ACCUMULATOR_BYTES
+
+    def bind(self, reservation: "Reservation") -> None:
+        """
+        Учитывать дальнейший рост состояния в резервировании памяти.
+        """
+        self.reservation = reservation
+
+    def update(self, value: Any) -> None:
+        raise NotImplementedError
+
+    def update_many(self, values: Iterable[Any]) -> None:
+        for value in values:
+            self.update(value)
+
+    def merge(self, other: "Accumulator") -> None:
+        raise NotImplementedError
+
+    def finalize(self) -> float:
+        raise NotImplementedError
+
+    def to_state(self) -> Dict[str, Any]:
+        """
+        Сериализация состояния в JSON-совместимый словарь.
+        """
+        return {
+            "name": self.name,
+            "argument": self.argument,
+            "relative_error": self.relative_error,
+            "count": self.count,
+            "data": self._dump(),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "Accumulator":
+        """
+        Восстановление аккумулятора из словаря to_state().
+        """
+        accumulator = cls(argument=state["argument"], relative_error=state["relative_error"])
+        accumulator.count = state["count"]
+        accumulator._load(state["data"])
+        return accumulator
+
+    def _dump(self) -> Any:
+        raise NotImplementedError
+
+    def _load(self, data: Any) -> None:
+        raise NotImplementedError
+
+
+@register_accumulator("avg")
+class AvgAccumulator(Accumulator):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.total = 0.0
+
+    def update(self, value: float) -> None:
+        self.total += value
+        self.count += 1
+
+    def update_many(self, values: Iterable[float]) -> None:
+        values = list(values)
+        self.total += sum(values)
+        self.count += len(values)
+
+    def merge(self, other: "AvgAccumulator") -> None:
+        self.total += other.total
+        self.count += other.count
+
+    def finalize(self) -> float:
+        return self.total / self.count
+
+    def _dump(self) -> Any:
+        return self.total
+
+    def _load(self, data: Any) -> None:
+        self.total = data
+
+
+@register_accumulator("sum")
+class SumAccumulator(AvgAccumulator):
+    def finalize(self) -> float:
+        return self.total
+
+
+@register_accumulator("min")
+class MinAccumulator(Accumulator):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.value: Optional[float] = None
+
+    def update(self, value: float) -> None:
+        if self.value is None or value < self.value:
+            self.value = value
+        self.count += 1
+
+    def update_many(self, values: Iterable[float]) -> None:
+        values = list(values)
+        if values:
+            self.update(min(values))
+            self.count += len(values) - 1
+
+    def merge(self, other: "MinAccumulator") -> None:
+        if other.count:
+            self.update(other.value)
+            self.count += other.count - 1
+
+    def finalize(self) -> float:
+        return self.value
+
+    def _dump(self) -> Any:
+        return self.value
+
+    def _load(self, data: Any) -> None:
+        self.value = data
+
+
+@register_accumulator("max")
+class MaxAccumulator(MinAccumulator):
+    def update(self, value: float) -> None:
+        if self.value is None or value > self.value:
+            self.value = value
+        self.count += 1
+
+    def update_many(self, values: Iterable[float]) -> None:
+        values = list(values)
+        if values:
+            self.update(max(values))
+            self.count += len(values) - 1
+
+
+@register_accumulator("count")
+class CountAccumulator(Accumulator):
+    """Количество непустых значений."""
+
+    numeric = False
+    allow_empty = True
+
+    def update(self, value: str) -> None:
+        self.count += 1
+
+    def merge(self, other: "CountAccumulator") -> None:
+        self.count += other.count
+
+    def finalize(self) -> float:
+        return self.count
+
+    def _dump(self) -> Any:
+        return None
+
+    def _load(self, data: Any) -> None:
+        pass
+
+
+@register_accumulator("count_distinct")
+class CountDistinctAccumulator(Accumulator):
+    """Точное количество уникальных значений (память растет с числом уникальных)."""
+
+    numeric = False
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.values: Set[str] = set()
+        self.value_bytes = 0
+
+    @property
+    def nbytes(self) -> int:
+        return ACCUMULATOR_BYTES + self.value_bytes
+
+    def update(self, value: str) -> None:
+        if value not in self.values:
+            self._add(value)
+        self.count += 1
+
+    def merge(self, other: "CountDistinctAccumulator") -> None:
+        for value in other.values:
+            if value not in self.values:
+                self._add(value)
+        self.count += other.count
+
+    def _add(self, value: str) -> None:
+        size = DISTINCT_VALUE_BYTES + len(value)
+        if self.reservation is not None:
+            self.reservation.grow(size, "Уникальные значения count_distinct")
+        self.values.add(value)
+        self.value_bytes += size
+
+    def finalize(self) -> float:
+        return len(self.values)
+
+    def _dump(self) -> Any:
+        return sorted(self.values)
+
+    def _load(self, data: Any) -> None:
+        self.values = set(data)
+        self.value_bytes = sum(DISTINCT_VALUE_BYTES + len(value) for value in self.values)
+
+
+@register_accumulator("var")
+class VarianceAccumulator(Accumulator):
+    """Выборочная дисперсия (алгоритм Уэлфорда, слияние по формуле Чана)."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def merge(self, other: "VarianceAccumulator") -> None:
+        if not other.count:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+
+    def finalize(self) -> float:
+        if self.count < 2:
+            return 0.0
+        return self.m2 / (self.count - 1)
+
+    def _dump(self) -> Any:
+        return [self.mean, self.m2]
+
+    def _load(self, data: Any) -> None:
+        self.mean, self.m2 = data
+
+
+@register_accumulator("stddev")
+class StddevAccumulator(VarianceAccumulator):
+    """Выборочное стандартное отклонение."""
+
+    def finalize(self) -> float:
+        return math.sqrt(super().finalize())
+
+
+@register_accumulator("approx_percentile")
+class ApproxPercentileAccumulator(Accumulator):
+    """Приближенный перцентиль (t-digest), параметр — перцентиль 0..100, по умолчанию медиана."""
+
+    accepts_argument = True
+    DEFAULT_PERCENTILE = 50.0
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # Скетчи импортируются при первом использовании, чтобы не замедлять запуск CLI
+        from .sketches import TDigest
+
+        self.digest = TDigest.from_error(self.relative_error)
+
+    @property
+    def nbytes(self) -> int:
+        return ACCUMULATOR_BYTES + self.digest.nbytes
+
+    @classmethod
+    def check_argument(cls, argument: Optional[float]) -> None:
+        if argument is not None and not 0 <= argument <= 100:
+            raise ValueError(f"Перцентиль должен быть в интервале [0, 100]: '{argument:g}'")
+
+    def update(self, value: float) -> None:
+        self.digest.update(value)
+        self.count += 1
+
+    def merge(self, other: "ApproxPercentileAccumulator") -> None:
+        self.digest.merge(other.digest)
+        self.count += other.count
+
+    def finalize(self) -> float:
+        percentile = self.DEFAULT_PERCENTILE if self.argument is None else self.argument
+        return self.digest.quantile(percentile / 100)
+
+    def _dump(self) -> Any:
+        return self.digest.to_dict()
+
+    def _load(self, data: Any) -> None:
+        from .sketches import TDigest
+
+        self.digest = TDigest.from_dict(data)
+
+
+@register_accumulator("approx_distinct")
+class ApproxDistinctAccumulator(Accumulator):
+    """Приближенное количество уникальных значений (HyperLogLog)."""
+
+    numeric = False
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        from .sketches import HyperLogLog
+
+        self.sketch = HyperLogLog.from_error(self.relative_error)
+
+    @property
+    def nbytes(self) -> int:
+        return ACCUMULATOR_BYTES + self.sketch.nbytes
+
+    def update(self, value: str) -> None:
+        self.sketch.update(value)
+        self.count += 1
+
+    def merge(self, other: "ApproxDistinctAccumulator") -> None:
+        self.sketch.merge(other.sketch)
+        self.count += other.count
+
+    def finalize(self) -> float:
+        # Оценка не может превышать число просмотренных значений
+        return min(round(self.sketch.estimate()), self.count)
+
+    def _dump(self) -> Any:
+        return self.sketch.to_dict()
+
+    def _load(self, data: Any) -> None:
+        from .sketches import HyperLogLog
+
+        self.sketch = HyperLogLog.from_dict(data)
@@ -1,80 +1,220 @@
 """
 Система агрегации данных
 """
-from typing import List, Dict, NamedTuple
-from enum import Enum
-import re
+import math
+from itertools import chain, islice
+from typing import Any, Iterable, List, Dict, NamedTuple, Optional, Sequence, Tuple, Union
+from .accumulators import Accumulator, DEFAULT_RELATIVE_ERROR, create_accumulator, get_accumulator_class
+from .argument_parser import AGGREGATE_PATTERN, AggregateCondition, AggregateFunction, aggregate_function
+from .records import column_getter, key_getter
 
-class AggregateFunction(Enum):
-    AVG = "avg"
-    MIN = "min"
-    MAX = "max"
+DEFAULT_CONFIDENCE = 0.95
+# Функции, значение которых по выборке масштабируется на весь файл
+SCALED_FUNCTIONS = ("sum", "count")
+
+
+class ConfidenceInterval(NamedTuple):
+    """Доверительный интервал оценки по выборке."""
+
+    low: float
+    high: float
+    level: float = DEFAULT_CONFIDENCE
 
-class AggregateCondition(NamedTuple):
-    column: str
-    function: AggregateFunction
 
 class Aggregator:
     """
     Движок агрегации данных
     """
+    def __init__(self, relative_error: float = DEFAULT_RELATIVE_ERROR):
+        """
+        relative_error — допустимая погрешность приближенных функций (approx_*)
+        """
+        self.relative_error = relative_error
+
     def aggregate_data(self, data: List[Dict[str, str]], condition: str) -> float:
         """
         Агрегация данных по условию (например, 'price=avg')
         """
         aggregate_condition = self._parse_condition(condition)
-        values = self._extract_numeric_values(data, aggregate_condition.column)
-        return self._apply_function(values, aggregate_condition.function)
+        accumulator = self.create_accumulator(aggregate_condition.function, aggregate_condition.argument)
+        accumulator.update_many(self.extract_values(data, aggregate_condition.column, accumulator.numeric))
+        return self.finalize(accumulator, aggregate_condition.column)
+
+    def create_accumulator(self, function: Union[AggregateFunction, str],
+                           argument: Optional[float] = None) -> Accumulator:
+        """
+        Создание аккумулятора функции (для поблочной обработки и слияния состояний)
+        """
+        name = function.value if isinstance(function, AggregateFunction) else function
+        return create_accumulator(name, argument, relative_error=self.relative_error)
+
+    def finalize(self, accumulator: Accumulator, column: str) -> float:
+        """
+        Итоговое значение аккумулятора с проверкой наличия данных
+        """
+        if not accumulator.count and not accumulator.allow_empty:
+            kind = "числовых значений" if accumulator.numeric else "значений"
+            raise ValueError(f"Нет {kind} в столбце '{column}' для агрегации")
+        return accumulator.finalize()
+
+    def estimate_from_sample(self, data: List[Dict[str, str]], condition: AggregateCondition, value: float,
+                             scale: float, confidence: float = DEFAULT_CONFIDENCE,
+                             clusters: Sequence[int] = ()) -> Tuple[float, Optional[ConfidenceInterval]]:
+        """
+        Оценка по выборке: sum и count масштабируются на весь файл (scale — отношение
+        числа строк файла к выборке), для avg строится нормальный доверительный интервал.
+        clusters — число строк каждого прочитанного блока блочной выборки (строки data
+        идут блоками подряд): дисперсия считается по блокам, а не по строкам
+        """
+        function = getattr(condition.function, "value", condition.function)
+        if function in SCALED_FUNCTIONS:
+            return value * scale, None
+        if function != AggregateFunction.AVG.value:
+            return value, None
+        if clusters:
+            standard_error = self._cluster_standard_error(data, condition.column, value, clusters)
+        else:
+            values = self._extract_numeric_values(data, condition.column)
+            standard_error = None
+            if len(values) >= 2:
+                from statistics import stdev
+
+                standard_error = stdev(values) / math.sqrt(len(values))
+        if standard_error is None:
+            return value, None
+        from statistics import NormalDist
+
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        # Поправка на конечность совокупности: при выборке всего файла интервал вырождается
+        correction = math.sqrt(max(0.0, 1 - 1 / scale)) if scale > 0 else 1.0
+        margin = z * standard_error * correction
+        return value, ConfidenceInterval(value - margin, value + margin, confidence)
+
+    def _cluster_standard_error(self, data: List[Dict[str, str]], column: str, mean: float,
+                                clusters: Sequence[int]) -> Optional[float]:
+        """
+        Стандартная ошибка среднего по кластерной (блочной) выборке: строки одного
+        блока зависимы, поэтому наблюдения — блоки, а среднее — отношение сумм
+        значений к их числу (оценка отношения, n — число блоков)
+        """
+        if len(clusters) < 2:
+            return None
+        get = column_getter(data, column)
+        rows = iter(data)
+        totals, counts = [], []
+        for size in clusters:
+            total, count = 0.0, 0
+            for row in islice(rows, size):
+                try:
+                    total += float(get(row))
+                except (TypeError, ValueError):
+                    continue
+                count += 1
+            totals.append(total)
+            counts.append(count)
+        blocks = len(counts)
+        mean_count = sum(counts) / blocks
+        if not mean_count:
+            return None
+        residual = sum((total - mean * count) ** 2 for total, count in zip(totals, counts)) / (blocks - 1)
+        return math.sqrt(residual / blocks) / mean_count
+
+    def extract_values(self, data: List[Dict[str, str]], column: str, numeric: bool = True) -> List[Any]:
+        """
+        Извлечение значений колонки: числовых или непустых строковых
+        """
+        if numeric:
+            return self._extract_numeric_values(data, column)
+        values = map(column_getter(data, column), data)
+        return [value for value in values if value]
+
+    def aggregate_groups(self, rows: Iterable[Dict[str, str]], group_columns: Sequence[str],
+                         condition: AggregateCondition, bucket: Optional[Any] = None,
+                         reservation: Optional[Any] = None) -> Dict[Tuple, Accumulator]:
+        """
+        Аккумуляторы по группам (значения group_columns) в порядке первого появления группы.
+
+        bucket (timestamps.TimeBucket) добавляет в начало ключа начало интервала
+        метки времени строки в микросекундах (None — значение не дата).
+        reservation (memory.Reservation) учитывает память групп и рост их состояний
+
+        Raises:
+            ValueError: если группы не помещаются в лимит памяти reservation
+        """
+        groups: Dict[Tuple, Accumulator] = {}
+        rows = iter(rows)
+        first = next(rows, None)
+        if first is None:
+            return groups
+        key_of = key_getter(first, group_columns)
+        if bucket is not None:
+            from .timestamps import bucket_start, parse_timestamp
+
+            group_key_of = key_of
+            get_time = column_getter([first], bucket.column)
+            width = bucket.width
+
+            def key_of(row):
+                timestamp = parse_timestamp(get_time(row))
+                return (None if timestamp is None else bucket_start(timestamp, width),) + group_key_of(row)
+        get = column_getter([first], condition.column)
+        for row in chain((first,), rows):
+            key = key_of(row)
+            accumulator = groups.get(key)
+            if accumulator is None:
+                accumulator = groups[key] = self.create_accumulator(condition.function, condition.argument)
+                if reservation is not None:
+                    reserve_group(reservation, key, accumulator)
+            value = get(row)
+            if accumulator.numeric:
+                try:
+                    value = float(value)
+                except (TypeError, ValueError):
+                    continue
+            elif not value:
+                continue
+            accumulator.update(value)
+        return groups
 
     def _parse_condition(self, condition: str) -> AggregateCondition:
         """
-        Парсинг условия агрегации (например, 'price=avg')
+        Парсинг условия агрегации (например, 'price=avg' или 'price=approx_percentile:95')
         """
-        pattern = r"^([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*([a-zA-Z]+)$"
-        match = re.match(pattern, condition.strip())
+        match = AGGREGATE_PATTERN.match(condition.strip())
         if not match:
             raise ValueError(f"Некорректный формат условия агрегации: '{condition}'. Ожидается формат 'column=func'")
-        column, function_str = match.groups()
-        try:
-            function = AggregateFunction(function_str.lower())
-        except ValueError:
-            valid = ', '.join(f.value for f in AggregateFunction)
-            raise ValueError(f"Неподдерживаемая функция агрегации: '{function_str}'. Поддерживаются: {valid}")
-        return AggregateCondition(column=column.strip(), function=function)
+        column, function_str, argument_str = match.groups()
+        accumulator_class = get_accumulator_class(function_str)
+        argument = float(argument_str) if argument_str is not None else None
+        accumulator_class.check_argument(argument)
+        return AggregateCondition(column=column.strip(), function=aggregate_function(accumulator_class.name),
+                                  argument=argument)
 
     def _extract_numeric_values(self, data: List[Dict[str, str]], column: str) -> List[float]:
         """
         Извлечение числовых значений из колонки
         """
         values = []
-        for row in data:
-            value = row.get(column)
+        for value in map(column_getter(data, column), data):
             if value is None:
                 continue
             try:
                 values.append(float(value))
             except Exception:
                 continue
-        if not values:
-            raise ValueError(f"Нет числовых значений в столбце '{column}' для агрегации")
         return values
 
-    def _apply_function(self, values: List[float], function: AggregateFunction) -> float:
-        """
-        Применение функции агрегации
-        """
-        if function == AggregateFunction.AVG:
-            return self._calculate_avg(values)
-        elif function == AggregateFunction.MIN:
-            return self._calculate_min(values)
-        elif function == AggregateFunction.MAX:
-            return self._calculate_max(values)
 
-    def _calculate_avg(self, values: List[float]) -> float:
-        return sum(values) / len(values)
+def reserve_group(reservation: Any, key: Tuple, accumulator: Accumulator) -> None:
+    """
+    Резервирует память группы агрегации (ключ и состояние аккумулятора)
+    и относит к резервированию дальнейший рост состояния.
 
-    def _calculate_min(self, values: List[float]) -> float:
-        return min(values)
+    Raises:
+        ValueError: если группа не помещается в лимит памяти
+    """
+    from .join_engine import ROW_OVERHEAD_BYTES
 
-    def _calculate_max(self, values: List[float]) -> float:
-        return max(values) 
\ No newline at end of file
+    size = ROW_OVERHEAD_BYTES * (len(key) + 2) + sum(len(value) for value in key if isinstance(value, str))
+    reservation.grow(size + accumulator.nbytes, "Группы агрегации")
+    accumulator.bind(reservation)
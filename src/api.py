@@ -0,0 +1,170 @@
+"""
+Встраиваемый Python API без вывода в консоль.
+
+Запрос строится цепочкой и выполняется лениво при итерации:
+
+    from src import open_csv
+
+    rows = open_csv("phones.csv").where("price>500").order_by("price=desc").limit(10)
+    for row in rows:
+        ...
+    for batch in open_csv("phones.csv").batches(1000):
+        prices = batch["price"]
+    average = open_csv("phones.csv").where("brand=xiaomi").aggregate("price=avg")
+
+Ошибки не перехватываются, а пробрасываются вызывающему коду
+(FileNotFoundError, ValueError, KeyError).
+"""
+
+import os
+from itertools import islice
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .aggregator import Aggregator
+from .argument_parser import (
+    FilterCondition,
+    SortCondition,
+    parse_aggregate_condition,
+    parse_filter_condition,
+    parse_order_by_conditions,
+)
+from .csv_reader import CSVReader
+from .filter_engine import compile_filter
+from .records import column_getter
+from .sorting import sort_rows
+
+Row = Dict[str, str]
+DEFAULT_BATCH_SIZE = 10000
+
+
+class Query:
+    """
+    Неизменяемый ленивый запрос к CSV-файлу: каждый шаг цепочки возвращает новый запрос.
+    """
+
+    def __init__(self, filepath: str, csv_reader: Optional[CSVReader] = None,
+                 aggregator: Optional[Aggregator] = None):
+        self.filepath = filepath
+        self.csv_reader = csv_reader or CSVReader()
+        self.aggregator = aggregator or Aggregator()
+        self._filters: Tuple[FilterCondition, ...] = ()
+        self._order_by: Tuple[SortCondition, ...] = ()
+        self._limit: Optional[int] = None
+
+    def _copy(self, **changes) -> "Query":
+        query = Query(self.filepath, self.csv_reader, self.aggregator)
+        query._filters, query._order_by, query._limit = self._filters, self._order_by, self._limit
+        for name, value in changes.items():
+            setattr(query, f"_{name}", value)
+        return query
+
+    def where(self, condition: Union[str, FilterCondition]) -> "Query":
+        """
+        Добавляет условие фильтрации ('price>500', 'brand in (apple,xiaomi)');
+        несколько условий объединяются через И.
+        """
+        if isinstance(condition, str):
+            condition = parse_filter_condition(condition)
+        return self._copy(filters=self._filters + (condition,))
+
+    def order_by(self, condition: Union[str, SortCondition]) -> "Query":
+        """
+        Сортировка результата ('price=desc' или 'brand=asc,price=desc');
+        требует чтения всех подходящих строк.
+        """
+        conditions = parse_order_by_conditions(condition) if isinstance(condition, str) else (condition,)
+        return self._copy(order_by=conditions)
+
+    def limit(self, count: int) -> "Query":
+        """
+        Ограничивает количество строк результата.
+        """
+        if count < 0:
+            raise ValueError(f"Лимит должен быть неотрицательным: {count}")
+        return self._copy(limit=count)
+
+    @property
+    def headers(self) -> List[str]:
+        """
+        Заголовки файла (читается только первая строка).
+        """
+        headers, rows = self.csv_reader.iter_file(self.filepath)
+        # Генератор закрывает файл, только если был запущен
+        next(rows, None)
+        rows.close()
+        return list(headers)
+
+    def __iter__(self) -> Iterator[Row]:
+        return self.rows()
+
+    def rows(self) -> Iterator[Row]:
+        """
+        Ленивый итератор строк результата.
+        """
+        _, rows = self._scan()
+        return rows
+
+    def batches(self, size: int = DEFAULT_BATCH_SIZE) -> Iterator[Dict[str, List[str]]]:
+        """
+        Ленивый итератор пакетов по столбцам: {столбец: значения} не более size строк.
+        """
+        if size <= 0:
+            raise ValueError(f"Размер пакета должен быть положительным: {size}")
+        headers, rows = self._scan()
+        while True:
+            chunk = list(islice(rows, size))
+            if not chunk:
+                return
+            yield {column: list(map(column_getter(chunk, column), chunk)) for column in headers}
+
+    def aggregate(self, condition: str) -> float:
+        """
+        Значение агрегации по строкам запроса ('price=avg', 'price=approx_percentile:95').
+
+        Raises:
+            ValueError: если условие некорректно или в столбце нет значений
+            KeyError: если столбца нет в файле
+        """
+        aggregate_condition = parse_aggregate_condition(condition)
+        accumulator = self.aggregator.create_accumulator(aggregate_condition.function, aggregate_condition.argument)
+        column = aggregate_condition.column
+        _, rows = self._scan([column])
+        while True:
+            chunk = list(islice(rows, DEFAULT_BATCH_SIZE))
+            if not chunk:
+                break
+            accumulator.update_many(self.aggregator.extract_values(chunk, column, accumulator.numeric))
+        return self.aggregator.finalize(accumulator, column)
+
+    def _scan(self, columns: Sequence[str] = ()) -> Tuple[List[str], Iterator[Row]]:
+        headers, rows = self.csv_reader.iter_file(self.filepath)
+        try:
+            predicates: List[Callable[[Row], bool]] = [compile_filter(condition, headers)
+                                                       for condition in self._filters]
+            for column in columns:
+                if column not in headers:
+                    raise KeyError(column)
+        except KeyError:
+            # Генератор закрывает файл, только если был запущен
+            next(rows, None)
+            rows.close()
+            raise
+        if predicates:
+            rows = (row for row in rows if all(predicate(row) for predicate in predicates))
+        if self._order_by:
+            rows = iter(sort_rows(list(rows), self._order_by))
+        if self._limit is not None:
+            rows = islice(rows, self._limit)
+        return headers, rows
+
+
+def open_csv(filepath: str, csv_reader: Optional[CSVReader] = None) -> Query:
+    """
+    Начинает запрос к CSV-файлу.
+
+    Raises:
+        FileNotFoundError: если файл не найден
+    """
+    if not os.path.exists(filepath):
+        raise FileNotFoundError("Файл не найден")
+    return Query(filepath, csv_reader)
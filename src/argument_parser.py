@@ -3,13 +3,56 @@
 
 Поддерживает парсинг команд фильтрации и агрегации:
 - --where "column=value" | --where "column>value" | --where "column<value"
-- --aggregate "column=function" (avg, min, max)
+- --where-in-file "column=keys.csv" (значение есть в файле ключей)
+- --aggregate "column=function" (avg, min, max, sum, count, count_distinct,
+  stddev, var, approx_percentile, approx_distinct)
+- --aggregate "column=approx_percentile:95" (функция с параметром)
 """
 
 import argparse
 from enum import Enum
+import os
 import re
-from typing import NamedTuple, Optional
+from typing import IO, TYPE_CHECKING, Any, Callable, Dict, NamedTuple, NoReturn, Optional, Tuple, Type, Union
+
+# Модули отдельных параметров импортируются в разборе этих параметров:
+# простой запрос не загружает кеш, выборку, метки времени и фильтры
+if TYPE_CHECKING:
+    from .csv_reader import ReadOptions
+    from .result_cache import CacheOptions
+    from .sampling import SampleOptions
+    from .timestamps import TimeBucket
+
+
+class LazyPattern:
+    """
+    Регулярное выражение, компилируемое при первом использовании: запуск
+    не платит за разбор шаблонов параметров, которые не указаны.
+    """
+
+    __slots__ = ("pattern", "flags", "_compiled")
+
+    def __init__(self, pattern: str, flags: int = 0):
+        self.pattern = pattern
+        self.flags = flags
+        self._compiled: Optional["re.Pattern[str]"] = None
+
+    def __getattr__(self, name: str) -> Any:
+        if self._compiled is None:
+            self._compiled = re.compile(self.pattern, self.flags)
+        return getattr(self._compiled, name)
+
+
+# Регулярные выражения компилируются один раз, при первом использовании
+IDENTIFIER_PATTERN = LazyPattern(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
+# Условие фильтрации (запрещает >= <= != и другие комбинации)
+FILTER_PATTERN = LazyPattern(r"^([a-zA-Z_][a-zA-Z0-9_]*)\s*(~=|\^=|~|=|>|<)(?!=|>|<)\s*(.+)$")
+FILTER_IN_PATTERN = LazyPattern(r"^([a-zA-Z_][a-zA-Z0-9_]*)\s+in\s*\((.*)\)$", re.IGNORECASE | re.DOTALL)
+FILTER_NULL_PATTERN = LazyPattern(r"^([a-zA-Z_][a-zA-Z0-9_]*)\s+is\s+(not\s+)?null$", re.IGNORECASE)
+AGGREGATE_PATTERN = LazyPattern(r"^([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*([a-zA-Z_]+)(?:\s*:\s*(\d+(?:\.\d+)?))?$")
+WINDOW_PATTERN = LazyPattern(r"^([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*([a-zA-Z_]+)(?:\s*:\s*(\d+))?$")
+ORDER_BY_PATTERN = LazyPattern(r"^([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*(asc|desc)$", re.IGNORECASE)
+SIZE_PATTERN = LazyPattern(r"^(\d+(?:\.\d+)?)\s*([KMGT]?)B?$", re.IGNORECASE)
 
 
 class FilterOperator(Enum):
@@ -18,14 +61,33 @@ class FilterOperator(Enum):
     EQUAL = "="
     GREATER = ">"
     LESS = "<"
+    IN = "in"
+    REGEX = "~"
+    PREFIX = "^="
+    EQUAL_IGNORE_CASE = "~="
+    IS_NULL = "is null"
+    IS_NOT_NULL = "is not null"
+    IN_FILE = "in file"
 
 
 class AggregateFunction(Enum):
-    """Функции агрегации."""
+    """
+    Встроенные функции агрегации (реализации — в реестре src.accumulators).
+
+    Допустимость функции проверяется по реестру: функция, добавленная через
+    register_accumulator, передается в условии агрегации строкой.
+    """
 
     AVG = "avg"
     MIN = "min"
     MAX = "max"
+    SUM = "sum"
+    COUNT = "count"
+    COUNT_DISTINCT = "count_distinct"
+    STDDEV = "stddev"
+    VAR = "var"
+    APPROX_PERCENTILE = "approx_percentile"
+    APPROX_DISTINCT = "approx_distinct"
 
 
 class SortDirection(Enum):
@@ -35,19 +97,37 @@ class SortDirection(Enum):
     DESC = "desc"
 
 
+class JoinType(Enum):
+    """Тип соединения."""
+
+    INNER = "inner"
+    LEFT = "left"
+
+
 class FilterCondition(NamedTuple):
     """Условие фильтрации."""
 
     column: str
     operator: FilterOperator
     value: str
+    # Проверка значения столбца, скомпилированная при разборе (см. filter_engine.build_value_test)
+    predicate: Optional[Callable[[Optional[str]], bool]] = None
 
 
 class AggregateCondition(NamedTuple):
     """Условие агрегации."""
 
     column: str
-    function: AggregateFunction
+    function: Union[AggregateFunction, str]
+    argument: Optional[float] = None
+
+
+class WindowCondition(NamedTuple):
+    """Оконная функция (реализации — в реестре src.window)."""
+
+    column: str
+    function: str
+    argument: Optional[int] = None
 
 
 class SortCondition(NamedTuple):
@@ -57,6 +137,14 @@ class SortCondition(NamedTuple):
     direction: SortDirection
 
 
+class JoinCondition(NamedTuple):
+    """Условие соединения с другим CSV-файлом."""
+
+    filename: str
+    key: str
+    join_type: JoinType = JoinType.INNER
+
+
 class Arguments(NamedTuple):
     """Распарсенные аргументы командной строки."""
 
@@ -64,16 +152,71 @@ class Arguments(NamedTuple):
     filter_condition: Optional[FilterCondition] = None
     aggregate_condition: Optional[AggregateCondition] = None
     order_by_condition: Optional[SortCondition] = None
+    join_condition: Optional[JoinCondition] = None
+    cache_options: Optional["CacheOptions"] = None
+    checkpoint_dir: Optional[str] = None
+    follow_interval: Optional[float] = None
+    queries_file: Optional[str] = None
+    output_dir: Optional[str] = None
+    sample_options: Optional["SampleOptions"] = None
+    sorted_by: Optional[SortCondition] = None
+    # Все ключи сортировки; order_by_condition — первый из них
+    order_by_conditions: Tuple[SortCondition, ...] = ()
+    # Столбцы DISTINCT: None — без удаления дубликатов, () — по всем столбцам
+    distinct_columns: Optional[Tuple[str, ...]] = None
+    read_options: Optional["ReadOptions"] = None
+    # Общий бюджет памяти запроса в байтах (--memory-limit)
+    memory_limit: Optional[int] = None
+    # Столбцы группировки агрегации (--group-by)
+    group_by: Tuple[str, ...] = ()
+    # Число процессов для обработки секций каталога; None — по числу ядер
+    workers: Optional[int] = None
+    # Профиль столбцов вместо строк (--describe)
+    describe: bool = False
+    # Число строк файла (--count) и первые/последние строки (--head/--tail)
+    count_rows: bool = False
+    head_rows: Optional[int] = None
+    tail_rows: Optional[int] = None
+    # Оконные функции (--window) и столбцы их секций (--partition-by)
+    window_conditions: Tuple[WindowCondition, ...] = ()
+    partition_by: Tuple[str, ...] = ()
+    # Интервал времени группировки агрегации (--bucket)
+    bucket: Optional["TimeBucket"] = None
+    # Адреса исполнителей распределенного выполнения (--coordinator)
+    coordinator: Tuple[Tuple[str, int], ...] = ()
+
+
+class ArgumentParserError(ValueError):
+    """Ошибка разбора аргументов; текст — то, что парсер вывел бы в консоль."""
+
+
+class RaisingArgumentParser(argparse.ArgumentParser):
+    """
+    Парсер без вывода в sys.stdout/sys.stderr и выхода из процесса: справка
+    и сообщения об ошибках передаются исключением ArgumentParserError.
+    Нужен там, где аргументы разбираются параллельно в потоках (serve).
+    """
 
+    def _print_message(self, message: str, file: Optional[IO[str]] = None) -> None:
+        if message:
+            self.__dict__.setdefault("_messages", []).append(message)
 
-def create_parser() -> argparse.ArgumentParser:
+    def exit(self, status: int = 0, message: Optional[str] = None) -> NoReturn:
+        text = "".join(self.__dict__.get("_messages", [])) + (message or "")
+        raise ArgumentParserError(text.strip() or "Ошибка: некорректные аргументы")
+
+
+def create_parser(parser_class: Type[argparse.ArgumentParser] = argparse.ArgumentParser) -> argparse.ArgumentParser:
     """
     Создает парсер аргументов командной строки.
 
+    Args:
+        parser_class: Класс парсера (RaisingArgumentParser — без вывода и выхода)
+
     Returns:
         argparse.ArgumentParser: Настроенный парсер
     """
-    parser = argparse.ArgumentParser(
+    parser = parser_class(
         description="CSV файл обработчик с поддержкой фильтрации и агрегации",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
@@ -82,6 +225,8 @@ def create_parser() -> argparse.ArgumentParser:
   python script.py data.csv --where "name=Apple"
   python script.py data.csv --aggregate "price=avg"
   python script.py data.csv --aggregate "quantity=min"
+  python script.py data.csv --aggregate "price=approx_percentile:95"
+  python script.py orders.csv --join products.csv --on sku --where "price>500"
         """,
     )
 
@@ -95,16 +240,256 @@ def create_parser() -> argparse.ArgumentParser:
         help='Условие фильтрации в формате "column=value", "column>value" или "column<value"',
     )
 
+    group.add_argument(
+        "--where-in-file",
+        type=str,
+        metavar="COLUMN=FILE",
+        help="Строки, значение столбца которых есть в первом столбце CSV-файла ключей: 'customer_id=keys.csv'",
+    )
+
     group.add_argument(
         "--aggregate",
         type=str,
-        help='Условие агрегации в формате "column=function" (avg, min, max)',
+        help='Условие агрегации в формате "column=function" '
+        '(avg, min, max, sum, count, count_distinct, stddev, var, '
+        'approx_percentile[:p], approx_distinct)',
     )
 
     group.add_argument(
         "--order-by",
         type=str,
-        help='Сортировка в формате "column=asc" или "column=desc"',
+        help='Сортировка в формате "column=asc" или "column=desc"; '
+        'несколько ключей через запятую: "brand=asc,price=desc"',
+    )
+
+    parser.add_argument(
+        "--describe",
+        action="store_true",
+        help="Профиль столбцов за один проход: тип, пустые значения, минимум, максимум, "
+        "среднее, стандартное отклонение, число уникальных и частые значения",
+    )
+
+    parser.add_argument(
+        "--window",
+        type=str,
+        metavar="FUNCTIONS",
+        help='Оконные функции через запятую: "price=moving_avg:7,price=cumsum" '
+        "(moving_avg:N, moving_sum:N, moving_min:N, moving_max:N, cumsum, cumavg, cummin, "
+        "cummax, cumcount, rank, lag[:N]); строки идут в порядке --order-by",
+    )
+
+    parser.add_argument(
+        "--partition-by",
+        type=str,
+        metavar="COLUMNS",
+        help="Столбцы секций оконных функций через запятую: состояние считается отдельно для каждой секции",
+    )
+
+    parser.add_argument(
+        "--count",
+        action="store_true",
+        help="Число строк данных: подсчет переводов строк по сырым байтам без разбора CSV",
+    )
+
+    parser.add_argument(
+        "--head",
+        type=int,
+        metavar="N",
+        help="Первые N строк (чтение останавливается после них)",
+    )
+
+    parser.add_argument(
+        "--tail",
+        type=int,
+        metavar="N",
+        help="Последние N строк (файл читается с конца)",
+    )
+
+    parser.add_argument(
+        "--join",
+        type=str,
+        metavar="FILE",
+        help="CSV файл для соединения (hash join) с основным файлом",
+    )
+
+    parser.add_argument(
+        "--on",
+        type=str,
+        metavar="COLUMN",
+        help="Ключевой столбец соединения (обязателен вместе с --join)",
+    )
+
+    parser.add_argument(
+        "--join-type",
+        type=str,
+        choices=[t.value for t in JoinType],
+        default=JoinType.INNER.value,
+        help="Тип соединения: inner (по умолчанию) или left",
+    )
+
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Кешировать результат на диске (инвалидируется при изменении файла)",
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        help="Каталог кеша результатов (по умолчанию ~/.cache/csv_file_processing)",
+    )
+
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        help="Время жизни записи кеша в секундах (по умолчанию 3600)",
+    )
+
+    parser.add_argument(
+        "--cache-max-size",
+        type=str,
+        help="Максимальный размер кеша, например 100M (по умолчанию 100M)",
+    )
+
+    parser.add_argument(
+        "--cache-content-hash",
+        action="store_true",
+        help="Отпечаток файла по хешу содержимого вместо размера и mtime",
+    )
+
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Инкрементальная агрегация: читать только строки, дописанные с прошлого запуска",
+    )
+
+    parser.add_argument(
+        "--checkpoint-dir",
+        type=str,
+        help="Каталог контрольных точек для --incremental (по умолчанию ~/.cache/csv_file_processing/checkpoints)",
+    )
+
+    parser.add_argument(
+        "--follow",
+        action="store_true",
+        help="Следить за дописываемым файлом (как tail -f) и обновлять результат",
+    )
+
+    parser.add_argument(
+        "--follow-interval",
+        type=float,
+        default=1.0,
+        help="Интервал опроса файла в секундах, если inotify недоступен (по умолчанию 1)",
+    )
+
+    parser.add_argument(
+        "--queries",
+        type=str,
+        metavar="FILE",
+        help="Файл запросов (по строке на запрос или JSON): все выполняются за одно чтение файла",
+    )
+
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        metavar="DIR",
+        help="Каталог для результатов запросов из --queries (по файлу на запрос)",
+    )
+
+    parser.add_argument(
+        "--sample",
+        type=float,
+        metavar="FRACTION",
+        help="Выполнить запрос по случайной доле строк (например, 0.01)",
+    )
+
+    parser.add_argument(
+        "--sample-rows",
+        type=int,
+        metavar="N",
+        help="Выполнить запрос по случайной выборке из N строк",
+    )
+
+    parser.add_argument(
+        "--sample-seed",
+        type=int,
+        metavar="SEED",
+        help="Начальное значение генератора для воспроизводимой выборки",
+    )
+
+    parser.add_argument(
+        "--distinct",
+        nargs="?",
+        const="",
+        metavar="COLUMNS",
+        help="Удалить дубликаты строк; со списком столбцов через запятую — "
+        "уникальные сочетания их значений",
+    )
+
+    parser.add_argument(
+        "--sorted-by",
+        type=str,
+        metavar="COLUMN",
+        help="Файл уже упорядочен по столбцу ('ts' или 'ts=desc'): "
+        "фильтр по нему читает только нужный диапазон, сортировка пропускается",
+    )
+
+    parser.add_argument(
+        "--group-by",
+        type=str,
+        metavar="COLUMNS",
+        help="Агрегация по группам: столбцы через запятую (вместе с --aggregate)",
+    )
+
+    parser.add_argument(
+        "--bucket",
+        type=str,
+        metavar="COLUMN=WIDTH",
+        help="Агрегация по интервалам времени столбца: 'ts=1h' (единицы s, m, h, d, w; вместе с --aggregate)",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        metavar="N",
+        help="Число процессов для параллельной обработки секций каталога (по умолчанию — по числу ядер)",
+    )
+
+    parser.add_argument(
+        "--coordinator",
+        type=str,
+        metavar="WORKERS",
+        help="Распределенное выполнение на исполнителях (main.py worker): адреса host:port через запятую; "
+        "файл — путь набора данных в каталогах данных исполнителей",
+    )
+
+    parser.add_argument(
+        "--memory-limit",
+        type=str,
+        metavar="SIZE",
+        help="Лимит памяти запроса, например 2G: сортировка, соединение и DISTINCT "
+        "сбрасывают данные на диск, таблица выводится частями",
+    )
+
+    parser.add_argument(
+        "--read-ahead",
+        type=int,
+        metavar="N",
+        help="Упреждающее чтение файла в фоновом потоке: N буферов в очереди "
+        "(2 — двойная, 3 — тройная буферизация)",
+    )
+
+    parser.add_argument(
+        "--read-buffer",
+        type=str,
+        metavar="SIZE",
+        help="Размер буфера упреждающего чтения, например 4M (по умолчанию 1M)",
+    )
+
+    parser.add_argument(
+        "--fadvise",
+        action="store_true",
+        help="Подсказать ядру последовательное чтение файла (posix_fadvise SEQUENTIAL)",
     )
 
     return parser
@@ -112,10 +497,12 @@ def create_parser() -> argparse.ArgumentParser:
 
 def parse_filter_condition(condition_str: str) -> FilterCondition:
     """
-    Парсит строку условия фильтрации.
+    Парсит строку условия фильтрации и компилирует для него предикат строки.
 
     Args:
-        condition_str: Строка вида "column=value", "column>value" или "column<value"
+        condition_str: Строка вида "column=value", "column>value", "column<value",
+            "column in (a,b,c)", "column~regex", "column^=prefix",
+            "column~=value" (без учета регистра), "column is null", "column is not null"
 
     Returns:
         FilterCondition: Распарсенное условие
@@ -123,14 +510,31 @@ def parse_filter_condition(condition_str: str) -> FilterCondition:
     Raises:
         ValueError: Если формат условия некорректен
     """
-    # Регулярное выражение для парсинга условия (запрещает >= <= != и другие комбинации)
-    pattern = r"^([a-zA-Z_][a-zA-Z0-9_]*)\s*(=|>|<)(?!=|>|<)\s*(.+)$"
-    match = re.match(pattern, condition_str.strip())
+    text = condition_str.strip()
+
+    null_match = FILTER_NULL_PATTERN.match(text)
+    if null_match:
+        column, negation = null_match.groups()
+        operator = FilterOperator.IS_NOT_NULL if negation else FilterOperator.IS_NULL
+        return _filter_condition(column, operator, "")
+
+    in_match = FILTER_IN_PATTERN.match(text)
+    if in_match:
+        from .filter_engine import parse_in_values
+
+        column, values = in_match.groups()
+        if not parse_in_values(values):
+            raise ValueError(f"Пустой список значений IN в условии: '{condition_str}'")
+        return _filter_condition(column, FilterOperator.IN, values.strip())
+
+    match = FILTER_PATTERN.match(text)
 
     if not match:
         raise ValueError(
             f"Некорректный формат условия фильтрации: '{condition_str}'. "
-            f"Ожидается формат 'column=value', 'column>value' или 'column<value'"
+            f"Ожидается формат 'column=value', 'column>value', 'column<value', "
+            f"'column in (a,b)', 'column~regex', 'column^=prefix', 'column~=value' "
+            f"или 'column is [not] null'"
         )
 
     column, operator_str, value = match.groups()
@@ -140,11 +544,35 @@ def parse_filter_condition(condition_str: str) -> FilterCondition:
         operator = FilterOperator(operator_str)
     except ValueError:
         raise ValueError(
-            f"Неподдерживаемый оператор: '{operator_str}'. " f"Поддерживаются: =, >, <"
+            f"Неподдерживаемый оператор: '{operator_str}'. " f"Поддерживаются: =, >, <, ~, ^=, ~="
         )
 
+    return _filter_condition(column, operator, value.strip())
+
+
+def parse_where_in_file(spec: str) -> FilterCondition:
+    """
+    Парсит условие полусоединения "column=keys.csv" (--where-in-file).
+
+    Raises:
+        ValueError: Если формат условия некорректен или файл ключей не найден
+    """
+    column, separator, filepath = spec.partition("=")
+    column, filepath = column.strip(), filepath.strip()
+    if not separator or not IDENTIFIER_PATTERN.match(column) or not filepath:
+        raise ValueError(f"Некорректный формат --where-in-file: '{spec}'. Ожидается 'column=keys.csv'")
+    if not os.path.isfile(filepath):
+        raise ValueError(f"Файл ключей не найден: '{filepath}'")
+    return _filter_condition(column, FilterOperator.IN_FILE, filepath)
+
+
+def _filter_condition(column: str, operator: FilterOperator, value: str) -> FilterCondition:
+    from .filter_engine import build_value_test
+
+    column = column.strip()
     return FilterCondition(
-        column=column.strip(), operator=operator, value=value.strip()
+        column=column, operator=operator, value=value,
+        predicate=build_value_test(operator.value, value),
     )
 
 
@@ -153,7 +581,7 @@ def parse_aggregate_condition(condition_str: str) -> AggregateCondition:
     Парсит строку условия агрегации.
 
     Args:
-        condition_str: Строка вида "column=function"
+        condition_str: Строка вида "column=function" или "column=function:argument"
 
     Returns:
         AggregateCondition: Распарсенное условие
@@ -161,9 +589,7 @@ def parse_aggregate_condition(condition_str: str) -> AggregateCondition:
     Raises:
         ValueError: Если формат условия некорректен
     """
-    # Регулярное выражение для парсинга условия агрегации
-    pattern = r"^([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*([a-zA-Z]+)$"
-    match = re.match(pattern, condition_str.strip())
+    match = AGGREGATE_PATTERN.match(condition_str.strip())
 
     if not match:
         raise ValueError(
@@ -171,25 +597,31 @@ def parse_aggregate_condition(condition_str: str) -> AggregateCondition:
             f"Ожидается формат 'column=function'"
         )
 
-    column, function_str = match.groups()
+    from .accumulators import get_accumulator_class
+
+    column, function_str, argument_str = match.groups()
+    accumulator_class = get_accumulator_class(function_str.strip())
+    argument = float(argument_str) if argument_str is not None else None
+    accumulator_class.check_argument(argument)
+
+    return AggregateCondition(column=column.strip(), function=aggregate_function(accumulator_class.name),
+                              argument=argument)
+
 
-    # Преобразуем функцию в enum
+def aggregate_function(name: str) -> Union[AggregateFunction, str]:
+    """
+    Функция агрегации зарегистрированного аккумулятора: элемент AggregateFunction
+    для встроенной функции, имя — для добавленной через register_accumulator.
+    """
     try:
-        function = AggregateFunction(function_str.lower().strip())
+        return AggregateFunction(name)
     except ValueError:
-        valid_functions = [f.value for f in AggregateFunction]
-        raise ValueError(
-            f"Неподдерживаемая функция агрегации: '{function_str}'. "
-            f"Поддерживаются: {', '.join(valid_functions)}"
-        )
-
-    return AggregateCondition(column=column.strip(), function=function)
+        return name
 
 
 def parse_order_by_condition(condition_str: str) -> SortCondition:
     """Парсит строку условия сортировки."""
-    pattern = r"^([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*(asc|desc)$"
-    match = re.match(pattern, condition_str.strip(), flags=re.IGNORECASE)
+    match = ORDER_BY_PATTERN.match(condition_str.strip())
     if not match:
         raise ValueError(
             f"Некорректный формат условия сортировки: '{condition_str}'. "
@@ -201,41 +633,387 @@ def parse_order_by_condition(condition_str: str) -> SortCondition:
     return SortCondition(column=column.strip(), direction=direction)
 
 
-def parse_arguments(args: Optional[list[str]] = None) -> Arguments:
+def parse_order_by_conditions(condition_str: str) -> Tuple[SortCondition, ...]:
+    """
+    Парсит список ключей сортировки через запятую ("brand=asc,price=desc").
+
+    Raises:
+        ValueError: Если формат одного из ключей некорректен
+    """
+    return tuple(parse_order_by_condition(part) for part in condition_str.split(","))
+
+
+def parse_window_condition(condition_str: str) -> WindowCondition:
+    """
+    Парсит оконную функцию вида "column=function" или "column=function:N".
+
+    Raises:
+        ValueError: Если формат, функция или параметр некорректны
+    """
+    match = WINDOW_PATTERN.match(condition_str.strip())
+    if not match:
+        raise ValueError(
+            f"Некорректный формат оконной функции: '{condition_str}'. "
+            f"Ожидается формат 'column=function' или 'column=function:N'"
+        )
+    column, function, argument_str = match.groups()
+    # Реестр оконных функций загружается только при их использовании
+    from .window import get_window_class
+
+    window_class = get_window_class(function)
+    argument = int(argument_str) if argument_str is not None else None
+    window_class.check_argument(argument)
+    return WindowCondition(column=column, function=window_class.name, argument=argument)
+
+
+def parse_window_conditions(conditions_str: str) -> Tuple[WindowCondition, ...]:
+    """
+    Парсит список оконных функций через запятую.
+    """
+    return tuple(parse_window_condition(part) for part in conditions_str.split(","))
+
+
+def parse_group_by_columns(columns_str: str, option: str = "--group-by") -> Tuple[str, ...]:
+    """
+    Парсит непустой список столбцов через запятую (--group-by, --by подкоманды partition).
+
+    Raises:
+        ValueError: Если список пуст или имя столбца некорректно
+    """
+    columns = tuple(column.strip() for column in columns_str.split(","))
+    for column in columns:
+        if not IDENTIFIER_PATTERN.match(column):
+            raise ValueError(f"Некорректное имя столбца в {option}: '{column}'")
+    if len(set(columns)) != len(columns):
+        raise ValueError(f"Столбцы в {option} повторяются: '{columns_str}'")
+    return columns
+
+
+def parse_distinct_columns(columns_str: str) -> Tuple[str, ...]:
+    """
+    Парсит список столбцов DISTINCT через запятую (пустая строка — все столбцы).
+
+    Raises:
+        ValueError: Если имя столбца некорректно
+    """
+    if not columns_str.strip():
+        return ()
+    columns = tuple(column.strip() for column in columns_str.split(","))
+    for column in columns:
+        if not IDENTIFIER_PATTERN.match(column):
+            raise ValueError(f"Некорректное имя столбца в --distinct: '{column}'")
+    return columns
+
+
+def parse_sorted_by(condition_str: str) -> SortCondition:
+    """
+    Парсит столбец, по которому упорядочен файл: 'column' (по возрастанию) или 'column=asc|desc'.
+
+    Raises:
+        ValueError: Если формат некорректен
+    """
+    if "=" in condition_str:
+        return parse_order_by_condition(condition_str)
+    if not IDENTIFIER_PATTERN.match(condition_str.strip()):
+        raise ValueError(f"Некорректное имя столбца в --sorted-by: '{condition_str}'")
+    return SortCondition(column=condition_str.strip(), direction=SortDirection.ASC)
+
+
+def parse_join_condition(
+    filename: str, key: Optional[str], join_type: str = JoinType.INNER.value
+) -> JoinCondition:
+    """
+    Проверяет и собирает условие соединения.
+
+    Args:
+        filename: Путь к присоединяемому CSV файлу
+        key: Ключевой столбец
+        join_type: Тип соединения (inner, left)
+
+    Returns:
+        JoinCondition: Условие соединения
+
+    Raises:
+        ValueError: Если ключ не указан или некорректен
+    """
+    if not key or not IDENTIFIER_PATTERN.match(key.strip()):
+        raise ValueError(
+            f"Некорректный ключ соединения: '{key}'. Укажите столбец через --on"
+        )
+    return JoinCondition(
+        filename=filename, key=key.strip(), join_type=JoinType(join_type.lower())
+    )
+
+
+def parse_size(size_str: str) -> int:
+    """
+    Парсит размер в байтах с необязательным суффиксом (K, M, G, T).
+
+    Args:
+        size_str: Строка вида "512", "64K", "512M", "2G"
+
+    Returns:
+        int: Размер в байтах
+
+    Raises:
+        ValueError: Если формат размера некорректен
+    """
+    match = SIZE_PATTERN.match(size_str.strip())
+    if not match:
+        raise ValueError(
+            f"Некорректный размер: '{size_str}'. Ожидается формат '512M', '2G' и т.п."
+        )
+    number, unit = match.groups()
+    multiplier = 1024 ** " KMGT".index(unit.upper() or " ")
+    return int(float(number) * multiplier)
+
+
+def parse_arguments(args: Optional[list[str]] = None,
+                    parser_class: Type[argparse.ArgumentParser] = argparse.ArgumentParser) -> Arguments:
     """
     Парсит аргументы командной строки.
 
     Args:
         args: Список аргументов
+        parser_class: Класс парсера (см. create_parser)
 
     Returns:
         Arguments: Распарсенные и валидированные аргументы
 
     Raises:
         ValueError: Если аргументы некорректны
+        ArgumentParserError: Ошибка argparse при parser_class=RaisingArgumentParser
     """
-    parser = create_parser()
+    parser = create_parser(parser_class)
     parsed = parser.parse_args(args)
 
     filter_condition = None
     aggregate_condition = None
     order_by_condition = None
+    join_condition = None
 
     # Парсим условие фильтрации если есть
     if parsed.where:
         filter_condition = parse_filter_condition(parsed.where)
+    elif parsed.where_in_file:
+        filter_condition = parse_where_in_file(parsed.where_in_file)
 
     # Парсим условие агрегации если есть
     if parsed.aggregate:
         aggregate_condition = parse_aggregate_condition(parsed.aggregate)
 
     # Парсим условие сортировки если есть
+    order_by_conditions: Tuple[SortCondition, ...] = ()
     if getattr(parsed, "order_by", None):
-        order_by_condition = parse_order_by_condition(parsed.order_by)
+        order_by_conditions = parse_order_by_conditions(parsed.order_by)
+        order_by_condition = order_by_conditions[0]
+
+    # Парсим условие соединения если есть
+    if parsed.join:
+        join_condition = parse_join_condition(parsed.join, parsed.on, parsed.join_type)
+    elif parsed.on:
+        raise ValueError("Параметр --on используется только вместе с --join")
+
+    # Настройки кеша результатов
+    cache_options = None
+    if parsed.cache:
+        from .result_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_SIZE, DEFAULT_TTL, CacheOptions
+
+        cache_ttl = DEFAULT_TTL if parsed.cache_ttl is None else parsed.cache_ttl
+        if cache_ttl <= 0:
+            raise ValueError("Время жизни записи кеша должно быть положительным")
+        cache_options = CacheOptions(
+            directory=parsed.cache_dir or DEFAULT_CACHE_DIR,
+            ttl=cache_ttl,
+            max_size=DEFAULT_MAX_SIZE if parsed.cache_max_size is None else parse_size(parsed.cache_max_size),
+            content_hash=parsed.cache_content_hash,
+        )
+
+    # Инкрементальная агрегация
+    checkpoint_dir = None
+    if parsed.incremental:
+        if not aggregate_condition:
+            raise ValueError("Параметр --incremental используется только вместе с --aggregate")
+        if join_condition:
+            raise ValueError("Параметр --incremental несовместим с --join")
+        from .result_cache import DEFAULT_CHECKPOINT_DIR
+
+        checkpoint_dir = parsed.checkpoint_dir or DEFAULT_CHECKPOINT_DIR
+
+    # Режим слежения за файлом
+    follow_interval = None
+    if parsed.follow:
+        if order_by_condition or join_condition or cache_options or checkpoint_dir:
+            raise ValueError(
+                "Параметр --follow совместим только с --where и --aggregate"
+            )
+        if parsed.follow_interval <= 0:
+            raise ValueError("Интервал опроса должен быть положительным")
+        follow_interval = parsed.follow_interval
+
+    # Пакет запросов
+    if parsed.queries:
+        if filter_condition or aggregate_condition or order_by_condition or parsed.follow or parsed.incremental:
+            raise ValueError(
+                "Параметр --queries несовместим с --where, --aggregate, --order-by, --follow и --incremental"
+            )
+    elif parsed.output_dir:
+        raise ValueError("Параметр --output-dir используется только вместе с --queries")
+
+    # Выборка
+    sample_options = None
+    if parsed.sample is not None or parsed.sample_rows is not None:
+        if parsed.sample is not None and parsed.sample_rows is not None:
+            raise ValueError("Параметры --sample и --sample-rows несовместимы")
+        if parsed.sample is not None and not 0 < parsed.sample <= 1:
+            raise ValueError(f"Доля выборки должна быть в интервале (0, 1]: '{parsed.sample:g}'")
+        if parsed.sample_rows is not None and parsed.sample_rows <= 0:
+            raise ValueError("Размер выборки должен быть положительным")
+        if join_condition or checkpoint_dir or follow_interval or parsed.queries:
+            raise ValueError("Выборка несовместима с --join, --incremental, --follow и --queries")
+        from .sampling import SampleOptions
+
+        sample_options = SampleOptions(fraction=parsed.sample, rows=parsed.sample_rows, seed=parsed.sample_seed)
+    elif parsed.sample_seed is not None:
+        raise ValueError("Параметр --sample-seed используется только вместе с --sample или --sample-rows")
+
+    # Упорядоченность файла
+    sorted_by = None
+    if parsed.sorted_by:
+        if join_condition or sample_options:
+            raise ValueError("Параметр --sorted-by несовместим с --join и выборкой")
+        sorted_by = parse_sorted_by(parsed.sorted_by)
+
+    # Удаление дубликатов
+    distinct_columns = None
+    if parsed.distinct is not None:
+        if aggregate_condition or follow_interval or parsed.queries:
+            raise ValueError("Параметр --distinct несовместим с --aggregate, --follow и --queries")
+        distinct_columns = parse_distinct_columns(parsed.distinct)
+
+    # Группировка
+    group_by: Tuple[str, ...] = ()
+    if parsed.group_by is not None:
+        if not aggregate_condition:
+            raise ValueError("Параметр --group-by используется только вместе с --aggregate")
+        if checkpoint_dir or follow_interval or sample_options:
+            raise ValueError("Параметр --group-by несовместим с --incremental, --follow и выборкой")
+        group_by = parse_group_by_columns(parsed.group_by)
+    bucket = None
+    if parsed.bucket is not None:
+        if not aggregate_condition:
+            raise ValueError("Параметр --bucket используется только вместе с --aggregate")
+        if checkpoint_dir or follow_interval or sample_options:
+            raise ValueError("Параметр --bucket несовместим с --incremental, --follow и выборкой")
+        from .timestamps import parse_bucket
+
+        bucket = parse_bucket(parsed.bucket)
+    if parsed.describe:
+        if aggregate_condition or order_by_condition or parsed.distinct is not None:
+            raise ValueError("Параметр --describe несовместим с --aggregate, --order-by и --distinct")
+        if checkpoint_dir or follow_interval or parsed.queries:
+            raise ValueError("Параметр --describe несовместим с --incremental, --follow и --queries")
+    # Оконные функции
+    window_conditions: Tuple[WindowCondition, ...] = ()
+    partition_by: Tuple[str, ...] = ()
+    if parsed.window:
+        if aggregate_condition or parsed.describe or parsed.distinct is not None:
+            raise ValueError("Параметр --window несовместим с --aggregate, --describe и --distinct")
+        if checkpoint_dir or follow_interval or parsed.queries:
+            raise ValueError("Параметр --window несовместим с --incremental, --follow и --queries")
+        window_conditions = parse_window_conditions(parsed.window)
+        if parsed.partition_by is not None:
+            partition_by = parse_group_by_columns(parsed.partition_by, "--partition-by")
+    elif parsed.partition_by is not None:
+        raise ValueError("Параметр --partition-by используется только вместе с --window")
+
+    # Подсчет строк, первые и последние строки
+    fast_modes = [parsed.count, parsed.head is not None, parsed.tail is not None]
+    if any(fast_modes):
+        if (sum(fast_modes) > 1 or filter_condition or aggregate_condition or order_by_condition or join_condition
+                or parsed.describe or parsed.distinct is not None or parsed.sample is not None
+                or parsed.sample_rows is not None or checkpoint_dir or follow_interval or parsed.queries
+                or parsed.sorted_by or window_conditions):
+            raise ValueError("Параметры --count, --head и --tail несовместимы друг с другом и с другими режимами запроса")
+        for rows in (parsed.head, parsed.tail):
+            if rows is not None and rows <= 0:
+                raise ValueError("Число строк в --head и --tail должно быть положительным")
+    if parsed.workers is not None and parsed.workers <= 0:
+        raise ValueError("Число процессов должно быть положительным")
+
+    # Секционированный набор данных (каталог)
+    if os.path.isdir(parsed.filename):
+        if checkpoint_dir or follow_interval or cache_options or sorted_by or parsed.sample is not None:
+            raise ValueError(
+                "Каталог секций несовместим с --incremental, --follow, --cache, --sorted-by и --sample"
+            )
+
+    # Общий бюджет памяти
+    memory_limit = None
+    if parsed.memory_limit is not None:
+        if follow_interval or parsed.queries:
+            raise ValueError("Параметр --memory-limit несовместим с --follow и --queries")
+        memory_limit = parse_size(parsed.memory_limit)
+        if memory_limit <= 0:
+            raise ValueError("Лимит памяти должен быть положительным")
+
+    # Распределенное выполнение
+    coordinator: Tuple[Tuple[str, int], ...] = ()
+    if parsed.coordinator is not None:
+        if (join_condition or cache_options or checkpoint_dir or follow_interval or parsed.queries or sample_options
+                or sorted_by or distinct_columns is not None or window_conditions or parsed.head is not None
+                or parsed.tail is not None or memory_limit or parsed.workers is not None):
+            raise ValueError(
+                "Параметр --coordinator совместим только с --where, --aggregate (--group-by, --bucket), "
+                "--order-by, --describe и --count"
+            )
+        if filter_condition and filter_condition.operator == FilterOperator.IN_FILE:
+            raise ValueError("Параметр --where-in-file несовместим с --coordinator")
+        from .distributed import parse_worker_addresses
+
+        coordinator = parse_worker_addresses(parsed.coordinator)
+
+    # Настройки чтения файла
+    read_options = None
+    if parsed.read_ahead is not None or parsed.read_buffer is not None or parsed.fadvise:
+        if parsed.read_ahead is not None and parsed.read_ahead <= 0:
+            raise ValueError("Глубина упреждающего чтения должна быть положительной")
+        if parsed.read_buffer is not None and parsed.read_ahead is None:
+            raise ValueError("Параметр --read-buffer используется только вместе с --read-ahead")
+        from .csv_reader import ReadOptions
+
+        read_options = ReadOptions(read_ahead=parsed.read_ahead or 0, fadvise=parsed.fadvise)
+        if parsed.read_buffer is not None:
+            buffer_size = parse_size(parsed.read_buffer)
+            if buffer_size <= 0:
+                raise ValueError("Размер буфера чтения должен быть положительным")
+            read_options = read_options._replace(buffer_size=buffer_size)
 
     return Arguments(
         filename=parsed.filename,
         filter_condition=filter_condition,
         aggregate_condition=aggregate_condition,
         order_by_condition=order_by_condition,
+        join_condition=join_condition,
+        cache_options=cache_options,
+        checkpoint_dir=checkpoint_dir,
+        follow_interval=follow_interval,
+        queries_file=parsed.queries,
+        output_dir=parsed.output_dir,
+        sample_options=sample_options,
+        sorted_by=sorted_by,
+        order_by_conditions=order_by_conditions,
+        distinct_columns=distinct_columns,
+        read_options=read_options,
+        memory_limit=memory_limit,
+        group_by=group_by,
+        workers=parsed.workers,
+        describe=parsed.describe,
+        count_rows=parsed.count,
+        head_rows=parsed.head,
+        tail_rows=parsed.tail,
+        window_conditions=window_conditions,
+        partition_by=partition_by,
+        bucket=bucket,
+        coordinator=coordinator,
     )
@@ -0,0 +1,187 @@
+"""
+Пакетное выполнение запросов за один проход по файлу (--queries).
+
+Файл запросов — текстовый (одна строка — один запрос в синтаксисе
+командной строки, например `--where "price>500"`; пустые строки и
+строки с # пропускаются) или JSON (.json): список объектов с ключами
+where / aggregate / order_by и необязательным output.
+
+Файл данных читается один раз: каждая строка передается во все
+скомпилированные фильтры и аккумуляторы одновременно.
+"""
+
+import json
+import shlex
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .accumulators import Accumulator
+from .aggregator import Aggregator
+from .argument_parser import Arguments, parse_arguments
+from .command_handler import QueryResult
+from .csv_reader import CSVReader
+from .filter_engine import ValueTest, compile_condition
+from .records import record_type
+from .sorting import sort_rows
+
+JSON_SPEC_KEYS = {"where": "--where", "aggregate": "--aggregate", "order_by": "--order-by"}
+# Поля Arguments, которые учитывает пакетное выполнение; остальные должны иметь значения по умолчанию
+BATCH_FIELDS = {"filename", "filter_condition", "aggregate_condition", "order_by_condition", "order_by_conditions"}
+
+
+class BatchQuery(NamedTuple):
+    """Запрос пакета."""
+
+    text: str
+    arguments: Arguments
+    output: Optional[str] = None
+
+
+class BatchResult(NamedTuple):
+    """Результат запроса пакета: значение или ошибка выполнения."""
+
+    query: BatchQuery
+    result: Optional[QueryResult] = None
+    error: Optional[Exception] = None
+
+
+def _parse_query(filename: str, argv: List[str], text: str, output: Optional[str] = None) -> BatchQuery:
+    try:
+        args = parse_arguments([filename] + argv)
+    except SystemExit:
+        raise ValueError(f"Некорректный запрос в пакете: '{text}'")
+    defaults = Arguments._field_defaults
+    if any(getattr(args, field) != defaults[field] for field in Arguments._fields if field not in BATCH_FIELDS):
+        raise ValueError(
+            f"В пакетном запросе допустимы только --where, --aggregate и --order-by: '{text}'"
+        )
+    return BatchQuery(text=text, arguments=args, output=output)
+
+
+def load_queries(queries_path: str, filename: str) -> List[BatchQuery]:
+    """
+    Загружает запросы пакета из текстового или JSON-файла.
+
+    Raises:
+        FileNotFoundError: если файл запросов не найден
+        ValueError: если запрос некорректен
+    """
+    with open(queries_path, encoding="utf-8") as f:
+        content = f.read()
+
+    queries = []
+    if queries_path.lower().endswith(".json"):
+        spec = json.loads(content)
+        items = spec.get("queries", []) if isinstance(spec, dict) else spec
+        for item in items:
+            unknown = set(item) - set(JSON_SPEC_KEYS) - {"output"}
+            if unknown:
+                raise ValueError(f"Неизвестные ключи запроса: {', '.join(sorted(unknown))}")
+            argv = []
+            for key, option in JSON_SPEC_KEYS.items():
+                if key in item:
+                    argv += [option, str(item[key])]
+            queries.append(_parse_query(filename, argv, json.dumps(item, ensure_ascii=False), item.get("output")))
+    else:
+        for line in content.splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                queries.append(_parse_query(filename, shlex.split(line), line))
+
+    if not queries:
+        raise ValueError("Файл запросов не содержит ни одного запроса")
+    return queries
+
+
+class BatchExecutor:
+    """
+    Выполнение набора запросов за одно чтение файла.
+    """
+
+    def __init__(self, csv_reader: Optional[CSVReader] = None, aggregator: Optional[Aggregator] = None):
+        self.csv_reader = csv_reader or CSVReader()
+        self.aggregator = aggregator or Aggregator()
+
+    def execute(self, filename: str, queries: List[BatchQuery]) -> List[BatchResult]:
+        """
+        Выполняет запросы пакета; ошибка одного запроса не прерывает остальные.
+        """
+        filters: List[Tuple[int, Tuple[str, ValueTest]]] = []
+        filtered: Dict[int, List[Dict[str, str]]] = {}
+        accumulators: Dict[int, Accumulator] = {}
+        # Аккумуляторы сгруппированы по столбцу: значение разбирается один раз на строку
+        numeric_groups: Dict[str, List[Accumulator]] = {}
+        text_groups: Dict[str, List[Accumulator]] = {}
+        errors: Dict[int, Exception] = {}
+        keep_all = False
+
+        for index, query in enumerate(queries):
+            args = query.arguments
+            try:
+                if args.aggregate_condition:
+                    condition = args.aggregate_condition
+                    accumulator = self.aggregator.create_accumulator(condition.function, condition.argument)
+                    accumulators[index] = accumulator
+                    groups = numeric_groups if accumulator.numeric else text_groups
+                    groups.setdefault(condition.column, []).append(accumulator)
+                elif args.filter_condition:
+                    filters.append((index, compile_condition(args.filter_condition)))
+                    filtered[index] = []
+                else:
+                    keep_all = True
+            except ValueError as e:
+                errors[index] = e
+
+        headers, rows = self.csv_reader.iter_file(filename)
+        # Столбцы разрешаются в позиции записей один раз на пакет
+        record = record_type(headers)
+        filter_tests = []
+        for index, (column, test) in filters:
+            if column in headers:
+                filter_tests.append((index, record.getter(column), test))
+            else:
+                errors[index] = KeyError(column)
+        numeric_getters = [(record.getter(column), group) for column, group in numeric_groups.items()]
+        text_getters = [(record.getter(column), group) for column, group in text_groups.items()]
+        all_rows: List[Dict[str, str]] = []
+        for row in rows:
+            for index, get, test in filter_tests:
+                if test(get(row)):
+                    filtered[index].append(row)
+            for get, group in numeric_getters:
+                try:
+                    number = float(get(row))
+                except (TypeError, ValueError):
+                    continue
+                for accumulator in group:
+                    accumulator.update(number)
+            for get, group in text_getters:
+                value = get(row)
+                if value:
+                    for accumulator in group:
+                        accumulator.update(value)
+            if keep_all:
+                all_rows.append(row)
+
+        results = []
+        for index, query in enumerate(queries):
+            args = query.arguments
+            try:
+                if index in errors:
+                    raise errors[index]
+                if args.aggregate_condition:
+                    condition = args.aggregate_condition
+                    function_str = getattr(condition.function, "value", condition.function)
+                    if condition.argument is not None:
+                        function_str = f"{function_str}:{condition.argument:g}"
+                    value = self.aggregator.finalize(accumulators[index], condition.column)
+                    result = QueryResult(column=condition.column, function=function_str, value=value)
+                elif args.filter_condition:
+                    result = QueryResult(headers=headers, rows=filtered[index])
+                elif args.order_by_condition:
+                    result = QueryResult(headers=headers, rows=sort_rows(all_rows, args.order_by_conditions or args.order_by_condition))
+                else:
+                    result = QueryResult(headers=headers, rows=all_rows)
+                results.append(BatchResult(query, result=result))
+            except Exception as e:
+                results.append(BatchResult(query, error=e))
+        return results
@@ -1,78 +1,773 @@
 """
 Координация выполнения команд
 """
-from .argument_parser import Arguments, FilterCondition, AggregateCondition, SortCondition
+import copy
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional, Sequence, Union
+from .argument_parser import (
+    Arguments, FilterCondition, FilterOperator, AggregateCondition, SortCondition, SortDirection
+)
 from .csv_reader import CSVReader
-from .filter_engine import filter_data
-from .aggregator import Aggregator
+from .filter_engine import compile_filter, filter_data
 from .output_formatter import OutputFormatter
-# from operator import itemgetter
+# Модули агрегации, сортировки, соединения, кеша, инкрементальной агрегации и слежения
+# импортируются в использующих их методах: простой запрос не платит за их загрузку при запуске
+
+if TYPE_CHECKING:
+    from .aggregator import Aggregator, ConfidenceInterval
+
+# Размер пакета строк при потоковой агрегации (--memory-limit)
+STREAM_CHUNK_ROWS = 10000
+# Операторы, для которых применим бинарный поиск по упорядоченному столбцу
+RANGE_OPERATORS = (FilterOperator.EQUAL, FilterOperator.GREATER, FilterOperator.LESS)
+
+class QueryResult(NamedTuple):
+    """
+    Результат запроса: таблица строк или значение агрегации
+    """
+    headers: List[str] = []
+    # При --memory-limit до вывода строки таблицы могут быть ленивым итератором
+    rows: List[Dict[str, str]] = []
+    column: Optional[str] = None
+    function: Optional[str] = None
+    value: Optional[float] = None
+    interval: Optional["ConfidenceInterval"] = None
+
+    @property
+    def is_aggregate(self) -> bool:
+        return self.function is not None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Преобразование в JSON-совместимый словарь
+        """
+        if self.is_aggregate:
+            data = {"column": self.column, "function": self.function, "value": self.value}
+            if self.interval is not None:
+                data["interval"] = list(self.interval)
+            return data
+        return {"headers": list(self.headers), "rows": [dict(row) for row in self.rows]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QueryResult":
+        """
+        Восстановление из словаря to_dict()
+        """
+        if "function" in data:
+            from .aggregator import ConfidenceInterval
+
+            interval = ConfidenceInterval(*data["interval"]) if data.get("interval") else None
+            return cls(column=data["column"], function=data["function"], value=data["value"], interval=interval)
+        return cls(headers=data["headers"], rows=data["rows"])
 
 class CommandHandler:
     """
     Главный координатор выполнения команд
     """
-    def __init__(self):
-        self.csv_reader = CSVReader()
-        self.aggregator = Aggregator()
+    def __init__(self, csv_reader: Optional[CSVReader] = None):
+        self.csv_reader = self._shared_reader = csv_reader or CSVReader()
+        self._aggregator = None
         self.output_formatter = OutputFormatter()
         self.filter_engine = filter_data
+        self._joiner = None
+        self._args = None
+        # Общий бюджет памяти запроса (--memory-limit); None — без ограничения
+        self._governor = None
+
+    @property
+    def aggregator(self) -> "Aggregator":
+        """
+        Агрегатор (создается при первом обращении)
+        """
+        if self._aggregator is None:
+            from .aggregator import Aggregator
+
+            self._aggregator = Aggregator()
+        return self._aggregator
+
+    @property
+    def joiner(self):
+        """
+        Движок соединения файлов (создается при первом обращении)
+        """
+        if self._joiner is None:
+            from .join_engine import HashJoiner
+
+            self._joiner = HashJoiner(self.csv_reader)
+        return self._joiner
 
     def execute(self, args: Arguments) -> None:
         """
         Выполнение команды на основе аргументов
         """
+        self._configure(args)
         try:
-            if args.aggregate_condition:
+            if args.queries_file:
+                self._execute_batch(args)
+            elif args.follow_interval:
+                self._execute_follow(args)
+            elif args.cache_options:
+                self.display(self.run(args))
+            elif getattr(args, "coordinator", ()):
+                self.display(self._run_distributed(args))
+            elif getattr(args, "describe", False):
+                self.display(self._run_describe(args.filename, args.filter_condition))
+            elif self._is_raw_scan(args):
+                self.display(self._run_raw_scan(args))
+            elif getattr(args, "window_conditions", ()):
+                self.display(self._run_window(args))
+            elif args.aggregate_condition:
                 self._execute_aggregate(args.filename, args.aggregate_condition)
             elif args.filter_condition:
                 self._execute_filter(args.filename, args.filter_condition)
             elif args.order_by_condition:
-                self._execute_order_by(args.filename, args.order_by_condition)
+                self._execute_order_by(args.filename, args.order_by_conditions or args.order_by_condition)
             else:
                 # Если не указано ни одного из аргументов — просто показать всю таблицу
-                headers, data = self.csv_reader.read_file(args.filename)
-                self.output_formatter.display_table(data, headers)
-        except FileNotFoundError:
-            print(f"Ошибка: файл '{args.filename}' не найден")
-        except ValueError as e:
-            print(f"Ошибка данных: {e}")
-        except KeyError as e:
-            print(f"Ошибка: столбец {e} не найден в данных")
+                self.display(self._run_table(args.filename))
+            if self._governor is not None:
+                governor = self._governor
+                self.output_formatter.display_memory_report(governor.peak, governor.limit, governor.operator_peaks)
         except Exception as e:
-            print(f"Неожиданная ошибка: {e}")
+            print(self.describe_error(args, e))
+
+    def _configure(self, args: Arguments) -> None:
+        self._args = args
+        read_options = getattr(args, "read_options", None)
+        reader = self._shared_reader
+        if read_options is not None:
+            # Копия читателя: общий читатель (serve) не меняется под настройки одного запроса
+            reader = copy.copy(reader)
+            reader.options = read_options
+        if reader is not self.csv_reader:
+            self.csv_reader = reader
+            self._joiner = None
+        self._governor = None
+        memory_limit = getattr(args, "memory_limit", None)
+        if memory_limit:
+            from .memory import MemoryGovernor
+
+            self._governor = MemoryGovernor(memory_limit)
+
+    def run(self, args: Arguments) -> QueryResult:
+        """
+        Выполнение команды без вывода: результат возвращается, ошибки пробрасываются
+        """
+        self._configure(args)
+        if args.follow_interval or args.queries_file:
+            raise ValueError("Режимы --follow и --queries доступны только при выводе в консоль")
+        if args.cache_options:
+            return self._run_cached(args)
+        return self._materialize(self._run_query(args))
+
+    def _materialize(self, result: QueryResult) -> QueryResult:
+        """
+        Строки результата списком; при --memory-limit результат должен помещаться в лимит
+        """
+        if self._governor is None or result.is_aggregate:
+            return result
+        from .join_engine import estimate_row_size
+        from .memory import format_size
+
+        rows = []
+        with self._governor.reserve("result") as reservation:
+            for row in result.rows:
+                if not reservation.try_grow(estimate_row_size(row)):
+                    raise ValueError(
+                        f"Результат запроса не помещается в лимит памяти {format_size(self._governor.limit)}"
+                    )
+                rows.append(row)
+        return result._replace(rows=rows)
+
+    def _run_cached(self, args: Arguments) -> QueryResult:
+        """
+        Выполнение через дисковый кеш результатов
+        """
+        from .result_cache import ResultCache
+
+        cache = ResultCache.from_options(args.cache_options)
+        key = cache.make_key(args)
+        cached = cache.get(key)
+        if cached is not None:
+            return QueryResult.from_dict(cached)
+        result = self._materialize(self._run_query(args))
+        cache.put(key, result.to_dict())
+        return result
+
+    def _run_query(self, args: Arguments) -> QueryResult:
+        if getattr(args, "coordinator", ()):
+            return self._run_distributed(args)
+        if getattr(args, "describe", False):
+            return self._run_describe(args.filename, args.filter_condition)
+        if self._is_raw_scan(args):
+            return self._run_raw_scan(args)
+        if getattr(args, "window_conditions", ()):
+            return self._run_window(args)
+        if args.aggregate_condition:
+            return self._run_aggregate(args.filename, args.aggregate_condition)
+        elif args.filter_condition:
+            return self._run_filter(args.filename, args.filter_condition)
+        elif args.order_by_condition:
+            return self._run_order_by(args.filename, args.order_by_conditions or args.order_by_condition)
+        return self._run_table(args.filename)
+
+    def display(self, result: QueryResult) -> None:
+        """
+        Вывод результата запроса в консоль
+        """
+        if result.is_aggregate and result.column is None:
+            self.output_formatter.display_row_count(result.value)
+        elif result.is_aggregate and result.interval is not None:
+            self.output_formatter.display_aggregate_result(
+                result.column, result.function, result.value, result.interval
+            )
+        elif result.is_aggregate:
+            self.output_formatter.display_aggregate_result(result.column, result.function, result.value)
+        elif self._governor is not None and not isinstance(result.rows, list):
+            self._display_governed(result)
+        else:
+            self.output_formatter.display_table(result.rows, result.headers)
+
+    def _display_governed(self, result: QueryResult) -> None:
+        """
+        Вывод потока строк частями: очередная таблица выводится, когда буфер
+        вывода перестает помещаться в бюджет памяти
+        """
+        from .join_engine import estimate_row_size
+
+        buffer: List[Dict[str, str]] = []
+        shown = False
+        with self._governor.reserve("output") as reservation:
+            for row in result.rows:
+                size = estimate_row_size(row)
+                if not reservation.try_grow(size) and buffer:
+                    self.output_formatter.display_table(buffer, result.headers)
+                    shown = True
+                    buffer = []
+                    reservation.release()
+                    if not reservation.try_grow(size):
+                        reservation.add(size)
+                buffer.append(row)
+        if buffer or not shown:
+            self.output_formatter.display_table(buffer, result.headers)
+
+    @staticmethod
+    def describe_error(args: Arguments, error: Exception) -> str:
+        """
+        Сообщение об ошибке выполнения для пользователя
+        """
+        if isinstance(error, FileNotFoundError):
+            return f"Ошибка: файл '{args.filename}' не найден"
+        if isinstance(error, ValueError):
+            return f"Ошибка данных: {error}"
+        if isinstance(error, KeyError):
+            return f"Ошибка: столбец {error} не найден в данных"
+        if isinstance(error, ConnectionError):
+            return f"Ошибка: {error}"
+        return f"Неожиданная ошибка: {error}"
+
+    def _read_source(self, file: str):
+        """
+        Чтение входных данных: файл целиком или результат соединения с другим файлом
+        """
+        join_condition = getattr(self._args, "join_condition", None)
+        sample_options = getattr(self._args, "sample_options", None)
+        if sample_options:
+            from .sampling import Sampler
+
+            sample = Sampler(sample_options, self.csv_reader).sample(file)
+            return sample.headers, sample.rows
+        if join_condition:
+            headers, rows = self.joiner.join(file, join_condition)
+            return headers, list(rows)
+        return self.csv_reader.read_file(file)
+
+    def _stream_source(self, file: str):
+        """
+        Входные данные потоком (режим --memory-limit): строки не накапливаются в памяти
+        """
+        if getattr(self._args, "sample_options", None):
+            return self._read_source(file)
+        join_condition = getattr(self._args, "join_condition", None)
+        if join_condition:
+            self.joiner.governor = self._governor
+            return self.joiner.join(file, join_condition)
+        return self.csv_reader.iter_file(file)
+
+    def _stream_filtered_source(self, file: str, condition: FilterCondition):
+        """
+        Входные данные потоком и предикат условия по их заголовкам
+
+        Raises:
+            KeyError: если столбца условия нет в данных (источник закрывается)
+        """
+        headers, rows = self._stream_source(file)
+        try:
+            return headers, rows, compile_filter(condition, headers)
+        except KeyError:
+            if hasattr(rows, "close"):
+                # Генератор закрывает файл, только если был запущен
+                next(rows, None)
+                rows.close()
+            raise
+
+    def _apply_distinct(self, headers: List[str], rows: List[Dict[str, str]]):
+        """
+        Удаление дубликатов (--distinct), если оно запрошено
+        """
+        columns = getattr(self._args, "distinct_columns", None)
+        if columns is None:
+            return headers, rows
+        from .distinct import Deduplicator
+
+        headers, unique = Deduplicator(governor=self._governor).distinct(headers, rows, columns)
+        return headers, unique if self._governor is not None else list(unique)
+
+    def _run_table(self, file: str) -> QueryResult:
+        if self._governor is not None:
+            # Строки остаются итератором: вывод и run() ограничивают их по бюджету памяти
+            headers, rows = self._apply_distinct(*self._stream_source(file))
+            return QueryResult(headers=headers, rows=rows)
+        headers, data = self._apply_distinct(*self._read_source(file))
+        return QueryResult(headers=headers, rows=data)
+
+    def _execute_batch(self, args: Arguments) -> None:
+        """
+        Выполнение пакета запросов за одно чтение файла
+        """
+        from .batch import BatchExecutor, load_queries
+
+        queries = load_queries(args.queries_file, args.filename)
+        results = BatchExecutor(self.csv_reader, self.aggregator).execute(args.filename, queries)
+        if args.output_dir:
+            os.makedirs(args.output_dir, exist_ok=True)
+        for number, batch_result in enumerate(results, start=1):
+            query = batch_result.query
+            if args.output_dir:
+                name = query.output or f"query-{number:03d}.txt"
+                with open(os.path.join(args.output_dir, name), "w", encoding="utf-8") as f:
+                    self._display_batch_result(batch_result, OutputFormatter(stream=f))
+            else:
+                print(f"Запрос {number}: {query.text}")
+                self._display_batch_result(batch_result, self.output_formatter)
+
+    def _display_batch_result(self, batch_result, formatter: OutputFormatter) -> None:
+        if batch_result.error is not None:
+            print(self.describe_error(batch_result.query.arguments, batch_result.error), file=formatter.stream)
+            return
+        result = batch_result.result
+        if result.is_aggregate:
+            formatter.display_aggregate_result(result.column, result.function, result.value)
+        else:
+            formatter.display_table(result.rows, result.headers)
+
+    def _execute_follow(self, args: Arguments, stop_event: Optional[threading.Event] = None) -> None:
+        """
+        Слежение за файлом: вывод новых подходящих строк или текущего значения агрегации
+        """
+        from .follow import CSVFollower
+
+        condition = args.aggregate_condition
+        accumulator = None
+        function_str = None
+        if condition:
+            accumulator = self.aggregator.create_accumulator(condition.function, condition.argument)
+            function_str = getattr(condition.function, "value", condition.function)
+            if condition.argument is not None:
+                function_str = f"{function_str}:{condition.argument:g}"
+        filter_condition = args.filter_condition
+
+        with CSVFollower(args.filename, args.follow_interval) as follower:
+            def on_rows(rows: List[Dict[str, str]]) -> None:
+                nonlocal accumulator
+                if condition:
+                    if follower.truncated:
+                        accumulator = self.aggregator.create_accumulator(condition.function, condition.argument)
+                    values = self.aggregator.extract_values(rows, condition.column, accumulator.numeric)
+                    if values or follower.truncated:
+                        accumulator.update_many(values)
+                        if accumulator.count or accumulator.allow_empty:
+                            value = self.aggregator.finalize(accumulator, condition.column)
+                            self.output_formatter.display_aggregate_result(condition.column, function_str, value)
+                    return
+                if filter_condition:
+                    rows = self.filter_engine(rows, filter_condition)
+                if rows:
+                    self.output_formatter.display_table(rows, follower.headers)
+
+            try:
+                follower.follow(on_rows, stop_event)
+            except KeyboardInterrupt:
+                pass
 
     def _execute_filter(self, file: str, condition: FilterCondition) -> None:
         """
         Выполнение фильтрации
         """
-        headers, data = self.csv_reader.read_file(file)
-        condition_str = f"{condition.column}{condition.operator.value}{condition.value}"
-        filtered = self.filter_engine(data, condition_str)
+        self.display(self._run_filter(file, condition))
 
-        self.output_formatter.display_table(filtered, headers)
+    def _run_filter(self, file: str, condition: FilterCondition) -> QueryResult:
+        sorted_by = getattr(self._args, "sorted_by", None)
+        if (sorted_by and sorted_by.column == condition.column and sorted_by.direction == SortDirection.ASC
+                and condition.operator in RANGE_OPERATORS):
+            from .range_scan import SortedRangeScanner
+
+            headers, rows = SortedRangeScanner(self.csv_reader).scan(file, condition)
+            headers, rows = self._apply_distinct(headers, rows)
+            return QueryResult(headers=headers, rows=rows if self._governor is not None else list(rows))
+        if os.path.isdir(file) and not getattr(self._args, "join_condition", None):
+            headers, rows = self._filter_partitions(file, condition)
+            headers, rows = self._apply_distinct(headers, rows)
+            return QueryResult(headers=headers, rows=rows)
+        if self._governor is not None:
+            headers, rows, predicate = self._stream_filtered_source(file, condition)
+            headers, rows = self._apply_distinct(headers, (row for row in rows if predicate(row)))
+            return QueryResult(headers=headers, rows=rows)
+        headers, data = self._read_source(file)
+        if condition.column not in headers:
+            raise KeyError(condition.column)
+        if condition.predicate is None:
+            # Условие собрано вручную: передается в строковом виде
+            condition = f"{condition.column}{condition.operator.value}{condition.value}"
+        filtered = self.filter_engine(data, condition)
+        headers, filtered = self._apply_distinct(headers, filtered)
+        return QueryResult(headers=headers, rows=filtered)
+
+    def _filter_partitions(self, directory: str, condition: FilterCondition):
+        """
+        Фильтрация секционированного набора: читаются только подходящие секции,
+        секции обрабатываются параллельно (при --memory-limit — потоком)
+        """
+        from .filter_engine import compile_condition
+        from .partitioning import PartitionedDataset, filter_partition, map_partitions
+
+        dataset = PartitionedDataset(directory, self.csv_reader)
+        column, test = compile_condition(condition)
+        if column not in dataset.headers:
+            raise KeyError(column)
+        partitions = dataset.prune(column, test)
+        if self._governor is not None:
+            headers, rows = dataset.iter_rows(partitions)
+            if column in dataset.columns:
+                return headers, rows
+            return headers, (row for row in rows if test(row.get(column)))
+        headers = dataset.headers
+        # Строки секции по столбцу секционирования подходят целиком
+        spec = None if column in dataset.columns else (column, condition.operator.value, condition.value)
+        tasks = [(partition.files, spec) for partition in partitions]
+        workers = getattr(self._args, "workers", None)
+        chunks = map_partitions(filter_partition, tasks, workers)
+        return headers, [row for chunk in chunks for row in chunk]
 
     def _execute_aggregate(self, file: str, condition: AggregateCondition) -> None:
         """
         Выполнение агрегации
         """
-        _, data = self.csv_reader.read_file(file)
-        condition_str = f"{condition.column}={condition.function.value}"
+        self.display(self._run_aggregate(file, condition))
+
+    def _run_aggregate(self, file: str, condition: AggregateCondition) -> QueryResult:
+        function_str = getattr(condition.function, "value", condition.function)
+        if condition.argument is not None:
+            function_str = f"{function_str}:{condition.argument:g}"
+        checkpoint_dir = getattr(self._args, "checkpoint_dir", None)
+        if checkpoint_dir:
+            from .incremental import IncrementalAggregator
+
+            incremental = IncrementalAggregator(checkpoint_dir, self.aggregator, self.csv_reader)
+            result = incremental.aggregate(file, condition)
+            return QueryResult(column=condition.column, function=function_str, value=result)
+        sample_options = getattr(self._args, "sample_options", None)
+        if sample_options:
+            return self._run_sampled_aggregate(file, condition, function_str)
+        group_by = getattr(self._args, "group_by", ())
+        if group_by or getattr(self._args, "bucket", None) or (os.path.isdir(file) and not getattr(self._args, "join_condition", None)):
+            return self._run_grouped_aggregate(file, condition, function_str, group_by)
+        condition_str = f"{condition.column}={function_str}"
+        if self._governor is not None:
+            result = self._aggregate_stream(file, condition)
+            return QueryResult(column=condition.column, function=function_str, value=result)
+        _, data = self._read_source(file)
         result = self.aggregator.aggregate_data(data, condition_str)
-        self.output_formatter.display_aggregate_result(condition.column, condition.function.value, result)
+        return QueryResult(column=condition.column, function=function_str, value=result)
+
+    def _aggregate_stream(self, file: str, condition: AggregateCondition) -> float:
+        """
+        Агрегация потока строк пакетами фиксированного размера
+        """
+        from itertools import islice
+
+        from .aggregator import reserve_group
+        from .join_engine import estimate_row_size
+
+        accumulator = self.aggregator.create_accumulator(condition.function, condition.argument)
+        _, rows = self._stream_source(file)
+        rows = iter(rows)
+        with self._governor.reserve("aggregate") as reservation, self._governor.reserve("group_by") as state:
+            reserve_group(state, (), accumulator)
+            while True:
+                chunk = list(islice(rows, STREAM_CHUNK_ROWS))
+                if not chunk:
+                    break
+                # Пакет удерживается целиком, пока из него извлекаются значения
+                reservation.add(estimate_row_size(chunk[0]) * len(chunk))
+                accumulator.update_many(self.aggregator.extract_values(chunk, condition.column, accumulator.numeric))
+                reservation.release()
+        return self.aggregator.finalize(accumulator, condition.column)
+
+    def _run_grouped_aggregate(self, file: str, condition: AggregateCondition, function_str: str,
+                               group_by: Sequence[str]) -> QueryResult:
+        """
+        Агрегация по группам (--group-by) и интервалам времени (--bucket); секции
+        каталога агрегируются параллельно и их состояния сливаются. Без группировки —
+        одно значение
+        """
+        bucket = getattr(self._args, "bucket", None)
+        # Группы не сбрасываются на диск: при --memory-limit их память резервируется
+        reservation = self._governor.reserve("group_by") if self._governor is not None else None
+        try:
+            if os.path.isdir(file) and not getattr(self._args, "join_condition", None):
+                from .accumulators import restore_accumulator
+                from .aggregator import reserve_group
+                from .partitioning import PartitionedDataset, aggregate_partition, map_partitions
+
+                dataset = PartitionedDataset(file, self.csv_reader)
+                headers = dataset.headers
+                function = getattr(condition.function, "value", condition.function)
+                tasks = [
+                    (partition.files, tuple(group_by), condition.column, function, condition.argument,
+                     self.aggregator.relative_error, bucket)
+                    for partition in dataset.partitions
+                ]
+                groups: Dict[tuple, Any] = {}
+                for states in map_partitions(aggregate_partition, tasks, getattr(self._args, "workers", None)):
+                    for key, state in states:
+                        accumulator = restore_accumulator(state)
+                        if key in groups:
+                            groups[key].merge(accumulator)
+                        else:
+                            if reservation is not None:
+                                reserve_group(reservation, key, accumulator)
+                            groups[key] = accumulator
+            else:
+                headers, rows = self._stream_source(file)
+                groups = self.aggregator.aggregate_groups(rows, group_by, condition, bucket, reservation)
+            return self._grouped_result(headers, groups, condition, function_str, group_by)
+        finally:
+            if reservation is not None:
+                reservation.release()
+
+    def _grouped_result(self, headers: List[str], groups: Dict[tuple, Any], condition: AggregateCondition,
+                        function_str: str, group_by: Sequence[str]) -> QueryResult:
+        """
+        Результат агрегации по аккумуляторам групп (ключ — значения group_by,
+        при --bucket перед ними начало интервала)
+        """
+        bucket = getattr(self._args, "bucket", None)
+        for column in list(group_by) + [condition.column] + ([bucket.column] if bucket else []):
+            if column not in headers:
+                raise KeyError(column)
+        if bucket is not None:
+            return self._bucket_result(groups, group_by, f"{function_str}({condition.column})", bucket)
+        if not group_by:
+            accumulator = groups.get(()) or self.aggregator.create_accumulator(condition.function, condition.argument)
+            value = self.aggregator.finalize(accumulator, condition.column)
+            return QueryResult(column=condition.column, function=function_str, value=value)
+        value_column = f"{function_str}({condition.column})"
+        rows = []
+        for key, accumulator in groups.items():
+            row = dict(zip(group_by, key))
+            # Группа без значений для агрегации получает пустую ячейку
+            row[value_column] = accumulator.finalize() if accumulator.count or accumulator.allow_empty else None
+            rows.append(row)
+        return QueryResult(headers=list(group_by) + [value_column], rows=rows)
+
+    def _bucket_result(self, groups: Dict[tuple, Any], group_by: Sequence[str], value_column: str,
+                       bucket: Any) -> QueryResult:
+        """
+        Таблица агрегатов по интервалам времени (--bucket) в порядке начала интервала;
+        строки с нераспознанной меткой времени — в конце с пустым интервалом
+        """
+        from .timestamps import format_timestamp
 
-    def _execute_order_by(self, file: str, condition: SortCondition) -> None:
+        rows = []
+        for key in sorted(groups, key=lambda key: (key[0] is None, key[0] or 0)):
+            accumulator = groups[key]
+            row = {bucket.column: None if key[0] is None else format_timestamp(key[0])}
+            row.update(zip(group_by, key[1:]))
+            row[value_column] = accumulator.finalize() if accumulator.count or accumulator.allow_empty else None
+            rows.append(row)
+        return QueryResult(headers=[bucket.column] + list(group_by) + [value_column], rows=rows)
+
+    def _run_distributed(self, args: Arguments) -> QueryResult:
+        """
+        Распределенное выполнение (--coordinator): исполнители возвращают частичные
+        результаты по файлам набора, здесь они объединяются в порядке файлов
+        """
+        from .distributed import Coordinator, build_plan
+        from .records import record_type
+
+        plan = build_plan(args, self.aggregator.relative_error)
+        headers, partials = Coordinator(args.coordinator).run(args.filename, plan)
+        mode = plan["mode"]
+        if mode == "count":
+            return QueryResult(function="count", value=sum(partials))
+        if mode == "describe":
+            from .profiling import PROFILE_HEADERS, TableProfile
+
+            if args.filter_condition is not None and args.filter_condition.column not in headers:
+                raise KeyError(args.filter_condition.column)
+            profile = TableProfile(headers, self.aggregator.relative_error)
+            for state in partials:
+                profile.merge(TableProfile.from_state(state))
+            return QueryResult(headers=list(PROFILE_HEADERS), rows=profile.summary())
+        if mode == "aggregate":
+            from .accumulators import restore_accumulator
+
+            condition = args.aggregate_condition
+            function_str = getattr(condition.function, "value", condition.function)
+            if condition.argument is not None:
+                function_str = f"{function_str}:{condition.argument:g}"
+            groups: Dict[tuple, Any] = {}
+            for states in partials:
+                for key, state in states:
+                    key, accumulator = tuple(key), restore_accumulator(state)
+                    if key in groups:
+                        groups[key].merge(accumulator)
+                    else:
+                        groups[key] = accumulator
+            return self._grouped_result(headers, groups, condition, function_str, args.group_by)
+        record = record_type(headers)
+        runs = [[record.from_values(values) for values in rows] for rows in partials]
+        if mode == "order_by":
+            import heapq
+
+            from .external_sort import merge_key
+
+            # Прогоны файлов сливаются в порядке файлов: равные строки — как при локальной сортировке
+            rows = list(heapq.merge(*runs, key=merge_key(args.order_by_conditions)))
+        else:
+            rows = [row for run in runs for row in run]
+        return QueryResult(headers=headers, rows=rows)
+
+    def _run_sampled_aggregate(self, file: str, condition: AggregateCondition, function_str: str) -> QueryResult:
+        """
+        Агрегация по выборке с масштабированием и доверительным интервалом
+        """
+        from .sampling import Sampler
+
+        sample = Sampler(self._args.sample_options, self.csv_reader).sample(file)
+        value = self.aggregator.aggregate_data(sample.rows, f"{condition.column}={function_str}")
+        value, interval = self.aggregator.estimate_from_sample(sample.rows, condition, value, sample.scale,
+                                                               clusters=sample.clusters)
+        return QueryResult(column=condition.column, function=function_str, value=value, interval=interval)
+
+    @staticmethod
+    def _is_raw_scan(args: Arguments) -> bool:
+        return bool(getattr(args, "count_rows", False) or getattr(args, "head_rows", None)
+                    or getattr(args, "tail_rows", None))
+
+    def _run_raw_scan(self, args: Arguments) -> QueryResult:
+        """
+        Число строк (--count), первые (--head) или последние (--tail) строки
+        без чтения всего файла через разбор CSV
+        """
+        if args.count_rows:
+            from .raw_scan import count_records
+
+            return QueryResult(function="count", value=count_records(args.filename, self.csv_reader))
+        if args.tail_rows:
+            from .raw_scan import tail_records
+
+            headers, rows = tail_records(args.filename, args.tail_rows, self.csv_reader)
+            return QueryResult(headers=headers, rows=rows)
+        from itertools import islice
+
+        headers, rows = self.csv_reader.iter_file(args.filename)
+        head = list(islice(rows, args.head_rows))
+        # Остаток файла не читается: генератор строк закрывает файл
+        rows.close()
+        return QueryResult(headers=headers, rows=head)
+
+    def _run_window(self, args: Arguments) -> QueryResult:
+        """
+        Оконные функции (--window) за один потоковый проход по строкам
+        в порядке --order-by (или в порядке файла)
+        """
+        from .window import apply_windows
+
+        source = None
+        if args.filter_condition:
+            filtered = self._run_filter(args.filename, args.filter_condition)
+            source = filtered.headers, filtered.rows
+        if args.order_by_condition:
+            ordered = self._run_order_by(args.filename, args.order_by_conditions or args.order_by_condition, source)
+            headers, rows = ordered.headers, ordered.rows
+        else:
+            headers, rows = source or self._stream_source(args.filename)
+        headers, rows = apply_windows(headers, rows, args.window_conditions, args.partition_by, self._governor)
+        return QueryResult(headers=headers, rows=rows if self._governor is not None else list(rows))
+
+    def _run_describe(self, file: str, condition: Optional[FilterCondition] = None) -> QueryResult:
+        """
+        Профиль столбцов за один потоковый проход (--describe); секции каталога
+        профилируются параллельно, их состояния сливаются
+        """
+        from .profiling import PROFILE_HEADERS, TableProfile, profile_partition
+
+        relative_error = self.aggregator.relative_error
+        if os.path.isdir(file) and not getattr(self._args, "join_condition", None):
+            from .filter_engine import compile_condition
+            from .partitioning import PartitionedDataset, map_partitions
+
+            dataset = PartitionedDataset(file, self.csv_reader)
+            headers = dataset.headers
+            partitions, spec = dataset.partitions, None
+            if condition is not None:
+                column, test = compile_condition(condition)
+                if column not in headers:
+                    raise KeyError(column)
+                partitions = dataset.prune(column, test)
+                if column not in dataset.columns:
+                    spec = (column, condition.operator.value, condition.value)
+            profile = TableProfile(headers, relative_error)
+            tasks = [(partition.files, spec, relative_error) for partition in partitions]
+            for state in map_partitions(profile_partition, tasks, getattr(self._args, "workers", None)):
+                profile.merge(TableProfile.from_state(state))
+        else:
+            if condition is not None:
+                headers, rows, predicate = self._stream_filtered_source(file, condition)
+                rows = (row for row in rows if predicate(row))
+            else:
+                headers, rows = self._stream_source(file)
+            profile = TableProfile(headers, relative_error)
+            profile.update(rows)
+        return QueryResult(headers=list(PROFILE_HEADERS), rows=profile.summary())
+
+    def _execute_order_by(self, file: str, condition: Union[SortCondition, Sequence[SortCondition]]) -> None:
         """Выполнение сортировки"""
-        headers, data = self.csv_reader.read_file(file)
-        col = condition.column
-        reverse = condition.direction == condition.direction.DESC
+        self.display(self._run_order_by(file, condition))
 
-        def sort_key(row):
-            value = row.get(col)
-            try:
-                return float(value)
-            except (TypeError, ValueError):
-                return value  # fallback to string
+    def _run_order_by(self, file: str, condition: Union[SortCondition, Sequence[SortCondition]],
+                      source=None) -> QueryResult:
+        if source is None:
+            source = self._stream_source(file) if self._governor is not None else self._read_source(file)
+        headers, data = self._apply_distinct(*source)
+        conditions = (condition,) if isinstance(condition[0], str) else tuple(condition)
+        if getattr(self._args, "distinct_columns", None):
+            # После DISTINCT по столбцам сортировать можно только по ним
+            for sort_condition in conditions:
+                if sort_condition.column not in headers:
+                    raise KeyError(sort_condition.column)
+        sorted_by = getattr(self._args, "sorted_by", None)
+        if sorted_by is not None and conditions == (sorted_by,):
+            # Файл уже упорядочен так, как требуется
+            return QueryResult(headers=headers, rows=data)
+        if self._governor is not None:
+            from .external_sort import ExternalSorter
+
+            return QueryResult(headers=headers, rows=ExternalSorter(self._governor).sort(data, conditions))
+        from .sorting import sort_rows
 
-        sorted_data = sorted(data, key=sort_key, reverse=reverse)
-        self.output_formatter.display_table(sorted_data, headers) 
+        sorted_data = sort_rows(data, condition)
+        return QueryResult(headers=headers, rows=sorted_data)
@@ -3,8 +3,61 @@
 """
 
 import csv
-from pathlib import Path
-from typing import Dict, List, Tuple
+import io
+import os
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+from .records import Record, record_type
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+class ReadOptions(NamedTuple):
+    """
+    Настройки чтения файла: read_ahead — число буферов упреждающего чтения
+    в фоновом потоке (0 — без него), buffer_size — размер буфера,
+    fadvise — подсказка ядру о последовательном чтении.
+    """
+
+    read_ahead: int = 0
+    buffer_size: int = DEFAULT_CHUNK_SIZE
+    fadvise: bool = False
+
+
+class RowBlock(NamedTuple):
+    """
+    Блок строк, разобранных из байтового диапазона файла.
+
+    complete=False у последнего блока, если файл не заканчивается
+    переводом строки (последняя строка может еще дописываться).
+    """
+
+    rows: List[List[str]]
+    start_offset: int
+    end_offset: int
+    complete: bool
+
+
+def find_row_boundary(data: bytes) -> int:
+    """
+    Позиция последнего перевода строки, завершающего запись CSV.
+
+    Данные должны начинаться с границы записи; перевод строки внутри
+    поля в кавычках границей не считается. Возвращает -1, если полной
+    записи в данных нет.
+    """
+    position = data.rfind(b"\n")
+    while position >= 0 and data.count(b'"', 0, position) % 2:
+        position = data.rfind(b"\n", 0, position)
+    return position
+
+
+def parse_block(data: bytes) -> List[List[str]]:
+    """
+    Разбор байтового блока полных записей CSV (пустые строки пропускаются).
+    """
+    reader = csv.reader(io.StringIO(data.decode("utf-8"), newline=""))
+    return [values for values in reader if values]
 
 
 class CSVReader:
@@ -12,7 +65,34 @@ class CSVReader:
     Класс для чтения CSV файлов.
     """
 
-    def read_file(self, filepath: str) -> Tuple[List[str], List[Dict[str, str]]]:
+    # Атрибут класса: подклассы без вызова __init__ читают без упреждения
+    options = ReadOptions()
+
+    def __init__(self, options: Optional[ReadOptions] = None):
+        if options is not None:
+            self.options = options
+
+    def _open(self, filepath: str, offset: int = 0, text: bool = True):
+        """
+        Открывает файл с учетом настроек чтения (упреждающее чтение, fadvise).
+        """
+        options = self.options
+        if options.read_ahead:
+            # Модуль потоков нужен только в режиме упреждающего чтения
+            from .read_ahead import open_read_ahead
+
+            return open_read_ahead(filepath, options.read_ahead, options.buffer_size, offset,
+                                   options.fadvise, "utf-8" if text else None)
+        f = open(filepath, encoding="utf-8", newline="") if text else open(filepath, "rb")
+        if options.fadvise:
+            from .read_ahead import advise_sequential
+
+            advise_sequential(f)
+        if offset:
+            f.seek(offset)
+        return f
+
+    def read_file(self, filepath: str) -> Tuple[List[str], List[Record]]:
         """
         Читает CSV-файл и возвращает заголовки и данные.
 
@@ -20,23 +100,113 @@ class CSVReader:
             filepath (str): Путь к CSV файлу.
 
         Returns:
-            Tuple[List[str], List[Dict[str, str]]]:
+            Tuple[List[str], List[Record]]:
                 - headers: список заголовков
-                - data: список строк в виде словарей
+                - data: список строк-записей (см. records.Record)
+
+        Raises:
+            FileNotFoundError: если файл не найден
+            ValueError: если файл пуст или не содержит заголовков
+        """
+        headers, rows = self.iter_file(filepath)
+        data = list(rows)
+        return headers, data
+
+    def iter_file(self, filepath: str) -> Tuple[List[str], Iterator[Record]]:
+        """
+        Открывает CSV-файл для потокового чтения.
+
+        Заголовки читаются сразу, строки — лениво; файл закрывается,
+        когда итератор исчерпан. Строки — записи одного класса с общим
+        отображением заголовков в позиции; пустые строки пропускаются.
+        Каталог читается как секционированный набор данных: все секции подряд.
+
+        Args:
+            filepath (str): Путь к CSV файлу.
+
+        Returns:
+            Tuple[List[str], Iterator[Record]]:
+                - headers: список заголовков
+                - rows: итератор строк-записей
 
         Raises:
             FileNotFoundError: если файл не найден
             ValueError: если файл пуст или не содержит заголовков
         """
         # Проверка существования файла
-        file = Path(filepath)
-        if not file.exists():
+        if not os.path.exists(filepath):
             raise FileNotFoundError("Файл не найден")
+        if os.path.isdir(filepath):
+            # Каталог — секционированный набор данных (см. partitioning)
+            from .partitioning import PartitionedDataset
 
-        with file.open(encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            headers = reader.fieldnames
-            if not headers:
-                raise ValueError("Файл пуст или не содержит заголовков")
-            data = [row for row in reader]
-        return headers, data
+            return PartitionedDataset(filepath, self).iter_rows()
+
+        f = self._open(filepath)
+        reader = csv.reader(f)
+        headers = next(reader, None)
+        if not headers:
+            f.close()
+            raise ValueError("Файл пуст или не содержит заголовков")
+        record = record_type(headers)
+        width = len(headers)
+        new = tuple.__new__
+
+        def rows() -> Iterator[Record]:
+            with f:
+                for values in reader:
+                    if len(values) < width:
+                        if not values:
+                            continue
+                        values += [None] * (width - len(values))
+                    yield new(record, values)
+
+        return headers, rows()
+
+    def iter_chunks(self, filepath: str, chunk_size: int = DEFAULT_CHUNK_SIZE, offset: int = 0) -> Iterator[bytes]:
+        """
+        Сырые байтовые фрагменты файла (с учетом настроек чтения), без разбора CSV.
+
+        Raises:
+            FileNotFoundError: если файл не найден
+        """
+        if not os.path.exists(filepath):
+            raise FileNotFoundError("Файл не найден")
+        with self._open(filepath, offset, text=False) as f:
+            yield from iter(lambda: f.read(chunk_size), b"")
+
+    def iter_row_blocks(
+        self, filepath: str, offset: int = 0, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[RowBlock]:
+        """
+        Читает файл с байтового смещения блоками полных записей.
+
+        Смещение должно указывать на границу записи. Каждый блок заканчивается
+        на границе записи (с учетом кавычек), поэтому end_offset блока можно
+        сохранить и продолжить чтение с него позже.
+
+        Args:
+            filepath (str): Путь к CSV файлу.
+            offset (int): Байтовое смещение начала чтения.
+            chunk_size (int): Размер читаемого за раз фрагмента.
+
+        Raises:
+            FileNotFoundError: если файл не найден
+        """
+        if not os.path.exists(filepath):
+            raise FileNotFoundError("Файл не найден")
+
+        with self._open(filepath, offset, text=False) as f:
+            position = offset
+            pending = b""
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                data = pending + chunk
+                boundary = find_row_boundary(data)
+                if boundary < 0:
+                    pending = data
+                    continue
+                block, pending = data[: boundary + 1], data[boundary + 1:]
+                yield RowBlock(parse_block(block), position, position + len(block), True)
+                position += len(block)
+            if pending:
+                yield RowBlock(parse_block(pending), position, position + len(pending), False)
@@ -0,0 +1,118 @@
+"""
+Удаление дубликатов строк (--distinct).
+
+Строки проходят потоком через множество уже встреченных ключей в памяти
+(память ключей резервируется у бюджета запроса), строка с новым ключом
+выдается сразу, в порядке первого появления. Если очередной ключ не
+помещается в бюджет, встреченные ключи и оставшиеся строки разбиваются
+по отпечатку (64-битному хешу ключа) на партиции во временных файлах,
+и каждая партиция обрабатывается отдельно (при необходимости —
+рекурсивно); порядок таких строк не гарантируется.
+"""
+
+import tempfile
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .join_engine import DEFAULT_MEMORY_BUDGET, ROW_OVERHEAD_BYTES, PartitionFiles
+from .memory import MemoryGovernor, governor_or_budget
+from .records import key_getter
+
+Row = Dict[str, str]
+Key = Tuple[Optional[str], ...]
+
+DEFAULT_PARTITIONS = 64
+MAX_SPILL_DEPTH = 4
+
+
+def fingerprint(key: Key, depth: int = 0) -> int:
+    """
+    64-битный отпечаток ключа; depth меняет распределение для повторного разбиения.
+    """
+    return hash((depth, key)) & 0xFFFFFFFFFFFFFFFF
+
+
+def estimate_key_size(key: Key) -> int:
+    """
+    Грубая оценка памяти под сохраненный ключ и запись таблицы.
+    """
+    return ROW_OVERHEAD_BYTES * (len(key) + 2) + sum(len(value or "") for value in key)
+
+
+class Deduplicator:
+    """
+    Потоковое удаление дубликатов с переходом на партиции на диске.
+    """
+
+    def __init__(self, memory_budget: int = DEFAULT_MEMORY_BUDGET, partitions: int = DEFAULT_PARTITIONS,
+                 governor: Optional[MemoryGovernor] = None):
+        """
+        governor — общий бюджет памяти запроса; без него используется memory_budget.
+        """
+        self.memory_budget = memory_budget
+        self.governor = governor
+        self.partitions = partitions
+        self.spilled_partitions = 0
+
+    def distinct(self, headers: List[str], rows: Iterable[Row],
+                 columns: Optional[Iterable[str]] = None) -> Tuple[List[str], Iterator[Row]]:
+        """
+        Уникальные строки (или уникальные сочетания значений columns).
+
+        Returns:
+            Tuple[List[str], Iterator[Row]]: заголовки результата и итератор строк
+
+        Raises:
+            KeyError: если столбца нет в данных
+        """
+        output_headers = list(columns) if columns else list(headers)
+        for column in output_headers:
+            if column not in headers:
+                raise KeyError(column)
+        rows = iter(rows)
+        first = next(rows, None)
+        if first is None:
+            return output_headers, iter(())
+        key_of = key_getter(first, output_headers)
+        keys = map(key_of, chain((first,), rows))
+        unique = self._exact(((False, key) for key in keys), 0, governor_or_budget(self.governor, self.memory_budget))
+        return output_headers, (dict(zip(output_headers, key)) for key in unique)
+
+    def _exact(self, records: Iterable[Tuple[bool, Key]], depth: int, governor: MemoryGovernor) -> Iterator[Key]:
+        """
+        Удаление дубликатов в памяти; records — пары (уже выдан ранее, ключ).
+        """
+        known: Set[Key] = set()
+        records = iter(records)
+        with governor.reserve("distinct") as reservation:
+            for emitted, key in records:
+                if key in known:
+                    continue
+                known.add(key)
+                if not emitted:
+                    yield key
+                size = estimate_key_size(key)
+                if reservation.try_grow(size):
+                    continue
+                if depth < MAX_SPILL_DEPTH:
+                    reservation.release()
+                    yield from self._spill(known, records, depth, governor)
+                    return
+                reservation.add(size)
+
+    def _spill(self, known: Set[Key], rest: Iterator[Tuple[bool, Key]], depth: int,
+               governor: MemoryGovernor) -> Iterator[Key]:
+        """
+        Разбиение встреченных ключей и оставшихся строк на партиции по отпечатку.
+        """
+        self.spilled_partitions += self.partitions
+        with tempfile.TemporaryDirectory(prefix="csv-distinct-") as directory:
+            partitions = PartitionFiles(directory, self.partitions)
+            # Уже встреченные ключи записываются первыми, чтобы не выдать их повторно
+            for key in known:
+                partitions.write(fingerprint(key, depth) % self.partitions, (True, key))
+            known.clear()
+            for emitted, key in rest:
+                partitions.write(fingerprint(key, depth) % self.partitions, (emitted, key))
+            for records in partitions.read_all():
+                yield from self._exact(records, depth + 1, governor)
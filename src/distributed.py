@@ -0,0 +1,367 @@
+"""
+Распределенное выполнение запроса: координатор и исполнители по TCP.
+
+Исполнитель (подкоманда worker) обслуживает файлы своего каталога данных.
+Координатор (--coordinator) узнает у исполнителей, какие файлы набора
+лежат у каждого, раздает файлы и план запроса (build_plan из Arguments),
+а исполнители возвращают по каждому файлу компактный частичный результат:
+подходящие строки, отсортированный прогон, состояния аккумуляторов групп,
+состояние профиля или число строк. Частичные результаты объединяются
+в порядке файлов, поэтому результат совпадает с локальным выполнением
+над теми же файлами подряд.
+
+Если исполнитель недоступен или обрывает соединение, его файлы
+передаются другим исполнителям, у которых есть те же файлы (реплики
+или общий диск). Любая другая ошибка исполнителя при выполнении
+(нет столбца, некорректный файл, ошибка разбора CSV) — ошибка данных:
+она не считается отказом и пробрасывается как при локальном выполнении.
+
+Протокол: одно соединение на запрос, JSON-строка запроса и JSON-строка ответа.
+    {"op": "files", "dataset": "events"}
+      -> {"files": ["events/part-0.csv", ...]}
+    {"op": "run", "plan": {...}, "files": [...]}
+      -> {"headers": {файл: [...]}, "results": {файл: частичный результат}}
+      -> {"error": "...", "type": "ValueError" | "KeyError" | "FileNotFoundError" | имя другого типа}
+    Ошибка с типом не из DATA_ERRORS пробрасывается координатором как ValueError.
+"""
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Sequence, Set, Tuple
+
+from .csv_reader import CSVReader
+
+DEFAULT_WORKER_HOST = "127.0.0.1"
+DEFAULT_WORKER_PORT = 8766
+# Ожидание подключения к исполнителю и ответа на запрос, секунды
+CONNECT_TIMEOUT = 5.0
+DEFAULT_TIMEOUT = 600.0
+
+Address = Tuple[str, int]
+
+# Ошибки данных, передаваемые от исполнителя координатору с сохранением типа (прочие — ValueError)
+DATA_ERRORS = {"ValueError": ValueError, "KeyError": KeyError, "FileNotFoundError": FileNotFoundError}
+
+
+class WorkerFailure(Exception):
+    """Исполнитель недоступен или оборвал соединение."""
+
+
+def parse_worker_addresses(addresses_str: str) -> Tuple[Address, ...]:
+    """
+    Парсит адреса исполнителей "host:port,host:port".
+
+    Raises:
+        ValueError: Если адрес некорректен
+    """
+    addresses = []
+    for item in addresses_str.split(","):
+        host, separator, port = item.strip().rpartition(":")
+        if not separator or not host or not port.isdecimal() or not 0 < int(port) < 65536:
+            raise ValueError(f"Некорректный адрес исполнителя: '{item.strip()}'. Ожидается 'host:port'")
+        addresses.append((host, int(port)))
+    if len(set(addresses)) != len(addresses):
+        raise ValueError("Адреса исполнителей повторяются")
+    return tuple(addresses)
+
+
+def build_plan(args: Any, relative_error: float) -> Dict[str, Any]:
+    """
+    План запроса для исполнителей (JSON-совместимый словарь) из Arguments.
+    """
+    plan: Dict[str, Any] = {
+        "mode": "table", "filter": None, "aggregate": None, "group_by": [], "bucket": None, "order_by": [],
+        "relative_error": relative_error,
+    }
+    condition = args.filter_condition
+    if condition is not None:
+        plan["filter"] = [condition.column, condition.operator.value, condition.value]
+        plan["mode"] = "filter"
+    if args.aggregate_condition is not None:
+        aggregate = args.aggregate_condition
+        function = getattr(aggregate.function, "value", aggregate.function)
+        plan.update(mode="aggregate", aggregate=[aggregate.column, function, aggregate.argument],
+                    group_by=list(args.group_by))
+        if args.bucket is not None:
+            plan["bucket"] = f"{args.bucket.column}={args.bucket.spec}"
+    elif args.order_by_conditions:
+        plan.update(mode="order_by", order_by=[[c.column, c.direction.value] for c in args.order_by_conditions])
+    elif args.describe:
+        plan["mode"] = "describe"
+    elif args.count_rows:
+        plan["mode"] = "count"
+    return plan
+
+
+def execute_plan(plan: Dict[str, Any], path: str) -> Tuple[List[str], Any]:
+    """
+    Заголовки файла и частичный результат плана для него (выполняется исполнителем).
+    """
+    from .filter_engine import build_value_test
+
+    reader = CSVReader()
+    headers, rows = reader.iter_file(path)
+    mode, filter_spec, relative_error = plan["mode"], plan["filter"], plan["relative_error"]
+    if mode not in ("table", "filter", "order_by"):
+        rows.close()
+    if mode == "count":
+        from .raw_scan import count_records
+
+        return headers, count_records(path, reader)
+    if mode == "describe":
+        from .profiling import profile_partition
+
+        return headers, profile_partition([path], filter_spec, relative_error)
+    if mode == "aggregate":
+        from .partitioning import aggregate_partition
+        from .timestamps import parse_bucket
+
+        column, function, argument = plan["aggregate"]
+        bucket = parse_bucket(plan["bucket"]) if plan["bucket"] else None
+        states = aggregate_partition([path], plan["group_by"], column, function, argument, relative_error, bucket)
+        return headers, [[list(key), state] for key, state in states]
+    if filter_spec is not None:
+        column = filter_spec[0]
+        test = build_value_test(filter_spec[1], filter_spec[2])
+        rows = (row for row in rows if test(row.get(column)))
+    rows = list(rows)
+    if mode == "order_by":
+        from .argument_parser import SortCondition, SortDirection
+        from .sorting import sort_rows
+
+        rows = sort_rows(rows, [SortCondition(column, SortDirection(direction))
+                                for column, direction in plan["order_by"]])
+    # Строки передаются списками значений: итерация записи дает имена столбцов
+    return headers, [list(tuple.__iter__(row)) for row in rows]
+
+
+class WorkerServer(socketserver.ThreadingTCPServer):
+    """
+    Исполнитель: выполняет план запроса над файлами каталога данных.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, data_dir: str, host: str = DEFAULT_WORKER_HOST, port: int = DEFAULT_WORKER_PORT):
+        self.data_dir = os.path.abspath(data_dir)
+        super().__init__((host, port), WorkerRequestHandler)
+
+    @property
+    def address(self) -> str:
+        host, port = self.server_address[:2]
+        return f"{host}:{port}"
+
+    def resolve(self, relative_path: str) -> str:
+        """
+        Абсолютный путь файла каталога данных.
+
+        Raises:
+            ValueError: Если путь выходит за пределы каталога данных
+        """
+        path = os.path.abspath(os.path.join(self.data_dir, relative_path))
+        if os.path.commonpath([path, self.data_dir]) != self.data_dir:
+            raise ValueError(f"Путь вне каталога данных исполнителя: '{relative_path}'")
+        return path
+
+    def list_files(self, dataset: str) -> List[str]:
+        """
+        Файлы набора данных (файл или CSV-файлы каталога) относительно каталога данных.
+        """
+        path = self.resolve(dataset)
+        if os.path.isfile(path):
+            return [os.path.relpath(path, self.data_dir)]
+        files = []
+        for directory, _, names in os.walk(path):
+            files.extend(
+                os.path.relpath(os.path.join(directory, name), self.data_dir)
+                for name in names if name.endswith(".csv")
+            )
+        return sorted(files)
+
+    def handle_request_message(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Ответ на сообщение координатора. Исключение при выполнении возвращается
+        как ошибка данных; ConnectionError (обрыв соединения) пробрасывается,
+        чтобы координатор передал файлы другому исполнителю.
+        """
+        try:
+            if message.get("op") == "files":
+                return {"files": self.list_files(message["dataset"])}
+            if message.get("op") == "run":
+                headers, results = {}, {}
+                for relative_path in message["files"]:
+                    file_headers, result = execute_plan(message["plan"], self.resolve(relative_path))
+                    headers[relative_path], results[relative_path] = file_headers, result
+                return {"headers": headers, "results": results}
+            return {"error": f"Неизвестная операция: {message.get('op')!r}", "type": "ValueError"}
+        except ConnectionError:
+            raise
+        except Exception as e:
+            detail = e.args[0] if isinstance(e, KeyError) and e.args else str(e) or type(e).__name__
+            return {"error": detail, "type": type(e).__name__}
+
+
+class WorkerRequestHandler(socketserver.StreamRequestHandler):
+    """
+    Обработчик соединения с исполнителем: одна JSON-строка запроса и ответа.
+    """
+
+    server: WorkerServer
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            message = json.loads(line)
+        except ValueError:
+            response = {"error": "Ожидается JSON-строка запроса", "type": "ValueError"}
+        else:
+            response = self.server.handle_request_message(message)
+        self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+
+
+def request_worker(address: Address, message: Dict[str, Any], timeout: float = DEFAULT_TIMEOUT) -> Dict[str, Any]:
+    """
+    Отправляет сообщение исполнителю и возвращает ответ.
+
+    Raises:
+        WorkerFailure: Если исполнитель недоступен или ответ не получен
+        ValueError, KeyError, FileNotFoundError: Ошибка данных на исполнителе (прочие типы — ValueError)
+    """
+    try:
+        with socket.create_connection(address, timeout=CONNECT_TIMEOUT) as connection:
+            connection.settimeout(timeout)
+            connection.sendall(json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n")
+            with connection.makefile("rb") as stream:
+                line = stream.readline()
+        response = json.loads(line)
+    except (OSError, ValueError) as e:
+        raise WorkerFailure(f"Исполнитель {address[0]}:{address[1]} недоступен: {e or 'нет ответа'}")
+    if "error" in response:
+        raise DATA_ERRORS.get(response.get("type"), ValueError)(response["error"])
+    return response
+
+
+class Coordinator:
+    """
+    Координатор: раздает файлы набора исполнителям и собирает частичные
+    результаты, передавая файлы отказавших исполнителей другим.
+    """
+
+    def __init__(self, addresses: Sequence[Address], timeout: float = DEFAULT_TIMEOUT):
+        self.addresses = list(addresses)
+        self.timeout = timeout
+        self.failed: Set[Address] = set()
+
+    def locate(self, dataset: str) -> Dict[str, List[Address]]:
+        """
+        Исполнители, у которых есть каждый файл набора (в порядке файлов).
+
+        Raises:
+            FileNotFoundError: если набора нет ни у одного доступного исполнителя
+            ConnectionError: если ни один исполнитель недоступен
+        """
+        locations: Dict[str, List[Address]] = {}
+        alive = [address for address in self.addresses if address not in self.failed]
+        with ThreadPoolExecutor(max_workers=max(1, len(alive))) as executor:
+            futures = [(address, executor.submit(request_worker, address, {"op": "files", "dataset": dataset},
+                                                 self.timeout)) for address in alive]
+            for address, future in futures:
+                try:
+                    files = future.result()["files"]
+                except WorkerFailure:
+                    self.failed.add(address)
+                    continue
+                for path in files:
+                    locations.setdefault(path, []).append(address)
+        if len(self.failed) == len(self.addresses):
+            raise ConnectionError("Нет доступных исполнителей")
+        if not locations:
+            raise FileNotFoundError("Файл не найден")
+        return dict(sorted(locations.items()))
+
+    def run(self, dataset: str, plan: Dict[str, Any]) -> Tuple[List[str], List[Any]]:
+        """
+        Заголовки набора и частичные результаты плана в порядке файлов.
+
+        Raises:
+            ConnectionError: если для файла не осталось доступных исполнителей
+            ValueError: если заголовки файлов различаются
+        """
+        locations = self.locate(dataset)
+        headers: Dict[str, List[str]] = {}
+        results: Dict[str, Any] = {}
+        pending = list(locations)
+        while pending:
+            assignment = self._assign(pending, locations)
+            with ThreadPoolExecutor(max_workers=len(assignment)) as executor:
+                futures = [
+                    (address, executor.submit(request_worker, address,
+                                              {"op": "run", "plan": plan, "files": files}, self.timeout))
+                    for address, files in assignment.items()
+                ]
+                for (address, future), files in zip(futures, assignment.values()):
+                    try:
+                        response = future.result()
+                    except WorkerFailure:
+                        self.failed.add(address)
+                        continue
+                    if not set(files) <= response["results"].keys():
+                        # Неполный ответ — отказ исполнителя: файлы передаются другим
+                        self.failed.add(address)
+                        continue
+                    headers.update(response["headers"])
+                    results.update(response["results"])
+            pending = [path for path in pending if path not in results]
+        dataset_headers = headers[next(iter(locations))]
+        for path, file_headers in headers.items():
+            if file_headers != dataset_headers:
+                raise ValueError(f"Заголовки файла '{path}' отличаются от заголовков набора данных")
+        return dataset_headers, [results[path] for path in locations]
+
+    def _assign(self, files: List[str], locations: Dict[str, List[Address]]) -> Dict[Address, List[str]]:
+        """
+        Файлы по доступным исполнителям: каждый файл — наименее загруженному
+        из тех, у кого он есть.
+        """
+        assignment: Dict[Address, List[str]] = {}
+        for path in files:
+            candidates = [address for address in locations[path] if address not in self.failed]
+            if not candidates:
+                raise ConnectionError(f"Нет доступных исполнителей для файла '{path}'")
+            address = min(candidates, key=lambda candidate: len(assignment.get(candidate, ())))
+            assignment.setdefault(address, []).append(path)
+        return assignment
+
+
+def run_worker_command(argv: List[str]) -> int:
+    """
+    Точка входа подкоманды worker.
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py worker", description="Исполнитель распределенных запросов над файлами каталога данных",
+    )
+    parser.add_argument("--data", required=True, metavar="DIR", help="Каталог данных исполнителя")
+    parser.add_argument("--host", default=DEFAULT_WORKER_HOST, help="Адрес (по умолчанию 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_WORKER_PORT,
+                        help="Порт (по умолчанию 8766; 0 — любой свободный)")
+    parsed = parser.parse_args(argv)
+    if not os.path.isdir(parsed.data):
+        print(f"Ошибка: каталог данных '{parsed.data}' не найден")
+        return 1
+
+    server = WorkerServer(parsed.data, parsed.host, parsed.port)
+    print(f"Исполнитель запущен: {server.address}, каталог данных: {server.data_dir}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
@@ -0,0 +1,118 @@
+"""
+Внешняя сортировка в пределах бюджета памяти (--memory-limit).
+
+Строки накапливаются в буфере, пока общий бюджет памяти разрешает его
+рост; при отказе буфер сортируется (sorting.sort_rows) и сбрасывается на
+диск отсортированным прогоном. Прогоны сливаются heapq.merge в том же
+порядке, что дает sort_rows: слияние устойчиво, поэтому равные строки
+сохраняют исходный порядок.
+"""
+
+import heapq
+import os
+import pickle
+import tempfile
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple, Union
+
+from .argument_parser import SortCondition, SortDirection
+from .join_engine import estimate_row_size
+from .memory import MemoryGovernor
+from .sorting import NULL_RANK, sort_rows, value_key
+
+Row = Dict[str, str]
+
+# Строк в одной записи pickle файла прогона
+RUN_CHUNK_ROWS = 1024
+# Порядок групп значений при сортировке по убыванию: строки, числа, пустые
+DESC_RANKS = {0: 1, 1: 0, NULL_RANK: NULL_RANK}
+
+
+class _Descending:
+    """
+    Обертка значения с обратным порядком сравнения.
+    """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __lt__(self, other: "_Descending") -> bool:
+        return other.value < self.value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Descending) and self.value == other.value
+
+
+def merge_key(conditions: Sequence[SortCondition]):
+    """
+    Ключ слияния, упорядочивающий строки так же, как sort_rows.
+    """
+    def key(row: Row) -> Tuple:
+        parts = []
+        for condition in conditions:
+            rank, value = value_key(row.get(condition.column))
+            if condition.direction == SortDirection.DESC:
+                parts.append((DESC_RANKS[rank], _Descending(value)))
+            else:
+                parts.append((rank, value))
+        return tuple(parts)
+
+    return key
+
+
+class ExternalSorter:
+    """
+    Сортировка потока строк с прогонами на диске при нехватке памяти.
+    """
+
+    def __init__(self, governor: MemoryGovernor):
+        self.governor = governor
+        self.spilled_runs = 0
+
+    def sort(self, rows: Iterable[Row],
+             conditions: Union[SortCondition, Sequence[SortCondition]]) -> Iterator[Row]:
+        """
+        Ленивый итератор отсортированных строк.
+        """
+        if isinstance(conditions[0], str):
+            conditions = (conditions,)
+        with tempfile.TemporaryDirectory(prefix="csv-sort-") as directory:
+            with self.governor.reserve("sort") as reservation:
+                runs: List[str] = []
+                buffer: List[Row] = []
+                for row in rows:
+                    size = estimate_row_size(row)
+                    if not reservation.try_grow(size) and buffer:
+                        runs.append(self._write_run(sort_rows(buffer, conditions), directory, len(runs)))
+                        buffer = []
+                        reservation.release()
+                        if not reservation.try_grow(size):
+                            reservation.add(size)
+                    buffer.append(row)
+                if not runs:
+                    yield from sort_rows(buffer, conditions)
+                    return
+                # Последний прогон остается в памяти; он идет последним, как и в исходном порядке
+                sources = [self._read_run(path) for path in runs] + [iter(sort_rows(buffer, conditions))]
+                yield from heapq.merge(*sources, key=merge_key(conditions))
+
+    def _write_run(self, rows: List[Row], directory: str, number: int) -> str:
+        self.spilled_runs += 1
+        path = os.path.join(directory, f"run-{number:04d}.pickle")
+        with open(path, "wb") as f:
+            iterator = iter(rows)
+            for chunk in iter(lambda: list(islice(iterator, RUN_CHUNK_ROWS)), []):
+                pickle.dump(chunk, f, pickle.HIGHEST_PROTOCOL)
+        return path
+
+    @staticmethod
+    def _read_run(path: str) -> Iterator[Row]:
+        with open(path, "rb") as f:
+            while True:
+                try:
+                    chunk = pickle.load(f)
+                except EOFError:
+                    return
+                yield from chunk
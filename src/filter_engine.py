@@ -1,37 +1,182 @@
 """
 Модуль фильтрации данных для CSV.
+
+Условие превращается в специализированную проверку значения один раз:
+списки IN — во frozenset, регулярные выражения компилируются заранее,
+для остальных операторов выбирается отдельная функция сравнения.
 """
 
+import csv
 import re
-from typing import Callable, Dict, List
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from .argument_parser import LazyPattern
+from .records import column_getter
+
+Row = Dict[str, str]
+Predicate = Callable[[Row], bool]
+ValueTest = Callable[[Optional[str]], bool]
+
+FILTER_PATTERN = LazyPattern(r"^(\w+)(~=|\^=|~|[=<>])(.*)$")
+IN_PATTERN = LazyPattern(r"^(\w+)\s+in\s*\((.*)\)$", re.IGNORECASE | re.DOTALL)
+NULL_PATTERN = LazyPattern(r"^(\w+)\s+is\s+(not\s+)?null$", re.IGNORECASE)
+
+
+def parse_in_values(values_str: str) -> List[str]:
+    """
+    Значения списка IN через запятую; значение с запятой берется в кавычки.
+    """
+    values = next(csv.reader([values_str], skipinitialspace=True), [])
+    return [value.strip() for value in values]
 
 
-def filter_data(rows: List[Dict[str, str]], condition: str) -> List[Dict[str, str]]:
+def build_value_test(operator_symbol: str, value: str) -> ValueTest:
     """
-    Фильтрует строки по условию вида 'column_name=filter_value', 'column_name>filter_value', 'column_name<filter_value'.
-    Поддерживаются операторы =, >, <.
+    Специализированная проверка значения ячейки для оператора
+    (None — столбца нет в строке).
+
+    Операторы: =, >, <, in (значения через запятую), ~ (регулярное выражение),
+    ^= (префикс), ~= (равенство без учета регистра), is null, is not null,
+    in file (значение — путь к файлу ключей, см. key_set).
+
+    Raises:
+        ValueError: если оператор или регулярное выражение некорректны
     """
-    match = re.match(r"^(\w+)([=<>])(.*)$", condition)
+    if operator_symbol == "is null":
+        return lambda cell: not cell
+    if operator_symbol == "is not null":
+        return bool
+
+    if operator_symbol == "in":
+        return frozenset(parse_in_values(value)).__contains__
+    if operator_symbol == "in file":
+        return _build_key_file_test(value)
+    if operator_symbol == "~":
+        try:
+            search = re.compile(value).search
+        except re.error as e:
+            raise ValueError(f"Некорректное регулярное выражение '{value}': {e}")
+        return lambda cell: cell is not None and search(cell) is not None
+    if operator_symbol == "^=":
+        return lambda cell: cell is not None and cell.startswith(value)
+    if operator_symbol == "~=":
+        folded = value.casefold()
+        return lambda cell: cell is not None and cell.casefold() == folded
+    if operator_symbol == "=":
+        return lambda cell: cell == value
+
+    if operator_symbol not in (">", "<"):
+        raise ValueError(f"Оператор '{operator_symbol}' не поддерживается")
+    # Порог преобразуется в число один раз; порог-дата сравнивается с датами
+    # ячеек как метка времени, иной нечисловой порог не подходит ни одной строке
+    try:
+        threshold = float(value)
+    except ValueError:
+        return _build_timestamp_test(operator_symbol, value)
+
+    if operator_symbol == ">":
+        def test(cell: Optional[str]) -> bool:
+            try:
+                return float(cell) > threshold
+            except (TypeError, ValueError):
+                return False
+    else:
+        def test(cell: Optional[str]) -> bool:
+            try:
+                return float(cell) < threshold
+            except (TypeError, ValueError):
+                return False
+
+    return test
+
+
+def _build_timestamp_test(operator_symbol: str, value: str) -> ValueTest:
+    from .timestamps import parse_timestamp
+
+    threshold = parse_timestamp(value.strip())
+    if threshold is None:
+        return lambda cell: False
+    if operator_symbol == ">":
+        def test(cell: Optional[str]) -> bool:
+            timestamp = parse_timestamp(cell)
+            return timestamp is not None and timestamp > threshold
+    else:
+        def test(cell: Optional[str]) -> bool:
+            timestamp = parse_timestamp(cell)
+            return timestamp is not None and timestamp < threshold
+    return test
+
+
+def _build_key_file_test(filepath: str) -> ValueTest:
+    # Множество ключей строится при первой проверке: разбор аргументов
+    # и запрос из кеша результатов файл ключей не читают
+    contains: Optional[ValueTest] = None
+
+    def test(cell: Optional[str]) -> bool:
+        nonlocal contains
+        if contains is None:
+            from .key_set import load_key_set
+
+            contains = load_key_set(filepath).__contains__
+        return contains(cell)
+
+    return test
+
+
+def build_predicate(column: str, operator_symbol: str, value: str) -> Predicate:
+    """
+    Предикат строки для оператора (см. build_value_test).
+    """
+    test = build_value_test(operator_symbol, value)
+    return lambda row: test(row.get(column))
+
+
+def compile_condition(condition: Union[str, Any]) -> Tuple[str, ValueTest]:
+    """
+    Столбец условия и проверка его значения.
+
+    condition — строка ('price>100', 'brand~=apple', 'sku in (a,b)', 'note is null')
+    или FilterCondition: у условий из parse_filter_condition проверка уже
+    скомпилирована при разборе и используется как есть.
+    """
+    if not isinstance(condition, str):
+        if getattr(condition, "predicate", None) is not None:
+            return condition.column, condition.predicate
+        return condition.column, build_value_test(condition.operator.value, condition.value)
+
+    match = NULL_PATTERN.match(condition)
+    if match:
+        column, negation = match.groups()
+        return column, build_value_test("is not null" if negation else "is null", "")
+    match = IN_PATTERN.match(condition)
+    if match:
+        return match.group(1), build_value_test("in", match.group(2))
+    match = FILTER_PATTERN.match(condition)
     if not match:
         raise ValueError("Некорректное условие фильтрации")
     column_name, operator_symbol, filter_value = match.groups()
-    operator_map: Dict[str, Callable[[str, str], bool]] = {
-        "=": lambda a, b: a == b,
-        ">": lambda a, b: float(a) > float(b),
-        "<": lambda a, b: float(a) < float(b),
-    }
-    if operator_symbol not in operator_map:
-        raise ValueError(f"Оператор '{operator_symbol}' не поддерживается")
+    return column_name, build_value_test(operator_symbol, filter_value)
 
-    compare = operator_map[operator_symbol]
-    filtered_rows = []
-    for row in rows:
-        value = row.get(column_name)
-        if value is None:
-            continue
-        try:
-            if compare(value, filter_value):
-                filtered_rows.append(row)
-        except Exception:
-            continue
-    return filtered_rows
+
+def compile_filter(condition: Union[str, Any], headers: Optional[Sequence[str]] = None) -> Predicate:
+    """
+    Компилирует условие (строку или FilterCondition) в предикат строки.
+
+    Raises:
+        KeyError: если переданы заголовки и столбца условия среди них нет
+    """
+    column, test = compile_condition(condition)
+    if headers is not None and column not in headers:
+        raise KeyError(column)
+    return lambda row: test(row.get(column))
+
+
+def filter_data(rows: List[Row], condition: Union[str, Any]) -> List[Row]:
+    """
+    Фильтрует строки по условию (строке или FilterCondition), см. compile_condition.
+
+    Столбец разрешается в позицию один раз на вызов (records.column_getter).
+    """
+    column, test = compile_condition(condition)
+    get = column_getter(rows, column)
+    return [row for row in rows if test(get(row))]
@@ -0,0 +1,162 @@
+"""
+Режим слежения (--follow) за растущим CSV-файлом, как tail -f.
+
+Файл остается открытым; новые данные ожидаются через inotify (Linux),
+а при его недоступности — опросом с интервалом. Разбираются только
+полностью дописанные записи, незавершенная строка ждет следующего чтения.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from .csv_reader import DEFAULT_CHUNK_SIZE, find_row_boundary, parse_block
+
+DEFAULT_POLL_INTERVAL = 1.0
+
+# Маски событий inotify (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVE_SELF = 0x00000800
+IN_DELETE_SELF = 0x00000400
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+
+class PollingWatcher:
+    """
+    Ожидание изменений файла опросом: просто пауза на интервал.
+    """
+
+    def __init__(self, interval: float = DEFAULT_POLL_INTERVAL):
+        self.interval = interval
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """
+    Ожидание изменений файла через inotify (только Linux, через libc).
+    """
+
+    def __init__(self, filepath: str, interval: float = DEFAULT_POLL_INTERVAL):
+        libc_name = ctypes.util.find_library("c")
+        if not libc_name or not hasattr(select, "select"):
+            raise OSError("inotify недоступен")
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify недоступен")
+        self.interval = interval
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+        mask = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVE_SELF | IN_DELETE_SELF
+        if libc.inotify_add_watch(self._fd, os.fsencode(filepath), mask) < 0:
+            os.close(self._fd)
+            raise OSError(ctypes.get_errno(), "inotify_add_watch")
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        # Интервал ограничивает ожидание, чтобы не пропустить изменения без событий
+        limit = self.interval if timeout is None else min(timeout, self.interval)
+        readable, _, _ = select.select([self._fd], [], [], limit)
+        if readable:
+            self._drain()
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _drain(self) -> None:
+        try:
+            while os.read(self._fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+
+def create_watcher(filepath: str, interval: float = DEFAULT_POLL_INTERVAL):
+    """
+    inotify, если доступен, иначе опрос.
+    """
+    try:
+        return InotifyWatcher(filepath, interval)
+    except (OSError, AttributeError):
+        return PollingWatcher(interval)
+
+
+class CSVFollower:
+    """
+    Потоковое чтение новых записей растущего CSV-файла.
+    """
+
+    def __init__(self, filepath: str, interval: float = DEFAULT_POLL_INTERVAL,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, watcher=None):
+        if not os.path.exists(filepath):
+            raise FileNotFoundError("Файл не найден")
+        self.filepath = filepath
+        self.chunk_size = chunk_size
+        self.headers: Optional[List[str]] = None
+        self.offset = 0
+        self.truncated = False
+        self._file = open(filepath, "rb")
+        self._pending = b""
+        self._watcher = watcher or create_watcher(filepath, interval)
+
+    def close(self) -> None:
+        self._file.close()
+        self._watcher.close()
+
+    def __enter__(self) -> "CSVFollower":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def poll(self) -> List[Dict[str, str]]:
+        """
+        Возвращает записи, полностью дописанные с прошлого вызова (без ожидания).
+
+        Если файл усечен, чтение начинается заново, а truncated становится True.
+        """
+        self.truncated = False
+        if os.fstat(self._file.fileno()).st_size < self.offset + len(self._pending):
+            self._file.seek(0)
+            self.headers, self.offset, self._pending = None, 0, b""
+            self.truncated = True
+
+        rows: List[Dict[str, str]] = []
+        for chunk in iter(lambda: self._file.read(self.chunk_size), b""):
+            data = self._pending + chunk
+            boundary = find_row_boundary(data)
+            if boundary < 0:
+                self._pending = data
+                continue
+            block, self._pending = data[: boundary + 1], data[boundary + 1:]
+            self.offset += len(block)
+            values_list = parse_block(block)
+            if self.headers is None and values_list:
+                self.headers, values_list = values_list[0], values_list[1:]
+            rows.extend(dict(zip(self.headers, values)) for values in values_list)
+        return rows
+
+    def follow(self, on_rows: Callable[[List[Dict[str, str]]], None],
+               stop_event: Optional[threading.Event] = None) -> None:
+        """
+        Передает новые записи в on_rows, пока не установлен stop_event
+        (или до прерывания с клавиатуры).
+        """
+        while stop_event is None or not stop_event.is_set():
+            rows = self.poll()
+            if rows or self.truncated:
+                on_rows(rows)
+            self._watcher.wait()
@@ -0,0 +1,173 @@
+"""
+Инкрементальная агрегация по дописываемым (append-only) CSV-файлам.
+
+После каждого запуска сохраняется контрольная точка: байтовое смещение
+конца последней полной записи, хеш префикса файла перед этим смещением
+и сериализованное состояние аккумулятора. Следующий запуск читает только
+новый хвост файла и сливает его с сохраненным состоянием. Если префикс
+изменился (файл перезаписан или усечен), выполняется полное сканирование.
+
+Хеш префикса ограничен по объему чтения: заголовок, PREFIX_SAMPLE_BLOCKS
+равномерно расположенных блоков и последние PREFIX_HASH_BYTES перед
+смещением. Правка в середине файла вне этих блоков без изменения длины
+не обнаруживается — для файлов, которые не только дописываются,
+--incremental не предназначен.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple
+
+from .accumulators import Accumulator, restore_accumulator
+from .aggregator import Aggregator
+from .argument_parser import AggregateCondition
+from .csv_reader import CSVReader
+
+CHECKPOINT_VERSION = 3
+HEADER_HASH_BYTES = 4096
+PREFIX_HASH_BYTES = 64 * 1024
+PREFIX_SAMPLE_BLOCKS = 16
+SAMPLE_BLOCK_BYTES = 4096
+
+
+def format_condition(condition: AggregateCondition) -> str:
+    """
+    Строковое представление условия агрегации ('price=avg', 'price=approx_percentile:95').
+    """
+    function = getattr(condition.function, "value", condition.function)
+    if condition.argument is not None:
+        function = f"{function}:{condition.argument:g}"
+    return f"{condition.column}={function}"
+
+
+def prefix_blocks(offset: int) -> List[Tuple[int, int]]:
+    """
+    Хешируемые блоки префикса [start, end): заголовок, равномерная выборка
+    блоков середины и последние байты перед смещением.
+    """
+    header_end = min(offset, HEADER_HASH_BYTES)
+    tail_start = max(header_end, offset - PREFIX_HASH_BYTES)
+    blocks = [(0, header_end)]
+    middle = tail_start - header_end
+    if middle > 0:
+        step = max(middle // PREFIX_SAMPLE_BLOCKS, SAMPLE_BLOCK_BYTES)
+        for start in range(header_end, tail_start, step):
+            blocks.append((start, min(start + SAMPLE_BLOCK_BYTES, tail_start)))
+    blocks.append((tail_start, offset))
+    return blocks
+
+
+def prefix_hash(filepath: str, offset: int) -> str:
+    """
+    Хеш префикса файла перед смещением по блокам prefix_blocks (с учетом смещения).
+    """
+    digest = hashlib.blake2b(str(offset).encode("ascii"), digest_size=16)
+    with open(filepath, "rb") as f:
+        for start, end in prefix_blocks(offset):
+            f.seek(start)
+            digest.update(f.read(end - start))
+    return digest.hexdigest()
+
+
+class IncrementalAggregator:
+    """
+    Агрегация с контрольными точками: повторный запуск читает только дописанные строки.
+    """
+
+    def __init__(self, checkpoint_dir: str, aggregator: Optional[Aggregator] = None,
+                 csv_reader: Optional[CSVReader] = None):
+        self.checkpoint_dir = checkpoint_dir
+        self.aggregator = aggregator or Aggregator()
+        self.csv_reader = csv_reader or CSVReader()
+        self.last_scan_start = 0
+
+    def checkpoint_path(self, filepath: str, condition: AggregateCondition) -> str:
+        """
+        Путь к файлу контрольной точки для пары (файл, условие агрегации).
+        """
+        identity = f"{os.path.abspath(filepath)}\n{format_condition(condition)}"
+        name = hashlib.sha256(identity.encode("utf-8")).hexdigest()
+        return os.path.join(self.checkpoint_dir, f"{name}.json")
+
+    def aggregate(self, filepath: str, condition: AggregateCondition) -> float:
+        """
+        Агрегирует файл, используя и обновляя контрольную точку.
+
+        Raises:
+            FileNotFoundError: если файл не найден
+            ValueError: если файл пуст или в столбце нет значений
+        """
+        path = self.checkpoint_path(filepath, condition)
+        checkpoint = self._load_checkpoint(path, filepath, condition)
+
+        if checkpoint and checkpoint["offset"] > 0:
+            headers = checkpoint["headers"]
+            offset = checkpoint["offset"]
+            accumulator = restore_accumulator(checkpoint["state"])
+        else:
+            headers, offset = None, 0
+            accumulator = self.aggregator.create_accumulator(condition.function, condition.argument)
+        self.last_scan_start = offset
+
+        tail_rows: List[List[str]] = []
+        for block in self.csv_reader.iter_row_blocks(filepath, offset):
+            rows = block.rows
+            if headers is None and rows:
+                headers, rows = rows[0], rows[1:]
+            if not block.complete:
+                # Незавершенная последняя строка учитывается в результате, но не в контрольной точке
+                tail_rows = rows
+                break
+            self._update(accumulator, headers, rows, condition.column)
+            offset = block.end_offset
+
+        if headers is None:
+            raise ValueError("Файл пуст или не содержит заголовков")
+
+        self._save_checkpoint(path, {
+            "version": CHECKPOINT_VERSION,
+            "file": os.path.abspath(filepath),
+            "condition": format_condition(condition),
+            "offset": offset,
+            "prefix_hash": prefix_hash(filepath, offset),
+            "headers": headers,
+            "state": accumulator.to_state(),
+        })
+
+        if tail_rows:
+            accumulator = restore_accumulator(accumulator.to_state())
+            self._update(accumulator, headers, tail_rows, condition.column)
+        return self.aggregator.finalize(accumulator, condition.column)
+
+    def _update(self, accumulator: Accumulator, headers: List[str], rows: List[List[str]], column: str) -> None:
+        data = [dict(zip(headers, values)) for values in rows]
+        accumulator.update_many(self.aggregator.extract_values(data, column, accumulator.numeric))
+
+    def _load_checkpoint(self, path: str, filepath: str, condition: AggregateCondition) -> Optional[Dict[str, Any]]:
+        """
+        Загружает контрольную точку, если она соответствует текущему состоянию файла.
+        """
+        try:
+            with open(path, encoding="utf-8") as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            return None
+        try:
+            valid = (
+                checkpoint["version"] == CHECKPOINT_VERSION
+                and checkpoint["condition"] == format_condition(condition)
+                and checkpoint["offset"] <= os.path.getsize(filepath)
+                and checkpoint["prefix_hash"] == prefix_hash(filepath, checkpoint["offset"])
+            )
+        except (KeyError, TypeError):
+            return None
+        return checkpoint if valid else None
+
+    def _save_checkpoint(self, path: str, checkpoint: Dict[str, Any]) -> None:
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.checkpoint_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(checkpoint, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
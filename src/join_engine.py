@@ -0,0 +1,241 @@
+"""
+Модуль соединения (JOIN) двух CSV-файлов.
+
+Hash join: хеш-таблица строится по меньшему файлу, больший файл
+читается потоково и пробует таблицу. Если сторона построения не
+помещается в бюджет памяти, выполняется grace hash join: обе стороны
+разбиваются по хешу ключа на партиции во временных файлах, и каждая
+пара партиций соединяется отдельно.
+"""
+
+import math
+import os
+import pickle
+import tempfile
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .argument_parser import JoinCondition, JoinType
+from .csv_reader import CSVReader
+from .memory import MemoryGovernor, Reservation, governor_or_budget
+
+Row = Dict[str, str]
+
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+ROW_OVERHEAD_BYTES = 64
+# Записей партиций в памяти до сброса в файлы
+PARTITION_BATCH_SIZE = 8192
+
+
+def estimate_row_size(row: Row) -> int:
+    """
+    Грубая оценка памяти, занимаемой строкой-словарем (вычисленные значения,
+    например числа оконных функций, учитываются только накладными расходами).
+    """
+    return ROW_OVERHEAD_BYTES * (len(row) + 1) + sum(len(value) for value in row.values() if isinstance(value, str))
+
+
+class PartitionFiles:
+    """
+    Партиции записей во временных файлах: записи копятся в памяти и пачками
+    по PARTITION_BATCH_SIZE дописываются в файлы через pickle. Одновременно
+    открыт не больше одного файла, значения (в том числе None) сохраняются как есть.
+    """
+
+    def __init__(self, directory: str, count: int, prefix: str = "part"):
+        self.paths = [os.path.join(directory, f"{prefix}-{index:04d}.bin") for index in range(count)]
+        self.count = count
+        self.buffers: List[List[Any]] = [[] for _ in range(count)]
+        self.written: Set[int] = set()
+        self.buffered = 0
+
+    def write(self, index: int, record: Any) -> None:
+        self.buffers[index].append(record)
+        self.buffered += 1
+        if self.buffered == PARTITION_BATCH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        for index, records in enumerate(self.buffers):
+            if records:
+                with open(self.paths[index], "ab") as f:
+                    pickle.dump(records, f, pickle.HIGHEST_PROTOCOL)
+                self.written.add(index)
+                self.buffers[index] = []
+        self.buffered = 0
+
+    def read(self, index: int) -> Iterator[Any]:
+        """Записи партиции в порядке записи (вызывается после flush)."""
+        if index not in self.written:
+            return
+        with open(self.paths[index], "rb") as f:
+            while True:
+                try:
+                    records = pickle.load(f)
+                except EOFError:
+                    return
+                yield from records
+
+    def read_all(self) -> Iterator[Iterator[Any]]:
+        """Записи каждой непустой партиции по порядку."""
+        self.flush()
+        for index in sorted(self.written):
+            yield self.read(index)
+
+
+class HashJoiner:
+    """
+    Соединение основного (левого) файла с другим (правым) файлом по ключу.
+    """
+
+    def __init__(self, csv_reader: Optional[CSVReader] = None, memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                 governor: Optional[MemoryGovernor] = None):
+        """
+        governor — общий бюджет памяти запроса; без него используется memory_budget.
+        """
+        self.csv_reader = csv_reader or CSVReader()
+        self.memory_budget = memory_budget
+        self.governor = governor
+        self.spilled_partitions = 0
+
+    def join(self, left_file: str, condition: JoinCondition) -> Tuple[List[str], Iterator[Row]]:
+        """
+        Соединяет left_file с condition.filename по столбцу condition.key.
+
+        Returns:
+            Tuple[List[str], Iterator[Row]]: заголовки результата и итератор строк
+
+        Raises:
+            KeyError: если ключевого столбца нет в одном из файлов
+        """
+        left_headers, left_rows = self.csv_reader.iter_file(left_file)
+        right_headers, right_rows = self.csv_reader.iter_file(condition.filename)
+        if condition.key not in left_headers or condition.key not in right_headers:
+            left_rows.close()
+            right_rows.close()
+            raise KeyError(condition.key)
+
+        renames = {
+            column: f"{column}_right" if column in left_headers else column
+            for column in right_headers
+            if column != condition.key
+        }
+        headers = list(left_headers) + list(renames.values())
+        right_empty = {name: None for name in renames.values()}
+
+        def combine(left: Row, right: Optional[Row]) -> Row:
+            row = dict(left)
+            if right is None:
+                row.update(right_empty)
+            else:
+                for column, name in renames.items():
+                    row[name] = right.get(column)
+            return row
+
+        # Хеш-таблица строится по меньшему файлу
+        left_size, right_size = os.path.getsize(left_file), os.path.getsize(condition.filename)
+        build_is_left = left_size < right_size
+        if build_is_left:
+            build, probe = (left_headers, left_rows), (right_headers, right_rows)
+        else:
+            build, probe = (right_headers, right_rows), (left_headers, left_rows)
+
+        build_size = min(left_size, right_size)
+        rows = self._execute(build, probe, build_size, condition, build_is_left, combine)
+        return headers, rows
+
+    def _execute(self, build, probe, build_size: int, condition: JoinCondition,
+                 build_is_left: bool, combine) -> Iterator[Row]:
+        """
+        Строит хеш-таблицу в памяти или переключается на grace hash join.
+        """
+        _, build_rows = build
+        _, probe_rows = probe
+        key = condition.key
+
+        governor = governor_or_budget(self.governor, self.memory_budget)
+        with governor.reserve("join") as reservation:
+            table: Dict[str, List[Row]] = {}
+            raw = 0
+            for row in build_rows:
+                table.setdefault(row[key], []).append(row)
+                size = estimate_row_size(row)
+                raw += sum(len(value or "") + 1 for value in row.values())
+                if not reservation.try_grow(size):
+                    # Оценка памяти под всю сторону построения по доле уже прочитанного
+                    estimated = (reservation.used + size) * build_size / max(raw, 1)
+                    partitions = max(2, min(1024, math.ceil(2 * estimated / governor.limit)))
+                    reservation.release()
+                    yield from self._grace_join(
+                        table, build_rows, partitions, build, probe, condition, build_is_left, combine, reservation,
+                    )
+                    return
+            yield from self._probe(table, probe_rows, key, condition.join_type, build_is_left, combine)
+
+    def _probe(self, table: Dict[str, List[Row]], probe_rows: Iterable[Row], key: str,
+               join_type: JoinType, build_is_left: bool, combine) -> Iterator[Row]:
+        """
+        Потоково пробует хеш-таблицу строками другой стороны.
+        """
+        keep_unmatched = join_type == JoinType.LEFT
+        matched_keys = set()
+        for probe_row in probe_rows:
+            matches = table.get(probe_row[key])
+            if matches:
+                if build_is_left:
+                    matched_keys.add(probe_row[key])
+                    for build_row in matches:
+                        yield combine(build_row, probe_row)
+                else:
+                    for build_row in matches:
+                        yield combine(probe_row, build_row)
+            elif keep_unmatched and not build_is_left:
+                yield combine(probe_row, None)
+
+        # Левые строки без пары, когда таблица построена по левому файлу
+        if keep_unmatched and build_is_left:
+            for value, build_rows in table.items():
+                if value not in matched_keys:
+                    for build_row in build_rows:
+                        yield combine(build_row, None)
+
+    def _grace_join(self, table: Dict[str, List[Row]], build_rest: Iterator[Row], partitions: int,
+                    build, probe, condition: JoinCondition, build_is_left: bool, combine,
+                    reservation: Reservation) -> Iterator[Row]:
+        """
+        Grace hash join: разбиение обеих сторон по хешу ключа на партиции на диске.
+        """
+        build_headers, _ = build
+        probe_headers, probe_rows = probe
+        key = condition.key
+        self.spilled_partitions = partitions
+
+        with tempfile.TemporaryDirectory(prefix="csv-join-") as directory:
+            build_files = self._spill(
+                [(row for rows in table.values() for row in rows), build_rest],
+                build_headers, key, partitions, directory, "build",
+            )
+            table.clear()
+            probe_files = self._spill([probe_rows], probe_headers, key, partitions, directory, "probe")
+            for index in range(partitions):
+                partition_table: Dict[str, List[Row]] = {}
+                for values in build_files.read(index):
+                    row = dict(zip(build_headers, values))
+                    partition_table.setdefault(row[key], []).append(row)
+                    reservation.add(estimate_row_size(row))
+                probe_partition = (dict(zip(probe_headers, values)) for values in probe_files.read(index))
+                yield from self._probe(
+                    partition_table, probe_partition, key, condition.join_type, build_is_left, combine,
+                )
+                reservation.release()
+
+    def _spill(self, sources: List[Iterable[Row]], headers: List[str], key: str,
+               partitions: int, directory: str, prefix: str) -> PartitionFiles:
+        """
+        Записывает значения строк в партиции по хешу ключа.
+        """
+        files = PartitionFiles(directory, partitions, prefix)
+        for source in sources:
+            for row in source:
+                files.write(hash(row[key]) % partitions, tuple(row.get(h) for h in headers))
+        files.flush()
+        return files
@@ -0,0 +1,116 @@
+"""
+Компактное множество ключей для полусоединения (--where-in-file).
+
+Ключи файла хранятся не строками, а 64-битными хешами в отсортированном
+массиве array('Q'): 8 байт на ключ вместо ~70–100 байт на строку в set.
+Проверка значения — двоичный поиск (bisect) в диапазоне массива, который
+выбирается по старшим битам хеша из каталога смещений, поэтому на каждое
+значение приходится несколько сравнений.
+
+Хеш — встроенный hash() строки: он кешируется в самой строке и не требует
+кодирования, но зависит от процесса (PYTHONHASHSEED), поэтому множество
+строится в том процессе, который по нему фильтрует, и не сериализуется.
+Совпадение хешей разных строк дает ложное срабатывание с вероятностью
+порядка n / 2**64 на проверку — для десятков миллионов ключей около 1e-12.
+"""
+
+import heapq
+import os
+from array import array
+from bisect import bisect_left
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .csv_reader import CSVReader
+from .records import record_type
+
+HASH_MASK = (1 << 64) - 1
+# Ключей в одном отсортированном куске при построении (пик памяти — кусок списком)
+BUILD_CHUNK_SIZE = 1 << 20
+# Максимум бит каталога смещений (2**16 + 1 смещений — 512 КиБ)
+MAX_DIRECTORY_BITS = 16
+
+# Последнее загруженное множество процесса: (путь, mtime, размер) -> KeySet
+_loaded: Dict[Tuple[str, int, int], "KeySet"] = {}
+
+
+class KeySet:
+    """
+    Множество строковых ключей в виде отсортированного массива 64-битных хешей.
+    """
+
+    def __init__(self, hashes: array):
+        """
+        hashes — отсортированный по возрастанию array('Q') хешей (см. key_hash)
+        """
+        self.hashes = hashes
+        size = len(hashes)
+        self.bits = min(MAX_DIRECTORY_BITS, size.bit_length())
+        self.shift = 64 - self.bits
+        # starts[b] — первая позиция хеша со старшими битами b
+        self.starts = array("q", (bisect_left(hashes, bucket << self.shift) for bucket in range(1 << self.bits)))
+        self.starts.append(size)
+
+    @classmethod
+    def from_values(cls, values: Iterable[Optional[str]], chunk_size: int = BUILD_CHUNK_SIZE) -> "KeySet":
+        """
+        Множество непустых значений; значения сортируются кусками по chunk_size,
+        куски сливаются (heapq.merge), так что в памяти одновременно хранится
+        не больше одного куска в виде списка.
+        """
+        values = iter(values)
+        chunks: List[array] = []
+        while True:
+            chunk = sorted(key_hash(value) for value in islice(values, chunk_size) if value)
+            if not chunk:
+                break
+            chunks.append(array("Q", chunk))
+        if len(chunks) == 1:
+            return cls(chunks[0])
+        return cls(array("Q", heapq.merge(*chunks)))
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    @property
+    def nbytes(self) -> int:
+        """Память массивов множества в байтах."""
+        return (len(self.hashes) + len(self.starts)) * 8
+
+    def __contains__(self, value: Optional[str]) -> bool:
+        if not value:
+            return False
+        hashed = hash(value) & HASH_MASK
+        bucket = hashed >> self.shift
+        high = self.starts[bucket + 1]
+        position = bisect_left(self.hashes, hashed, self.starts[bucket], high)
+        return position < high and self.hashes[position] == hashed
+
+
+def key_hash(value: str) -> int:
+    """
+    64-битный хеш ключа (действителен только в текущем процессе).
+    """
+    return hash(value) & HASH_MASK
+
+
+def load_key_set(filepath: str, csv_reader: Optional[CSVReader] = None) -> KeySet:
+    """
+    Множество ключей первого столбца CSV-файла (первая строка — заголовок).
+    Файл читается один раз на процесс, пока не изменится.
+
+    Raises:
+        FileNotFoundError: если файл не найден
+        ValueError: если файл пуст или не содержит заголовков
+    """
+    if not os.path.isfile(filepath):
+        raise FileNotFoundError("Файл не найден")
+    stat = os.stat(filepath)
+    signature = (os.path.abspath(filepath), stat.st_mtime_ns, stat.st_size)
+    key_set = _loaded.get(signature)
+    if key_set is None:
+        headers, rows = (csv_reader or CSVReader()).iter_file(filepath)
+        key_set = KeySet.from_values(map(record_type(headers).getter(headers[0]), rows))
+        _loaded.clear()
+        _loaded[signature] = key_set
+    return key_set
@@ -0,0 +1,122 @@
+"""
+Общий бюджет памяти запроса (--memory-limit).
+
+Операторы (хеш-таблицы соединения и DISTINCT, буферы сортировки, буфер
+вывода, группы агрегации, секции оконных функций) резервируют память
+у одного MemoryGovernor. Когда очередное резервирование не помещается
+в лимит, оператор получает отказ и освобождает память сам: сбрасывает
+данные на диск или выводит накопленное; операторы без сброса на диск
+(группы агрегации и состояния count_distinct, секции оконных функций)
+завершают запрос ошибкой. Учет приблизительный — по оценке размера
+строк, — поэтому лимит стоит задавать с запасом относительно реально
+доступной памяти.
+"""
+
+from typing import Dict, Optional
+
+DEFAULT_MEMORY_LIMIT = 256 * 1024 * 1024
+
+
+class MemoryGovernor:
+    """
+    Учет зарезервированной операторами памяти относительно общего лимита.
+    """
+
+    def __init__(self, limit: int = DEFAULT_MEMORY_LIMIT):
+        if limit <= 0:
+            raise ValueError("Лимит памяти должен быть положительным")
+        self.limit = limit
+        self.used = 0
+        self.peak = 0
+        # Пиковое резервирование каждого оператора
+        self.operator_peaks: Dict[str, int] = {}
+
+    @property
+    def available(self) -> int:
+        """
+        Память, которую еще можно зарезервировать.
+        """
+        return max(0, self.limit - self.used)
+
+    def reserve(self, operator: str) -> "Reservation":
+        """
+        Новое (пока пустое) резервирование оператора.
+        """
+        self.operator_peaks.setdefault(operator, 0)
+        return Reservation(self, operator)
+
+    def _account(self, reservation: "Reservation", nbytes: int) -> None:
+        self.used += nbytes
+        reservation.used += nbytes
+        self.peak = max(self.peak, self.used)
+        operator = reservation.operator
+        self.operator_peaks[operator] = max(self.operator_peaks[operator], reservation.used)
+
+
+class Reservation:
+    """
+    Память, удерживаемая одним оператором.
+    """
+
+    def __init__(self, governor: MemoryGovernor, operator: str):
+        self.governor = governor
+        self.operator = operator
+        self.used = 0
+
+    def try_grow(self, nbytes: int) -> bool:
+        """
+        Резервирует nbytes, если они помещаются в лимит; иначе возвращает False,
+        и оператор должен освободить память (сбросить данные на диск или вывести их).
+        """
+        if self.governor.used + nbytes > self.governor.limit:
+            return False
+        self.governor._account(self, nbytes)
+        return True
+
+    def grow(self, nbytes: int, operator_name: str) -> None:
+        """
+        Резервирует nbytes для оператора, который не умеет сбрасывать данные
+        на диск (группы агрегации, секции оконных функций).
+
+        Raises:
+            ValueError: если память не помещается в лимит
+        """
+        if not self.try_grow(nbytes):
+            raise ValueError(f"{operator_name}: превышен лимит памяти {format_size(self.governor.limit)}")
+
+    def add(self, nbytes: int) -> None:
+        """
+        Учитывает память, без которой оператор не может продолжить (даже сверх лимита).
+        """
+        self.governor._account(self, nbytes)
+
+    def release(self) -> None:
+        """
+        Освобождает всю память оператора.
+        """
+        self.governor.used -= self.used
+        self.used = 0
+
+    def __enter__(self) -> "Reservation":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+def format_size(nbytes: float) -> str:
+    """
+    Размер в байтах в виде '512K', '1.5M', '2G'.
+    """
+    for unit in ("", "K", "M", "G"):
+        if nbytes < 1024:
+            return f"{nbytes:.3g}{unit}"
+        nbytes /= 1024
+    return f"{nbytes:.3g}T"
+
+
+def governor_or_budget(governor: Optional[MemoryGovernor], memory_budget: int) -> MemoryGovernor:
+    """
+    Общий бюджет запроса или собственный бюджет оператора, если общего нет.
+    """
+    return governor if governor is not None else MemoryGovernor(memory_budget)
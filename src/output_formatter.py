@@ -1,35 +1,73 @@
 """
 Модуль форматирования и вывода таблиц для CSV-обработчика.
 """
-from typing import List, Dict, Union
-from tabulate import tabulate
+from typing import List, Dict, Optional, TextIO, Tuple, Union
+from .records import column_getter
 
 class OutputFormatter:
     """
     Класс для форматирования и вывода таблиц и результатов агрегации.
     """
+    def __init__(self, stream: Optional[TextIO] = None):
+        """
+        stream — поток вывода (по умолчанию sys.stdout на момент вывода)
+        """
+        self.stream = stream
+
     def display_table(self, data: List[Dict[str, str]], headers: List[str]) -> None:
         """
         Выводит таблицу данных в консоль с помощью tabulate.
         """
         if not data:
-            print("Нет данных для отображения.")
+            print("Нет данных для отображения.", file=self.stream)
             return
+        # tabulate импортируется только при выводе таблицы: агрегации он не нужен
+        from tabulate import tabulate
+
         table_data = self._prepare_table_data(data, headers)
-        print(tabulate(table_data, headers=headers, tablefmt="grid", showindex=False))
+        print(tabulate(table_data, headers=headers, tablefmt="grid", showindex=False), file=self.stream)
 
-    def display_aggregate_result(self, column: str, function: str, result: float) -> None:
+    def display_aggregate_result(self, column: str, function: str, result: float,
+                                 interval: Optional[Tuple[float, float, float]] = None) -> None:
         """
-        Выводит результат агрегации в консоль.
+        Выводит результат агрегации в консоль (с доверительным интервалом, если он есть).
         """
         formatted = self._format_number(result)
-        print(f"{function.upper()} по столбцу '{column}': {formatted}")
+        if interval is not None:
+            low, high, level = interval
+            formatted += (
+                f" ({level:.0%} доверительный интервал: "
+                f"{self._format_number(float(low))} – {self._format_number(float(high))})"
+            )
+        print(f"{function.upper()} по столбцу '{column}': {formatted}", file=self.stream)
+
+    def display_row_count(self, count: int) -> None:
+        """
+        Выводит число строк данных файла (--count).
+        """
+        print(f"Количество строк: {count}", file=self.stream)
+
+    def display_memory_report(self, peak: int, limit: int, operator_peaks: Dict[str, int]) -> None:
+        """
+        Выводит пиковое использование памяти по оценке бюджета (--memory-limit).
+        """
+        from .memory import format_size
+
+        line = f"Пиковое использование памяти (оценка): {format_size(peak)} из {format_size(limit)}"
+        details = ", ".join(
+            f"{operator} {format_size(used)}" for operator, used in operator_peaks.items() if used
+        )
+        if details:
+            line += f" ({details})"
+        print(line, file=self.stream)
 
     def _prepare_table_data(self, data: List[Dict[str, str]], headers: List[str]) -> List[List[str]]:
         """
         Подготовка данных для tabulate
         """
-        return [[row.get(h, "") for h in headers] for row in data]
+        # Пустые значения (None) tabulate выводит как пустые ячейки
+        getters = [column_getter(data, h) for h in headers]
+        return [[get(row) for get in getters] for row in data]
 
     def _format_number(self, value: Union[float, int]) -> str:
         """
@@ -0,0 +1,304 @@
+"""
+Секционированные наборы данных в стиле Hive.
+
+Подкоманда partition переписывает CSV-файл в дерево каталогов по
+значениям одного или нескольких столбцов:
+
+    phones_parts/brand=xiaomi/part-0000.csv
+    phones_parts/brand=apple/part-0000.csv
+
+Файлы секций — обычные CSV с полным набором столбцов (столбцы секций
+сохраняются и в самих строках). Спецсимволы в значениях кодируются
+как %XX, пустое значение — __HIVE_DEFAULT_PARTITION__.
+
+Каталог принимается как входной файл: CSVReader читает все секции подряд,
+а фильтр по столбцу секции открывает только подходящие секции (partition
+pruning). Фильтрация и агрегация выполняются по секциям параллельно
+в отдельных процессах.
+"""
+
+import argparse
+import csv
+import os
+from collections import OrderedDict
+from itertools import chain
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, TextIO, Tuple
+from urllib.parse import quote, unquote
+
+from .csv_reader import CSVReader
+from .filter_engine import build_value_test
+from .records import key_getter
+
+Row = Dict[str, str]
+
+DEFAULT_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+PART_FILE_TEMPLATE = "part-{:04d}.csv"
+DEFAULT_MAX_OPEN_FILES = 64
+
+
+class Partition(NamedTuple):
+    """Секция: значения столбцов секционирования и ее файлы."""
+
+    values: Dict[str, str]
+    files: List[str]
+
+
+def escape_partition_value(value: Optional[str]) -> str:
+    """
+    Значение столбца в имени каталога секции.
+    """
+    if not value:
+        return DEFAULT_PARTITION
+    return quote(value, safe=" -_.,+@")
+
+
+def unescape_partition_value(name: str) -> str:
+    """
+    Значение столбца по имени каталога секции.
+    """
+    return "" if name == DEFAULT_PARTITION else unquote(name)
+
+
+def is_partitioned(path: str) -> bool:
+    """
+    Путь указывает на секционированный набор данных (каталог).
+    """
+    return os.path.isdir(path)
+
+
+class PartitionWriter:
+    """
+    Запись строк в файлы секций с ограничением числа открытых файлов.
+    """
+
+    def __init__(self, output_dir: str, columns: Sequence[str], rows_per_file: Optional[int] = None,
+                 max_open_files: int = DEFAULT_MAX_OPEN_FILES):
+        self.output_dir = output_dir
+        self.columns = tuple(columns)
+        self.rows_per_file = rows_per_file
+        self.max_open_files = max_open_files
+        # Открытые файлы: путь -> (файл, writer), в порядке последнего использования
+        self._open: "OrderedDict[str, Tuple[TextIO, Any]]" = OrderedDict()
+        # Число строк секции и номер ее текущего файла
+        self._counts: Dict[Tuple[Optional[str], ...], int] = {}
+
+    def write(self, headers: List[str], rows: Iterable[Row]) -> Dict[Tuple[Optional[str], ...], int]:
+        """
+        Записывает строки в секции.
+
+        Returns:
+            Dict: число строк каждой секции (ключ — значения столбцов секционирования)
+
+        Raises:
+            KeyError: если столбца секционирования нет в данных
+            ValueError: если каталог результата не пуст
+        """
+        for column in self.columns:
+            if column not in headers:
+                raise KeyError(column)
+        if os.path.isdir(self.output_dir) and os.listdir(self.output_dir):
+            raise ValueError(f"Каталог '{self.output_dir}' не пуст")
+        os.makedirs(self.output_dir, exist_ok=True)
+        rows = iter(rows)
+        first = next(rows, None)
+        if first is None:
+            return {}
+        key_of = key_getter(first, self.columns)
+        try:
+            for row in chain((first,), rows):
+                key = key_of(row)
+                count = self._counts.get(key, 0)
+                self._counts[key] = count + 1
+                number = count // self.rows_per_file if self.rows_per_file else 0
+                self._writer(key, number, headers).writerow([row.get(column) for column in headers])
+        finally:
+            for f, _ in self._open.values():
+                f.close()
+            self._open.clear()
+        return dict(self._counts)
+
+    def _writer(self, key: Tuple[Optional[str], ...], number: int, headers: List[str]):
+        directory = os.path.join(self.output_dir, *(
+            f"{column}={escape_partition_value(value)}" for column, value in zip(self.columns, key)
+        ))
+        path = os.path.join(directory, PART_FILE_TEMPLATE.format(number))
+        entry = self._open.get(path)
+        if entry is not None:
+            self._open.move_to_end(path)
+            return entry[1]
+        if len(self._open) >= self.max_open_files:
+            _, (oldest, _) = self._open.popitem(last=False)
+            oldest.close()
+        exists = os.path.exists(path)
+        os.makedirs(directory, exist_ok=True)
+        f = open(path, "a", encoding="utf-8", newline="")
+        writer = csv.writer(f)
+        if not exists:
+            writer.writerow(headers)
+        self._open[path] = (f, writer)
+        return writer
+
+
+class PartitionedDataset:
+    """
+    Секционированный набор данных: обнаружение секций, отсечение и чтение.
+    """
+
+    def __init__(self, directory: str, csv_reader: Optional[CSVReader] = None):
+        """
+        Raises:
+            FileNotFoundError: если каталог не найден
+            ValueError: если в каталоге нет файлов секций
+        """
+        if not os.path.isdir(directory):
+            raise FileNotFoundError("Файл не найден")
+        self.directory = directory
+        self.csv_reader = csv_reader or CSVReader()
+        self.partitions = self._discover()
+        if not self.partitions:
+            raise ValueError(f"В каталоге '{directory}' нет файлов секций")
+        self.columns = list(self.partitions[0].values)
+        for partition in self.partitions:
+            if list(partition.values) != self.columns:
+                raise ValueError(f"Секции каталога '{directory}' разбиты по разным столбцам")
+
+    def _discover(self) -> List[Partition]:
+        partitions = []
+        for root, directories, files in os.walk(self.directory):
+            directories.sort()
+            data_files = sorted(name for name in files if name.endswith(".csv") and not name.startswith("."))
+            if not data_files:
+                continue
+            relative = os.path.relpath(root, self.directory)
+            values = {}
+            if relative != os.curdir:
+                for part in relative.split(os.sep):
+                    column, separator, name = part.partition("=")
+                    if not separator:
+                        raise ValueError(f"Некорректный каталог секции: '{part}'. Ожидается 'столбец=значение'")
+                    values[column] = unescape_partition_value(name)
+            partitions.append(Partition(values, [os.path.join(root, name) for name in data_files]))
+        return partitions
+
+    @property
+    def files(self) -> List[str]:
+        return [path for partition in self.partitions for path in partition.files]
+
+    @property
+    def headers(self) -> List[str]:
+        """
+        Заголовки набора данных (по первому файлу секций).
+        """
+        headers, rows = self.csv_reader.iter_file(self.files[0])
+        next(rows, None)
+        rows.close()
+        return list(headers)
+
+    def prune(self, column: str, test: Callable[[Optional[str]], bool]) -> List[Partition]:
+        """
+        Секции, которые могут содержать строки с test(column) — истинным.
+        Если column не столбец секционирования, подходят все секции.
+        """
+        if column not in self.columns:
+            return list(self.partitions)
+        return [partition for partition in self.partitions if test(partition.values[column])]
+
+    def iter_rows(self, partitions: Optional[List[Partition]] = None) -> Tuple[List[str], Iterator[Row]]:
+        """
+        Заголовки и ленивый итератор строк секций (по умолчанию всех).
+        """
+        if partitions is None:
+            partitions = self.partitions
+        files = [path for partition in partitions for path in partition.files]
+        if not files:
+            return self.headers, iter(())
+        headers, first_rows = self.csv_reader.iter_file(files[0])
+
+        def rows() -> Iterator[Row]:
+            yield from first_rows
+            for path in files[1:]:
+                file_headers, file_rows = self.csv_reader.iter_file(path)
+                if list(file_headers) != list(headers):
+                    file_rows.close()
+                    raise ValueError(f"Заголовки секции '{path}' отличаются от заголовков набора данных")
+                yield from file_rows
+
+        return headers, rows()
+
+
+def map_partitions(function: Callable, tasks: List[Tuple], workers: Optional[int] = None) -> List[Any]:
+    """
+    Выполняет function(*task) для каждой секции: параллельно в процессах,
+    если задач и процессов больше одного. Порядок результатов — порядок задач.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers <= 1:
+        return [function(*task) for task in tasks]
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(function, *zip(*tasks)))
+
+
+def filter_partition(files: List[str], filter_spec: Optional[Tuple[str, str, str]]) -> List[Row]:
+    """
+    Строки файлов секции, подходящие под условие (столбец, оператор, значение).
+    Условие передается полями, так как скомпилированный предикат не сериализуется.
+    """
+    reader = CSVReader()
+    result: List[Row] = []
+    test = build_value_test(filter_spec[1], filter_spec[2]) if filter_spec else None
+    for path in files:
+        _, rows = reader.iter_file(path)
+        if test is None:
+            result.extend(rows)
+            continue
+        column = filter_spec[0]
+        result.extend(row for row in rows if test(row.get(column)))
+    return result
+
+
+def aggregate_partition(files: List[str], group_columns: Sequence[str], column: str, function: str,
+                        argument: Optional[float], relative_error: float,
+                        bucket: Optional[Any] = None) -> List[Tuple[Tuple, Dict[str, Any]]]:
+    """
+    Состояния аккумуляторов по группам для файлов секции: [(ключ группы, to_state())].
+    """
+    from .aggregator import Aggregator
+    from .argument_parser import AggregateCondition
+
+    reader = CSVReader()
+    rows = chain.from_iterable(reader.iter_file(path)[1] for path in files)
+    condition = AggregateCondition(column=column, function=function, argument=argument)
+    groups = Aggregator(relative_error).aggregate_groups(rows, group_columns, condition, bucket)
+    return [(key, accumulator.to_state()) for key, accumulator in groups.items()]
+
+
+def run_partition_command(argv: List[str]) -> int:
+    """
+    Точка входа подкоманды partition.
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py partition", description="Секционирование CSV-файла по значениям столбцов (в стиле Hive)",
+    )
+    parser.add_argument("filename", help="Исходный CSV файл")
+    parser.add_argument("--by", required=True, metavar="COLUMNS", help="Столбцы секционирования через запятую")
+    parser.add_argument("--output", required=True, metavar="DIR", help="Каталог набора данных (должен быть пуст)")
+    parser.add_argument("--rows-per-file", type=int, metavar="N",
+                        help="Максимум строк в одном файле секции (по умолчанию без ограничения)")
+    parser.add_argument("--max-open-files", type=int, default=DEFAULT_MAX_OPEN_FILES,
+                        help="Максимум одновременно открытых файлов секций (по умолчанию 64)")
+    parsed = parser.parse_args(argv)
+
+    from .argument_parser import parse_group_by_columns
+
+    columns = parse_group_by_columns(parsed.by, "--by")
+    if parsed.rows_per_file is not None and parsed.rows_per_file <= 0:
+        raise ValueError("Число строк в файле секции должно быть положительным")
+    if parsed.max_open_files <= 0:
+        raise ValueError("Число открытых файлов должно быть положительным")
+    headers, rows = CSVReader().iter_file(parsed.filename)
+    writer = PartitionWriter(parsed.output, columns, parsed.rows_per_file, parsed.max_open_files)
+    counts = writer.write(headers, rows)
+    print(f"Записано строк: {sum(counts.values())}, секций: {len(counts)} в '{parsed.output}'")
+    return 0
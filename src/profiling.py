@@ -0,0 +1,351 @@
+"""
+Профиль столбцов за один проход (--describe).
+
+Для каждого столбца считаются тип (integer, float, timestamp, string), число пустых значений, минимум,
+максимум, среднее, стандартное отклонение, оценка числа уникальных
+значений и самые частые значения. Строки обрабатываются пакетами: значения
+пакета извлекаются по столбцу целиком, а статистики обновляются
+встроенными функциями над всем пакетом (min/max, math.fsum, Counter),
+а не по одному значению.
+
+Состояние профиля сливается (merge) и сериализуется (to_state/from_state),
+как у аккумуляторов агрегации, поэтому секции каталога профилируются
+параллельно в отдельных процессах.
+"""
+
+import math
+import re
+from collections import Counter
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .accumulators import DEFAULT_RELATIVE_ERROR
+from .records import column_getter
+from .timestamps import format_timestamp, parse_timestamp
+
+Row = Dict[str, str]
+
+# Строк в одном пакете профилирования
+PROFILE_CHUNK_ROWS = 10000
+# Число счетчиков частых значений на столбец (алгоритм Мисры — Гриса)
+TOP_CAPACITY = 1000
+# Частых значений в сводной таблице
+TOP_VALUES = 3
+PROFILE_HEADERS = ["column", "type", "count", "nulls", "min", "max", "mean", "stddev", "distinct", "top"]
+INTEGER_PATTERN = re.compile(r"[+-]?\d+")
+
+
+class ColumnProfile:
+    """
+    Сливаемое состояние профиля одного столбца.
+
+    Пустое значение (None или '') считается отсутствующим, как в фильтре 'is null'.
+    Столбец числовой, пока все его непустые значения разбираются как числа;
+    после первого нечислового значения числовые статистики больше не считаются.
+    Так же столбец остается столбцом дат, пока все значения разбираются как
+    метки времени (минимум и максимум — по меткам, а не по строкам).
+    """
+
+    def __init__(self, relative_error: float = DEFAULT_RELATIVE_ERROR):
+        # Скетчи импортируются при первом использовании, чтобы не замедлять запуск CLI
+        from .sketches import HyperLogLog
+
+        self.relative_error = relative_error
+        self.count = 0
+        self.nulls = 0
+        self.numeric = True
+        self.integer = True
+        self.text_min: Optional[str] = None
+        self.text_max: Optional[str] = None
+        self.number_min: Optional[float] = None
+        self.number_max: Optional[float] = None
+        self.temporal = True
+        self.time_min: Optional[int] = None
+        self.time_max: Optional[int] = None
+        # Среднее и сумма квадратов отклонений (слияние по формуле Чана)
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.sketch = HyperLogLog.from_error(relative_error)
+        # Счетчики частых значений; пока они ни разу не усекались, подсчет точный,
+        # а скетч не заполняется: все уникальные значения есть в счетчиках
+        self.top: Counter = Counter()
+        self.exact = True
+
+    @property
+    def present(self) -> int:
+        """Число непустых значений."""
+        return self.count - self.nulls
+
+    def update_batch(self, values: Sequence[Optional[str]]) -> None:
+        """
+        Добавляет значения столбца одного пакета строк.
+        """
+        self.count += len(values)
+        present = [value for value in values if value]
+        self.nulls += len(values) - len(present)
+        if not present:
+            return
+        low, high = min(present), max(present)
+        if self.text_min is None or low < self.text_min:
+            self.text_min = low
+        if self.text_max is None or high > self.text_max:
+            self.text_max = high
+        if self.numeric:
+            self._update_numbers(present)
+        if self.temporal:
+            self._update_timestamps(present)
+        counts = Counter(present)
+        if not self.exact:
+            self.sketch.update_many(counts)
+        self._merge_top(counts)
+
+    def _update_numbers(self, present: List[str]) -> None:
+        try:
+            numbers = list(map(float, present))
+        except ValueError:
+            self.numeric = self.integer = False
+            return
+        if self.integer:
+            self.integer = all(map(INTEGER_PATTERN.fullmatch, present))
+        count = len(numbers)
+        mean = math.fsum(numbers) / count
+        m2 = math.fsum((number - mean) ** 2 for number in numbers)
+        self._merge_moments(self.present - count, count, mean, m2)
+        low, high = min(numbers), max(numbers)
+        if self.number_min is None or low < self.number_min:
+            self.number_min = low
+        if self.number_max is None or high > self.number_max:
+            self.number_max = high
+
+    def _update_timestamps(self, present: List[str]) -> None:
+        # Первое значение отсеивает столбцы не-дат без разбора всего пакета
+        if parse_timestamp(present[0]) is None:
+            self.temporal = False
+            return
+        timestamps = list(map(parse_timestamp, present))
+        if None in timestamps:
+            self.temporal = False
+            return
+        low, high = min(timestamps), max(timestamps)
+        if self.time_min is None or low < self.time_min:
+            self.time_min = low
+        if self.time_max is None or high > self.time_max:
+            self.time_max = high
+
+    def _merge_moments(self, count: int, other_count: int, other_mean: float, other_m2: float) -> None:
+        total = count + other_count
+        delta = other_mean - self.mean
+        self.mean += delta * other_count / total
+        self.m2 += other_m2 + delta * delta * count * other_count / total
+
+    def _merge_top(self, counts: Counter) -> None:
+        self.top.update(counts)
+        if len(self.top) > TOP_CAPACITY:
+            self._leave_exact()
+            # Усечение Мисры — Гриса: счетчики уменьшаются на (capacity+1)-й по величине
+            threshold = sorted(self.top.values(), reverse=True)[TOP_CAPACITY]
+            self.top = Counter({value: count - threshold for value, count in self.top.items() if count > threshold})
+
+    def _leave_exact(self) -> None:
+        # Перед первым усечением все уникальные значения переносятся в скетч
+        if self.exact:
+            self.sketch.update_many(self.top)
+            self.exact = False
+
+    def merge(self, other: "ColumnProfile") -> None:
+        """
+        Сливает профиль того же столбца другой части данных.
+        """
+        present = self.present
+        self.count += other.count
+        self.nulls += other.nulls
+        for value in (other.text_min, other.text_max):
+            if value is not None:
+                self.text_min = value if self.text_min is None else min(self.text_min, value)
+                self.text_max = value if self.text_max is None else max(self.text_max, value)
+        self.numeric = self.numeric and other.numeric
+        self.integer = self.integer and other.integer
+        self.temporal = self.temporal and other.temporal
+        if self.temporal and other.present:
+            self.time_min = other.time_min if self.time_min is None else min(self.time_min, other.time_min)
+            self.time_max = other.time_max if self.time_max is None else max(self.time_max, other.time_max)
+        if self.numeric and other.present:
+            self._merge_moments(present, other.present, other.mean, other.m2)
+            self.number_min = other.number_min if self.number_min is None else min(self.number_min, other.number_min)
+            self.number_max = other.number_max if self.number_max is None else max(self.number_max, other.number_max)
+        if not other.exact:
+            self._leave_exact()
+            self.sketch.merge(other.sketch)
+        elif not self.exact:
+            self.sketch.update_many(other.top)
+        self._merge_top(other.top)
+
+    @property
+    def type_name(self) -> str:
+        """
+        Тип столбца: integer, float, timestamp, string или empty (нет ни одного значения).
+        """
+        if not self.present:
+            return "empty"
+        if self.integer:
+            return "integer"
+        if self.numeric:
+            return "float"
+        return "timestamp" if self.temporal else "string"
+
+    def distinct(self) -> int:
+        """
+        Число уникальных значений: точное, пока счетчики частых значений не усекались,
+        иначе — оценка HyperLogLog (не больше числа непустых значений).
+        """
+        if self.exact:
+            return len(self.top)
+        return min(round(self.sketch.estimate()), self.present)
+
+    def summary(self, column: str) -> Row:
+        """
+        Строка сводной таблицы профиля.
+        """
+        type_name = self.type_name
+        row: Dict[str, Any] = {
+            "column": column, "type": type_name, "count": self.present, "nulls": self.nulls,
+            "min": None, "max": None, "mean": None, "stddev": None, "distinct": self.distinct(), "top": None,
+        }
+        if type_name in ("integer", "float"):
+            convert = int if type_name == "integer" else float
+            row["min"], row["max"] = convert(self.number_min), convert(self.number_max)
+            row["mean"] = self.mean
+            row["stddev"] = math.sqrt(self.m2 / (self.present - 1)) if self.present > 1 else 0.0
+        elif type_name == "timestamp":
+            row["min"], row["max"] = format_timestamp(self.time_min), format_timestamp(self.time_max)
+        elif type_name == "string":
+            row["min"], row["max"] = self.text_min, self.text_max
+        if self.top:
+            # После усечения счетчики — нижние оценки частоты
+            template = "{} ({})" if self.exact else "{} (≥{})"
+            row["top"] = ", ".join(template.format(value, count) for value, count in self.top.most_common(TOP_VALUES))
+        return row
+
+    def to_state(self) -> Dict[str, Any]:
+        """
+        Сериализация состояния в JSON-совместимый словарь.
+        """
+        return {
+            "relative_error": self.relative_error,
+            "count": self.count,
+            "nulls": self.nulls,
+            "numeric": self.numeric,
+            "integer": self.integer,
+            "text": [self.text_min, self.text_max],
+            "numbers": [self.number_min, self.number_max],
+            "temporal": self.temporal,
+            "times": [self.time_min, self.time_max],
+            "moments": [self.mean, self.m2],
+            "sketch": self.sketch.to_dict(),
+            "top": list(self.top.items()),
+            "exact": self.exact,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "ColumnProfile":
+        """
+        Восстановление профиля из словаря to_state().
+        """
+        from .sketches import HyperLogLog
+
+        profile = cls(state["relative_error"])
+        profile.count, profile.nulls = state["count"], state["nulls"]
+        profile.numeric, profile.integer = state["numeric"], state["integer"]
+        profile.text_min, profile.text_max = state["text"]
+        profile.number_min, profile.number_max = state["numbers"]
+        profile.temporal = state["temporal"]
+        profile.time_min, profile.time_max = state["times"]
+        profile.mean, profile.m2 = state["moments"]
+        profile.sketch = HyperLogLog.from_dict(state["sketch"])
+        profile.top = Counter(dict(state["top"]))
+        profile.exact = state["exact"]
+        return profile
+
+
+class TableProfile:
+    """
+    Профиль всех столбцов набора данных.
+    """
+
+    def __init__(self, headers: Sequence[str], relative_error: float = DEFAULT_RELATIVE_ERROR):
+        # Повторяющиеся заголовки профилируются один раз (значение — последнего столбца, как в записи)
+        self.headers = list(dict.fromkeys(headers))
+        self.relative_error = relative_error
+        self.columns = {header: ColumnProfile(relative_error) for header in self.headers}
+
+    def update(self, rows: Iterable[Row], chunk_rows: int = PROFILE_CHUNK_ROWS) -> None:
+        """
+        Добавляет строки пакетами по chunk_rows.
+        """
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, chunk_rows))
+            if not chunk:
+                return
+            self.update_batch(chunk)
+
+    def update_batch(self, chunk: List[Row]) -> None:
+        """
+        Добавляет пакет строк: значения извлекаются по столбцу целиком.
+        """
+        for header, profile in self.columns.items():
+            profile.update_batch(list(map(column_getter(chunk, header), chunk)))
+
+    def merge(self, other: "TableProfile") -> None:
+        """
+        Сливает профиль другой части данных с теми же столбцами.
+        """
+        if other.headers != self.headers:
+            raise ValueError("Нельзя объединить профили с разными столбцами")
+        for header, profile in self.columns.items():
+            profile.merge(other.columns[header])
+
+    def summary(self) -> List[Row]:
+        """
+        Сводная таблица: одна строка на столбец (заголовки PROFILE_HEADERS).
+        """
+        return [profile.summary(header) for header, profile in self.columns.items()]
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            "headers": self.headers,
+            "relative_error": self.relative_error,
+            "columns": [self.columns[header].to_state() for header in self.headers],
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "TableProfile":
+        profile = cls(state["headers"], state["relative_error"])
+        profile.columns = {
+            header: ColumnProfile.from_state(column_state)
+            for header, column_state in zip(profile.headers, state["columns"])
+        }
+        return profile
+
+
+def profile_partition(files: List[str], filter_spec: Optional[Tuple[str, str, str]],
+                      relative_error: float) -> Dict[str, Any]:
+    """
+    Состояние профиля файлов секции (TableProfile.to_state()) с необязательным
+    условием (столбец, оператор, значение).
+    """
+    from .csv_reader import CSVReader
+    from .filter_engine import build_value_test
+
+    reader = CSVReader()
+    profile = None
+    test = build_value_test(filter_spec[1], filter_spec[2]) if filter_spec else None
+    for path in files:
+        headers, rows = reader.iter_file(path)
+        if profile is None:
+            profile = TableProfile(headers, relative_error)
+        if test is not None:
+            column = filter_spec[0]
+            rows = (row for row in rows if test(row.get(column)))
+        profile.update(rows)
+    return profile.to_state()
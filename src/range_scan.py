@@ -0,0 +1,116 @@
+"""
+Диапазонная фильтрация по упорядоченному столбцу (--sorted-by).
+
+Если файл упорядочен по возрастанию столбца (в порядке value_key: числа,
+затем строки, затем пустые значения), начало подходящего диапазона
+ищется бинарным поиском по байтовым смещениям: seek в середину интервала,
+синхронизация на начало следующей строки, сравнение ключа. Затем читается
+только нужный срез файла, а для условия '<' чтение останавливается на
+первой неподходящей строке.
+
+Синхронизация ищет перевод строки и не знает, находится ли он внутри поля
+в кавычках, поэтому для файлов с многострочными полями режим не подходит.
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .argument_parser import FilterCondition, FilterOperator
+from .csv_reader import CSVReader, parse_block
+from .filter_engine import compile_condition
+from .records import record_type
+from .sorting import value_key
+
+Row = Dict[str, str]
+
+# Интервал, начиная с которого бинарный поиск сменяется последовательным чтением
+LINEAR_SCAN_BYTES = 64 * 1024
+
+
+class SortedRangeScanner:
+    """
+    Чтение строк, удовлетворяющих условию на упорядоченный столбец.
+    """
+
+    def __init__(self, csv_reader: Optional[CSVReader] = None, linear_scan_bytes: int = LINEAR_SCAN_BYTES):
+        self.csv_reader = csv_reader or CSVReader()
+        self.linear_scan_bytes = linear_scan_bytes
+        self.scan_start = 0
+
+    def scan(self, filepath: str, condition: FilterCondition) -> Tuple[List[str], Iterator[Row]]:
+        """
+        Заголовки и ленивый итератор подходящих строк в порядке файла.
+
+        Raises:
+            FileNotFoundError: если файл не найден
+            ValueError: если файл пуст или не содержит заголовков
+            KeyError: если столбца нет в файле
+        """
+        headers, rows = self.csv_reader.iter_file(filepath)
+        next(rows, None)
+        rows.close()
+        if condition.column not in headers:
+            raise KeyError(condition.column)
+        index = headers.index(condition.column)
+        target = value_key(condition.value)
+        _, test = compile_condition(condition)
+
+        if condition.operator == FilterOperator.LESS:
+            # Подходящие строки — в начале файла: поиск не нужен
+            self.scan_start = self._data_start(filepath)
+        else:
+            inclusive = condition.operator == FilterOperator.EQUAL
+            self.scan_start = self._lower_bound(filepath, index, target, inclusive)
+        return headers, self._read_slice(filepath, headers, index, target, condition.operator, test)
+
+    def _data_start(self, filepath: str) -> int:
+        with open(filepath, "rb") as f:
+            f.readline()
+            return f.tell()
+
+    def _lower_bound(self, filepath: str, index: int, target, inclusive: bool) -> int:
+        """
+        Граница строки, перед которой все строки заведомо не подходят:
+        ключ < target (inclusive) или ключ <= target.
+        """
+        with open(filepath, "rb") as f:
+            f.readline()
+            low = f.tell()
+            high = f.seek(0, 2)
+            while high - low > self.linear_scan_bytes:
+                middle = (low + high) // 2
+                start, line = self._row_after(f, middle)
+                if not line or start >= high:
+                    high = middle
+                    continue
+                values = parse_block(line)
+                key = value_key(values[0][index]) if values and len(values[0]) > index else None
+                if key is not None and (key < target or (not inclusive and key == target)):
+                    low = start + len(line)
+                else:
+                    high = start
+            return low
+
+    @staticmethod
+    def _row_after(f, offset: int) -> Tuple[int, bytes]:
+        """
+        Первая строка, начинающаяся не раньше offset: (смещение, байты строки).
+        """
+        f.seek(offset - 1)
+        f.readline()
+        start = f.tell()
+        return start, f.readline()
+
+    def _read_slice(self, filepath: str, headers: List[str], index: int, target,
+                    operator: FilterOperator, test) -> Iterator[Row]:
+        record = record_type(headers)
+        for block in self.csv_reader.iter_row_blocks(filepath, self.scan_start):
+            for values in block.rows:
+                if len(values) <= index:
+                    continue
+                key = value_key(values[index])
+                if operator == FilterOperator.LESS and key >= target:
+                    return
+                if operator == FilterOperator.EQUAL and key > target:
+                    return
+                if test(values[index]):
+                    yield record.from_values(values)
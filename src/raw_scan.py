@@ -0,0 +1,202 @@
+"""
+Быстрые операции над сырыми байтами файла: подсчет строк (--count)
+и последние строки (--tail).
+
+Подсчет читает файл большими фрагментами и считает переводы строк
+методами bytes (count, split) без декодирования и разбора полей.
+Перевод строки внутри поля в кавычках записью не завершается: состояние
+кавычек определяется по четности символов '"', как в find_row_boundary.
+Фрагменты без кавычек (обычный случай) обрабатываются одним bytes.count.
+
+Хвост файла читается блоками с конца, начиная от EOF. Границы записей
+в прочитанном хвосте однозначны, если в нем нет кавычек; иначе
+состояние кавычек в начале хвоста вычисляется по четности кавычек
+до него (один проход bytes.count по началу файла).
+"""
+
+import os
+from typing import Iterator, List, Optional, Tuple
+
+from .csv_reader import CSVReader, parse_block
+from .records import Record, record_type
+
+# Размер фрагмента при подсчете строк
+COUNT_CHUNK_SIZE = 8 * 1024 * 1024
+# Начальный размер блока, читаемого с конца файла (удваивается)
+TAIL_BLOCK_SIZE = 64 * 1024
+BLANK_LINES = (b"", b"\r")
+
+
+class RecordCounter:
+    """
+    Счетчик непустых записей CSV по последовательным байтовым фрагментам.
+    """
+
+    def __init__(self):
+        self.records = 0
+        # Позиция внутри поля в кавычках
+        self.quoted = False
+        # В текущей (незавершенной) строке уже есть данные
+        self.content = False
+
+    def feed(self, chunk: bytes) -> None:
+        """
+        Учитывает очередной фрагмент файла.
+        """
+        if b'"' not in chunk:
+            if not self.quoted:
+                self._feed_unquoted(chunk)
+            return
+        # Куски между кавычками попеременно лежат вне и внутри полей в кавычках;
+        # экранированная кавычка ("") дает пустой кусок и не меняет состояние
+        for index, piece in enumerate(chunk.split(b'"')):
+            if index:
+                self.quoted = not self.quoted
+                self.content = True
+            if not self.quoted:
+                self._feed_unquoted(piece)
+
+    def _feed_unquoted(self, data: bytes) -> None:
+        newlines = data.count(b"\n")
+        if not newlines:
+            if data not in BLANK_LINES:
+                self.content = True
+            return
+        first = data.index(b"\n")
+        blanks = 0 if self.content or data[:first] not in BLANK_LINES else 1
+        if b"\n\n" in data or b"\n\r\n" in data:
+            # Пустые строки пропускаются, как при чтении CSVReader
+            inner = data.split(b"\n")[1:-1]
+            blanks += inner.count(b"") + inner.count(b"\r")
+        self.records += newlines - blanks
+        self.content = data[data.rindex(b"\n") + 1:] not in BLANK_LINES
+
+    def finish(self) -> int:
+        """
+        Число записей с учетом последней строки без перевода строки.
+        """
+        return self.records + (1 if self.content else 0)
+
+
+def count_records(filepath: str, csv_reader: Optional[CSVReader] = None,
+                  chunk_size: int = COUNT_CHUNK_SIZE) -> int:
+    """
+    Число строк данных (без заголовка); каталог — сумма по файлам секций.
+
+    Raises:
+        FileNotFoundError: если файл не найден
+        ValueError: если файл пуст
+    """
+    csv_reader = csv_reader or CSVReader()
+    if os.path.isdir(filepath):
+        from .partitioning import PartitionedDataset
+
+        dataset = PartitionedDataset(filepath, csv_reader)
+        return sum(count_records(path, csv_reader, chunk_size) for path in dataset.files)
+    counter = RecordCounter()
+    for chunk in csv_reader.iter_chunks(filepath, chunk_size):
+        counter.feed(chunk)
+    total = counter.finish()
+    if not total:
+        raise ValueError("Файл пуст или не содержит заголовков")
+    return total - 1
+
+
+def _quote_parity(csv_reader: CSVReader, filepath: str, end: int) -> bool:
+    """
+    Нечетно ли число кавычек до смещения end (позиция внутри поля в кавычках).
+    """
+    quotes = 0
+    position = 0
+    for chunk in csv_reader.iter_chunks(filepath, COUNT_CHUNK_SIZE):
+        if position + len(chunk) >= end:
+            quotes += chunk.count(b'"', 0, end - position)
+            break
+        quotes += chunk.count(b'"')
+        position += len(chunk)
+    return bool(quotes % 2)
+
+
+def _record_starts(data: bytes, quoted: bool) -> Iterator[int]:
+    """
+    Позиции начала записей в data: за каждым переводом строки вне кавычек.
+    """
+    position = 0
+    for index, piece in enumerate(data.split(b'"')):
+        if index:
+            quoted = not quoted
+            position += 1
+        if not quoted:
+            newline = piece.find(b"\n")
+            while newline >= 0:
+                yield position + newline + 1
+                newline = piece.find(b"\n", newline + 1)
+        position += len(piece)
+
+
+def _tail_file(filepath: str, count: int, csv_reader: CSVReader) -> Tuple[List[str], List[Record]]:
+    with open(filepath, "rb") as f:
+        parsed = parse_block(f.readline())
+        if not parsed:
+            raise ValueError("Файл пуст или не содержит заголовков")
+        headers = parsed[0]
+        record = record_type(headers)
+        data_start = f.tell()
+        start = f.seek(0, 2)
+        data = b""
+        block = TAIL_BLOCK_SIZE
+        quoted: Optional[bool] = None
+        while count > 0 and start > data_start:
+            new_start = max(data_start, start - block)
+            f.seek(new_start)
+            piece = f.read(start - new_start)
+            data, start = piece + data, new_start
+            block *= 2
+            if start == data_start:
+                first = 0
+            else:
+                if quoted is None:
+                    # Хвост без кавычек целиком лежит вне полей в кавычках: поле,
+                    # открытое раньше, закрылось бы кавычкой внутри хвоста
+                    if b'"' not in data:
+                        quoted_at_start = False
+                    else:
+                        quoted = _quote_parity(csv_reader, filepath, start)
+                        quoted_at_start = quoted
+                else:
+                    # Состояние в новом начале: четность кавычек прочитанного куска
+                    quoted ^= bool(piece.count(b'"') % 2)
+                    quoted_at_start = quoted
+                first = next(_record_starts(data, quoted_at_start), None)
+                if first is None or first >= len(data):
+                    continue
+            rows = parse_block(data[first:])
+            if len(rows) >= count or start == data_start:
+                return headers, [record.from_values(values) for values in rows[-count:]]
+    return headers, []
+
+
+def tail_records(filepath: str, count: int, csv_reader: Optional[CSVReader] = None
+                 ) -> Tuple[List[str], List[Record]]:
+    """
+    Заголовки и последние count строк файла (каталога секций — по файлам с конца).
+
+    Raises:
+        FileNotFoundError: если файл не найден
+        ValueError: если файл пуст
+    """
+    csv_reader = csv_reader or CSVReader()
+    if not os.path.exists(filepath):
+        raise FileNotFoundError("Файл не найден")
+    if not os.path.isdir(filepath):
+        return _tail_file(filepath, count, csv_reader)
+    from .partitioning import PartitionedDataset
+
+    dataset = PartitionedDataset(filepath, csv_reader)
+    rows: List[Record] = []
+    for path in reversed(dataset.files):
+        if len(rows) >= count:
+            break
+        _, file_rows = _tail_file(path, count - len(rows), csv_reader)
+        rows = file_rows + rows
+    return dataset.headers, rows
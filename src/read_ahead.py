@@ -0,0 +1,129 @@
+"""
+Упреждающее чтение файла в фоновом потоке (--read-ahead).
+
+Поток читает файл большими буферами фиксированного размера в ограниченную
+очередь (depth буферов: 2 — двойная, 3 — тройная буферизация), пока
+основной поток разбирает уже прочитанные данные. Так ожидание диска
+(сетевые тома, HDD) перекрывается с разбором CSV. Чтение с диска
+освобождает GIL, поэтому поток не мешает разбору.
+
+Подсказка posix_fadvise(SEQUENTIAL) сообщает ядру о последовательном
+чтении (увеличенное упреждающее чтение на уровне ОС); на платформах без
+posix_fadvise она пропускается.
+"""
+
+import io
+import os
+import queue
+import threading
+from typing import BinaryIO, Optional, Union
+
+DEFAULT_READ_AHEAD_DEPTH = 3
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+# Период проверки флага остановки, пока очередь заполнена
+PUT_TIMEOUT = 0.1
+
+
+def advise_sequential(f: BinaryIO) -> bool:
+    """
+    Подсказка ядру о последовательном чтении файла; False, если недоступна.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return False
+    try:
+        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+    except OSError:
+        return False
+    return True
+
+
+class ReadAheadStream(io.RawIOBase):
+    """
+    Двоичный поток для чтения, буферы которого заранее читает фоновый поток.
+    """
+
+    def __init__(self, filepath: str, depth: int = DEFAULT_READ_AHEAD_DEPTH,
+                 buffer_size: int = DEFAULT_BUFFER_SIZE, offset: int = 0, fadvise: bool = False):
+        """
+        Raises:
+            FileNotFoundError: если файл не найден
+            ValueError: если глубина или размер буфера не положительны
+        """
+        super().__init__()
+        if depth <= 0 or buffer_size <= 0:
+            raise ValueError("Глубина упреждающего чтения и размер буфера должны быть положительными")
+        # Файл открывается в вызывающем потоке, чтобы ошибка открытия была синхронной
+        self._file = open(filepath, "rb")
+        if fadvise:
+            advise_sequential(self._file)
+        self._file.seek(offset)
+        self.buffer_size = buffer_size
+        self._queue: "queue.Queue[Union[bytes, BaseException]]" = queue.Queue(maxsize=depth)
+        self._stop = threading.Event()
+        self._current = memoryview(b"")
+        self._eof = False
+        self._thread = threading.Thread(target=self._produce, name="csv-read-ahead", daemon=True)
+        self._thread.start()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._eof:
+            return 0
+        if not self._current:
+            item = self._queue.get()
+            if isinstance(item, BaseException):
+                self._eof = True
+                raise item
+            if not item:
+                self._eof = True
+                return 0
+            self._current = memoryview(item)
+        size = min(len(buffer), len(self._current))
+        buffer[:size] = self._current[:size]
+        self._current = self._current[size:]
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stop.set()
+            # Освобождение места в очереди, если поток ждет на put
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            self._thread.join()
+            self._file.close()
+        super().close()
+
+    def _produce(self) -> None:
+        try:
+            while not self._stop.is_set():
+                chunk = self._file.read(self.buffer_size)
+                self._put(chunk)
+                if not chunk:
+                    return
+        except BaseException as e:
+            self._put(e)
+
+    def _put(self, item: Union[bytes, BaseException]) -> None:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=PUT_TIMEOUT)
+                return
+            except queue.Full:
+                continue
+
+
+def open_read_ahead(filepath: str, depth: int = DEFAULT_READ_AHEAD_DEPTH, buffer_size: int = DEFAULT_BUFFER_SIZE,
+                    offset: int = 0, fadvise: bool = False, encoding: Optional[str] = None):
+    """
+    Открывает файл с упреждающим чтением: двоичный буферизованный поток
+    или текстовый (если задана кодировка; переводы строк не преобразуются, как нужно модулю csv).
+    """
+    stream = io.BufferedReader(ReadAheadStream(filepath, depth, buffer_size, offset, fadvise), buffer_size)
+    if encoding is None:
+        return stream
+    return io.TextIOWrapper(stream, encoding=encoding, newline="")
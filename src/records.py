@@ -0,0 +1,171 @@
+"""
+Компактные записи строк CSV.
+
+Строка хранится как кортеж значений; заголовки и отображение
+«столбец → позиция» общие для всех строк файла и лежат в классе записи,
+который создается один раз на набор заголовков (record_type). Запись
+ведет себя как неизменяемый словарь: row["price"], row.get("price"),
+keys()/items()/values(), dict(row) и сравнение со словарем.
+
+В горячих циклах имя столбца разрешается в позицию один раз на запрос
+(column_getter): для записей это C-аксессор поля по позиции, без поиска
+по строковому ключу.
+"""
+
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Sequence, Tuple, Type
+
+try:
+    # Тот же дескриптор поля по позиции, что у collections.namedtuple
+    from _collections import _tuplegetter
+except ImportError:
+    def _tuplegetter(index: int, doc: str) -> property:
+        return property(lambda self: tuple.__getitem__(self, index), doc=doc)
+
+_tuple_getitem = tuple.__getitem__
+_tuple_iter = tuple.__iter__
+
+
+class Record(tuple):
+    """
+    Строка CSV: кортеж значений с доступом по имени столбца.
+
+    Отсутствующие в строке значения (строка короче заголовка) равны None,
+    как у csv.DictReader.
+    """
+
+    __slots__ = ()
+
+    _headers: Tuple[str, ...] = ()
+    _index: Dict[str, int] = {}
+
+    @classmethod
+    def from_values(cls, values: Sequence[Optional[str]]) -> "Record":
+        """
+        Запись из значений в порядке заголовков (недостающие дополняются None).
+        """
+        missing = len(cls._headers) - len(values)
+        if missing > 0:
+            values = list(values) + [None] * missing
+        return tuple.__new__(cls, values)
+
+    @classmethod
+    def getter(cls, column: str) -> Callable[["Record"], Optional[str]]:
+        """
+        Аксессор значения столбца для записей этого класса.
+        """
+        index = cls._index.get(column)
+        if index is None:
+            return _none
+        return attrgetter(f"_{index}")
+
+    def __getitem__(self, key):
+        if key.__class__ is str:
+            index = self._index.get(key)
+            if index is None:
+                raise KeyError(key)
+            return _tuple_getitem(self, index)
+        return _tuple_getitem(self, key)
+
+    def get(self, column: str, default: Any = None) -> Any:
+        index = self._index.get(column)
+        return default if index is None else _tuple_getitem(self, index)
+
+    def __contains__(self, column: object) -> bool:
+        return column in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def keys(self):
+        return self._index.keys()
+
+    def values(self):
+        return self.as_dict().values()
+
+    def items(self):
+        return self.as_dict().items()
+
+    def as_dict(self) -> Dict[str, Optional[str]]:
+        """
+        Строка в виде обычного словаря.
+        """
+        return dict(zip(self._headers, _tuple_iter(self)))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (Record, dict)):
+            return self.as_dict() == (other.as_dict() if isinstance(other, Record) else other)
+        return NotImplemented
+
+    def __ne__(self, other: object) -> bool:
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = tuple.__hash__
+
+    def __repr__(self) -> str:
+        return repr(self.as_dict())
+
+    def __reduce__(self):
+        return _rebuild, (self._headers, tuple(_tuple_iter(self)))
+
+
+def _none(row: Any) -> None:
+    return None
+
+
+# Число наборов заголовков, чьи классы записей хранятся (долгоживущие serve и worker
+# видят много разных файлов); вытесненный класс создается заново при следующем обращении
+RECORD_TYPE_CACHE_SIZE = 256
+
+
+def record_type(headers: Iterable[str]) -> Type[Record]:
+    """
+    Класс записей для набора заголовков (переиспользуется, пока в кеше).
+    """
+    return _record_type(tuple(headers))
+
+
+@lru_cache(maxsize=RECORD_TYPE_CACHE_SIZE)
+def _record_type(headers: Tuple[str, ...]) -> Type[Record]:
+    namespace: Dict[str, Any] = {
+        "__slots__": (),
+        "_headers": headers,
+        # При повторе имени столбца используется последняя позиция, как у csv.DictReader
+        "_index": {column: index for index, column in enumerate(headers)},
+    }
+    for index, column in enumerate(headers):
+        namespace[f"_{index}"] = _tuplegetter(index, f"Значение столбца '{column}'")
+    return type("Record", (Record,), namespace)
+
+
+def _rebuild(headers: Tuple[str, ...], values: Tuple[Optional[str], ...]) -> Record:
+    return tuple.__new__(record_type(headers), values)
+
+
+def column_getter(rows: Sequence[Any], column: str) -> Callable[[Any], Optional[str]]:
+    """
+    Аксессор столбца для строк одного источника: позиционный для записей,
+    row.get(column) для словарей.
+    """
+    if rows and isinstance(rows[0], Record):
+        return type(rows[0]).getter(column)
+    return lambda row: row.get(column)
+
+
+def key_getter(row: Any, columns: Sequence[str]) -> Callable[[Any], Tuple[Optional[str], ...]]:
+    """
+    Аксессор кортежа значений columns для строк того же источника, что row.
+    """
+    if isinstance(row, Record):
+        positions = [type(row)._index.get(column) for column in columns]
+        if positions and None not in positions:
+            getter = attrgetter(*(f"_{position}" for position in positions))
+            if len(positions) == 1:
+                return lambda record: (getter(record),)
+            return getter
+    return lambda other: tuple(other.get(column) for column in columns)
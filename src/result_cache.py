@@ -0,0 +1,182 @@
+"""
+Дисковый кеш результатов запросов.
+
+Ключ — отпечаток входных файлов (путь, размер, mtime или хеш содержимого)
+и нормализованные аргументы запроса. Изменение файла меняет ключ, поэтому
+устаревшие результаты никогда не возвращаются; старые записи удаляются по
+TTL и при превышении лимита размера кеша. Записи — JSON-файлы в общем
+каталоге, поэтому кеш разделяется между процессами.
+
+Парсер аргументов импортирует отсюда настройки по умолчанию при каждом
+запуске, поэтому hashlib и tempfile загружаются только при работе с кешем.
+"""
+
+import json
+import os
+import time
+from enum import Enum
+from typing import Any, Dict, NamedTuple, Optional
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "csv_file_processing")
+DEFAULT_CHECKPOINT_DIR = os.path.join(DEFAULT_CACHE_DIR, "checkpoints")
+DEFAULT_TTL = 3600.0
+DEFAULT_MAX_SIZE = 100 * 1024 * 1024
+
+
+class CacheOptions(NamedTuple):
+    """Настройки кеша результатов."""
+
+    directory: str = DEFAULT_CACHE_DIR
+    ttl: float = DEFAULT_TTL
+    max_size: int = DEFAULT_MAX_SIZE
+    content_hash: bool = False
+
+
+def file_fingerprint(filepath: str, content_hash: bool = False) -> Dict[str, Any]:
+    """
+    Отпечаток файла: абсолютный путь, размер и mtime (или хеш содержимого).
+
+    Raises:
+        FileNotFoundError: если файл не найден
+    """
+    path = os.path.abspath(filepath)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        raise FileNotFoundError("Файл не найден")
+    fingerprint: Dict[str, Any] = {"path": path, "size": stat.st_size}
+    if content_hash:
+        import hashlib
+
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        fingerprint["hash"] = digest.hexdigest()
+    else:
+        fingerprint["mtime_ns"] = stat.st_mtime_ns
+    return fingerprint
+
+
+def normalize_value(value: Any) -> Any:
+    """
+    Приведение значения аргументов к JSON-совместимому каноническому виду.
+    """
+    if isinstance(value, Enum):
+        return value.value
+    if callable(value):
+        # Скомпилированные предикаты восстанавливаются из остальных полей условия
+        return None
+    if hasattr(value, "_asdict"):
+        return {name: normalize_value(item) for name, item in value._asdict().items()}
+    if isinstance(value, (list, tuple)):
+        return [normalize_value(item) for item in value]
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+class ResultCache:
+    """
+    Кеш результатов запросов в каталоге на диске.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, ttl: float = DEFAULT_TTL,
+                 max_size: int = DEFAULT_MAX_SIZE, content_hash: bool = False):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_size = max_size
+        self.content_hash = content_hash
+
+    @classmethod
+    def from_options(cls, options: CacheOptions) -> "ResultCache":
+        return cls(options.directory, options.ttl, options.max_size, options.content_hash)
+
+    def make_key(self, args: Any) -> str:
+        """
+        Ключ кеша: отпечатки входных файлов и нормализованные аргументы (Arguments).
+        """
+        query = normalize_value(args._replace(cache_options=None))
+        query["filename"] = file_fingerprint(args.filename, self.content_hash)
+        if args.join_condition:
+            query["join_condition"]["filename"] = file_fingerprint(
+                args.join_condition.filename, self.content_hash
+            )
+        filter_condition = args.filter_condition
+        if filter_condition is not None and filter_condition.operator.value == "in file":
+            query["filter_condition"]["value"] = file_fingerprint(filter_condition.value, self.content_hash)
+        payload = json.dumps(query, sort_keys=True, ensure_ascii=False)
+        import hashlib
+
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Возвращает сохраненный результат или None (нет записи или истек TTL).
+        """
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                os.remove(path)
+                return None
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """
+        Атомарно сохраняет результат и освобождает место при превышении лимита.
+        """
+        import tempfile
+
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(result, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._prune()
+
+    def clear(self) -> None:
+        """
+        Удаляет все записи кеша.
+        """
+        for entry in self._entries():
+            os.remove(entry.path)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _entries(self):
+        try:
+            return [e for e in os.scandir(self.directory) if e.name.endswith(".json")]
+        except FileNotFoundError:
+            return []
+
+    def _prune(self) -> None:
+        """
+        Удаляет записи с истекшим TTL, затем самые старые, пока кеш больше лимита.
+        """
+        now = time.time()
+        entries = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for mtime, size, path in entries:
+            if now - mtime <= self.ttl and total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
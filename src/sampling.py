@@ -0,0 +1,176 @@
+"""
+Выборочное чтение CSV-файлов для быстрых приближенных ответов.
+
+--sample F — бернуллиевская выборка: каждая строка попадает в выборку
+с вероятностью F. Большие файлы не читаются целиком: файл делится на
+байтовые блоки, выбранные блоки читаются через seek с синхронизацией на
+начало следующей строки (блочная выборка). Строки блока — кластер:
+в отсортированном или сгруппированном файле они похожи, поэтому
+доверительный интервал строится по блокам (SampleResult.clusters).
+
+--sample-rows N — резервуарная выборка ровно N строк за один проход.
+
+Блочная синхронизация ищет перевод строки и не знает, находится ли он
+внутри поля в кавычках; строки с числом полей, отличным от заголовка,
+отбрасываются.
+"""
+
+import os
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from .csv_reader import CSVReader, parse_block
+from .records import record_type
+
+Row = Dict[str, str]
+
+DEFAULT_BLOCK_SIZE = 64 * 1024
+# Блочная выборка включается, когда в файле не меньше стольких блоков
+MIN_SAMPLED_BLOCKS = 100
+
+
+class SampleOptions(NamedTuple):
+    """Настройки выборки: доля строк (--sample) или размер выборки (--sample-rows)."""
+
+    fraction: Optional[float] = None
+    rows: Optional[int] = None
+    seed: Optional[int] = None
+
+
+class SampleResult(NamedTuple):
+    """Выборка строк и оценка числа строк во всем файле."""
+
+    headers: List[str]
+    rows: List[Row]
+    population: float
+    # Число строк каждого прочитанного блока (блочная выборка); пусто — выборка строк
+    clusters: Tuple[int, ...] = ()
+
+    @property
+    def scale(self) -> float:
+        """
+        Во сколько раз файл больше выборки (множитель для sum и count).
+        """
+        return self.population / len(self.rows) if self.rows else 1.0
+
+
+def bernoulli_sample(rows: Iterable[Row], fraction: float, rng) -> Iterator[Row]:
+    """
+    Каждая строка независимо попадает в выборку с вероятностью fraction.
+    """
+    return (row for row in rows if rng.random() < fraction)
+
+
+def reservoir_sample(rows: Iterable[Row], size: int, rng) -> Tuple[List[Row], int]:
+    """
+    Равновероятная выборка size строк за один проход (алгоритм R).
+
+    Returns:
+        Tuple[List[Row], int]: выборка и количество просмотренных строк
+    """
+    reservoir: List[Row] = []
+    seen = 0
+    for seen, row in enumerate(rows, start=1):
+        if seen <= size:
+            reservoir.append(row)
+        else:
+            index = rng.randrange(seen)
+            if index < size:
+                reservoir[index] = row
+    return reservoir, seen
+
+
+class Sampler:
+    """
+    Чтение выборки строк CSV-файла.
+    """
+
+    def __init__(self, options: SampleOptions, csv_reader: Optional[CSVReader] = None,
+                 block_size: int = DEFAULT_BLOCK_SIZE):
+        # random нужен только в режиме выборки
+        import random
+
+        self.options = options
+        self.csv_reader = csv_reader or CSVReader()
+        self.block_size = block_size
+        self.rng = random.Random(options.seed)
+
+    def sample(self, filepath: str) -> SampleResult:
+        """
+        Читает выборку строк файла.
+
+        Raises:
+            FileNotFoundError: если файл не найден
+            ValueError: если файл пуст или не содержит заголовков
+        """
+        if self.options.rows is not None:
+            headers, rows = self.csv_reader.iter_file(filepath)
+            sample, seen = reservoir_sample(rows, self.options.rows, self.rng)
+            return SampleResult(headers, sample, seen)
+
+        blocks = self._sample_blocks(filepath)
+        if blocks is not None:
+            return blocks
+        headers, rows = self.csv_reader.iter_file(filepath)
+        counter = _Counter(rows)
+        sample = list(bernoulli_sample(counter, self.options.fraction, self.rng))
+        return SampleResult(headers, sample, counter.count)
+
+    def _sample_blocks(self, filepath: str) -> Optional[SampleResult]:
+        """
+        Блочная выборка через seek; None, если файл слишком мал для нее.
+        """
+        if not os.path.exists(filepath):
+            raise FileNotFoundError("Файл не найден")
+        with open(filepath, "rb") as f:
+            header_line = f.readline()
+            parsed = parse_block(header_line)
+            if not parsed:
+                raise ValueError("Файл пуст или не содержит заголовков")
+            headers = parsed[0]
+            data_start = f.tell()
+            size = f.seek(0, 2)
+            block_count = -(-(size - data_start) // self.block_size)
+            if block_count < MIN_SAMPLED_BLOCKS:
+                return None
+
+            record = record_type(headers)
+            rows: List[Row] = []
+            clusters: List[int] = []
+            bytes_read = 0
+            for index in range(block_count):
+                if self.rng.random() >= self.options.fraction:
+                    continue
+                start = data_start + index * self.block_size
+                end = min(start + self.block_size, size)
+                # Синхронизация: пропуск хвоста строки, начатой в предыдущем блоке
+                f.seek(start - 1)
+                f.readline()
+                # Блоку принадлежат строки, начинающиеся до его конца
+                data = f.read(max(0, end - f.tell()))
+                if data and not data.endswith(b"\n"):
+                    data += f.readline()
+                bytes_read += len(data)
+                block_start = len(rows)
+                for values in parse_block(data):
+                    if len(values) == len(headers):
+                        rows.append(record.from_values(values))
+                clusters.append(len(rows) - block_start)
+
+        # Число строк файла оценивается по средней длине прочитанных строк
+        population = len(rows) * (size - data_start) / bytes_read if bytes_read else 0.0
+        return SampleResult(headers, rows, population, tuple(clusters))
+
+
+class _Counter:
+    """
+    Итератор-обертка, считающий пройденные строки.
+    """
+
+    def __init__(self, rows: Iterable[Row]):
+        self._rows = iter(rows)
+        self.count = 0
+
+    def __iter__(self) -> Iterator[Row]:
+        for row in self._rows:
+            self.count += 1
+            yield row
@@ -0,0 +1,279 @@
+"""
+Долгоживущий сервер запросов с "теплыми" таблицами в памяти.
+
+Сервер держит распарсенные CSV-файлы в LRU-кеше, ограниченном по объему
+памяти и инвалидируемом по mtime/размеру файла, выполняет логику
+CommandHandler в параллельных потоках и возвращает результат в JSON.
+
+Протокол (HTTP, JSON):
+    POST /query  {"argv": ["phones.csv", "--where", "price>500"]}
+      -> {"headers": [...], "rows": [...]} или
+         {"column": "...", "function": "...", "value": ...}
+      -> {"error": "..."} с кодом 400 при ошибке
+    GET /health  -> {"status": "ok", "tables": N, "bytes": N}
+"""
+
+import argparse
+import json
+import os
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from urllib import error as urllib_error
+from urllib import request as urllib_request
+
+from .argument_parser import ArgumentParserError, RaisingArgumentParser, parse_arguments, parse_size
+from .command_handler import CommandHandler, QueryResult
+from .csv_reader import CSVReader
+from .join_engine import estimate_row_size
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_SIZE = 512 * 1024 * 1024
+
+
+class CachedTable(NamedTuple):
+    """Распарсенная таблица в кеше."""
+
+    mtime_ns: int
+    size: int
+    headers: List[str]
+    rows: List[Dict[str, str]]
+    nbytes: int
+
+
+class TableCache:
+    """
+    Потокобезопасный LRU-кеш распарсенных CSV-файлов, ограниченный по памяти.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_SIZE, csv_reader: Optional[CSVReader] = None):
+        self.max_bytes = max_bytes
+        self.csv_reader = csv_reader or CSVReader()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._tables: "OrderedDict[str, CachedTable]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+    def get(self, filepath: str) -> Tuple[List[str], List[Dict[str, str]]]:
+        """
+        Возвращает заголовки и строки файла, перечитывая его при изменении.
+        """
+        path = os.path.abspath(filepath)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            raise FileNotFoundError("Файл не найден")
+
+        with self._lock:
+            table = self._tables.get(path)
+            if table and table.mtime_ns == stat.st_mtime_ns and table.size == stat.st_size:
+                self._tables.move_to_end(path)
+                self.hits += 1
+                return table.headers, table.rows
+            self.misses += 1
+
+        # Парсинг вне блокировки, чтобы не задерживать запросы к другим таблицам
+        headers, rows = self.csv_reader.read_file(path)
+        nbytes = sum(estimate_row_size(row) for row in rows)
+        table = CachedTable(stat.st_mtime_ns, stat.st_size, headers, rows, nbytes)
+
+        with self._lock:
+            previous = self._tables.pop(path, None)
+            if previous:
+                self.total_bytes -= previous.nbytes
+            if nbytes <= self.max_bytes:
+                self._tables[path] = table
+                self.total_bytes += nbytes
+                self._evict()
+        return headers, rows
+
+    def _evict(self) -> None:
+        while self.total_bytes > self.max_bytes and self._tables:
+            _, table = self._tables.popitem(last=False)
+            self.total_bytes -= table.nbytes
+
+
+class CachedCSVReader(CSVReader):
+    """
+    CSVReader, читающий таблицы через общий TableCache.
+    """
+
+    def __init__(self, cache: TableCache):
+        super().__init__()
+        self.cache = cache
+
+    def read_file(self, filepath: str) -> Tuple[List[str], List[Dict[str, str]]]:
+        headers, rows = self.cache.get(filepath)
+        # Копия списка: обработчики могут менять порядок, но не сами строки
+        return headers, list(rows)
+
+    def iter_file(self, filepath: str) -> Tuple[List[str], Iterator[Dict[str, str]]]:
+        headers, rows = self.cache.get(filepath)
+        return headers, iter(rows)
+
+
+class QueryServer(ThreadingHTTPServer):
+    """
+    HTTP-сервер запросов; каждый запрос обрабатывается в отдельном потоке.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 cache_size: int = DEFAULT_CACHE_SIZE):
+        self.table_cache = TableCache(cache_size)
+        self.csv_reader = CachedCSVReader(self.table_cache)
+        super().__init__((host, port), QueryRequestHandler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def execute_query(self, argv: List[str]) -> Tuple[int, Dict[str, Any]]:
+        """
+        Выполняет запрос, заданный аргументами командной строки.
+
+        Returns:
+            Tuple[int, Dict[str, Any]]: HTTP-код и тело ответа
+        """
+        # Запросы обрабатываются в потоках: парсер не пишет в общие sys.stdout/sys.stderr
+        try:
+            args = parse_arguments(argv, RaisingArgumentParser)
+        except ArgumentParserError as e:
+            return 400, {"error": str(e).splitlines()[-1]}
+        except ValueError as e:
+            return 400, {"error": f"Ошибка: {e}"}
+
+        handler = CommandHandler(csv_reader=self.csv_reader)
+        try:
+            return 200, handler.run(args).to_dict()
+        except Exception as e:
+            return 400, {"error": handler.describe_error(args, e)}
+
+
+class QueryRequestHandler(BaseHTTPRequestHandler):
+    """
+    Обработчик HTTP-запросов сервера.
+    """
+
+    server: QueryServer
+
+    def do_GET(self) -> None:
+        if self.path != "/health":
+            self._send_json(404, {"error": "Не найдено"})
+            return
+        cache = self.server.table_cache
+        self._send_json(200, {"status": "ok", "tables": len(cache), "bytes": cache.total_bytes})
+
+    def do_POST(self) -> None:
+        if self.path != "/query":
+            self._send_json(404, {"error": "Не найдено"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            argv = payload["argv"]
+            if not isinstance(argv, list) or not all(isinstance(a, str) for a in argv):
+                raise ValueError
+        except (ValueError, KeyError, TypeError):
+            self._send_json(400, {"error": "Ошибка: ожидается JSON вида {\"argv\": [...]}"})
+            return
+        status, body = self.server.execute_query(argv)
+        self._send_json(status, body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # Журнал запросов не выводится, чтобы не засорять консоль
+        pass
+
+    def _send_json(self, status: int, body: Dict[str, Any]) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def query_server(url: str, argv: List[str], timeout: float = 60.0) -> Dict[str, Any]:
+    """
+    Отправляет запрос серверу и возвращает тело ответа.
+
+    Raises:
+        ValueError: Если сервер вернул ошибку выполнения запроса
+        ConnectionError: Если сервер недоступен
+    """
+    body = json.dumps({"argv": argv}).encode("utf-8")
+    req = urllib_request.Request(
+        f"{url.rstrip('/')}/query", data=body, headers={"Content-Type": "application/json"},
+    )
+    try:
+        with urllib_request.urlopen(req, timeout=timeout) as response:
+            return json.loads(response.read())
+    except urllib_error.HTTPError as e:
+        raise ValueError(json.loads(e.read()).get("error", str(e)))
+    except urllib_error.URLError as e:
+        raise ConnectionError(f"Сервер {url} недоступен: {e.reason}")
+
+
+def run_serve_command(argv: List[str]) -> int:
+    """
+    Точка входа подкоманды serve.
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py serve", description="Сервер запросов с кешем таблиц в памяти",
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Адрес (по умолчанию 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Порт (по умолчанию 8765)")
+    parser.add_argument("--cache-size", type=parse_size, default=DEFAULT_CACHE_SIZE,
+                        help="Лимит памяти кеша таблиц, например 512M (по умолчанию 512M)")
+    parsed = parser.parse_args(argv)
+
+    server = QueryServer(parsed.host, parsed.port, parsed.cache_size)
+    print(f"Сервер запущен: {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def run_client_command(argv: List[str]) -> int:
+    """
+    Точка входа подкоманды client: те же аргументы, что у обычного запуска,
+    но выполнение на сервере; вывод совпадает с локальным.
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py client", description="Выполнение запроса на сервере", add_help=False,
+    )
+    parser.add_argument("--server", default=f"http://{DEFAULT_HOST}:{DEFAULT_PORT}",
+                        help="Адрес сервера")
+    parsed, query_argv = parser.parse_known_args(argv)
+
+    # Пути к файлам передаются абсолютными: у сервера может быть другой рабочий каталог
+    if query_argv and not query_argv[0].startswith("-"):
+        query_argv[0] = os.path.abspath(query_argv[0])
+    for index, value in enumerate(query_argv[:-1]):
+        if value == "--join":
+            query_argv[index + 1] = os.path.abspath(query_argv[index + 1])
+        elif value == "--where-in-file":
+            column, separator, filepath = query_argv[index + 1].partition("=")
+            if separator and filepath.strip():
+                query_argv[index + 1] = f"{column}={os.path.abspath(filepath.strip())}"
+
+    handler = CommandHandler()
+    try:
+        data = query_server(parsed.server, query_argv)
+    except ValueError as e:
+        print(e)
+        return 0
+    handler.display(QueryResult.from_dict(data))
+    return 0
@@ -0,0 +1,300 @@
+"""
+Вероятностные структуры данных для приближённой агрегации.
+
+- TDigest — приближённые квантили (перцентили) с фиксированной памятью
+- HyperLogLog — приближённый подсчёт числа уникальных значений
+
+Обе структуры сливаемы (merge) и сериализуемы (to_dict/from_dict), поэтому
+состояние можно считать по частям файла или по разным файлам и объединять.
+"""
+
+import base64
+import hashlib
+import math
+from typing import Any, Dict, Iterable, List, Tuple
+
+
+class TDigest:
+    """
+    Merging t-digest для оценки квантилей.
+
+    Память ограничена ~compression центроидами, погрешность ранга
+    порядка 1/compression (меньше на хвостах распределения).
+    """
+
+    def __init__(self, compression: float = 100.0):
+        if compression < 10:
+            raise ValueError("Параметр compression должен быть не меньше 10")
+        self.compression = float(compression)
+        self._centroids: List[Tuple[float, float]] = []
+        self._buffer: List[Tuple[float, float]] = []
+        self._buffer_limit = int(self.compression * 5)
+        self.count = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Верхняя оценка памяти дайджеста: буфер и центроиды (кортеж двух чисел ~100 байт).
+        """
+        return 100 * (self._buffer_limit + 2 * int(self.compression))
+
+    @classmethod
+    def from_error(cls, relative_error: float) -> "TDigest":
+        """
+        Создает дайджест с compression, соответствующим допустимой погрешности ранга.
+        """
+        if not 0 < relative_error < 1:
+            raise ValueError("Погрешность должна быть в интервале (0, 1)")
+        return cls(compression=max(10.0, math.ceil(1.0 / relative_error)))
+
+    def update(self, value: float, weight: float = 1.0) -> None:
+        """
+        Добавляет значение в дайджест.
+        """
+        self._buffer.append((value, weight))
+        self.count += weight
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if len(self._buffer) >= self._buffer_limit:
+            self._compress()
+
+    def update_many(self, values: Iterable[float]) -> None:
+        """
+        Добавляет последовательность значений.
+        """
+        for value in values:
+            self.update(value)
+
+    def merge(self, other: "TDigest") -> None:
+        """
+        Сливает другой дайджест в текущий.
+        """
+        if other.count == 0:
+            return
+        self._buffer.extend(other._centroids)
+        self._buffer.extend(other._buffer)
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+
+    def quantile(self, q: float) -> float:
+        """
+        Оценка квантиля q (0 <= q <= 1).
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("Квантиль должен быть в интервале [0, 1]")
+        self._compress()
+        if not self._centroids:
+            raise ValueError("Дайджест пуст")
+        if q == 0:
+            return self.min
+        if q == 1:
+            return self.max
+        if len(self._centroids) == 1:
+            return self._centroids[0][0]
+
+        target = q * self.count
+        cumulative = 0.0
+        previous_mean, previous_center = self.min, 0.0
+        for mean, weight in self._centroids:
+            center = cumulative + weight / 2
+            if target < center:
+                span = center - previous_center
+                if span <= 0:
+                    return mean
+                ratio = (target - previous_center) / span
+                return previous_mean + ratio * (mean - previous_mean)
+            cumulative += weight
+            previous_mean, previous_center = mean, center
+
+        span = self.count - previous_center
+        if span <= 0:
+            return self.max
+        ratio = (target - previous_center) / span
+        return previous_mean + ratio * (self.max - previous_mean)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Сериализация состояния в JSON-совместимый словарь.
+        """
+        self._compress()
+        return {
+            "compression": self.compression,
+            "centroids": [[mean, weight] for mean, weight in self._centroids],
+            "count": self.count,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> "TDigest":
+        """
+        Восстановление дайджеста из словаря to_dict().
+        """
+        digest = cls(compression=state["compression"])
+        digest._centroids = [(float(m), float(w)) for m, w in state["centroids"]]
+        digest.count = float(state["count"])
+        if digest.count:
+            digest.min = float(state["min"])
+            digest.max = float(state["max"])
+        return digest
+
+    def _scale(self, q: float) -> float:
+        """
+        Функция масштаба k1: мелкие центроиды на хвостах, крупные в центре.
+        """
+        return self.compression / (2 * math.pi) * math.asin(2 * q - 1)
+
+    def _compress(self) -> None:
+        """
+        Сливает буфер с центроидами, соблюдая ограничение функции масштаба.
+        """
+        if not self._buffer:
+            return
+        points = sorted(self._centroids + self._buffer)
+        self._buffer = []
+        total = sum(weight for _, weight in points)
+
+        merged: List[Tuple[float, float]] = []
+        current_mean, current_weight = points[0]
+        cumulative = 0.0
+        k_lower = self._scale(0.0)
+        for mean, weight in points[1:]:
+            q_upper = (cumulative + current_weight + weight) / total
+            if self._scale(min(q_upper, 1.0)) - k_lower <= 1.0:
+                current_weight += weight
+                current_mean += (mean - current_mean) * weight / current_weight
+            else:
+                merged.append((current_mean, current_weight))
+                cumulative += current_weight
+                k_lower = self._scale(min(cumulative / total, 1.0))
+                current_mean, current_weight = mean, weight
+        merged.append((current_mean, current_weight))
+        self._centroids = merged
+
+
+class HyperLogLog:
+    """
+    HyperLogLog для оценки числа уникальных значений.
+
+    Использует 2**precision однобайтовых регистров, стандартная
+    относительная погрешность ~1.04 / sqrt(2**precision).
+    """
+
+    MIN_PRECISION = 4
+    MAX_PRECISION = 18
+
+    def __init__(self, precision: int = 14):
+        if not self.MIN_PRECISION <= precision <= self.MAX_PRECISION:
+            raise ValueError(
+                f"Точность HyperLogLog должна быть от {self.MIN_PRECISION} до {self.MAX_PRECISION}"
+            )
+        self.precision = precision
+        self._size = 1 << precision
+        self._registers = bytearray(self._size)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Память регистров в байтах.
+        """
+        return len(self._registers)
+
+    @classmethod
+    def from_error(cls, relative_error: float) -> "HyperLogLog":
+        """
+        Создает HyperLogLog с минимальной точностью, обеспечивающей заданную погрешность.
+        """
+        if not 0 < relative_error < 1:
+            raise ValueError("Погрешность должна быть в интервале (0, 1)")
+        precision = math.ceil(math.log2((1.04 / relative_error) ** 2))
+        return cls(max(cls.MIN_PRECISION, min(cls.MAX_PRECISION, precision)))
+
+    @property
+    def relative_error(self) -> float:
+        """Стандартная относительная погрешность оценки."""
+        return 1.04 / math.sqrt(self._size)
+
+    def update(self, value: str) -> None:
+        """
+        Добавляет значение (строку) в скетч.
+        """
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest()
+        hashed = int.from_bytes(digest, "big")
+        index = hashed >> (64 - self.precision)
+        remainder = (hashed << self.precision) & 0xFFFFFFFFFFFFFFFF
+        rank = 64 - self.precision + 1 if remainder == 0 else 65 - remainder.bit_length()
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def update_many(self, values: Iterable[str]) -> None:
+        """
+        Добавляет последовательность значений.
+        """
+        # То же, что update, но без вызова метода и поиска атрибутов на каждое значение
+        precision = self.precision
+        registers = self._registers
+        blake2b = hashlib.blake2b
+        shift = 64 - precision
+        overflow_rank = 64 - precision + 1
+        for value in values:
+            hashed = int.from_bytes(blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+            remainder = (hashed << precision) & 0xFFFFFFFFFFFFFFFF
+            rank = overflow_rank if remainder == 0 else 65 - remainder.bit_length()
+            index = hashed >> shift
+            if rank > registers[index]:
+                registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """
+        Сливает другой скетч той же точности в текущий.
+        """
+        if other.precision != self.precision:
+            raise ValueError("Нельзя объединить HyperLogLog с разной точностью")
+        self._registers = bytearray(map(max, self._registers, other._registers))
+
+    def estimate(self) -> float:
+        """
+        Оценка числа уникальных значений.
+        """
+        m = self._size
+        if m == 16:
+            alpha = 0.673
+        elif m == 32:
+            alpha = 0.697
+        elif m == 64:
+            alpha = 0.709
+        else:
+            alpha = 0.7213 / (1 + 1.079 / m)
+        harmonic = sum(2.0 ** -register for register in self._registers)
+        raw = alpha * m * m / harmonic
+        zeros = self._registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)
+        return raw
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Сериализация состояния в JSON-совместимый словарь.
+        """
+        return {
+            "precision": self.precision,
+            "registers": base64.b64encode(bytes(self._registers)).decode("ascii"),
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> "HyperLogLog":
+        """
+        Восстановление скетча из словаря to_dict().
+        """
+        sketch = cls(precision=state["precision"])
+        registers = base64.b64decode(state["registers"])
+        if len(registers) != sketch._size:
+            raise ValueError("Некорректное состояние HyperLogLog")
+        sketch._registers = bytearray(registers)
+        return sketch
@@ -0,0 +1,75 @@
+"""
+Модуль сортировки строк CSV.
+"""
+
+import math
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from .argument_parser import SortCondition, SortDirection
+from .records import column_getter
+from .timestamps import parse_timestamp
+
+Row = Dict[str, str]
+
+NULL_RANK = 2
+
+
+def value_key(value: Optional[str]) -> Tuple[int, Union[float, str]]:
+    """
+    Ключ упорядочения значения ячейки: числа (по величине) и даты (по метке
+    времени, см. timestamps) раньше строк, пустые значения — в конце. В таком
+    порядке считаются упорядоченными столбцы, заявленные через --sorted-by.
+    Значения 'nan' и 'inf' не числа: nan несравнимо и нарушило бы порядок
+    сортировки, поэтому они упорядочиваются как строки.
+    """
+    if value is None or value == "":
+        return (NULL_RANK, "")
+    try:
+        number = float(value)
+    except ValueError:
+        timestamp = parse_timestamp(value)
+        if timestamp is not None:
+            return (0, float(timestamp))
+        return (1, value)
+    if not math.isfinite(number):
+        return (1, value)
+    return (0, number)
+
+
+def sort_rows(data: List[Row], conditions: Union[SortCondition, Sequence[SortCondition]]) -> List[Row]:
+    """
+    Устойчивая сортировка строк по одному или нескольким столбцам.
+
+    Ключи вычисляются один раз на строку: числа сравниваются как числа и идут
+    раньше строк, пустые значения — в конце при любом направлении. Смешанные
+    направления обрабатываются устойчивыми проходами от последнего ключа
+    к первому, без cmp_to_key.
+    """
+    if isinstance(conditions[0], str):
+        conditions = (conditions,)
+
+    order = list(range(len(data)))
+    for condition in reversed(conditions):
+        keys = list(map(value_key, map(column_getter(data, condition.column), data)))
+        order = _sort_pass(order, keys, condition.direction == SortDirection.DESC)
+    return [data[i] for i in order]
+
+
+def _sort_pass(order: List[int], keys: List[Tuple[int, Union[float, str]]], reverse: bool) -> List[int]:
+    """
+    Устойчивый проход сортировки по одному столбцу.
+
+    Индексы разбиваются на числа, строки и пустые значения; внутри группы ключи
+    однотипны (float или str), что позволяет list.sort использовать быстрое
+    сравнение вместо сравнения кортежей.
+    """
+    groups: Tuple[List[int], List[int], List[int]] = ([], [], [])
+    for i in order:
+        groups[keys[i][0]].append(i)
+    values = [key[1] for key in keys]
+    numbers, strings, nulls = groups
+    numbers.sort(key=values.__getitem__, reverse=reverse)
+    strings.sort(key=values.__getitem__, reverse=reverse)
+    if reverse:
+        return strings + numbers + nulls
+    return numbers + strings + nulls
@@ -0,0 +1,154 @@
+"""
+Разбор дат и меток времени ISO 8601 в целые микросекунды от эпохи (UTC).
+
+Быстрый путь — фиксированные форматы 'YYYY-MM-DD', 'YYYY-MM-DDTHH:MM:SS'
+и 'YYYY-MM-DD HH:MM:SS' (с необязательным 'Z'): начало часа по префиксу
+'YYYY-MM-DDTHH' запоминается (в файлах с метками времени один и тот же час
+повторяется в тысячах строк подряд), минуты и секунды разбираются срезами. Остальные варианты
+(дробные секунды, смещения часового пояса) разбирает datetime.fromisoformat.
+Метки без часового пояса считаются метками UTC. Модуль datetime нужен
+только медленному пути и загружается при первом обращении к нему.
+
+Целые метки сравниваются в фильтрах > и <, упорядочиваются при сортировке
+и округляются до начала интервала в --bucket.
+"""
+
+import re
+from typing import Dict, NamedTuple, Optional
+
+SECOND = 1_000_000
+MINUTE = 60 * SECOND
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+WEEK = 7 * DAY
+BUCKET_UNITS = {"s": SECOND, "m": MINUTE, "h": HOUR, "d": DAY, "w": WEEK}
+# 1970-01-01 — четверг: недели отсчитываются от понедельника 1969-12-29
+WEEK_ORIGIN = -3 * DAY
+BUCKET_PATTERN = re.compile(r"^([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*(\d+)\s*([smhdw])$")
+
+DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+# Метка начала дня или часа по префиксу 'YYYY-MM-DD' или 'YYYY-MM-DDTHH' (None — не дата)
+DATE_CACHE_SIZE = 4096
+_date_cache: Dict[str, Optional[int]] = {}
+
+
+class TimeBucket(NamedTuple):
+    """Интервал группировки по метке времени (--bucket ts=1h)."""
+
+    column: str
+    width: int
+    spec: str
+
+
+def parse_bucket(spec: str) -> TimeBucket:
+    """
+    Парсит интервал группировки вида "ts=15m" (единицы: s, m, h, d, w).
+
+    Raises:
+        ValueError: Если формат или ширина интервала некорректны
+    """
+    match = BUCKET_PATTERN.match(spec.strip())
+    if not match:
+        raise ValueError(
+            f"Некорректный формат --bucket: '{spec}'. Ожидается 'column=N<единица>', "
+            f"единицы: {', '.join(BUCKET_UNITS)}"
+        )
+    column, count, unit = match.groups()
+    if int(count) <= 0:
+        raise ValueError(f"Ширина интервала должна быть положительной: '{spec}'")
+    return TimeBucket(column=column, width=int(count) * BUCKET_UNITS[unit], spec=f"{int(count)}{unit}")
+
+
+def _parse_prefix(prefix: str) -> Optional[int]:
+    days = _parse_date(prefix)
+    if days is None or len(prefix) == 10:
+        return None if days is None else days * DAY
+    hours = prefix[11:13]
+    if prefix[10] not in "T " or not hours.isdecimal() or int(hours) >= 24:
+        return None
+    return days * DAY + int(hours) * HOUR
+
+
+def _parse_date(prefix: str) -> Optional[int]:
+    if prefix[7] != "-":
+        return None
+    year, month, day = prefix[:4], prefix[5:7], prefix[8:10]
+    if not (year + month + day).isdecimal():
+        return None
+    year, month, day = int(year), int(month), int(day)
+    if not 1 <= month <= 12:
+        return None
+    leap = year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+    if not 1 <= day <= DAYS_IN_MONTH[month - 1] + (leap and month == 2):
+        return None
+    return days_from_civil(year, month, day)
+
+
+def days_from_civil(year: int, month: int, day: int) -> int:
+    """
+    Номер дня от 1970-01-01 по дате пролептического григорианского календаря.
+    """
+    year -= month <= 2
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * (month + (-3 if month > 2 else 9)) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 719468
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[int]:
+    """
+    Метка времени в микросекундах от эпохи (UTC) или None, если значение — не дата.
+    """
+    if not value or len(value) < 10 or value[4] != "-":
+        return None
+    length = len(value)
+    fixed = length == 19 or (length == 20 and value[19] == "Z")
+    if not fixed and length != 10:
+        return _parse_iso(value) if _parse_date(value[:10]) is not None else None
+    prefix = value[:13] if fixed else value
+    start = _date_cache.get(prefix, False)
+    if start is False:
+        if len(_date_cache) >= DATE_CACHE_SIZE:
+            _date_cache.clear()
+        start = _date_cache[prefix] = _parse_prefix(prefix)
+    if start is None or not fixed:
+        return start
+    minutes, seconds = value[14:16], value[17:19]
+    if value[13] == ":" and value[16] == ":" and minutes.isdecimal() and seconds.isdecimal():
+        minutes, seconds = int(minutes), int(seconds)
+        if minutes < 60 and seconds < 60:
+            return start + minutes * MINUTE + seconds * SECOND
+    return None
+
+
+def _parse_iso(value: str) -> Optional[int]:
+    from datetime import datetime, timedelta, timezone
+
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return (parsed - datetime(1970, 1, 1, tzinfo=timezone.utc)) // timedelta(microseconds=1)
+
+
+def format_timestamp(timestamp: int) -> str:
+    """
+    Метка времени в микросекундах от эпохи в виде 'YYYY-MM-DDTHH:MM:SS' (UTC).
+    """
+    from datetime import datetime, timedelta
+
+    return (datetime(1970, 1, 1) + timedelta(microseconds=timestamp)).isoformat()
+
+
+def bucket_start(timestamp: int, width: int) -> int:
+    """
+    Начало интервала ширины width, содержащего метку (интервалы выровнены
+    по эпохе, недели — по понедельникам).
+    """
+    origin = WEEK_ORIGIN if width % WEEK == 0 else 0
+    return timestamp - (timestamp - origin) % width
@@ -0,0 +1,350 @@
+"""
+Оконные функции (--window) за один потоковый проход.
+
+Строки поступают в порядке --order-by (или в порядке файла) и сразу
+выходят с добавленными столбцами функций. Состояние хранится отдельно
+для каждой секции --partition-by и занимает O(размер окна): скользящие
+сумма и среднее — очередь значений окна с текущей суммой, скользящие
+минимум и максимум — монотонная очередь, lag — очередь последних значений.
+Накопительные функции (cumsum, cumavg, ...) — аккумуляторы агрегации
+из общего реестра (src.accumulators), значение снимается после каждой строки.
+
+Новая функция добавляется декоратором register_window.
+"""
+
+from collections import deque
+from itertools import chain
+from typing import (
+    TYPE_CHECKING, Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Type,
+)
+
+from .records import key_getter, record_type
+
+if TYPE_CHECKING:
+    from .memory import MemoryGovernor
+
+Row = Dict[str, str]
+
+# Грубая оценка памяти состояния функции в секции и одного значения ее окна
+STATE_BYTES = 256
+WINDOW_VALUE_BYTES = 64
+
+WINDOWS: Dict[str, Type["WindowFunction"]] = {}
+
+
+def register_window(name: str) -> Callable[[Type["WindowFunction"]], Type["WindowFunction"]]:
+    """
+    Декоратор регистрации класса оконной функции под именем.
+    """
+
+    def decorator(cls: Type["WindowFunction"]) -> Type["WindowFunction"]:
+        cls.name = name
+        WINDOWS[name] = cls
+        return cls
+
+    return decorator
+
+
+def get_window_class(name: str) -> Type["WindowFunction"]:
+    """
+    Возвращает класс оконной функции по имени.
+
+    Raises:
+        ValueError: Если функция не зарегистрирована
+    """
+    try:
+        return WINDOWS[name.lower()]
+    except KeyError:
+        raise ValueError(f"Неподдерживаемая оконная функция: '{name}'. Поддерживаются: {', '.join(WINDOWS)}")
+
+
+def _number(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class WindowFunction:
+    """
+    Состояние оконной функции в одной секции: step(value) принимает значение
+    столбца очередной строки и возвращает значение функции для нее.
+
+    Атрибуты класса:
+        accepts_argument: функция принимает параметр ("column=func:N")
+        requires_argument: параметр обязателен (размер окна)
+        default_argument: значение параметра по умолчанию
+    """
+
+    name: str = ""
+    accepts_argument = False
+    requires_argument = False
+    default_argument: Optional[int] = None
+
+    def __init__(self, argument: Optional[int] = None):
+        self.argument = self.default_argument if argument is None else argument
+
+    @classmethod
+    def check_argument(cls, argument: Optional[int]) -> None:
+        """
+        Проверка параметра функции.
+
+        Raises:
+            ValueError: Если параметр недопустим
+        """
+        if argument is None:
+            if cls.requires_argument:
+                raise ValueError(f"Оконной функции '{cls.name}' нужен размер окна: '{cls.name}:N'")
+            return
+        if not cls.accepts_argument:
+            raise ValueError(f"Оконная функция '{cls.name}' не принимает параметр")
+        if argument <= 0:
+            raise ValueError(f"Параметр оконной функции '{cls.name}' должен быть положительным")
+
+    @property
+    def nbytes(self) -> int:
+        """Оценка памяти состояния сверху: окно из argument значений заполнено."""
+        return STATE_BYTES + WINDOW_VALUE_BYTES * (self.argument or 0)
+
+    def step(self, value: Optional[str]) -> Any:
+        raise NotImplementedError
+
+
+@register_window("moving_avg")
+class MovingAvgWindow(WindowFunction):
+    """Среднее числовых значений последних N строк (нечисловые пропускаются)."""
+
+    accepts_argument = True
+    requires_argument = True
+
+    def __init__(self, argument: Optional[int] = None):
+        super().__init__(argument)
+        self.values: Deque[Optional[float]] = deque()
+        self.total = 0.0
+        self.count = 0
+
+    def step(self, value: Optional[str]) -> Optional[float]:
+        number = _number(value)
+        self.values.append(number)
+        if number is not None:
+            self.total += number
+            self.count += 1
+        if len(self.values) > self.argument:
+            removed = self.values.popleft()
+            if removed is not None:
+                self.total -= removed
+                self.count -= 1
+        return self.result()
+
+    def result(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+
+@register_window("moving_sum")
+class MovingSumWindow(MovingAvgWindow):
+    """Сумма числовых значений последних N строк."""
+
+    def result(self) -> Optional[float]:
+        return self.total if self.count else None
+
+
+@register_window("moving_min")
+class MovingMinWindow(WindowFunction):
+    """Минимум последних N строк: монотонная очередь (индекс, значение)."""
+
+    accepts_argument = True
+    requires_argument = True
+
+    def __init__(self, argument: Optional[int] = None):
+        super().__init__(argument)
+        self.queue: Deque[Tuple[int, float]] = deque()
+        self.index = 0
+
+    @staticmethod
+    def dominates(new: float, old: float) -> bool:
+        # Старое значение больше не может стать ответом
+        return new <= old
+
+    def step(self, value: Optional[str]) -> Optional[float]:
+        number = _number(value)
+        queue = self.queue
+        if number is not None:
+            while queue and self.dominates(number, queue[-1][1]):
+                queue.pop()
+            queue.append((self.index, number))
+        while queue and queue[0][0] <= self.index - self.argument:
+            queue.popleft()
+        self.index += 1
+        return queue[0][1] if queue else None
+
+
+@register_window("moving_max")
+class MovingMaxWindow(MovingMinWindow):
+    """Максимум последних N строк."""
+
+    @staticmethod
+    def dominates(new: float, old: float) -> bool:
+        return new >= old
+
+
+class CumulativeWindow(WindowFunction):
+    """
+    Накопительное значение функции агрегации с начала секции.
+    """
+
+    function = ""
+
+    def __init__(self, argument: Optional[int] = None):
+        super().__init__(argument)
+        from .accumulators import create_accumulator
+
+        self.accumulator = create_accumulator(self.function)
+
+    def step(self, value: Optional[str]) -> Any:
+        accumulator = self.accumulator
+        if accumulator.numeric:
+            number = _number(value)
+            if number is not None:
+                accumulator.update(number)
+        elif value:
+            accumulator.update(value)
+        if accumulator.count or accumulator.allow_empty:
+            return accumulator.finalize()
+        return None
+
+
+@register_window("cumsum")
+class CumSumWindow(CumulativeWindow):
+    """Накопительная сумма."""
+
+    function = "sum"
+
+
+@register_window("cumavg")
+class CumAvgWindow(CumulativeWindow):
+    """Накопительное среднее."""
+
+    function = "avg"
+
+
+@register_window("cummin")
+class CumMinWindow(CumulativeWindow):
+    """Накопительный минимум."""
+
+    function = "min"
+
+
+@register_window("cummax")
+class CumMaxWindow(CumulativeWindow):
+    """Накопительный максимум."""
+
+    function = "max"
+
+
+@register_window("cumcount")
+class CumCountWindow(CumulativeWindow):
+    """Число непустых значений с начала секции."""
+
+    function = "count"
+
+
+@register_window("rank")
+class RankWindow(WindowFunction):
+    """
+    Ранг строки в секции (как RANK в SQL): номер строки, равные подряд
+    значения получают ранг первой из них. Строки должны быть упорядочены
+    по столбцу функции (--order-by).
+    """
+
+    def __init__(self, argument: Optional[int] = None):
+        super().__init__(argument)
+        from .sorting import value_key
+
+        self.value_key = value_key
+        self.number = 0
+        self.rank = 0
+        self.previous: Any = None
+
+    def step(self, value: Optional[str]) -> int:
+        self.number += 1
+        key = self.value_key(value)
+        if self.number == 1 or key != self.previous:
+            self.rank = self.number
+            self.previous = key
+        return self.rank
+
+
+@register_window("lag")
+class LagWindow(WindowFunction):
+    """Значение столбца N строк назад в секции (по умолчанию — предыдущей строки)."""
+
+    accepts_argument = True
+    default_argument = 1
+
+    def __init__(self, argument: Optional[int] = None):
+        super().__init__(argument)
+        self.values: Deque[Optional[str]] = deque(maxlen=self.argument + 1)
+
+    def step(self, value: Optional[str]) -> Optional[str]:
+        self.values.append(value)
+        return self.values[0] if len(self.values) > self.argument else None
+
+
+def window_column(condition) -> str:
+    """
+    Имя столбца результата оконной функции: 'moving_avg:7(price)'.
+    """
+    function = condition.function
+    if condition.argument is not None:
+        function = f"{function}:{condition.argument}"
+    return f"{function}({condition.column})"
+
+
+def apply_windows(headers: List[str], rows: Iterable[Row], conditions: Sequence[Any],
+                  partition_by: Sequence[str] = (),
+                  governor: Optional["MemoryGovernor"] = None) -> Tuple[List[str], Iterator[Row]]:
+    """
+    Заголовки результата и ленивый итератор строк с добавленными столбцами
+    оконных функций (в порядке conditions). С governor память состояний
+    секций резервируется в общем бюджете запроса.
+
+    Raises:
+        KeyError: если столбца функции или секционирования нет в данных
+        ValueError: если состояния секций не помещаются в бюджет памяти
+    """
+    for column in chain(partition_by, (condition.column for condition in conditions)):
+        if column not in headers:
+            raise KeyError(column)
+    names = [window_column(condition) for condition in conditions]
+    result_headers = list(headers) + [name for name in names if name not in headers]
+    classes = [(get_window_class(condition.function), condition.argument) for condition in conditions]
+
+    def output() -> Iterator[Row]:
+        iterator = iter(rows)
+        first = next(iterator, None)
+        if first is None:
+            return
+        values_of = key_getter(first, headers)
+        columns_of = key_getter(first, [condition.column for condition in conditions])
+        partition_of = key_getter(first, partition_by)
+        record = record_type(list(headers) + names)
+        states: Dict[Tuple, List[WindowFunction]] = {}
+        reservation = governor.reserve("window") if governor is not None else None
+        try:
+            for row in chain((first,), iterator):
+                key = partition_of(row)
+                functions = states.get(key)
+                if functions is None:
+                    functions = [cls(argument) for cls, argument in classes]
+                    if reservation is not None:
+                        size = sum(function.nbytes for function in functions)
+                        size += STATE_BYTES + sum(len(value) for value in key if isinstance(value, str))
+                        reservation.grow(size, "Секции оконных функций")
+                    states[key] = functions
+                results = [function.step(value) for function, value in zip(functions, columns_of(row))]
+                yield record.from_values(values_of(row) + tuple(results))
+        finally:
+            if reservation is not None:
+                reservation.release()
+
+    return result_headers, output()
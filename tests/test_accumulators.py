@@ -0,0 +1,110 @@
+import json
+import random
+
+import pytest
+from src.accumulators import (
+    ACCUMULATORS,
+    Accumulator,
+    create_accumulator,
+    register_accumulator,
+    restore_accumulator,
+)
+from src.aggregator import Aggregator
+from src.argument_parser import AggregateFunction, parse_arguments
+from src.command_handler import CommandHandler
+
+
+def test_every_builtin_function_is_registered():
+    """
+    Проверяет, что у каждой встроенной функции есть аккумулятор в реестре.
+    """
+    for function in AggregateFunction:
+        assert function.value in ACCUMULATORS
+
+
+@pytest.mark.parametrize("name", [f.value for f in AggregateFunction])
+def test_merge_matches_single_pass(name):
+    """
+    Проверяет, что слияние аккумуляторов частей совпадает с одним проходом
+    по всем данным, а состояние переживает сериализацию в JSON.
+    """
+    rng = random.Random(7)
+    numbers = [float(rng.randint(0, 50)) for _ in range(300)]
+    whole = create_accumulator(name)
+    parts = [create_accumulator(name) for _ in range(3)]
+    values = numbers if whole.numeric else [str(int(v)) for v in numbers]
+
+    whole.update_many(values)
+    for index, part in enumerate(parts):
+        part.update_many(values[index::3])
+    merged = restore_accumulator(json.loads(json.dumps(parts[0].to_state())))
+    for part in parts[1:]:
+        merged.merge(part)
+
+    assert merged.count == whole.count
+    assert merged.finalize() == pytest.approx(whole.finalize(), rel=0.02)
+
+
+@pytest.mark.parametrize("name,expected", [
+    ("sum", 10.0),
+    ("count", 4),
+    ("var", 1.6666666666666667),
+    ("stddev", 1.2909944487358056),
+])
+def test_accumulator_values(name, expected):
+    accumulator = create_accumulator(name)
+    accumulator.update_many([1.0, 2.0, 3.0, 4.0])
+    assert accumulator.finalize() == pytest.approx(expected)
+
+
+def test_merge_with_empty_accumulator():
+    accumulator = create_accumulator("min")
+    accumulator.update_many([3.0, 1.0])
+    accumulator.merge(create_accumulator("min"))
+    assert accumulator.finalize() == 1.0
+    assert accumulator.count == 2
+
+
+@pytest.mark.parametrize("count", [1, 10, 290, 1000])
+def test_approx_distinct_does_not_exceed_values_seen(count):
+    accumulator = create_accumulator("approx_distinct")
+    accumulator.update_many(f"value-{i}" for i in range(count))
+    assert accumulator.finalize() <= count
+    merged = create_accumulator("approx_distinct")
+    merged.merge(accumulator)
+    assert merged.finalize() <= count
+
+
+def test_custom_accumulator_registration(tmp_path):
+    """
+    Проверяет, что новая функция подключается регистрацией, без правок Aggregator.
+    """
+
+    @register_accumulator("range")
+    class RangeAccumulator(Accumulator):
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+            self.low = self.high = None
+
+        def update(self, value):
+            self.low = value if self.low is None else min(self.low, value)
+            self.high = value if self.high is None else max(self.high, value)
+            self.count += 1
+
+        def finalize(self):
+            return self.high - self.low
+
+    try:
+        data = [{"price": "100"}, {"price": "40"}, {"price": "70"}]
+        assert Aggregator().aggregate_data(data, "price=range") == 60.0
+        file_path = tmp_path / "prices.csv"
+        file_path.write_text("brand,price\na,100\nb,40\na,70\n", encoding="utf-8")
+        args = parse_arguments([str(file_path), "--aggregate", "price=range"])
+        assert args.aggregate_condition.function == "range"
+        result = CommandHandler().run(args)
+        assert (result.function, result.value) == ("range", 60.0)
+        grouped = CommandHandler().run(parse_arguments([str(file_path), "--aggregate", "price=range",
+                                                        "--group-by", "brand"]))
+        assert [row["range(price)"] for row in grouped.rows] == [30.0, 0.0]
+    finally:
+        del ACCUMULATORS["range"]
@@ -16,6 +16,17 @@ from tests.fixtures.csv_files import *
         ("csv_with_non_numeric", "price=avg", 75.0),
         ("csv_with_non_numeric", "price=min", 50.0),
         ("csv_with_non_numeric", "price=max", 100.0),
+        ("simple_csv_file", "price=approx_percentile:0", 50.0),
+        ("simple_csv_file", "price=approx_percentile:100", 100.0),
+        ("simple_csv_file", "name=approx_distinct", 2),
+        ("csv_with_non_numeric", "price=approx_distinct", 3),
+        ("simple_csv_file", "price=sum", 150.0),
+        ("csv_with_non_numeric", "price=count", 3),
+        ("simple_csv_file", "not_a_column=count", 0),
+        ("csv_with_non_numeric", "price=count_distinct", 3),
+        ("simple_csv_file", "price=var", 1250.0),
+        ("simple_csv_file", "price=stddev", 1250.0 ** 0.5),
+        ("headers_csv_file", "price=var", 0.0),
     ]
 )
 def test_aggregate_data_parametrized(request, fixture_name, condition, expected_result):
@@ -35,7 +46,9 @@ def test_aggregate_data_parametrized(request, fixture_name, condition, expected_
     "fixture_name,condition,expected_exception,expected_message",
     [
         ("simple_csv_file", "not_a_column=avg", ValueError, "Нет числовых значений в столбце"),
-        ("simple_csv_file", "price=sum", ValueError, "Неподдерживаемая функция агрегации"),
+        ("simple_csv_file", "price=median", ValueError, "Неподдерживаемая функция агрегации"),
+        ("simple_csv_file", "price=avg:5", ValueError, "не принимает параметр"),
+        ("simple_csv_file", "name=count_distinct:1", ValueError, "не принимает параметр"),
         ("only_headers_csv_file", "price=avg", ValueError, "Нет числовых значений в столбце"),
         ("simple_csv_file", "badformat", ValueError, "Некорректный формат условия агрегации"),
         ("csv_with_non_numeric", "price=avg", None, None),
@@ -0,0 +1,90 @@
+import pytest
+from src import Query, open_csv
+from src.argument_parser import FilterCondition, FilterOperator
+
+
+@pytest.fixture
+def sample_csv_file(tmp_path):
+    file_path = tmp_path / "phones.csv"
+    file_path.write_text(
+        "name,brand,price,rating\n"
+        "iphone 15 pro,apple,999,4.9\n"
+        "galaxy s23 ultra,samsung,1199,4.8\n"
+        "redmi note 12,xiaomi,199,4.6\n"
+        "poco x5 pro,xiaomi,299,4.4\n"
+    )
+    return file_path
+
+
+def test_where_order_by_limit(sample_csv_file):
+    query = open_csv(str(sample_csv_file)).where("price>250").order_by("price=desc").limit(2)
+    assert isinstance(query, Query)
+    assert [row["name"] for row in query] == ["galaxy s23 ultra", "iphone 15 pro"]
+
+
+def test_query_is_immutable_and_reusable(sample_csv_file):
+    base = open_csv(str(sample_csv_file))
+    xiaomi = base.where(FilterCondition("brand", FilterOperator.EQUAL, "xiaomi"))
+    cheap = xiaomi.where("price<250")
+    assert len(list(base)) == 4
+    assert len(list(xiaomi)) == 2
+    assert [row["name"] for row in cheap] == ["redmi note 12"]
+    assert len(list(xiaomi)) == 2
+
+
+def test_rows_are_lazy(sample_csv_file):
+    rows = open_csv(str(sample_csv_file)).rows()
+    assert next(rows)["name"] == "iphone 15 pro"
+    rows.close()
+
+
+@pytest.mark.parametrize("size,expected_sizes", [
+    (1, [1, 1, 1, 1]),
+    (3, [3, 1]),
+    (10, [4]),
+])
+def test_batches(sample_csv_file, size, expected_sizes):
+    batches = list(open_csv(str(sample_csv_file)).batches(size))
+    assert [len(batch["price"]) for batch in batches] == expected_sizes
+    assert list(batches[0]) == ["name", "brand", "price", "rating"]
+    assert sum((batch["name"] for batch in batches), []) == [
+        "iphone 15 pro", "galaxy s23 ultra", "redmi note 12", "poco x5 pro"
+    ]
+
+
+@pytest.mark.parametrize("condition,expected", [
+    ("price=avg", 674.0),
+    ("price=max", 1199.0),
+    ("brand=count_distinct", 3),
+    ("price=approx_percentile:50", 649.0),
+])
+def test_aggregate(sample_csv_file, condition, expected):
+    assert open_csv(str(sample_csv_file)).aggregate(condition) == pytest.approx(expected)
+
+
+def test_aggregate_with_where(sample_csv_file):
+    assert open_csv(str(sample_csv_file)).where("brand=xiaomi").aggregate("price=sum") == 498.0
+
+
+def test_headers(sample_csv_file):
+    assert open_csv(str(sample_csv_file)).headers == ["name", "brand", "price", "rating"]
+
+
+def test_errors_are_raised(sample_csv_file):
+    with pytest.raises(FileNotFoundError):
+        open_csv("missing.csv")
+    query = open_csv(str(sample_csv_file))
+    with pytest.raises(ValueError):
+        query.where("price>=5")
+    with pytest.raises(ValueError):
+        query.order_by("price=up")
+    with pytest.raises(ValueError):
+        query.limit(-1)
+    with pytest.raises(ValueError, match="Неподдерживаемая функция"):
+        query.aggregate("price=median")
+    with pytest.raises(KeyError, match="missing"):
+        query.aggregate("missing=avg")
+    with pytest.raises(ValueError, match="Нет числовых значений"):
+        query.aggregate("name=avg")
+    with pytest.raises(KeyError):
+        list(query.where("missing is null"))
@@ -9,6 +9,8 @@ from src.argument_parser import (
     Arguments,
     FilterCondition,
     FilterOperator,
+    JoinCondition,
+    JoinType,
     SortDirection,
     create_parser,
     parse_aggregate_condition,
@@ -62,6 +64,12 @@ def test_create_parser_structure():
         ("category=Electronics", "category", FilterOperator.EQUAL, "Electronics"),
         ("name=John Doe", "name", FilterOperator.EQUAL, "John Doe"),
         ("user_id=123", "user_id", FilterOperator.EQUAL, "123"),
+        ("brand in (apple, xiaomi)", "brand", FilterOperator.IN, "apple, xiaomi"),
+        ("sku~^A-\\d+$", "sku", FilterOperator.REGEX, "^A-\\d+$"),
+        ("sku^=A-", "sku", FilterOperator.PREFIX, "A-"),
+        ("brand~=APPLE", "brand", FilterOperator.EQUAL_IGNORE_CASE, "APPLE"),
+        ("note is null", "note", FilterOperator.IS_NULL, ""),
+        ("note is not null", "note", FilterOperator.IS_NOT_NULL, ""),
     ],
 )
 def test_parse_filter_condition_valid(
@@ -73,6 +81,7 @@ def test_parse_filter_condition_valid(
     assert condition.column == expected_column
     assert condition.operator == expected_operator
     assert condition.value == expected_value
+    assert condition.predicate is not None
 
 
 @pytest.mark.parametrize(
@@ -83,6 +92,8 @@ def test_parse_filter_condition_valid(
         ("=value", "Некорректный формат условия фильтрации"),
         ("price!=100", "Некорректный формат условия фильтрации"),
         ("amount>=50", "Некорректный формат условия фильтрации"),
+        ("brand in ()", "Пустой список значений IN"),
+        ("sku~[A-", "Некорректное регулярное выражение"),
         ("", "Некорректный формат условия фильтрации"),
         ("   ", "Некорректный формат условия фильтрации"),
     ],
@@ -104,6 +115,11 @@ def test_parse_filter_condition_invalid(invalid_condition, expected_error):
         ("price=Avg", "price", AggregateFunction.AVG),
         ("price=aVg", "price", AggregateFunction.AVG),
         ("user_score=max", "user_score", AggregateFunction.MAX),
+        ("price=approx_percentile:95", "price", AggregateFunction.APPROX_PERCENTILE),
+        ("user_id=approx_distinct", "user_id", AggregateFunction.APPROX_DISTINCT),
+        ("price=sum", "price", AggregateFunction.SUM),
+        ("name=count_distinct", "name", AggregateFunction.COUNT_DISTINCT),
+        ("price=STDDEV", "price", AggregateFunction.STDDEV),
     ],
 )
 def test_parse_aggregate_condition_valid(
@@ -121,7 +137,9 @@ def test_parse_aggregate_condition_valid(
     [
         ("invalid", "Некорректный формат условия агрегации"),
         ("column>avg", "Некорректный формат условия агрегации"),
-        ("price=sum", "Неподдерживаемая функция агрегации"),
+        ("price=median", "Неподдерживаемая функция агрегации"),
+        ("price=approx_percentile:101", "Перцентиль должен быть в интервале"),
+        ("price=avg:5", "не принимает параметр"),
         ("", "Некорректный формат условия агрегации"),
         ("   ", "Некорректный формат условия агрегации"),
     ],
@@ -322,3 +340,21 @@ def test_parse_arguments_order_by(request, csv_fixture_name, order_arg, expected
     assert args.order_by_condition.direction == expected_direction
     assert args.filter_condition is None
     assert args.aggregate_condition is None
+
+
+def test_parse_arguments_join(simple_csv_file, headers_csv_file):
+    args = parse_arguments([
+        str(simple_csv_file), "--join", str(headers_csv_file), "--on", "name",
+        "--join-type", "left", "--where", "price>50",
+    ])
+    assert args.join_condition == JoinCondition(str(headers_csv_file), "name", JoinType.LEFT)
+    assert args.filter_condition is not None
+
+
+@pytest.mark.parametrize("extra_args,expected_error", [
+    (["--join", "other.csv"], "Некорректный ключ соединения"),
+    (["--on", "name"], "только вместе с --join"),
+])
+def test_parse_arguments_join_invalid(simple_csv_file, extra_args, expected_error):
+    with pytest.raises(ValueError, match=expected_error):
+        parse_arguments([str(simple_csv_file)] + extra_args)
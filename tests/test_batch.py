@@ -0,0 +1,148 @@
+import json
+
+import pytest
+from src.argument_parser import parse_arguments
+from src.batch import BatchExecutor, load_queries
+from src.command_handler import CommandHandler
+from src.csv_reader import CSVReader
+
+
+@pytest.fixture
+def sample_csv_file(tmp_path):
+    file_path = tmp_path / "phones.csv"
+    file_path.write_text(
+        "name,brand,price,rating\n"
+        "iphone 15 pro,apple,999,4.9\n"
+        "galaxy s23 ultra,samsung,1199,4.8\n"
+        "redmi note 12,xiaomi,199,4.6\n"
+        "poco x5 pro,xiaomi,299,4.4\n"
+    )
+    return file_path
+
+
+@pytest.fixture
+def queries_file(tmp_path):
+    file_path = tmp_path / "nightly.txt"
+    file_path.write_text(
+        "# ночной отчет\n"
+        '--where "price>500"\n'
+        "\n"
+        "--aggregate price=avg\n"
+        "--aggregate brand=count_distinct\n"
+        "--aggregate missing=avg\n"
+        '--order-by "price=desc"\n'
+    )
+    return file_path
+
+
+class CountingReader(CSVReader):
+    def __init__(self):
+        self.scans = 0
+
+    def iter_file(self, filepath):
+        self.scans += 1
+        return super().iter_file(filepath)
+
+
+def test_batch_answers_all_queries_in_one_scan(sample_csv_file, queries_file):
+    reader = CountingReader()
+    queries = load_queries(str(queries_file), str(sample_csv_file))
+    results = BatchExecutor(reader).execute(str(sample_csv_file), queries)
+
+    assert reader.scans == 1
+    assert [row["name"] for row in results[0].result.rows] == ["iphone 15 pro", "galaxy s23 ultra"]
+    assert results[1].result.value == 674.0
+    assert results[2].result.value == 3
+    assert isinstance(results[3].error, ValueError)
+    assert [row["price"] for row in results[4].result.rows] == ["1199", "999", "299", "199"]
+
+
+def test_batch_results_match_single_queries(sample_csv_file, queries_file):
+    queries = load_queries(str(queries_file), str(sample_csv_file))
+    results = BatchExecutor().execute(str(sample_csv_file), queries)
+    for query, batch_result in zip(queries, results):
+        if batch_result.error is None:
+            assert batch_result.result == CommandHandler().run(query.arguments)
+
+
+def test_load_json_queries(tmp_path, sample_csv_file):
+    spec = tmp_path / "nightly.json"
+    spec.write_text(json.dumps({"queries": [
+        {"where": "brand=xiaomi", "output": "xiaomi.txt"},
+        {"aggregate": "rating=max"},
+    ]}))
+    queries = load_queries(str(spec), str(sample_csv_file))
+    assert queries[0].output == "xiaomi.txt"
+    assert queries[0].arguments.filter_condition.value == "xiaomi"
+    assert queries[1].arguments.aggregate_condition.column == "rating"
+
+
+@pytest.mark.parametrize("content", [
+    "",
+    "# только комментарий\n",
+    "--aggregate price=median\n",
+    "--where price>1 --cache\n",
+    "--unknown\n",
+])
+def test_load_invalid_queries(tmp_path, sample_csv_file, content):
+    spec = tmp_path / "bad.txt"
+    spec.write_text(content)
+    with pytest.raises(ValueError):
+        load_queries(str(spec), str(sample_csv_file))
+
+
+@pytest.mark.parametrize("line", [
+    "--aggregate price=sum --group-by brand",
+    "--count",
+    "--distinct brand",
+    "--where price>1 --sample 0.5",
+    "--describe",
+    "--order-by price=asc --window price=cumsum",
+    "--aggregate price=sum --bucket name=1h",
+    "--where price>1 --sorted-by price",
+    "--where price>1 --memory-limit 1M",
+    "--head 2",
+    "--where price>1 --read-ahead 2",
+])
+def test_batch_rejects_unsupported_options(tmp_path, sample_csv_file, line):
+    spec = tmp_path / "bad.txt"
+    spec.write_text(line + "\n")
+    with pytest.raises(ValueError, match="допустимы только"):
+        load_queries(str(spec), str(sample_csv_file))
+
+
+def test_queries_output_dir(tmp_path, sample_csv_file, queries_file, capsys):
+    output_dir = tmp_path / "reports"
+    args = parse_arguments([str(sample_csv_file), "--queries", str(queries_file), "--output-dir", str(output_dir)])
+    CommandHandler().execute(args)
+
+    assert capsys.readouterr().out == ""
+    assert sorted(p.name for p in output_dir.iterdir()) == [f"query-{n:03d}.txt" for n in range(1, 6)]
+    assert "674" in (output_dir / "query-002.txt").read_text()
+    assert "Ошибка данных" in (output_dir / "query-004.txt").read_text()
+
+
+def test_queries_stdout(sample_csv_file, queries_file, capsys):
+    CommandHandler().execute(parse_arguments([str(sample_csv_file), "--queries", str(queries_file)]))
+    out = capsys.readouterr().out
+    assert 'Запрос 1: --where "price>500"' in out
+    assert "AVG по столбцу 'price': 674" in out
+
+
+@pytest.mark.parametrize("argv", [
+    ["--queries", "q.txt", "--where", "price>1"],
+    ["--queries", "q.txt", "--follow"],
+    ["--output-dir", "out"],
+])
+def test_queries_invalid_combinations(argv):
+    with pytest.raises(ValueError):
+        parse_arguments(["phones.csv"] + argv)
+
+
+def test_batch_filter_on_unknown_column(sample_csv_file, tmp_path):
+    queries_file = tmp_path / "typo.txt"
+    queries_file.write_text('--where "prise is null"\n--where "price>1000"\n')
+    queries = load_queries(str(queries_file), str(sample_csv_file))
+    results = BatchExecutor().execute(str(sample_csv_file), queries)
+    assert isinstance(results[0].error, KeyError)
+    assert [row["name"] for row in results[1].result.rows] == ["galaxy s23 ultra"]
@@ -1,7 +1,7 @@
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from src.command_handler import CommandHandler
-from src.argument_parser import Arguments, FilterCondition, AggregateCondition, FilterOperator, AggregateFunction, SortCondition, SortDirection
+from src.argument_parser import Arguments, FilterCondition, AggregateCondition, FilterOperator, AggregateFunction, SortCondition, SortDirection, JoinCondition
 
 def test_command_handler_initialization():
     """Тест инициализации CommandHandler"""
@@ -159,4 +159,61 @@ def test_execute_order_by_branch():
     args = Arguments(filename="test.csv", order_by_condition=("price", "asc"))
     with patch.object(handler, '_execute_order_by') as mock_order_by:
         handler.execute(args)
-        mock_order_by.assert_called_once() 
\ No newline at end of file
+        mock_order_by.assert_called_once() 
+
+def test_execute_join_flows_into_filter(capsys, tmp_path):
+    """Тест что строки соединения проходят через этап фильтрации"""
+    orders = tmp_path / "orders.csv"
+    orders.write_text("id,sku\n1,a\n2,b\n3,c")
+    products = tmp_path / "products.csv"
+    products.write_text("sku,price\na,100\nb,700")
+    handler = CommandHandler()
+    args = Arguments(
+        filename=str(orders),
+        filter_condition=FilterCondition(column="price", operator=FilterOperator.GREATER, value="500"),
+        join_condition=JoinCondition(filename=str(products), key="sku"),
+    )
+
+    handler.execute(args)
+
+    output = capsys.readouterr().out
+    assert "700" in output
+    assert "100" not in output
+
+
+def test_startup_does_not_import_optional_modules():
+    """Тест: простой запрос не импортирует tabulate и модули необязательных режимов"""
+    import os
+    import subprocess
+    import sys
+
+    code = (
+        "import sys; import main; "
+        "from src.argument_parser import parse_arguments; "
+        "parse_arguments(['phones.csv', '--aggregate', 'price=avg']); "
+        "print(','.join(sorted(m for m in sys.modules if m == 'tabulate' or m.startswith('src.'))))"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    completed = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+    loaded = set(completed.stdout.strip().split(","))
+    for module in ("tabulate", "src.sketches", "src.join_engine", "src.incremental", "src.follow", "src.server",
+                   "src.read_ahead", "src.profiling", "src.raw_scan", "src.window",
+                   "src.key_set", "src.distributed", "src.aggregator", "src.sorting", "src.timestamps"):
+        assert module not in loaded
+
+
+def test_argument_parser_imports_only_used_options():
+    """Тест: разбор аргументов загружает только модули указанных параметров"""
+    import os
+    import subprocess
+    import sys
+
+    code = (
+        "import sys; "
+        "from src.argument_parser import parse_arguments; "
+        "parse_arguments(['phones.csv', '--aggregate', 'price=avg']); "
+        "print(','.join(sorted(m for m in sys.modules if m.startswith('src.'))))"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    completed = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+    assert set(completed.stdout.strip().split(",")) == {"src.argument_parser", "src.accumulators"}
@@ -58,3 +58,28 @@ def test_read_file_handles_missing_file(tmp_path):
     missing_file = tmp_path / "nonexistent_file.csv"
     with pytest.raises(FileNotFoundError, match="Файл не найден"):
         reader.read_file(str(missing_file))
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1024])
+def test_iter_row_blocks_respects_quoted_newlines(tmp_path, chunk_size):
+    """
+    Проверяет, что блоки заканчиваются только на границах записей,
+    а перевод строки внутри кавычек не разрывает запись.
+    """
+    file_path = tmp_path / "quoted.csv"
+    file_path.write_bytes(b'name,note\nApple,"red\nfruit"\nBanana,plain\nCherry,"tail')
+    reader = CSVReader()
+    blocks = list(reader.iter_row_blocks(str(file_path), chunk_size=chunk_size))
+
+    complete_rows = [row for block in blocks if block.complete for row in block.rows]
+    assert complete_rows == [["name", "note"], ["Apple", "red\nfruit"], ["Banana", "plain"]]
+    assert not blocks[-1].complete
+    assert blocks[-1].rows == [["Cherry", "tail"]]
+    assert blocks[-1].end_offset == file_path.stat().st_size
+
+
+def test_iter_row_blocks_from_offset(tmp_path):
+    file_path = tmp_path / "offset.csv"
+    file_path.write_bytes(b"a,b\n1,2\n3,4\n")
+    reader = CSVReader()
+    blocks = list(reader.iter_row_blocks(str(file_path), offset=8))
+    assert [row for block in blocks for row in block.rows] == [["3", "4"]]
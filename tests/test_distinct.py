@@ -0,0 +1,111 @@
+import pytest
+from src.argument_parser import parse_arguments
+from src.command_handler import CommandHandler
+from src.distinct import Deduplicator
+from src.memory import MemoryGovernor
+
+
+@pytest.fixture
+def duplicates_csv_file(tmp_path):
+    file_path = tmp_path / "export.csv"
+    file_path.write_text(
+        "name,brand,price\n"
+        "iphone 15 pro,apple,999\n"
+        "redmi note 12,xiaomi,199\n"
+        "iphone 15 pro,apple,999\n"
+        "poco x5 pro,xiaomi,299\n"
+        "redmi note 12,xiaomi,199\n"
+    )
+    return file_path
+
+
+def _rows(count, distinct):
+    return [{"id": str(i % distinct), "group": str(i % distinct % 3)} for i in range(count)]
+
+
+def test_distinct_full_rows_keeps_first_occurrence_order():
+    headers, rows = Deduplicator().distinct(["id", "group"], _rows(30, 10))
+    assert headers == ["id", "group"]
+    assert [row["id"] for row in rows] == [str(i) for i in range(10)]
+
+
+def test_distinct_columns():
+    headers, rows = Deduplicator().distinct(["id", "group"], _rows(30, 10), ["group"])
+    assert headers == ["group"]
+    assert list(rows) == [{"group": "0"}, {"group": "1"}, {"group": "2"}]
+
+
+def test_distinct_missing_column():
+    with pytest.raises(KeyError):
+        Deduplicator().distinct(["id"], [], ["missing"])
+
+
+def test_distinct_spills_to_disk_when_over_budget():
+    deduplicator = Deduplicator(memory_budget=2000, partitions=8)
+    _, rows = deduplicator.distinct(["id", "group"], _rows(5000, 700))
+    ids = [row["id"] for row in rows]
+    assert deduplicator.spilled_partitions >= 8
+    assert len(ids) == 700
+    assert set(ids) == {str(i) for i in range(700)}
+
+
+def test_distinct_distinguishes_missing_and_empty_values():
+    rows = [{"a": ""}, {}, {"a": ""}, {}]
+    deduplicator = Deduplicator(memory_budget=1, partitions=2)
+    _, unique = deduplicator.distinct(["a"], rows)
+    assert sorted(unique, key=lambda row: row["a"] is None) == [{"a": ""}, {"a": None}]
+
+
+def test_distinct_verifies_hash_collisions(monkeypatch):
+    monkeypatch.setattr("src.distinct.fingerprint", lambda key, depth=0: 42)
+    deduplicator = Deduplicator(memory_budget=1, partitions=4)
+    _, rows = deduplicator.distinct(["id"], [{"id": "a"}, {"id": "b"}, {"id": "a"}, {"id": "c"}, {"id": "b"}])
+    assert sorted(row["id"] for row in rows) == ["a", "b", "c"]
+
+
+def test_distinct_within_budget_does_not_spill(monkeypatch):
+    def no_temporary_directory(*args, **kwargs):
+        raise AssertionError("временные файлы без нехватки памяти")
+
+    monkeypatch.setattr("src.distinct.tempfile.TemporaryDirectory", no_temporary_directory)
+    governor = MemoryGovernor(10 ** 9)
+    deduplicator = Deduplicator(governor=governor)
+    _, unique = deduplicator.distinct(["id", "group"], _rows(5000, 700))
+    assert [row["id"] for row in unique] == [str(i) for i in range(700)]
+    assert deduplicator.spilled_partitions == 0
+    assert governor.operator_peaks["distinct"] > 0
+
+
+def test_distinct_verifies_hash_collisions_after_spill(monkeypatch):
+    monkeypatch.setattr("src.distinct.fingerprint", lambda key, depth=0: 42 if depth == 0 else hash(key))
+    deduplicator = Deduplicator(memory_budget=1, partitions=4)
+    _, rows = deduplicator.distinct(["id"], [{"id": value} for value in "abacbdca"])
+    assert sorted(row["id"] for row in rows) == ["a", "b", "c", "d"]
+
+
+@pytest.mark.parametrize("argv,expected", [
+    (["--distinct"], [
+        ["iphone 15 pro", "apple", "999"], ["redmi note 12", "xiaomi", "199"], ["poco x5 pro", "xiaomi", "299"],
+    ]),
+    (["--distinct", "brand"], [["apple"], ["xiaomi"]]),
+    (["--where", "price<500", "--distinct", "brand,price"], [["xiaomi", "199"], ["xiaomi", "299"]]),
+    (["--distinct", "brand", "--order-by", "brand=desc"], [["xiaomi"], ["apple"]]),
+])
+def test_command_handler_distinct(duplicates_csv_file, argv, expected):
+    result = CommandHandler().run(parse_arguments([str(duplicates_csv_file)] + argv))
+    assert [list(row.values()) for row in result.rows] == expected
+
+
+def test_order_by_column_outside_distinct(duplicates_csv_file):
+    args = parse_arguments([str(duplicates_csv_file), "--distinct", "brand", "--order-by", "price=asc"])
+    with pytest.raises(KeyError):
+        CommandHandler().run(args)
+
+
+@pytest.mark.parametrize("argv", [
+    ["--distinct", "brand,", "--where", "price>1"],
+    ["--distinct", "--aggregate", "price=avg"],
+])
+def test_distinct_invalid_arguments(argv):
+    with pytest.raises(ValueError):
+        parse_arguments(["data.csv"] + argv)
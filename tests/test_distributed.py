@@ -0,0 +1,231 @@
+"""
+Тесты распределенного выполнения: координатор и исполнители на localhost.
+"""
+
+import os
+import random
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from src.argument_parser import parse_arguments
+from src.command_handler import CommandHandler
+from src.distributed import Coordinator, WorkerServer, build_plan, parse_worker_addresses, request_worker
+
+HEADERS = ["ts", "store", "price"]
+
+
+def _write_shards(directory, shards=4, rows=30, seed=5):
+    rng = random.Random(seed)
+    dataset = directory / "sales"
+    dataset.mkdir(parents=True)
+    for shard in range(shards):
+        lines = [",".join(HEADERS)]
+        for row in range(rows):
+            price = "" if rng.random() < 0.1 else str(rng.randint(1, 500))
+            lines.append(f"2024-03-0{shard + 1}T{row % 24:02d}:00:00,{rng.choice('abc')},{price}")
+        (dataset / f"part-{shard}.csv").write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return dataset
+
+
+def _local_copy(dataset, tmp_path):
+    """Все файлы набора одним файлом: эталон локального выполнения."""
+    combined = tmp_path / "combined.csv"
+    parts = sorted(dataset.glob("*.csv"))
+    lines = [parts[0].read_text(encoding="utf-8").splitlines()[0]]
+    for part in parts:
+        lines.extend(part.read_text(encoding="utf-8").splitlines()[1:])
+    combined.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return combined
+
+
+class DroppingWorkerServer(WorkerServer):
+    """Исполнитель, который находит файлы, но обрывает соединение при выполнении."""
+
+    def handle_request_message(self, message):
+        if message.get("op") == "run":
+            raise ConnectionAbortedError("исполнитель остановлен")
+        return super().handle_request_message(message)
+
+    def handle_error(self, request, client_address):
+        pass
+
+
+def _start(server):
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    return server
+
+
+@pytest.fixture
+def cluster(tmp_path):
+    data_dir = tmp_path / "data"
+    dataset = _write_shards(data_dir)
+    servers = [_start(WorkerServer(str(data_dir), port=0)) for _ in range(3)]
+    yield data_dir, dataset, servers
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _coordinator_argv(servers):
+    return ["--coordinator", ",".join(server.address for server in servers)]
+
+
+def _run(argv):
+    return CommandHandler().run(parse_arguments(argv))
+
+
+def _assert_same(result, expected):
+    # Моменты профиля сливаются по формуле Чана: совпадение с точностью до округления
+    assert result.headers == expected.headers and len(result.rows) == len(expected.rows)
+    for row, expected_row in zip(result.rows, expected.rows):
+        assert {key: pytest.approx(value) if isinstance(value, float) else value
+                for key, value in expected_row.items()} == dict(row)
+    if expected.is_aggregate:
+        assert (result.column, result.function, result.value) == (expected.column, expected.function, expected.value)
+
+
+@pytest.mark.parametrize("query", [
+    [],
+    ["--where", "price>250"],
+    ["--where", "store in (a,c)"],
+    ["--order-by", "price=desc,ts=asc"],
+    ["--aggregate", "price=avg"],
+    ["--aggregate", "price=sum", "--group-by", "store"],
+    ["--aggregate", "price=count", "--bucket", "ts=1d", "--group-by", "store"],
+    ["--aggregate", "store=approx_distinct"],
+    ["--describe"],
+    ["--count"],
+])
+def test_distributed_matches_local(cluster, tmp_path, monkeypatch, query):
+    data_dir, dataset, servers = cluster
+    expected = _run([str(_local_copy(dataset, tmp_path))] + query)
+    monkeypatch.chdir(tmp_path)
+    result = _run(["sales"] + query + _coordinator_argv(servers))
+    _assert_same(result, expected)
+
+
+def test_failed_worker_files_are_reassigned(cluster, tmp_path, monkeypatch):
+    data_dir, dataset, servers = cluster
+    dropping = _start(DroppingWorkerServer(str(data_dir), port=0))
+    try:
+        expected = _run([str(_local_copy(dataset, tmp_path)), "--aggregate", "price=sum", "--group-by", "store"])
+        coordinator = Coordinator(parse_worker_addresses(f"{dropping.address},{servers[0].address}"))
+        plan = build_plan(parse_arguments(["sales", "--aggregate", "price=sum"]), 0.01)
+        headers, partials = coordinator.run("sales", plan)
+        assert headers == HEADERS and len(partials) == 4
+        assert coordinator.failed == {dropping.server_address[:2]}
+        monkeypatch.chdir(tmp_path)
+        argv = ["sales", "--aggregate", "price=sum", "--group-by", "store",
+                "--coordinator", f"{dropping.address},{servers[1].address}"]
+        assert _run(argv).to_dict() == expected.to_dict()
+    finally:
+        dropping.shutdown()
+        dropping.server_close()
+
+
+def test_unreachable_worker_is_skipped(cluster):
+    _, _, servers = cluster
+    stopped = servers.pop()
+    stopped.shutdown()
+    stopped.server_close()
+    result = _run(["sales", "--count"] + _coordinator_argv(servers + [stopped]))
+    assert result.value == 120
+
+
+def test_file_without_live_replica(tmp_path):
+    first, second = tmp_path / "first", tmp_path / "second"
+    _write_shards(first, shards=2)
+    _write_shards(second, shards=1)
+    servers = [_start(DroppingWorkerServer(str(first), port=0)), _start(WorkerServer(str(second), port=0))]
+    try:
+        with pytest.raises(ConnectionError, match="part-1.csv"):
+            _run(["sales", "--count"] + _coordinator_argv(servers))
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+
+
+def test_data_errors_are_not_failures(cluster):
+    _, _, servers = cluster
+    with pytest.raises(KeyError):
+        _run(["sales", "--aggregate", "model=sum"] + _coordinator_argv(servers))
+    with pytest.raises(FileNotFoundError):
+        _run(["missing", "--count"] + _coordinator_argv(servers))
+    with pytest.raises(ValueError, match="вне каталога данных"):
+        request_worker(servers[0].server_address[:2], {"op": "files", "dataset": "../.."})
+
+
+def test_unexpected_worker_errors_are_data_errors(cluster, monkeypatch):
+    data_dir, dataset, servers = cluster
+    # Ни csv.Error, ни UnicodeDecodeError не считаются отказом исполнителя
+    bad = dataset / "part-0.csv"
+    bad.write_text('ts,store,price\n1,"' + "x" * 200000 + '",1\n', encoding="utf-8")
+    monkeypatch.chdir(data_dir)
+    with pytest.raises(ValueError, match="field larger than field limit"):
+        _run(["sales", "--aggregate", "price=sum", "--group-by", "store"] + _coordinator_argv(servers))
+    bad.write_bytes(b"ts,store,price\n1,\xff\xfe,1\n")
+    coordinator = Coordinator(parse_worker_addresses(",".join(server.address for server in servers)))
+    with pytest.raises(ValueError, match="can't decode"):
+        coordinator.run("sales", build_plan(parse_arguments(["sales", "--aggregate", "store=count_distinct"]), 0.01))
+    assert coordinator.failed == set()
+
+
+def test_no_workers_available(tmp_path):
+    server = WorkerServer(str(tmp_path), port=0)
+    address = server.address
+    server.server_close()
+    handler = CommandHandler()
+    args = parse_arguments(["sales", "--count", "--coordinator", address])
+    with pytest.raises(ConnectionError):
+        handler.run(args)
+    assert handler.describe_error(args, ConnectionError("Нет доступных исполнителей")).startswith("Ошибка")
+
+
+def test_worker_processes(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    dataset = _write_shards(data_dir, shards=3)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    processes = [
+        subprocess.Popen([sys.executable, "main.py", "worker", "--data", str(data_dir), "--port", "0"],
+                         cwd=root, stdout=subprocess.PIPE, text=True)
+        for _ in range(2)
+    ]
+    try:
+        addresses = [process.stdout.readline().split()[2].rstrip(",") for process in processes]
+        expected = _run([str(_local_copy(dataset, tmp_path)), "--order-by", "price=asc"])
+        monkeypatch.chdir(tmp_path)
+        argv = ["sales", "--order-by", "price=asc", "--coordinator", ",".join(addresses)]
+        assert _run(argv).to_dict() == expected.to_dict()
+        processes[0].kill()
+        processes[0].wait()
+        assert _run(argv).to_dict() == expected.to_dict()
+    finally:
+        for process in processes:
+            process.kill()
+            process.wait()
+            process.stdout.close()
+
+
+@pytest.mark.parametrize("value", ["localhost", "host:port", "host:0", "a:1,a:1", ":80"])
+def test_parse_worker_addresses_invalid(value):
+    with pytest.raises(ValueError):
+        parse_worker_addresses(value)
+
+
+def test_parse_worker_addresses():
+    assert parse_worker_addresses("127.0.0.1:9000, node-2:9001") == (("127.0.0.1", 9000), ("node-2", 9001))
+
+
+@pytest.mark.parametrize("argv,message", [
+    (["--join", "other.csv", "--on", "id"], "--coordinator совместим только"),
+    (["--distinct"], "--coordinator совместим только"),
+    (["--memory-limit", "1M"], "--coordinator совместим только"),
+])
+def test_coordinator_arguments_invalid(argv, message):
+    with pytest.raises(ValueError, match=message):
+        parse_arguments(["sales", "--coordinator", "127.0.0.1:9000"] + argv)
@@ -80,3 +80,71 @@ def test_filter_data_empty():
     Проверяет, что функция возвращает пустой список, если входные данные пусты.
     """
     assert filter_data([], "a=1") == []
+
+
+PREDICATE_ROWS = [
+    {"sku": "A-1", "brand": "Apple", "note": ""},
+    {"sku": "B-2", "brand": "apple", "note": "скидка"},
+    {"sku": "C,3", "brand": "Xiaomi", "note": ""},
+    {"sku": "A-4", "brand": "Samsung", "note": "новинка"},
+]
+
+
+@pytest.mark.parametrize(
+    "condition,expected_skus",
+    [
+        ("sku in (A-1,A-4)", ["A-1", "A-4"]),
+        ('sku IN (B-2, "C,3")', ["B-2", "C,3"]),
+        ("sku~^A-\\d$", ["A-1", "A-4"]),
+        ("brand~[Xx]iao", ["C,3"]),
+        ("sku^=A", ["A-1", "A-4"]),
+        ("brand~=APPLE", ["A-1", "B-2"]),
+        ("note is null", ["A-1", "C,3"]),
+        ("note IS NOT NULL", ["B-2", "A-4"]),
+        ("missing is null", ["A-1", "B-2", "C,3", "A-4"]),
+        ("missing^=A", []),
+    ],
+)
+def test_filter_data_predicates(condition, expected_skus):
+    """
+    Проверяет операторы IN, ~ (регулярное выражение), ^= (префикс),
+    ~= (без учета регистра) и проверки на пустое значение.
+    """
+    assert [row["sku"] for row in filter_data(PREDICATE_ROWS, condition)] == expected_skus
+
+
+def test_filter_data_invalid_regex():
+    """
+    Некорректное регулярное выражение отклоняется при компиляции условия.
+    """
+    with pytest.raises(ValueError, match="Некорректное регулярное выражение"):
+        filter_data(PREDICATE_ROWS, "sku~[A-")
+
+
+@pytest.mark.parametrize("condition", ["missing is null", "missing is not null", "missing=1", "missing in (a)"])
+def test_compile_filter_rejects_unknown_column(condition):
+    """
+    Условие по отсутствующему в заголовках столбцу отклоняется при компиляции.
+    """
+    from src.filter_engine import compile_filter
+
+    with pytest.raises(KeyError, match="missing"):
+        compile_filter(condition, ["sku", "brand", "note"])
+    assert compile_filter("note is null", ["sku", "brand", "note"])({"note": ""})
+
+
+@pytest.mark.parametrize("where", ["missing is null", "missing=1"])
+@pytest.mark.parametrize("extra", [[], ["--memory-limit", "64MB"]])
+def test_filter_unknown_column_is_reported(tmp_path, capsys, where, extra):
+    """
+    Опечатка в столбце --where дает ошибку, а не всю таблицу или пустой результат.
+    """
+    from src.argument_parser import parse_arguments
+    from src.command_handler import CommandHandler
+
+    file_path = tmp_path / "data.csv"
+    file_path.write_text("sku,note\nA-1,\nB-2,x\n", encoding="utf-8")
+    CommandHandler().execute(parse_arguments([str(file_path), "--where", where] + extra))
+    output = capsys.readouterr().out
+    assert "Ошибка: столбец 'missing' не найден в данных" in output
+    assert "A-1" not in output
@@ -0,0 +1,90 @@
+import threading
+import time
+
+import pytest
+from src.argument_parser import parse_arguments
+from src.command_handler import CommandHandler
+from src.follow import CSVFollower, PollingWatcher, create_watcher
+
+
+@pytest.fixture
+def growing_csv_file(tmp_path):
+    file_path = tmp_path / "growing.csv"
+    file_path.write_text("name,price\nApple,100\n")
+    return file_path
+
+
+def _append(file_path, text):
+    with open(file_path, "a") as f:
+        f.write(text)
+
+
+def test_poll_returns_only_new_complete_rows(growing_csv_file):
+    """
+    Проверяет, что poll возвращает только новые полностью дописанные строки.
+    """
+    with CSVFollower(str(growing_csv_file), watcher=PollingWatcher(0.01)) as follower:
+        assert follower.poll() == [{"name": "Apple", "price": "100"}]
+        assert follower.poll() == []
+
+        _append(growing_csv_file, "Banana,50\nCher")
+        assert follower.poll() == [{"name": "Banana", "price": "50"}]
+
+        _append(growing_csv_file, "ry,70\n")
+        assert follower.poll() == [{"name": "Cherry", "price": "70"}]
+        assert follower.headers == ["name", "price"]
+
+
+def test_poll_restarts_after_truncation(growing_csv_file):
+    with CSVFollower(str(growing_csv_file), watcher=PollingWatcher(0.01)) as follower:
+        follower.poll()
+        growing_csv_file.write_text("name,price\nKiwi,1\n")
+        assert follower.poll() == [{"name": "Kiwi", "price": "1"}]
+        assert follower.truncated
+
+
+def test_follower_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError, match="Файл не найден"):
+        CSVFollower(str(tmp_path / "missing.csv"))
+
+
+def test_create_watcher_falls_back_to_polling(monkeypatch, growing_csv_file):
+    monkeypatch.setattr("ctypes.util.find_library", lambda name: None)
+    assert isinstance(create_watcher(str(growing_csv_file)), PollingWatcher)
+
+
+@pytest.mark.parametrize("query,appended,expected_lines", [
+    (["--aggregate", "price=sum"], "Banana,50\n", ["SUM по столбцу 'price': 100", "SUM по столбцу 'price': 150"]),
+    (["--where", "price<80"], "Banana,50\nKiwi,90\n", ["Banana"]),
+])
+def test_execute_follow_updates_results(capsys, growing_csv_file, query, appended, expected_lines):
+    """
+    Проверяет, что режим слежения выводит обновления по мере дописывания файла.
+    """
+    args = parse_arguments([str(growing_csv_file), "--follow", "--follow-interval", "0.02"] + query)
+    handler = CommandHandler()
+    stop_event = threading.Event()
+    thread = threading.Thread(target=handler._execute_follow, args=(args, stop_event))
+    thread.start()
+    try:
+        time.sleep(0.2)
+        _append(growing_csv_file, appended)
+        time.sleep(0.3)
+    finally:
+        stop_event.set()
+        thread.join(timeout=5)
+
+    output = capsys.readouterr().out
+    position = 0
+    for line in expected_lines:
+        position = output.index(line, position)
+    assert "Kiwi" not in output
+
+
+@pytest.mark.parametrize("extra_args", [
+    ["--order-by", "price=asc"],
+    ["--cache"],
+])
+def test_follow_argument_errors(growing_csv_file, extra_args):
+    with pytest.raises(ValueError, match="--follow"):
+        parse_arguments([str(growing_csv_file), "--follow"] + extra_args)
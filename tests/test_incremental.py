@@ -0,0 +1,123 @@
+import os
+
+import pytest
+from src.argument_parser import AggregateCondition, AggregateFunction, parse_arguments
+from src.command_handler import CommandHandler
+from src.incremental import PREFIX_SAMPLE_BLOCKS, IncrementalAggregator, prefix_blocks
+
+
+@pytest.fixture
+def log_csv_file(tmp_path):
+    file_path = tmp_path / "log.csv"
+    file_path.write_text("user,price\na,10\nb,20\n")
+    return file_path
+
+
+def _append(file_path, text):
+    with open(file_path, "a") as f:
+        f.write(text)
+
+
+@pytest.mark.parametrize("function,expected_first,expected_second", [
+    (AggregateFunction.SUM, 30.0, 100.0),
+    (AggregateFunction.AVG, 15.0, 25.0),
+    (AggregateFunction.MAX, 20.0, 40.0),
+    (AggregateFunction.COUNT_DISTINCT, 2, 3),
+])
+def test_incremental_reads_only_appended_rows(tmp_path, log_csv_file, function, expected_first, expected_second):
+    """
+    Проверяет, что второй запуск начинает чтение с сохраненного смещения
+    и дает тот же результат, что и полное сканирование.
+    """
+    column = "user" if function == AggregateFunction.COUNT_DISTINCT else "price"
+    condition = AggregateCondition(column, function)
+    aggregator = IncrementalAggregator(str(tmp_path / "checkpoints"))
+    assert aggregator.aggregate(str(log_csv_file), condition) == expected_first
+    assert aggregator.last_scan_start == 0
+
+    size_before = log_csv_file.stat().st_size
+    _append(log_csv_file, "c,30\na,40\n")
+    assert aggregator.aggregate(str(log_csv_file), condition) == expected_second
+    assert aggregator.last_scan_start == size_before
+
+
+def test_incomplete_last_line_is_reread(tmp_path, log_csv_file):
+    """
+    Проверяет, что строка без перевода строки учитывается, но не попадает в контрольную точку.
+    """
+    condition = AggregateCondition("price", AggregateFunction.SUM)
+    aggregator = IncrementalAggregator(str(tmp_path / "checkpoints"))
+    _append(log_csv_file, "c,5")
+    assert aggregator.aggregate(str(log_csv_file), condition) == 35.0
+
+    _append(log_csv_file, "0\n")
+    assert aggregator.aggregate(str(log_csv_file), condition) == 80.0
+
+
+def test_changed_prefix_falls_back_to_full_scan(tmp_path, log_csv_file):
+    condition = AggregateCondition("price", AggregateFunction.SUM)
+    aggregator = IncrementalAggregator(str(tmp_path / "checkpoints"))
+    aggregator.aggregate(str(log_csv_file), condition)
+
+    log_csv_file.write_text("user,price\na,1\nb,2\nc,3\n")
+    assert aggregator.aggregate(str(log_csv_file), condition) == 6.0
+    assert aggregator.last_scan_start == 0
+
+
+def test_edit_in_sampled_block_falls_back_to_full_scan(tmp_path):
+    """
+    Проверяет, что правка в проверяемом блоке середины без изменения размера и mtime обнаруживается.
+    """
+    file_path = tmp_path / "big.csv"
+    file_path.write_text("user,price\n" + "a,1\n" * 50000)
+    condition = AggregateCondition("price", AggregateFunction.SUM)
+    aggregator = IncrementalAggregator(str(tmp_path / "checkpoints"))
+    assert aggregator.aggregate(str(file_path), condition) == 50000.0
+
+    stat = file_path.stat()
+    header = len("user,price\n")
+    start, _ = prefix_blocks(stat.st_size)[PREFIX_SAMPLE_BLOCKS // 2]
+    with open(file_path, "r+b") as f:
+        f.seek(header + 4 * ((start - header) // 4 + 1))
+        f.write(b"a,9\n")
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert aggregator.aggregate(str(file_path), condition) == 50008.0
+    assert aggregator.last_scan_start == 0
+
+
+@pytest.mark.parametrize("offset", [0, 100, 70 * 1024, 10 ** 6, 10 ** 10])
+def test_prefix_blocks_are_bounded(offset):
+    blocks = prefix_blocks(offset)
+    assert blocks[0][0] == 0 and blocks[-1][1] == offset
+    assert all(start <= end and end <= next_start for (start, end), (next_start, _) in zip(blocks, blocks[1:]))
+    assert sum(end - start for start, end in blocks) <= 4096 + 64 * 1024 + (PREFIX_SAMPLE_BLOCKS + 1) * 4096
+
+
+def test_truncated_file_falls_back_to_full_scan(tmp_path, log_csv_file):
+    condition = AggregateCondition("price", AggregateFunction.SUM)
+    aggregator = IncrementalAggregator(str(tmp_path / "checkpoints"))
+    aggregator.aggregate(str(log_csv_file), condition)
+
+    log_csv_file.write_text("user,price\na,7\n")
+    assert aggregator.aggregate(str(log_csv_file), condition) == 7.0
+
+
+def test_incremental_through_command_handler(capsys, tmp_path, log_csv_file):
+    argv = [str(log_csv_file), "--aggregate", "price=avg", "--incremental",
+            "--checkpoint-dir", str(tmp_path / "checkpoints")]
+    CommandHandler().execute(parse_arguments(argv))
+    _append(log_csv_file, "c,60\n")
+    CommandHandler().execute(parse_arguments(argv))
+    assert capsys.readouterr().out.splitlines() == [
+        "AVG по столбцу 'price': 15",
+        "AVG по столбцу 'price': 30",
+    ]
+
+
+@pytest.mark.parametrize("extra_args,expected_error", [
+    (["--incremental"], "только вместе с --aggregate"),
+    (["--aggregate", "price=avg", "--incremental", "--join", "x.csv", "--on", "user"], "несовместим с --join"),
+])
+def test_incremental_argument_errors(log_csv_file, extra_args, expected_error):
+    with pytest.raises(ValueError, match=expected_error):
+        parse_arguments([str(log_csv_file)] + extra_args)
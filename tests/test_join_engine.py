@@ -0,0 +1,138 @@
+import pytest
+from src.argument_parser import JoinCondition, JoinType
+from src.join_engine import HashJoiner
+
+
+@pytest.fixture
+def orders_csv_file(tmp_path):
+    file_path = tmp_path / "orders.csv"
+    rows = [f"{i},sku{i % 5},{i * 10}" for i in range(40)]
+    file_path.write_text("order_id,sku,price\n" + "\n".join(rows))
+    return file_path
+
+
+@pytest.fixture
+def products_csv_file(tmp_path):
+    file_path = tmp_path / "products.csv"
+    file_path.write_text("sku,title,price\nsku0,Phone,100\nsku1,Tablet,200\nsku2,Watch,300\nsku9,Unused,0")
+    return file_path
+
+
+def _sorted(rows):
+    return sorted(rows, key=lambda row: int(row["order_id"]))
+
+
+@pytest.mark.parametrize("join_type,expected_count", [
+    (JoinType.INNER, 24),
+    (JoinType.LEFT, 40),
+])
+def test_join_small_build_side(orders_csv_file, products_csv_file, join_type, expected_count):
+    """
+    Проверяет inner/left соединение, когда таблица строится по правому (меньшему) файлу.
+    """
+    joiner = HashJoiner()
+    headers, rows = joiner.join(str(orders_csv_file), JoinCondition(str(products_csv_file), "sku", join_type))
+    rows = list(rows)
+    assert headers == ["order_id", "sku", "price", "title", "price_right"]
+    assert len(rows) == expected_count
+    first = _sorted(rows)[0]
+    assert first == {"order_id": "0", "sku": "sku0", "price": "0", "title": "Phone", "price_right": "100"}
+    if join_type == JoinType.LEFT:
+        unmatched = [row for row in rows if row["sku"] == "sku4"]
+        assert unmatched and all(row["title"] is None for row in unmatched)
+
+
+@pytest.mark.parametrize("join_type,expected_count", [
+    (JoinType.INNER, 24),
+    (JoinType.LEFT, 40),
+])
+def test_join_left_is_build_side(orders_csv_file, products_csv_file, join_type, expected_count):
+    """
+    Проверяет, что при построении таблицы по левому файлу результат тот же.
+    """
+    joiner = HashJoiner()
+    _, reference = joiner.join(str(orders_csv_file), JoinCondition(str(products_csv_file), "sku", join_type))
+    reference = _sorted(reference)
+
+    # Делаем правый файл больше левого
+    with open(products_csv_file, "a") as f:
+        f.write("\n" + "\n".join(f"extra{i},Pad,1" for i in range(200)))
+    _, rows = joiner.join(str(orders_csv_file), JoinCondition(str(products_csv_file), "sku", join_type))
+    assert _sorted(rows) == reference
+    assert len(reference) == expected_count
+
+
+@pytest.mark.parametrize("join_type", [JoinType.INNER, JoinType.LEFT])
+def test_grace_join_matches_in_memory_join(orders_csv_file, products_csv_file, join_type):
+    """
+    Проверяет, что grace hash join со сбросом партиций на диск дает тот же результат.
+    """
+    condition = JoinCondition(str(orders_csv_file), "sku", join_type)
+    _, expected = HashJoiner().join(str(products_csv_file), condition)
+    expected = sorted(map(sorted, (row.items() for row in expected)), key=str)
+
+    joiner = HashJoiner(memory_budget=500)
+    _, rows = joiner.join(str(products_csv_file), condition)
+    rows = sorted(map(sorted, (row.items() for row in rows)), key=str)
+    assert joiner.spilled_partitions >= 2
+    assert rows == expected
+
+
+def test_grace_join_preserves_missing_fields(orders_csv_file, tmp_path):
+    """
+    Проверяет, что отсутствующие поля (None) после сброса на диск не превращаются в пустые строки.
+    """
+    products = tmp_path / "short.csv"
+    products.write_text("sku,title,price\nsku0,Phone\nsku1,,200\nsku2,Watch,300\n")
+    condition = JoinCondition(str(orders_csv_file), "sku", JoinType.LEFT)
+    _, expected = HashJoiner().join(str(products), condition)
+    joiner = HashJoiner(memory_budget=100)
+    _, rows = joiner.join(str(products), condition)
+    rows = list(rows)
+    assert joiner.spilled_partitions >= 2
+    assert sorted(map(sorted, (row.items() for row in rows)), key=str) == \
+        sorted(map(sorted, (row.items() for row in expected)), key=str)
+    assert {row["price"] for row in rows if row["sku"] == "sku0"} == {None}
+    assert {row["title"] for row in rows if row["sku"] == "sku1"} == {""}
+
+
+def test_grace_join_keeps_one_file_open(orders_csv_file, products_csv_file, monkeypatch):
+    """
+    Проверяет, что при большом числе партиций одновременно открыт не больше одного файла.
+    """
+    import builtins
+
+    opened, peak = [0], [0]
+    real_open = builtins.open
+
+    class Tracked:
+        def __init__(self, *args, **kwargs):
+            self.file = real_open(*args, **kwargs)
+            opened[0] += 1
+            peak[0] = max(peak[0], opened[0])
+
+        def __enter__(self):
+            return self.file
+
+        def __exit__(self, *exc):
+            opened[0] -= 1
+            return self.file.__exit__(*exc)
+
+    monkeypatch.setattr("src.join_engine.open", Tracked, raising=False)
+    monkeypatch.setattr("src.join_engine.math.ceil", lambda value: 4096)
+    condition = JoinCondition(str(orders_csv_file), "sku", JoinType.INNER)
+    joiner = HashJoiner(memory_budget=500)
+    _, rows = joiner.join(str(products_csv_file), condition)
+    assert len(list(rows)) == 24
+    assert joiner.spilled_partitions == 1024
+    assert peak[0] == 1
+
+
+def test_join_missing_key(orders_csv_file, products_csv_file):
+    with pytest.raises(KeyError):
+        HashJoiner().join(str(orders_csv_file), JoinCondition(str(products_csv_file), "title"))
+
+
+def test_join_missing_file(orders_csv_file, tmp_path):
+    with pytest.raises(FileNotFoundError):
+        HashJoiner().join(str(orders_csv_file), JoinCondition(str(tmp_path / "nope.csv"), "sku"))
@@ -0,0 +1,130 @@
+"""
+Тесты множества ключей и фильтра --where-in-file.
+"""
+
+import random
+
+import pytest
+
+import src.key_set as key_set
+from src.argument_parser import FilterOperator, parse_arguments, parse_where_in_file
+from src.command_handler import CommandHandler
+from src.key_set import KeySet, load_key_set
+from src.partitioning import run_partition_command
+from src.result_cache import ResultCache
+
+ORDERS = [
+    ("1", "c1", "100"),
+    ("2", "c2", "250"),
+    ("3", "c3", "75"),
+    ("4", "c1", "40"),
+    ("5", "", "10"),
+    ("6", "c4", "500"),
+]
+
+
+@pytest.fixture
+def orders_csv_file(tmp_path):
+    file_path = tmp_path / "orders.csv"
+    lines = ["id,customer_id,price"] + [",".join(order) for order in ORDERS]
+    file_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return file_path
+
+
+@pytest.fixture
+def keys_csv_file(tmp_path):
+    file_path = tmp_path / "blocklist.csv"
+    file_path.write_text("customer_id,reason\nc1,fraud\nc4,chargeback\n\nc9,spam\n", encoding="utf-8")
+    return file_path
+
+
+@pytest.mark.parametrize("size,chunk_size", [(0, 10), (1, 10), (100, 1000), (5000, 300)])
+def test_key_set_membership(size, chunk_size):
+    rng = random.Random(size)
+    keys = [f"id-{rng.randrange(10 ** 9)}" for _ in range(size)]
+    others = [f"id-{rng.randrange(10 ** 9)}" for _ in range(2000)]
+    values = KeySet.from_values(keys + [None, ""], chunk_size=chunk_size)
+    assert len(values) == size
+    assert list(values.hashes) == sorted(values.hashes)
+    assert all(key in values for key in keys)
+    assert [value in values for value in others] == [value in set(keys) for value in others]
+    assert None not in values and "" not in values
+
+
+def test_key_set_is_compact():
+    keys = [f"customer-{number:08d}" for number in range(100_000)]
+    values = KeySet.from_values(keys)
+    # Строковые ключи в set занимают на порядок больше 8 байт на ключ
+    assert values.nbytes < 10 * len(keys) + (1 << 19) + 16
+
+
+def test_load_key_set_reuses_unchanged_file(keys_csv_file):
+    loaded = load_key_set(str(keys_csv_file))
+    assert load_key_set(str(keys_csv_file)) is loaded
+    assert "c1" in loaded and "fraud" not in loaded and "customer_id" not in loaded
+    keys_csv_file.write_text("customer_id\nc2\nc3\n", encoding="utf-8")
+    reloaded = load_key_set(str(keys_csv_file))
+    assert "c2" in reloaded and "c1" not in reloaded
+    assert len(key_set._loaded) == 1
+
+
+@pytest.mark.parametrize("extra", [[], ["--memory-limit", "1M"]])
+def test_where_in_file(orders_csv_file, keys_csv_file, extra):
+    args = parse_arguments([str(orders_csv_file), "--where-in-file", f"customer_id={keys_csv_file}"] + extra)
+    result = CommandHandler().run(args)
+    assert [row["id"] for row in result.rows] == ["1", "4", "6"]
+
+
+def test_where_in_file_with_describe(orders_csv_file, keys_csv_file):
+    args = parse_arguments([str(orders_csv_file), "--where-in-file", f"customer_id={keys_csv_file}", "--describe"])
+    result = CommandHandler().run(args)
+    assert {row["column"]: row["count"] for row in result.rows}["price"] == 3
+
+
+def test_where_in_file_over_partitions(tmp_path, orders_csv_file, keys_csv_file):
+    dataset = tmp_path / "orders_parts"
+    assert run_partition_command([str(orders_csv_file), "--by", "customer_id", "--output", str(dataset)]) == 0
+    for column in ("customer_id", "id"):
+        args = parse_arguments([str(dataset), "--where-in-file", f"{column}={keys_csv_file}", "--workers", "1"])
+        result = CommandHandler().run(args)
+        expected = ["1", "4", "6"] if column == "customer_id" else []
+        assert sorted(row["id"] for row in result.rows) == expected
+
+
+def test_where_in_file_unknown_column(orders_csv_file, keys_csv_file):
+    # Как и у --where, отсутствующий столбец условия — ошибка, а не пустой результат
+    with pytest.raises(KeyError, match="client"):
+        CommandHandler().run(parse_arguments([str(orders_csv_file), "--where-in-file", f"client={keys_csv_file}"]))
+
+
+def test_cache_key_tracks_key_file(orders_csv_file, keys_csv_file, tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"))
+    args = parse_arguments([str(orders_csv_file), "--where-in-file", f"customer_id={keys_csv_file}"])
+    key = cache.make_key(args)
+    keys_csv_file.write_text("customer_id\nc2\n", encoding="utf-8")
+    assert cache.make_key(args) != key
+
+
+def test_parse_where_in_file(keys_csv_file):
+    condition = parse_where_in_file(f" customer_id = {keys_csv_file}")
+    assert (condition.column, condition.operator, condition.value) == (
+        "customer_id", FilterOperator.IN_FILE, str(keys_csv_file),
+    )
+    assert condition.predicate("c4") and not condition.predicate("c2")
+
+
+@pytest.mark.parametrize("spec,message", [
+    ("customer_id", "Некорректный формат --where-in-file"),
+    ("customer id=keys.csv", "Некорректный формат --where-in-file"),
+    ("customer_id=", "Некорректный формат --where-in-file"),
+    ("customer_id=missing.csv", "Файл ключей не найден"),
+])
+def test_parse_where_in_file_invalid(tmp_path, monkeypatch, spec, message):
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(ValueError, match=message):
+        parse_where_in_file(spec)
+
+
+def test_where_in_file_excludes_where(orders_csv_file, keys_csv_file):
+    with pytest.raises(SystemExit):
+        parse_arguments([str(orders_csv_file), "--where", "price>1", "--where-in-file", f"customer_id={keys_csv_file}"])
@@ -0,0 +1,134 @@
+"""
+Тесты общего бюджета памяти и операторов со сбросом на диск.
+"""
+
+import random
+
+import pytest
+
+from src.argument_parser import JoinCondition, JoinType, SortCondition, SortDirection, parse_arguments
+from src.command_handler import CommandHandler
+from src.csv_reader import CSVReader
+from src.distinct import Deduplicator
+from src.external_sort import ExternalSorter
+from src.join_engine import HashJoiner
+from src.memory import MemoryGovernor, format_size
+from src.sorting import sort_rows
+
+
+@pytest.fixture
+def mixed_csv_file(tmp_path):
+    rng = random.Random(7)
+    values = [str(rng.randrange(50)) for _ in range(300)] + ["", "abc", "Abc", "1e3", "-2.5"] * 20
+    rng.shuffle(values)
+    file_path = tmp_path / "mixed.csv"
+    lines = ["id,value,group"] + [f"{i},{value},g{rng.randrange(5)}" for i, value in enumerate(values)]
+    file_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return file_path
+
+
+def test_governor_tracks_usage_and_peak():
+    governor = MemoryGovernor(100)
+    first, second = governor.reserve("sort"), governor.reserve("join")
+    assert first.try_grow(60)
+    assert not second.try_grow(50)
+    assert second.try_grow(40)
+    assert governor.available == 0
+    first.release()
+    assert governor.used == 40 and governor.peak == 100
+    second.add(80)
+    assert governor.peak == 120
+    assert governor.operator_peaks == {"sort": 60, "join": 120}
+
+
+def test_governor_rejects_non_positive_limit():
+    with pytest.raises(ValueError, match="Лимит памяти"):
+        MemoryGovernor(0)
+
+
+@pytest.mark.parametrize("nbytes,expected", [(512, "512"), (2048, "2K"), (3 * 1024 ** 3, "3G")])
+def test_format_size(nbytes, expected):
+    assert format_size(nbytes) == expected
+
+
+@pytest.mark.parametrize("conditions", [
+    (SortCondition("value", SortDirection.ASC),),
+    (SortCondition("value", SortDirection.DESC),),
+    (SortCondition("group", SortDirection.DESC), SortCondition("value", SortDirection.ASC)),
+])
+def test_external_sort_matches_in_memory_sort(mixed_csv_file, conditions):
+    _, rows = CSVReader().read_file(str(mixed_csv_file))
+    sorter = ExternalSorter(MemoryGovernor(4000))
+    result = list(sorter.sort(iter(rows), conditions))
+    assert sorter.spilled_runs > 1
+    assert result == sort_rows(rows, conditions)
+
+
+def test_operators_share_governor(tmp_path):
+    left, right = tmp_path / "left.csv", tmp_path / "right.csv"
+    left.write_text("id,sku\n" + "".join(f"{i},s{i % 40}\n" for i in range(400)), encoding="utf-8")
+    right.write_text("sku,title\n" + "".join(f"s{i},t{i}\n" for i in range(40)), encoding="utf-8")
+    governor = MemoryGovernor(2000)
+    joiner = HashJoiner(governor=governor)
+    headers, rows = joiner.join(str(left), JoinCondition(str(right), "sku", JoinType.INNER))
+    headers, unique = Deduplicator(governor=governor, partitions=4).distinct(headers, rows, ["sku", "title"])
+    assert sorted(row["sku"] for row in unique) == sorted(f"s{i}" for i in range(40))
+    assert governor.used == 0
+    assert governor.operator_peaks["join"] > 0 and governor.operator_peaks["distinct"] > 0
+
+
+def test_handler_reports_peak_and_flushes_table(mixed_csv_file, capsys):
+    args = parse_arguments([str(mixed_csv_file), "--order-by", "value=asc", "--memory-limit", "8K"])
+    CommandHandler().execute(args)
+    output = capsys.readouterr().out
+    assert "Пиковое использование памяти (оценка)" in output
+    assert "из 8K" in output
+    # Таблица выводится несколькими частями
+    assert output.count("|   id |") > 1
+
+
+def test_run_materializes_within_limit(mixed_csv_file):
+    args = parse_arguments([str(mixed_csv_file), "--where", "group=g1", "--memory-limit", "1M"])
+    expected = CommandHandler().run(parse_arguments([str(mixed_csv_file), "--where", "group=g1"]))
+    assert CommandHandler().run(args).rows == expected.rows
+    aggregate = parse_arguments([str(mixed_csv_file), "--aggregate", "id=sum", "--memory-limit", "1M"])
+    assert CommandHandler().run(aggregate).value == sum(range(400))
+
+
+def test_run_rejects_result_over_limit(mixed_csv_file):
+    args = parse_arguments([str(mixed_csv_file), "--memory-limit", "1K"])
+    with pytest.raises(ValueError, match="не помещается в лимит памяти"):
+        CommandHandler().run(args)
+
+
+@pytest.mark.parametrize("argv,message", [
+    (["--memory-limit", "0"], "Лимит памяти должен быть положительным"),
+    (["--memory-limit", "1M", "--follow"], "несовместим с --follow"),
+])
+def test_parse_memory_limit_invalid(mixed_csv_file, argv, message):
+    with pytest.raises(ValueError, match=message):
+        parse_arguments([str(mixed_csv_file)] + argv)
+
+
+@pytest.fixture
+def unique_csv_file(tmp_path):
+    file_path = tmp_path / "unique.csv"
+    lines = ["id,value"] + [f"key-{i},{i % 7}" for i in range(3000)]
+    file_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return file_path
+
+
+@pytest.mark.parametrize("argv,message", [
+    (["--aggregate", "value=sum", "--group-by", "id"], "Группы агрегации"),
+    (["--aggregate", "id=count_distinct"], "Уникальные значения count_distinct"),
+    (["--aggregate", "id=count_distinct", "--group-by", "value"], "Уникальные значения count_distinct"),
+    (["--window", "value=cumsum", "--partition-by", "id"], "Секции оконных функций"),
+])
+def test_unspillable_state_respects_limit(unique_csv_file, argv, message):
+    args = parse_arguments([str(unique_csv_file), "--memory-limit", "256K"] + argv)
+    with pytest.raises(ValueError, match=f"{message}: превышен лимит памяти 256K"):
+        result = CommandHandler().run(args)
+        list(result.rows or ())
+    expected = CommandHandler().run(parse_arguments([str(unique_csv_file)] + argv))
+    result = CommandHandler().run(parse_arguments([str(unique_csv_file), "--memory-limit", "64M"] + argv))
+    assert result.to_dict() == expected.to_dict()
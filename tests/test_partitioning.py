@@ -0,0 +1,152 @@
+"""
+Тесты секционированных наборов данных.
+"""
+
+import os
+
+import pytest
+
+from src.argument_parser import parse_arguments
+from src.command_handler import CommandHandler
+from src.csv_reader import CSVReader
+from src.partitioning import (
+    DEFAULT_PARTITION,
+    PartitionWriter,
+    PartitionedDataset,
+    escape_partition_value,
+    run_partition_command,
+    unescape_partition_value,
+)
+
+ROWS = [
+    ("1", "xiaomi", "100", "red"),
+    ("2", "apple", "900", ""),
+    ("3", "xiaomi", "300", "blue"),
+    ("4", "a/b=c", "50", "red"),
+    ("5", "", "70", "blue"),
+    ("6", "apple", "1100", "red"),
+]
+
+
+@pytest.fixture
+def source_csv_file(tmp_path):
+    file_path = tmp_path / "phones.csv"
+    lines = ["id,brand,price,color"] + [",".join(row) for row in ROWS]
+    file_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return file_path
+
+
+@pytest.fixture
+def dataset_dir(tmp_path, source_csv_file):
+    directory = tmp_path / "parts"
+    assert run_partition_command([str(source_csv_file), "--by", "brand", "--output", str(directory)]) == 0
+    return directory
+
+
+class CountingReader(CSVReader):
+    def __init__(self):
+        self.opened = []
+
+    def iter_file(self, filepath):
+        self.opened.append(filepath)
+        return super().iter_file(filepath)
+
+
+@pytest.mark.parametrize("value", ["xiaomi", "a/b=c", "100%", "Samsung Galaxy"])
+def test_partition_value_roundtrip(value):
+    name = escape_partition_value(value)
+    assert "/" not in name and "=" not in name
+    assert unescape_partition_value(name) == value
+
+
+def test_partition_writer_layout(dataset_dir, source_csv_file):
+    assert sorted(os.listdir(dataset_dir)) == sorted(
+        ["brand=xiaomi", "brand=apple", "brand=a%2Fb%3Dc", f"brand={DEFAULT_PARTITION}"]
+    )
+    _, rows = CSVReader().read_file(str(dataset_dir / "brand=apple" / "part-0000.csv"))
+    assert [row["id"] for row in rows] == ["2", "6"]
+
+
+def test_partition_writer_rotates_files_and_limits_open_files(tmp_path, source_csv_file):
+    headers, rows = CSVReader().iter_file(str(source_csv_file))
+    writer = PartitionWriter(str(tmp_path / "out"), ["color"], rows_per_file=1, max_open_files=1)
+    counts = writer.write(headers, rows)
+    assert counts == {("red",): 3, ("blue",): 2, ("",): 1}
+    assert sorted(os.listdir(tmp_path / "out" / "color=red")) == ["part-0000.csv", "part-0001.csv", "part-0002.csv"]
+
+
+def test_partition_writer_rejects_non_empty_output(dataset_dir, source_csv_file):
+    with pytest.raises(ValueError, match="не пуст"):
+        run_partition_command([str(source_csv_file), "--by", "brand", "--output", str(dataset_dir)])
+
+
+def test_reader_reads_directory_as_dataset(dataset_dir):
+    headers, rows = CSVReader().read_file(str(dataset_dir))
+    assert headers == ["id", "brand", "price", "color"]
+    assert sorted(row["id"] for row in rows) == [row[0] for row in ROWS]
+
+
+def test_dataset_partitions_and_pruning(dataset_dir):
+    dataset = PartitionedDataset(str(dataset_dir))
+    assert dataset.columns == ["brand"]
+    assert sorted(partition.values["brand"] for partition in dataset.partitions) == ["", "a/b=c", "apple", "xiaomi"]
+    pruned = dataset.prune("brand", lambda value: value == "apple")
+    assert [partition.values for partition in pruned] == [{"brand": "apple"}]
+    assert len(dataset.prune("price", lambda value: False)) == 4
+
+
+@pytest.mark.parametrize("where,expected_ids,opened", [
+    ("brand=xiaomi", ["1", "3"], 1),
+    ("brand in (apple, a/b=c)", ["2", "4", "6"], 2),
+    ("brand is null", ["5"], 1),
+    ("price>200", ["2", "3", "6"], 4),
+])
+def test_filter_opens_only_matching_partitions(dataset_dir, monkeypatch, where, expected_ids, opened):
+    reader = CountingReader()
+    monkeypatch.setattr("src.partitioning.CSVReader", lambda: reader)
+    result = CommandHandler(reader).run(parse_arguments([str(dataset_dir), "--where", where]))
+    assert sorted(row["id"] for row in result.rows) == expected_ids
+    data_files = {path for path in reader.opened if os.path.basename(path).startswith("part-")}
+    # Заголовки читаются из первого файла набора; строки — только из подходящих секций
+    assert len(data_files - {reader.opened[0]}) <= opened
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_group_by_over_partitions(dataset_dir, source_csv_file, workers):
+    argv = ["--aggregate", "price=sum", "--group-by", "brand", "--workers", str(workers)]
+    partitioned = CommandHandler().run(parse_arguments([str(dataset_dir)] + argv))
+    plain = CommandHandler().run(parse_arguments([str(source_csv_file)] + argv))
+    assert partitioned.headers == plain.headers == ["brand", "sum(price)"]
+    assert sorted(partitioned.rows, key=lambda row: row["brand"]) == sorted(plain.rows, key=lambda row: row["brand"])
+    assert {row["brand"]: row["sum(price)"] for row in plain.rows}["apple"] == 2000
+
+
+def test_aggregate_without_group_by_over_partitions(dataset_dir):
+    result = CommandHandler().run(parse_arguments([str(dataset_dir), "--aggregate", "price=max", "--workers", "2"]))
+    assert result.value == 1100
+
+
+def test_group_by_by_non_partition_column(dataset_dir):
+    result = CommandHandler().run(parse_arguments([str(dataset_dir), "--aggregate", "id=count", "--group-by", "color"]))
+    assert {row["color"]: row["count(id)"] for row in result.rows} == {"red": 3, "blue": 2, "": 1}
+
+
+def test_group_by_unknown_column(source_csv_file):
+    with pytest.raises(KeyError):
+        CommandHandler().run(parse_arguments([str(source_csv_file), "--aggregate", "price=avg", "--group-by", "model"]))
+
+
+@pytest.mark.parametrize("argv,message", [
+    (["--group-by", "brand"], "только вместе с --aggregate"),
+    (["--aggregate", "price=avg", "--group-by", "brand,brand"], "повторяются"),
+    (["--aggregate", "price=avg", "--group-by", "bad-name"], "Некорректное имя столбца"),
+    (["--workers", "0"], "Число процессов"),
+])
+def test_group_by_arguments_invalid(source_csv_file, argv, message):
+    with pytest.raises(ValueError, match=message):
+        parse_arguments([str(source_csv_file)] + argv)
+
+
+def test_directory_incompatible_with_sorted_by(dataset_dir):
+    with pytest.raises(ValueError, match="Каталог секций несовместим"):
+        parse_arguments([str(dataset_dir), "--sorted-by", "id"])
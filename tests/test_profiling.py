@@ -0,0 +1,143 @@
+"""
+Тесты профилирования столбцов (--describe).
+"""
+
+import math
+import statistics
+
+import pytest
+
+from src.argument_parser import parse_arguments
+from src.command_handler import CommandHandler
+from src.partitioning import run_partition_command
+from src.profiling import PROFILE_HEADERS, TOP_CAPACITY, ColumnProfile, TableProfile
+
+
+@pytest.fixture
+def profile_csv_file(tmp_path):
+    file_path = tmp_path / "profile.csv"
+    lines = ["id,brand,price,rating,note"]
+    for i in range(1, 301):
+        brand = ["apple", "xiaomi", "samsung"][i % 3] if i % 10 else "apple"
+        note = "" if i % 2 else f"n{i}"
+        lines.append(f"{i},{brand},{i * 10},{i / 4},{note}")
+    file_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return file_path
+
+
+def _by_column(result):
+    return {row["column"]: row for row in result.rows}
+
+
+def test_describe_summary(profile_csv_file):
+    result = CommandHandler().run(parse_arguments([str(profile_csv_file), "--describe"]))
+    assert result.headers == PROFILE_HEADERS
+    rows = _by_column(result)
+    assert list(rows) == ["id", "brand", "price", "rating", "note"]
+
+    price = rows["price"]
+    prices = [i * 10 for i in range(1, 301)]
+    assert (price["type"], price["count"], price["nulls"], price["min"], price["max"]) == ("integer", 300, 0, 10, 3000)
+    assert price["mean"] == pytest.approx(statistics.mean(prices))
+    assert price["stddev"] == pytest.approx(statistics.stdev(prices))
+    assert price["distinct"] == 300
+
+    assert rows["rating"]["type"] == "float"
+    assert rows["rating"]["max"] == 75.0
+    brand = rows["brand"]
+    assert (brand["type"], brand["min"], brand["max"], brand["distinct"]) == ("string", "apple", "xiaomi", 3)
+    assert brand["mean"] is None
+    assert brand["top"].startswith("apple (120)")
+    assert (rows["note"]["count"], rows["note"]["nulls"]) == (150, 150)
+
+
+def test_describe_with_filter(profile_csv_file):
+    result = CommandHandler().run(parse_arguments([str(profile_csv_file), "--describe", "--where", "brand=xiaomi"]))
+    rows = _by_column(result)
+    assert rows["brand"]["top"] == "xiaomi (90)"
+    assert rows["id"]["count"] == 90
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 7, 1000])
+def test_chunked_and_merged_profiles_agree(profile_csv_file, chunk_rows):
+    from src.csv_reader import CSVReader
+
+    headers, rows = CSVReader().read_file(str(profile_csv_file))
+    whole = TableProfile(headers)
+    whole.update(rows)
+    merged = TableProfile(headers)
+    for start in range(0, len(rows), 100):
+        part = TableProfile(headers)
+        part.update(rows[start:start + 100], chunk_rows)
+        merged.merge(TableProfile.from_state(part.to_state()))
+    for expected, actual in zip(whole.summary(), merged.summary()):
+        assert actual.keys() == expected.keys()
+        for key, value in expected.items():
+            if isinstance(value, float):
+                assert actual[key] == pytest.approx(value)
+            else:
+                assert actual[key] == value
+
+
+def test_column_type_changes_after_non_numeric_value():
+    profile = ColumnProfile()
+    profile.update_batch(["1", "2", None])
+    assert profile.type_name == "integer"
+    profile.update_batch(["2.5"])
+    assert profile.type_name == "float"
+    profile.update_batch(["n/a", ""])
+    assert profile.type_name == "string"
+    assert profile.summary("x")["min"] == "1"
+    assert (profile.present, profile.nulls) == (4, 2)
+    assert ColumnProfile().type_name == "empty"
+
+
+def test_high_cardinality_switches_to_estimates():
+    profile = ColumnProfile()
+    values = [f"user-{i}" for i in range(TOP_CAPACITY * 5)] + ["hot"] * 2000
+    profile.update_batch(values[:3000])
+    profile.update_batch(values[3000:])
+    assert not profile.exact
+    assert profile.distinct() == pytest.approx(TOP_CAPACITY * 5 + 1, rel=0.05)
+    assert profile.summary("user")["top"].startswith("hot (≥")
+    assert len(profile.top) <= TOP_CAPACITY
+
+
+def test_merge_of_exact_and_estimated_profiles():
+    exact, estimated = ColumnProfile(), ColumnProfile()
+    exact.update_batch([f"v{i}" for i in range(10)])
+    estimated.update_batch([f"v{i}" for i in range(TOP_CAPACITY * 2)])
+    exact.merge(estimated)
+    assert exact.distinct() == pytest.approx(TOP_CAPACITY * 2, rel=0.05)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_describe_partitioned_dataset(tmp_path, profile_csv_file, workers):
+    directory = tmp_path / "parts"
+    run_partition_command([str(profile_csv_file), "--by", "brand", "--output", str(directory)])
+    plain = _by_column(CommandHandler().run(parse_arguments([str(profile_csv_file), "--describe"])))
+    argv = [str(directory), "--describe", "--workers", str(workers)]
+    partitioned = _by_column(CommandHandler().run(parse_arguments(argv)))
+    for column in ("id", "price", "brand", "note"):
+        for key in ("type", "count", "nulls", "min", "max", "distinct"):
+            assert partitioned[column][key] == plain[column][key]
+        assert math.isclose(partitioned["price"]["stddev"], plain["price"]["stddev"])
+    pruned = _by_column(CommandHandler().run(parse_arguments(argv + ["--where", "brand=samsung"])))
+    assert pruned["brand"]["top"] == "samsung (90)"
+
+
+def test_describe_display(profile_csv_file, capsys):
+    CommandHandler().execute(parse_arguments([str(profile_csv_file), "--describe"]))
+    output = capsys.readouterr().out
+    assert "| column" in output and "| price" in output and "integer" in output
+
+
+@pytest.mark.parametrize("argv,message", [
+    (["--describe", "--aggregate", "price=avg"], "--describe несовместим"),
+    (["--describe", "--order-by", "price=asc"], "--describe несовместим"),
+    (["--describe", "--distinct"], "--describe несовместим"),
+    (["--describe", "--follow"], "--describe несовместим"),
+])
+def test_describe_arguments_invalid(profile_csv_file, argv, message):
+    with pytest.raises(ValueError, match=message):
+        parse_arguments([str(profile_csv_file)] + argv)
@@ -0,0 +1,92 @@
+import pytest
+from unittest.mock import patch
+from src.argument_parser import FilterCondition, FilterOperator, SortCondition, SortDirection, parse_arguments
+from src.command_handler import CommandHandler
+from src.filter_engine import filter_data
+from src.range_scan import SortedRangeScanner
+from src.csv_reader import CSVReader
+
+
+@pytest.fixture
+def sorted_csv_file(tmp_path):
+    file_path = tmp_path / "events.csv"
+    lines = ["ts,user,price"] + [f"{1000 + i // 3},u{i % 7},{i % 50}" for i in range(6000)]
+    file_path.write_text("\n".join(lines) + "\n")
+    return file_path
+
+
+@pytest.mark.parametrize("operator,value", [
+    (FilterOperator.GREATER, "2500"),
+    (FilterOperator.GREATER, "999"),
+    (FilterOperator.GREATER, "5000"),
+    (FilterOperator.LESS, "1003"),
+    (FilterOperator.LESS, "1000"),
+    (FilterOperator.EQUAL, "1500"),
+    (FilterOperator.EQUAL, "2999"),
+    (FilterOperator.EQUAL, "1500.5"),
+])
+def test_range_scan_matches_linear_filter(sorted_csv_file, operator, value):
+    condition = FilterCondition("ts", operator, value)
+    headers, rows = SortedRangeScanner(linear_scan_bytes=256).scan(str(sorted_csv_file), condition)
+    _, data = CSVReader().read_file(str(sorted_csv_file))
+    assert headers == ["ts", "user", "price"]
+    assert list(rows) == filter_data(data, f"ts{operator.value}{value}")
+
+
+def test_range_scan_skips_file_prefix(sorted_csv_file):
+    scanner = SortedRangeScanner(linear_scan_bytes=256)
+    _, rows = scanner.scan(str(sorted_csv_file), FilterCondition("ts", FilterOperator.GREATER, "2900"))
+    assert len(list(rows)) == 297
+    assert scanner.scan_start > sorted_csv_file.stat().st_size * 0.9
+
+
+def test_range_scan_stops_early_for_less(sorted_csv_file):
+    _, rows = SortedRangeScanner().scan(str(sorted_csv_file), FilterCondition("ts", FilterOperator.LESS, "1001"))
+    first = next(rows)
+    assert first["ts"] == "1000"
+    assert len([first] + list(rows)) == 3
+
+
+def test_range_scan_missing_column(sorted_csv_file):
+    with pytest.raises(KeyError):
+        SortedRangeScanner().scan(str(sorted_csv_file), FilterCondition("missing", FilterOperator.GREATER, "1"))
+
+
+def test_command_handler_uses_range_scan(sorted_csv_file):
+    args = parse_arguments([str(sorted_csv_file), "--where", "ts>2990", "--sorted-by", "ts"])
+    handler = CommandHandler()
+    with patch.object(handler.csv_reader, "read_file") as mock_read:
+        result = handler.run(args)
+    mock_read.assert_not_called()
+    assert [row["ts"] for row in result.rows] == [str(ts) for ts in range(2991, 3000) for _ in range(3)]
+
+
+@pytest.mark.parametrize("sorted_by,order_by,skips_sort", [
+    ("ts", "ts=asc", True),
+    ("ts=desc", "ts=desc", True),
+    ("ts", "ts=desc", False),
+    ("ts", "price=asc", False),
+])
+def test_order_by_skips_sort_on_sorted_column(sorted_csv_file, sorted_by, order_by, skips_sort):
+    args = parse_arguments([str(sorted_csv_file), "--order-by", order_by, "--sorted-by", sorted_by])
+    with patch("src.sorting.sort_rows", side_effect=lambda data, condition: data) as mock_sort:
+        CommandHandler().run(args)
+    assert mock_sort.called != skips_sort
+
+
+@pytest.mark.parametrize("value,expected", [
+    ("ts", SortCondition("ts", SortDirection.ASC)),
+    ("ts=desc", SortCondition("ts", SortDirection.DESC)),
+])
+def test_parse_sorted_by(value, expected):
+    assert parse_arguments(["data.csv", "--sorted-by", value]).sorted_by == expected
+
+
+@pytest.mark.parametrize("argv", [
+    ["--sorted-by", "1ts"],
+    ["--sorted-by", "ts=up"],
+    ["--sorted-by", "ts", "--sample", "0.5"],
+])
+def test_sorted_by_invalid(argv):
+    with pytest.raises(ValueError):
+        parse_arguments(["data.csv"] + argv)
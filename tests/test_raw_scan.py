@@ -0,0 +1,139 @@
+"""
+Тесты подсчета строк и чтения хвоста файла по сырым байтам.
+"""
+
+import pytest
+
+import src.raw_scan as raw_scan
+from src.argument_parser import parse_arguments
+from src.command_handler import CommandHandler
+from src.csv_reader import CSVReader
+from src.partitioning import run_partition_command
+from src.raw_scan import RecordCounter, count_records, tail_records
+
+CONTENTS = {
+    "plain": "id,name\n1,a\n2,b\n3,c\n",
+    "no_trailing_newline": "id,name\n1,a\n2,b",
+    "blank_lines": "id,name\n\n1,a\n\n\n2,b\n\n",
+    "crlf": "id,name\r\n1,a\r\n\r\n2,b\r\n",
+    "quoted_newlines": 'id,name\n1,"multi\nline"\n2,"x\n\ny"\n3,c\n',
+    "escaped_quotes": 'id,name\n1,"say ""hi""\n, ok"\n2,""\n3,"a"",""b"\n',
+    "quoted_last_line": 'id,name\n1,a\n2,"tail\nrow"',
+}
+
+
+@pytest.fixture(params=sorted(CONTENTS))
+def tricky_csv_file(request, tmp_path):
+    file_path = tmp_path / f"{request.param}.csv"
+    file_path.write_bytes(CONTENTS[request.param].encode("utf-8"))
+    return file_path
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1024])
+def test_count_matches_reader(tricky_csv_file, chunk_size):
+    _, rows = CSVReader().read_file(str(tricky_csv_file))
+    assert count_records(str(tricky_csv_file), chunk_size=chunk_size) == len(rows)
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 10])
+def test_tail_matches_reader(tricky_csv_file, monkeypatch, count):
+    monkeypatch.setattr(raw_scan, "TAIL_BLOCK_SIZE", 3)
+    headers, rows = CSVReader().read_file(str(tricky_csv_file))
+    tail_headers, tail = tail_records(str(tricky_csv_file), count)
+    assert tail_headers == headers
+    assert tail == rows[-count:]
+
+
+def test_tail_inside_long_quoted_field(tmp_path, monkeypatch):
+    # Хвост начинается внутри поля в кавычках: состояние определяется по четности кавычек до него
+    monkeypatch.setattr(raw_scan, "TAIL_BLOCK_SIZE", 4)
+    file_path = tmp_path / "quoted.csv"
+    lines = ["id,note"] + [f'{i},"row {i}\nline ""{i}""\n"' for i in range(50)]
+    file_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    _, rows = CSVReader().read_file(str(file_path))
+    assert tail_records(str(file_path), 5)[1] == rows[-5:]
+
+
+def test_counter_fed_in_chunks():
+    counter = RecordCounter()
+    for chunk in (b'id\n1\n"a\n', b'b"\n', b"\r\n", b"3"):
+        counter.feed(chunk)
+    assert counter.finish() == 4
+
+
+@pytest.mark.parametrize("content", ["", "\n\n"])
+def test_count_empty_file(tmp_path, content):
+    file_path = tmp_path / "empty.csv"
+    file_path.write_text(content, encoding="utf-8")
+    with pytest.raises(ValueError, match="пуст"):
+        count_records(str(file_path))
+    with pytest.raises(ValueError, match="пуст"):
+        tail_records(str(file_path), 1)
+
+
+def test_header_only_file(tmp_path):
+    file_path = tmp_path / "header.csv"
+    file_path.write_text("id,name\n", encoding="utf-8")
+    assert count_records(str(file_path)) == 0
+    assert tail_records(str(file_path), 3) == (["id", "name"], [])
+
+
+@pytest.fixture
+def numbered_csv_file(tmp_path):
+    file_path = tmp_path / "numbered.csv"
+    file_path.write_text("id,group\n" + "".join(f"{i},g{i % 3}\n" for i in range(100)), encoding="utf-8")
+    return file_path
+
+
+@pytest.mark.parametrize("argv,expected", [
+    (["--head", "3"], ["0", "1", "2"]),
+    (["--tail", "2"], ["98", "99"]),
+    (["--head", "500"], [str(i) for i in range(100)]),
+])
+def test_head_and_tail_arguments(numbered_csv_file, argv, expected):
+    result = CommandHandler().run(parse_arguments([str(numbered_csv_file)] + argv))
+    assert result.headers == ["id", "group"]
+    assert [row["id"] for row in result.rows] == expected
+
+
+def test_head_stops_reading(numbered_csv_file, monkeypatch):
+    reads = []
+
+    class CountingReader(CSVReader):
+        def iter_file(self, filepath):
+            headers, rows = super().iter_file(filepath)
+
+            def counted():
+                for row in rows:
+                    reads.append(row)
+                    yield row
+
+            return headers, counted()
+
+    CommandHandler(CountingReader()).run(parse_arguments([str(numbered_csv_file), "--head", "5"]))
+    assert len(reads) == 5
+
+
+def test_count_display(numbered_csv_file, capsys):
+    CommandHandler().execute(parse_arguments([str(numbered_csv_file), "--count"]))
+    assert capsys.readouterr().out.strip() == "Количество строк: 100"
+
+
+def test_count_and_tail_partitioned_dataset(numbered_csv_file, tmp_path):
+    directory = tmp_path / "parts"
+    run_partition_command([str(numbered_csv_file), "--by", "group", "--output", str(directory), "--rows-per-file", "10"])
+    assert CommandHandler().run(parse_arguments([str(directory), "--count"])).value == 100
+    _, rows = CSVReader().read_file(str(directory))
+    assert tail_records(str(directory), 15)[1] == rows[-15:]
+
+
+@pytest.mark.parametrize("argv,message", [
+    (["--count", "--head", "1"], "несовместимы"),
+    (["--tail", "1", "--where", "id=1"], "несовместимы"),
+    (["--count", "--describe"], "несовместимы"),
+    (["--head", "0"], "положительным"),
+    (["--tail", "-1"], "положительным"),
+])
+def test_raw_scan_arguments_invalid(numbered_csv_file, argv, message):
+    with pytest.raises(ValueError, match=message):
+        parse_arguments([str(numbered_csv_file)] + argv)
@@ -0,0 +1,99 @@
+"""
+Тесты упреждающего чтения файла.
+"""
+
+import threading
+
+import pytest
+
+from src.argument_parser import parse_arguments
+from src.csv_reader import CSVReader, ReadOptions
+from src.read_ahead import ReadAheadStream, advise_sequential, open_read_ahead
+
+
+@pytest.fixture
+def unicode_csv_file(tmp_path):
+    file_path = tmp_path / "unicode.csv"
+    lines = ["name,note"] + [f'товар {i},"строка\nс переводом {i}"' for i in range(200)]
+    file_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return file_path
+
+
+@pytest.mark.parametrize("depth,buffer_size", [(1, 1), (2, 7), (3, 4096)])
+def test_stream_returns_file_bytes(unicode_csv_file, depth, buffer_size):
+    with open_read_ahead(str(unicode_csv_file), depth, buffer_size) as f:
+        assert f.read() == unicode_csv_file.read_bytes()
+
+
+def test_stream_from_offset(unicode_csv_file):
+    with open_read_ahead(str(unicode_csv_file), 2, 16, offset=10) as f:
+        assert f.read() == unicode_csv_file.read_bytes()[10:]
+
+
+@pytest.mark.parametrize("buffer_size", [1, 5, 1024])
+def test_reader_with_read_ahead_matches_plain_reader(unicode_csv_file, buffer_size):
+    """Многобайтовые символы и переводы строк в кавычках могут попадать на границу буфера."""
+    expected = CSVReader().read_file(str(unicode_csv_file))
+    reader = CSVReader(ReadOptions(read_ahead=2, buffer_size=buffer_size, fadvise=True))
+    assert reader.read_file(str(unicode_csv_file)) == expected
+
+
+def test_row_blocks_with_read_ahead(unicode_csv_file):
+    plain = list(CSVReader().iter_row_blocks(str(unicode_csv_file), 10, chunk_size=100))
+    reader = CSVReader(ReadOptions(read_ahead=3, buffer_size=64))
+    assert list(reader.iter_row_blocks(str(unicode_csv_file), 10, chunk_size=100)) == plain
+
+
+def test_early_close_stops_thread(unicode_csv_file):
+    reader = CSVReader(ReadOptions(read_ahead=1, buffer_size=8))
+    _, rows = reader.iter_file(str(unicode_csv_file))
+    next(rows)
+    rows.close()
+    assert not any(thread.name == "csv-read-ahead" for thread in threading.enumerate())
+
+
+class _FailingFile:
+    def read(self, size):
+        raise OSError("диск недоступен")
+
+    def seek(self, offset):
+        return offset
+
+    def close(self):
+        pass
+
+
+def test_read_errors_are_raised_in_reader(tmp_path, monkeypatch):
+    """Ошибка чтения в фоновом потоке пробрасывается при чтении из потока."""
+    monkeypatch.setattr("src.read_ahead.open", lambda *args, **kwargs: _FailingFile(), raising=False)
+    stream = ReadAheadStream(str(tmp_path / "data.csv"), 1, 4)
+    with pytest.raises(OSError, match="диск недоступен"):
+        stream.read(4)
+    stream.close()
+
+
+def test_missing_file_raises_synchronously(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        ReadAheadStream(str(tmp_path / "missing.csv"))
+
+
+def test_advise_sequential(unicode_csv_file):
+    with open(unicode_csv_file, "rb") as f:
+        assert advise_sequential(f) in (True, False)
+
+
+def test_parse_read_options(unicode_csv_file):
+    args = parse_arguments([str(unicode_csv_file), "--read-ahead", "3", "--read-buffer", "4M", "--fadvise"])
+    assert args.read_options == ReadOptions(read_ahead=3, buffer_size=4 * 1024 * 1024, fadvise=True)
+    assert parse_arguments([str(unicode_csv_file), "--fadvise"]).read_options == ReadOptions(fadvise=True)
+    assert parse_arguments([str(unicode_csv_file)]).read_options is None
+
+
+@pytest.mark.parametrize("argv,message", [
+    (["--read-ahead", "0"], "Глубина упреждающего чтения"),
+    (["--read-buffer", "4M"], "только вместе с --read-ahead"),
+    (["--read-ahead", "2", "--read-buffer", "0"], "Размер буфера чтения"),
+])
+def test_parse_read_options_invalid(unicode_csv_file, argv, message):
+    with pytest.raises(ValueError, match=message):
+        parse_arguments([str(unicode_csv_file)] + argv)
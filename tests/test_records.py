@@ -0,0 +1,101 @@
+"""
+Тесты для компактных записей строк.
+"""
+
+import csv
+import pickle
+
+import pytest
+
+from src.csv_reader import CSVReader
+from src.records import RECORD_TYPE_CACHE_SIZE, Record, column_getter, key_getter, record_type
+
+
+@pytest.fixture
+def records_csv_file(tmp_path):
+    file_path = tmp_path / "records.csv"
+    file_path.write_text("name,price,note\nApple,100,red\n\nBanana,50\n", encoding="utf-8")
+    return file_path
+
+
+def test_reader_produces_records_with_shared_type(records_csv_file):
+    headers, rows = CSVReader().read_file(str(records_csv_file))
+    assert headers == ["name", "price", "note"]
+    assert all(isinstance(row, Record) for row in rows)
+    assert type(rows[0]) is type(rows[1]) is record_type(headers)
+    # Пустая строка пропускается, недостающее значение равно None
+    assert rows == [
+        {"name": "Apple", "price": "100", "note": "red"},
+        {"name": "Banana", "price": "50", "note": None},
+    ]
+
+
+def test_record_mapping_interface():
+    row = record_type(["name", "price"]).from_values(["Apple", "100"])
+    assert row["price"] == "100"
+    assert row[0] == "Apple"
+    assert row.get("missing") is None
+    assert row.get("missing", "") == ""
+    assert "name" in row and "Apple" not in row
+    assert list(row) == ["name", "price"]
+    assert list(row.items()) == [("name", "Apple"), ("price", "100")]
+    assert dict(row) == {**row} == row.as_dict() == {"name": "Apple", "price": "100"}
+    assert row != {"name": "Apple"}
+    with pytest.raises(KeyError):
+        row["missing"]
+
+
+def test_record_duplicate_headers_match_dict_reader():
+    row = record_type(["a", "a"]).from_values(["1", "2"])
+    assert row["a"] == "2"
+    assert row == {"a": "2"}
+
+
+def test_record_pickle_roundtrip():
+    row = record_type(["name", "price"]).from_values(["Apple", "100"])
+    restored = pickle.loads(pickle.dumps(row))
+    assert type(restored) is type(row)
+    assert restored == row
+
+
+@pytest.mark.parametrize("make_row", [
+    lambda values: record_type(["name", "price"]).from_values(values),
+    lambda values: dict(zip(["name", "price"], values)),
+])
+def test_getters_for_records_and_dicts(make_row):
+    rows = [make_row(["Apple", "100"]), make_row(["Banana", "50"])]
+    assert list(map(column_getter(rows, "price"), rows)) == ["100", "50"]
+    assert list(map(column_getter(rows, "missing"), rows)) == [None, None]
+    assert [key_getter(rows[0], ["price"])(row) for row in rows] == [("100",), ("50",)]
+    assert key_getter(rows[0], ["price", "name"])(rows[1]) == ("50", "Banana")
+
+
+def test_getters_match_dict_reader_rows(tmp_path):
+    """
+    Повтор заголовка, короткие и длинные строки: аксессоры записей дают те же значения,
+    что и словари csv.DictReader (лишние поля длинной строки не видны ни там, ни там).
+    """
+    file_path = tmp_path / "ragged.csv"
+    file_path.write_text("a,b,a,c\n1,2,3,4\n5,6\n7,8,9,10,11,12\n,,,\n", encoding="utf-8")
+    headers, records = CSVReader().read_file(str(file_path))
+    with open(file_path, newline="", encoding="utf-8") as f:
+        dicts = list(csv.DictReader(f))
+    assert len(records) == len(dicts) == 4
+    for column in ["a", "b", "c", "missing"]:
+        assert list(map(column_getter(records, column), records)) == list(map(column_getter(dicts, column), dicts))
+    for columns in (["a"], ["c", "a", "b"], ["b", "missing"]):
+        by_record, by_dict = key_getter(records[0], columns), key_getter(dicts[0], columns)
+        assert list(map(by_record, records)) == list(map(by_dict, dicts))
+    assert [{**row} for row in records] == [{k: v for k, v in row.items() if k is not None} for row in dicts]
+
+
+def test_record_type_cache_is_bounded():
+    first = record_type(["cache", "probe"])
+    assert record_type(("cache", "probe")) is first
+    for index in range(RECORD_TYPE_CACHE_SIZE + 1):
+        record_type([f"column_{index}"])
+    replacement = record_type(["cache", "probe"])
+    assert replacement is not first
+    # Записи вытесненного класса работают с аксессорами нового
+    row = first.from_values(["1", "2"])
+    assert replacement.getter("probe")(row) == "2" and row == replacement.from_values(["1", "2"])
@@ -0,0 +1,83 @@
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+from src.argument_parser import parse_arguments
+from src.command_handler import CommandHandler
+from src.result_cache import ResultCache, file_fingerprint
+from tests.fixtures.csv_files import simple_csv_file
+
+
+def _cached_args(csv_file, cache_dir, *extra):
+    return parse_arguments([str(csv_file), "--cache", "--cache-dir", str(cache_dir), *extra])
+
+
+def test_repeated_query_served_from_cache(simple_csv_file, tmp_path):
+    """
+    Проверяет, что повторный запрос не перечитывает файл.
+    """
+    args = _cached_args(simple_csv_file, tmp_path, "--aggregate", "price=avg")
+    assert CommandHandler().run(args).value == 75.0
+
+    handler = CommandHandler()
+    with patch.object(handler.csv_reader, "read_file") as mock_read:
+        result = handler.run(args)
+    mock_read.assert_not_called()
+    assert result.value == 75.0
+
+
+def test_cache_invalidated_when_file_changes(simple_csv_file, tmp_path):
+    args = _cached_args(simple_csv_file, tmp_path, "--aggregate", "price=max")
+    assert CommandHandler().run(args).value == 100.0
+
+    simple_csv_file.write_text("name,price\nApple,100\nBanana,50\nCherry,500")
+    assert CommandHandler().run(args).value == 500.0
+
+
+@pytest.mark.parametrize("first,second,same_key", [
+    (["--where", "price>50"], ["--where", " price > 50 "], True),
+    (["--aggregate", "price=avg"], ["--aggregate", "price=AVG"], True),
+    (["--aggregate", "price=avg"], ["--aggregate", "price=max"], False),
+    (["--where", "price>50"], ["--where", "price<50"], False),
+])
+def test_key_uses_normalized_arguments(simple_csv_file, tmp_path, first, second, same_key):
+    cache = ResultCache(str(tmp_path))
+    first_key = cache.make_key(_cached_args(simple_csv_file, tmp_path, *first))
+    second_key = cache.make_key(_cached_args(simple_csv_file, tmp_path, *second))
+    assert (first_key == second_key) == same_key
+
+
+def test_ttl_expiration(tmp_path):
+    cache = ResultCache(str(tmp_path), ttl=10)
+    cache.put("key", {"value": 1})
+    assert cache.get("key") == {"value": 1}
+
+    old = time.time() - 60
+    os.utime(tmp_path / "key.json", (old, old))
+    assert cache.get("key") is None
+    assert not (tmp_path / "key.json").exists()
+
+
+def test_max_size_evicts_oldest(tmp_path):
+    cache = ResultCache(str(tmp_path), max_size=200)
+    for index in range(5):
+        cache.put(f"key{index}", {"rows": ["x" * 50]})
+        old = time.time() - 100 + index
+        os.utime(tmp_path / f"key{index}.json", (old, old))
+    cache.put("newest", {"rows": ["x" * 50]})
+    assert cache.get("newest") is not None
+    assert cache.get("key0") is None
+    assert sum(entry.stat().st_size for entry in os.scandir(tmp_path)) <= 200
+
+
+@pytest.mark.parametrize("content_hash,expected_field", [(False, "mtime_ns"), (True, "hash")])
+def test_file_fingerprint(simple_csv_file, content_hash, expected_field):
+    fingerprint = file_fingerprint(str(simple_csv_file), content_hash)
+    assert fingerprint["size"] == simple_csv_file.stat().st_size
+    assert expected_field in fingerprint
+
+
+def test_file_fingerprint_missing(tmp_path):
+    with pytest.raises(FileNotFoundError, match="Файл не найден"):
+        file_fingerprint(str(tmp_path / "missing.csv"))
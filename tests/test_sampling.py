@@ -0,0 +1,147 @@
+import random
+
+import pytest
+from src.aggregator import Aggregator, ConfidenceInterval
+from src.argument_parser import AggregateCondition, AggregateFunction, parse_arguments
+from src.command_handler import CommandHandler, QueryResult
+from src.sampling import SampleOptions, Sampler, bernoulli_sample, reservoir_sample
+
+
+@pytest.fixture
+def numbers_csv_file(tmp_path):
+    file_path = tmp_path / "numbers.csv"
+    lines = ["id,value,label"] + [f"{i},{i % 100},item {i}" for i in range(20000)]
+    file_path.write_text("\n".join(lines) + "\n")
+    return file_path
+
+
+def test_bernoulli_sample_fraction():
+    rows = [{"id": str(i)} for i in range(10000)]
+    sample = list(bernoulli_sample(rows, 0.1, random.Random(1)))
+    assert 800 < len(sample) < 1200
+
+
+def test_reservoir_sample_size_and_uniformity():
+    rows = [{"id": str(i)} for i in range(1000)]
+    sample, seen = reservoir_sample(rows, 50, random.Random(1))
+    assert seen == 1000
+    assert len(sample) == 50
+    assert len({row["id"] for row in sample}) == 50
+    # Выборка не смещена к началу файла
+    assert sum(int(row["id"]) for row in sample) / 50 > 300
+
+
+def test_reservoir_sample_smaller_input():
+    rows = [{"id": "1"}, {"id": "2"}]
+    assert reservoir_sample(rows, 5, random.Random(1)) == (rows, 2)
+
+
+def test_block_sampling_reads_valid_rows(numbers_csv_file):
+    sampler = Sampler(SampleOptions(fraction=0.2, seed=7), block_size=1024)
+    result = sampler.sample(str(numbers_csv_file))
+    ids = [int(row["id"]) for row in result.rows]
+
+    assert result.headers == ["id", "value", "label"]
+    assert len(ids) == len(set(ids))
+    assert all(row["label"] == f"item {row['id']}" for row in result.rows)
+    assert 2000 < len(ids) < 6000
+    assert result.population == pytest.approx(20000, rel=0.05)
+
+
+def test_block_sampling_full_fraction_reads_every_row(numbers_csv_file):
+    result = Sampler(SampleOptions(fraction=1.0), block_size=1024).sample(str(numbers_csv_file))
+    assert sorted(int(row["id"]) for row in result.rows) == list(range(20000))
+
+
+def test_block_sampling_skips_rows_broken_by_resync(tmp_path):
+    file_path = tmp_path / "quoted.csv"
+    lines = ["id,note"] + [f'{i},"line one\nline two"' for i in range(3000)]
+    file_path.write_text("\n".join(lines) + "\n")
+    result = Sampler(SampleOptions(fraction=0.5, seed=3), block_size=256).sample(str(file_path))
+    assert all(set(row) == {"id", "note"} for row in result.rows)
+
+
+def test_sampling_is_reproducible_with_seed(numbers_csv_file):
+    first = Sampler(SampleOptions(rows=10, seed=42)).sample(str(numbers_csv_file))
+    second = Sampler(SampleOptions(rows=10, seed=42)).sample(str(numbers_csv_file))
+    assert first.rows == second.rows
+    assert first.population == 20000
+
+
+def test_sampling_missing_file():
+    with pytest.raises(FileNotFoundError):
+        Sampler(SampleOptions(fraction=0.5)).sample("missing.csv")
+
+
+@pytest.mark.parametrize("function,value,scale,expected", [
+    (AggregateFunction.SUM, 10.0, 4.0, 40.0),
+    (AggregateFunction.COUNT, 5, 10.0, 50.0),
+    (AggregateFunction.MAX, 9.0, 10.0, 9.0),
+])
+def test_estimate_from_sample_scaling(function, value, scale, expected):
+    condition = AggregateCondition("price", function)
+    estimate, interval = Aggregator().estimate_from_sample([], condition, value, scale)
+    assert estimate == expected
+    assert interval is None
+
+
+def test_estimate_from_sample_avg_interval():
+    data = [{"price": str(v)} for v in (10, 20, 30, 40)]
+    condition = AggregateCondition("price", AggregateFunction.AVG)
+    value, interval = Aggregator().estimate_from_sample(data, condition, 25.0, 100.0)
+    assert value == 25.0
+    assert interval.low < 25.0 < interval.high
+    assert interval.level == 0.95
+    # Выборка всего файла дает вырожденный интервал
+    _, full = Aggregator().estimate_from_sample(data, condition, 25.0, 1.0)
+    assert full.low == full.high == 25.0
+
+
+def test_block_sample_interval_coverage_on_sorted_file(tmp_path):
+    """
+    В отсортированном файле строки блока похожи: интервал по блокам должен
+    накрывать истинное среднее примерно с заявленной вероятностью.
+    """
+    file_path = tmp_path / "sorted.csv"
+    file_path.write_text("id,value\n" + "".join(f"{i},{i}\n" for i in range(20000)))
+    condition = AggregateCondition("value", AggregateFunction.AVG)
+    covered = 0
+    for seed in range(100):
+        sample = Sampler(SampleOptions(fraction=0.1, seed=seed), block_size=1024).sample(str(file_path))
+        assert len(sample.clusters) > 1 and sum(sample.clusters) == len(sample.rows)
+        value = Aggregator().aggregate_data(sample.rows, "value=avg")
+        _, interval = Aggregator().estimate_from_sample(sample.rows, condition, value, sample.scale,
+                                                        clusters=sample.clusters)
+        covered += interval.low <= 9999.5 <= interval.high
+    assert covered >= 85
+
+
+def test_sampled_avg_interval_covers_true_mean(numbers_csv_file, capsys):
+    args = parse_arguments([str(numbers_csv_file), "--aggregate", "value=avg", "--sample", "0.1", "--sample-seed", "5"])
+    result = CommandHandler().run(args)
+    assert result.interval.low <= 49.5 <= result.interval.high
+    assert QueryResult.from_dict(result.to_dict()) == result
+
+    CommandHandler().execute(args)
+    assert "доверительный интервал" in capsys.readouterr().out
+
+
+def test_sampled_table(numbers_csv_file):
+    args = parse_arguments([str(numbers_csv_file), "--where", "value<10", "--sample-rows", "100", "--sample-seed", "1"])
+    result = CommandHandler().run(args)
+    assert len(result.rows) <= 100
+    assert all(int(row["value"]) < 10 for row in result.rows)
+
+
+@pytest.mark.parametrize("argv", [
+    ["--sample", "0"],
+    ["--sample", "1.5"],
+    ["--sample-rows", "0"],
+    ["--sample", "0.1", "--sample-rows", "10"],
+    ["--sample-seed", "1"],
+    ["--sample", "0.1", "--join", "other.csv", "--on", "id"],
+    ["--sample", "0.1", "--aggregate", "price=sum", "--incremental"],
+])
+def test_sample_invalid_arguments(argv):
+    with pytest.raises(ValueError):
+        parse_arguments(["data.csv"] + argv)
@@ -0,0 +1,165 @@
+import os
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from src.command_handler import CommandHandler
+from src.argument_parser import parse_arguments
+from src.server import QueryServer, TableCache, query_server, run_client_command
+from tests.fixtures.csv_files import simple_csv_file, headers_csv_file
+
+
+@pytest.fixture
+def query_server_url():
+    server = QueryServer(port=0)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield server.url
+    server.shutdown()
+    server.server_close()
+
+
+def test_table_cache_hits_and_invalidation(simple_csv_file):
+    """
+    Проверяет, что повторное чтение берется из кеша, а изменение файла его инвалидирует.
+    """
+    cache = TableCache()
+    cache.get(str(simple_csv_file))
+    cache.get(str(simple_csv_file))
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    simple_csv_file.write_text("name,price\nApple,100\nBanana,50\nCherry,10")
+    stat = os.stat(simple_csv_file)
+    os.utime(simple_csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    _, rows = cache.get(str(simple_csv_file))
+    assert len(rows) == 3
+    assert cache.misses == 2
+
+
+def test_table_cache_evicts_least_recently_used(simple_csv_file, headers_csv_file):
+    cache = TableCache()
+    cache.get(str(simple_csv_file))
+    cache.max_bytes = cache.total_bytes + 1
+    cache.get(str(headers_csv_file))
+    assert len(cache) == 1
+    cache.get(str(headers_csv_file))
+    assert cache.hits == 1
+
+
+def test_table_cache_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError, match="Файл не найден"):
+        TableCache().get(str(tmp_path / "missing.csv"))
+
+
+@pytest.mark.parametrize("query,expected", [
+    (["--where", "price>60"], {"headers": ["name", "price"], "rows": [{"name": "Apple", "price": "100"}]}),
+    (["--aggregate", "price=avg"], {"column": "price", "function": "avg", "value": 75.0}),
+])
+def test_server_query(query_server_url, simple_csv_file, query, expected):
+    assert query_server(query_server_url, [str(simple_csv_file)] + query) == expected
+
+
+@pytest.mark.parametrize("query,expected_error", [
+    (["missing.csv"], "не найден"),
+    (["{file}", "--aggregate", "price=median"], "Неподдерживаемая функция агрегации"),
+    (["{file}", "--unknown"], "unrecognized arguments"),
+])
+def test_server_query_errors(query_server_url, simple_csv_file, query, expected_error):
+    query = [item.format(file=simple_csv_file) for item in query]
+    with pytest.raises(ValueError, match=expected_error):
+        query_server(query_server_url, query)
+
+
+def test_server_concurrent_queries(query_server_url, simple_csv_file):
+    """
+    Проверяет параллельное выполнение запросов к одной теплой таблице.
+    """
+    argv = [str(simple_csv_file), "--order-by", "price=asc"]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: query_server(query_server_url, argv), range(32)))
+    assert all(result["rows"][0]["name"] == "Banana" for result in results)
+
+
+def test_server_concurrent_argument_errors(query_server_url, simple_csv_file):
+    """
+    Проверяет, что параллельные ошибки разбора аргументов не трогают общие sys.stdout/sys.stderr.
+    """
+    stdout, stderr = sys.stdout, sys.stderr
+    good = [str(simple_csv_file), "--aggregate", "price=avg"]
+
+    def request(index):
+        if index % 3 == 0:
+            return query_server(query_server_url, good)["value"]
+        argv = [str(simple_csv_file), f"--unknown-{index}"] if index % 3 == 1 else ["--help"]
+        try:
+            query_server(query_server_url, argv)
+        except ValueError as e:
+            return str(e)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(request, range(96)))
+    assert (sys.stdout, sys.stderr) == (stdout, stderr)
+    for index, result in enumerate(results):
+        if index % 3 == 0:
+            assert result == 75.0
+        elif index % 3 == 1:
+            assert result.endswith(f"unrecognized arguments: --unknown-{index}")
+        else:
+            assert result
+
+
+def test_request_read_options_do_not_leak(simple_csv_file):
+    """
+    Проверяет, что настройки чтения одного запроса не меняют общий читатель сервера.
+    """
+    server = QueryServer(port=0)
+    try:
+        shared_options = server.csv_reader.options
+        status, body = server.execute_query([str(simple_csv_file), "--read-ahead", "2", "--fadvise"])
+        assert status == 200 and len(body["rows"]) == 2
+        assert server.csv_reader.options == shared_options
+    finally:
+        server.server_close()
+
+
+def test_client_output_matches_local(capsys, query_server_url, simple_csv_file):
+    """
+    Проверяет, что вывод клиента совпадает с локальным запуском.
+    """
+    argv = [str(simple_csv_file), "--order-by", "price=desc"]
+    CommandHandler().execute(parse_arguments(argv))
+    local_output = capsys.readouterr().out
+
+    run_client_command(["--server", query_server_url] + argv)
+    assert capsys.readouterr().out == local_output
+
+
+def test_client_paths_from_another_cwd(capsys, tmp_path, monkeypatch):
+    """
+    Проверяет, что относительные пути клиента (файл, --where-in-file) не зависят от каталога сервера.
+    """
+    (tmp_path / "orders.csv").write_text("id,customer\n1,c1\n2,c2\n3,c1\n", encoding="utf-8")
+    (tmp_path / "keys.csv").write_text("customer\nc1\n", encoding="utf-8")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    process = subprocess.Popen([sys.executable, "-u", "main.py", "serve", "--port", "0"],
+                               cwd=root, stdout=subprocess.PIPE, text=True)
+    try:
+        url = process.stdout.readline().split()[-1]
+        monkeypatch.chdir(tmp_path)
+        argv = ["orders.csv", "--where-in-file", "customer=keys.csv"]
+        CommandHandler().execute(parse_arguments(argv))
+        local_output = capsys.readouterr().out
+        run_client_command(["--server", url] + argv)
+        assert capsys.readouterr().out == local_output
+        assert "3" in local_output and "не найден" not in local_output
+    finally:
+        process.kill()
+        process.wait()
+        process.stdout.close()
+
+
+def test_client_unavailable_server(simple_csv_file):
+    with pytest.raises(ConnectionError, match="недоступен"):
+        query_server("http://127.0.0.1:9", [str(simple_csv_file)])
@@ -0,0 +1,102 @@
+import random
+
+import pytest
+from src.sketches import TDigest, HyperLogLog
+
+
+@pytest.mark.parametrize("q", [0.01, 0.25, 0.5, 0.9, 0.99])
+def test_tdigest_quantile_accuracy(q):
+    """
+    Проверяет, что оценка квантиля t-digest близка к точному значению.
+    """
+    rng = random.Random(42)
+    values = [rng.uniform(0, 1000) for _ in range(20000)]
+    digest = TDigest(compression=100)
+    digest.update_many(values)
+    exact = sorted(values)[int(q * (len(values) - 1))]
+    assert digest.quantile(q) == pytest.approx(exact, abs=10)
+
+
+def test_tdigest_memory_is_bounded():
+    """
+    Проверяет, что число центроидов ограничено параметром compression.
+    """
+    digest = TDigest(compression=50)
+    digest.update_many(float(i) for i in range(100000))
+    assert len(digest.to_dict()["centroids"]) <= 50
+
+
+def test_tdigest_merge_and_serialization():
+    """
+    Проверяет, что слияние дайджестов частей эквивалентно дайджесту целого,
+    а сериализация сохраняет состояние.
+    """
+    left, right = TDigest(), TDigest()
+    left.update_many(float(i) for i in range(0, 5000))
+    right.update_many(float(i) for i in range(5000, 10000))
+    restored = TDigest.from_dict(right.to_dict())
+    left.merge(restored)
+    assert left.count == 10000
+    assert left.min == 0 and left.max == 9999
+    assert left.quantile(0.5) == pytest.approx(5000, abs=100)
+
+
+@pytest.mark.parametrize("bad_value", [-0.1, 1.5])
+def test_tdigest_invalid_quantile(bad_value):
+    digest = TDigest()
+    digest.update(1.0)
+    with pytest.raises(ValueError, match="Квантиль должен быть"):
+        digest.quantile(bad_value)
+
+
+def test_tdigest_empty():
+    with pytest.raises(ValueError, match="Дайджест пуст"):
+        TDigest().quantile(0.5)
+
+
+@pytest.mark.parametrize("cardinality", [10, 1000, 50000])
+def test_hyperloglog_estimate(cardinality):
+    """
+    Проверяет, что оценка HyperLogLog укладывается в несколько стандартных погрешностей.
+    """
+    sketch = HyperLogLog(precision=12)
+    for _ in range(2):
+        sketch.update_many(f"user-{i}" for i in range(cardinality))
+    tolerance = max(1.0, 4 * sketch.relative_error * cardinality)
+    assert abs(sketch.estimate() - cardinality) <= tolerance
+
+
+def test_hyperloglog_merge_and_serialization():
+    """
+    Проверяет, что слияние скетчей пересекающихся множеств оценивает размер объединения.
+    """
+    first, second = HyperLogLog(12), HyperLogLog(12)
+    first.update_many(str(i) for i in range(0, 6000))
+    second.update_many(str(i) for i in range(4000, 10000))
+    first.merge(HyperLogLog.from_dict(second.to_dict()))
+    assert first.estimate() == pytest.approx(10000, rel=0.08)
+
+
+def test_hyperloglog_from_error():
+    sketch = HyperLogLog.from_error(0.01)
+    assert sketch.relative_error <= 0.01
+
+
+@pytest.mark.parametrize("precision", [3, 19])
+def test_hyperloglog_invalid_precision(precision):
+    with pytest.raises(ValueError, match="Точность HyperLogLog"):
+        HyperLogLog(precision)
+
+
+def test_hyperloglog_merge_precision_mismatch():
+    with pytest.raises(ValueError, match="разной точностью"):
+        HyperLogLog(10).merge(HyperLogLog(12))
+
+
+def test_hyperloglog_update_many_matches_update():
+    values = [f"sku-{i}" for i in range(3000)]
+    single, batch = HyperLogLog(10), HyperLogLog(10)
+    for value in values:
+        single.update(value)
+    batch.update_many(values)
+    assert batch.to_dict() == single.to_dict()
@@ -0,0 +1,83 @@
+import pytest
+from src.argument_parser import SortCondition, SortDirection, parse_arguments, parse_order_by_conditions
+from src.sorting import sort_rows, value_key
+
+
+@pytest.mark.parametrize("values,expected", [
+    (["10", "9", "100"], ["9", "10", "100"]),
+    (["b", "10", "a", "2"], ["2", "10", "a", "b"]),
+    (["", "3", None, "x", "1"], ["1", "3", "x", "", None]),
+])
+def test_sort_rows_typed_keys_ascending(values, expected):
+    rows = [{"v": value} for value in values]
+    result = sort_rows(rows, SortCondition("v", SortDirection.ASC))
+    assert [row["v"] for row in result] == expected
+
+
+def test_sort_rows_descending_keeps_nulls_last():
+    rows = [{"v": value} for value in ["", "3", "x", "1", "y"]]
+    result = sort_rows(rows, SortCondition("v", SortDirection.DESC))
+    assert [row["v"] for row in result] == ["y", "x", "3", "1", ""]
+
+
+def test_sort_rows_multiple_keys_mixed_directions():
+    rows = [
+        {"brand": "xiaomi", "price": "199", "name": "a"},
+        {"brand": "apple", "price": "999", "name": "b"},
+        {"brand": "xiaomi", "price": "299", "name": "c"},
+        {"brand": "apple", "price": "1299", "name": "d"},
+        {"brand": "xiaomi", "price": "299", "name": "e"},
+    ]
+    result = sort_rows(rows, parse_order_by_conditions("brand=asc,price=desc"))
+    assert [row["name"] for row in result] == ["d", "b", "c", "e", "a"]
+
+
+@pytest.mark.parametrize("direction", [SortDirection.ASC, SortDirection.DESC])
+def test_sort_rows_is_stable(direction):
+    rows = [{"k": str(i % 3), "id": str(i)} for i in range(30)]
+    result = sort_rows(rows, SortCondition("k", direction))
+    for key in "012":
+        ids = [int(row["id"]) for row in result if row["k"] == key]
+        assert ids == sorted(ids)
+
+
+def test_sort_rows_does_not_modify_input():
+    rows = [{"v": "2"}, {"v": "1"}]
+    sort_rows(rows, SortCondition("v", SortDirection.ASC))
+    assert rows == [{"v": "2"}, {"v": "1"}]
+
+
+@pytest.mark.parametrize("value,expected", [
+    ("1.5", (0, 1.5)),
+    ("abc", (1, "abc")),
+    ("", (2, "")),
+    (None, (2, "")),
+])
+def test_value_key(value, expected):
+    assert value_key(value) == expected
+
+
+@pytest.mark.parametrize("value", ["nan", "NaN", "inf", "-Infinity"])
+def test_value_key_non_finite_is_text(value):
+    assert value_key(value) == (1, value)
+
+
+def test_sort_rows_with_nan():
+    rows = [{"v": "3"}, {"v": "nan"}, {"v": "1"}, {"v": ""}, {"v": "2"}, {"v": "nan"}, {"v": "0"}]
+    result = sort_rows(rows, SortCondition("v", SortDirection.ASC))
+    assert [row["v"] for row in result] == ["0", "1", "2", "3", "nan", "nan", ""]
+
+
+def test_parse_arguments_multiple_order_keys():
+    args = parse_arguments(["data.csv", "--order-by", "brand=asc, price=DESC"])
+    assert args.order_by_conditions == (
+        SortCondition("brand", SortDirection.ASC),
+        SortCondition("price", SortDirection.DESC),
+    )
+    assert args.order_by_condition == SortCondition("brand", SortDirection.ASC)
+
+
+@pytest.mark.parametrize("condition", ["brand=asc,", "brand=asc,price", "brand=asc;price=desc"])
+def test_parse_order_by_conditions_invalid(condition):
+    with pytest.raises(ValueError):
+        parse_order_by_conditions(condition)
@@ -0,0 +1,190 @@
+"""
+Тесты разбора меток времени, фильтров по датам и агрегации по интервалам (--bucket).
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from src import timestamps
+from src.argument_parser import parse_arguments
+from src.command_handler import CommandHandler
+from src.filter_engine import build_value_test
+from src.profiling import TableProfile
+from src.sorting import value_key
+from src.timestamps import DAY, HOUR, TimeBucket, bucket_start, format_timestamp, parse_bucket, parse_timestamp
+
+EVENTS = [
+    ("2024-03-01T10:15:00", "a", "10"),
+    ("2024-03-01T10:45:00", "b", "20"),
+    ("2024-03-01T11:05:00", "a", "30"),
+    ("2024-03-01 12:00:00", "a", "5"),
+    ("bad", "b", "7"),
+    ("2024-03-02T00:30:00Z", "b", "40"),
+]
+
+
+@pytest.fixture
+def events_csv_file(tmp_path):
+    file_path = tmp_path / "events.csv"
+    lines = ["ts,store,price"] + [",".join(event) for event in EVENTS]
+    file_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return file_path
+
+
+def _reference(value):
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return round(parsed.timestamp() * 1_000_000)
+
+
+@pytest.mark.parametrize("value", [
+    "1970-01-01",
+    "2024-02-29",
+    "1969-12-31T23:59:59",
+    "2024-03-01T10:15:30",
+    "2024-03-01 10:15:30",
+    "2024-03-01T10:15:30Z",
+    "2024-03-01T10:15:30.250",
+    "2024-03-01T10:15:30.123456+03:00",
+    "2024-03-01T10:15:30-05:30",
+    "2000-12-31T23:59:59Z",
+])
+def test_parse_timestamp_matches_datetime(value):
+    assert parse_timestamp(value) == _reference(value)
+
+
+@pytest.mark.parametrize("value", [
+    None, "", "2024", "12.5", "hello world", "2023-02-29", "2024-13-01", "2024-00-10",
+    "2024-03-01T24:00:00", "2024-03-01T10:60:00", "2024-03-01Tnoon",
+])
+def test_parse_timestamp_invalid(value):
+    assert parse_timestamp(value) is None
+
+
+def test_date_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(timestamps, "DATE_CACHE_SIZE", 8)
+    timestamps._date_cache.clear()
+    for day in range(1, 29):
+        assert parse_timestamp(f"2024-02-{day:02d}T00:00:00") == _reference(f"2024-02-{day:02d}")
+    assert len(timestamps._date_cache) <= 8
+
+
+def test_bucket_start_aligns_weeks_to_monday():
+    monday = parse_timestamp("2024-03-04")
+    assert bucket_start(parse_timestamp("2024-03-10T23:59:59"), 7 * DAY) == monday
+    assert bucket_start(parse_timestamp("2024-03-04T00:00:00"), 7 * DAY) == monday
+    assert bucket_start(parse_timestamp("2024-03-04T10:15:00"), HOUR) == parse_timestamp("2024-03-04T10:00:00")
+    assert format_timestamp(parse_timestamp("1969-12-31T23:30:00")) == "1969-12-31T23:30:00"
+
+
+@pytest.mark.parametrize("spec,expected", [
+    ("ts=1h", TimeBucket("ts", HOUR, "1h")),
+    ("created = 15m", TimeBucket("created", 15 * 60 * 1_000_000, "15m")),
+    ("day=1d", TimeBucket("day", DAY, "1d")),
+])
+def test_parse_bucket(spec, expected):
+    assert parse_bucket(spec) == expected
+
+
+@pytest.mark.parametrize("spec", ["ts", "ts=h", "ts=1y", "ts=0h", "1ts=1h", "ts=-1h"])
+def test_parse_bucket_invalid(spec):
+    with pytest.raises(ValueError):
+        parse_bucket(spec)
+
+
+@pytest.mark.parametrize("operator,threshold,expected", [
+    (">", "2024-03-01T11:00:00", [False, False, True, True, False, True]),
+    ("<", "2024-03-01T11:00:00", [True, True, False, False, False, False]),
+    (">", "2024-03-01T12:00:00+01:00", [False, False, True, True, False, True]),
+    (">", "2024-03-02", [False, False, False, False, False, True]),
+    (">", "not-a-date", [False] * 6),
+])
+def test_timestamp_filter(operator, threshold, expected):
+    test = build_value_test(operator, threshold)
+    assert [test(event[0]) for event in EVENTS] == expected
+
+
+def test_equality_filter_stays_textual():
+    assert build_value_test("=", "2024-03-01")("2024-03-01T00:00:00") is False
+
+
+def test_value_key_orders_mixed_formats():
+    values = ["2024-03-02", "", "2024-03-01T23:00:00+00:00", "text", "2024-03-01 22:00:00"]
+    assert sorted(values, key=value_key) == [
+        "2024-03-01 22:00:00", "2024-03-01T23:00:00+00:00", "2024-03-02", "text", "",
+    ]
+
+
+def test_profile_detects_timestamp_column():
+    profile = TableProfile(["ts", "price"])
+    profile.update([dict(zip(["ts", "price"], event[::2])) for event in EVENTS if event[0] != "bad"])
+    summary = {row["column"]: row for row in profile.summary()}
+    assert summary["ts"]["type"] == "timestamp"
+    assert summary["ts"]["min"] == "2024-03-01T10:15:00"
+    assert summary["ts"]["max"] == "2024-03-02T00:30:00"
+    restored = TableProfile.from_state(profile.to_state())
+    assert restored.summary() == profile.summary()
+
+
+def test_where_date_range(events_csv_file):
+    args = parse_arguments([str(events_csv_file), "--where", "ts>2024-03-01T11:00:00"])
+    result = CommandHandler().run(args)
+    assert [row["price"] for row in result.rows] == ["30", "5", "40"]
+
+
+def test_order_by_timestamps(events_csv_file):
+    args = parse_arguments([str(events_csv_file), "--order-by", "ts=desc"])
+    result = CommandHandler().run(args)
+    assert [row["price"] for row in result.rows] == ["7", "40", "5", "30", "20", "10"]
+
+
+def test_bucket_aggregate(events_csv_file):
+    args = parse_arguments([str(events_csv_file), "--aggregate", "price=sum", "--bucket", "ts=1h"])
+    result = CommandHandler().run(args)
+    assert result.headers == ["ts", "sum(price)"]
+    assert [(row["ts"], row["sum(price)"]) for row in result.rows] == [
+        ("2024-03-01T10:00:00", 30), ("2024-03-01T11:00:00", 30), ("2024-03-01T12:00:00", 5),
+        ("2024-03-02T00:00:00", 40), (None, 7),
+    ]
+
+
+def test_bucket_with_group_by(events_csv_file):
+    args = parse_arguments([str(events_csv_file), "--aggregate", "price=count", "--bucket", "ts=1d",
+                            "--group-by", "store"])
+    result = CommandHandler().run(args)
+    assert result.headers == ["ts", "store", "count(price)"]
+    assert [tuple(row.values()) for row in result.rows] == [
+        ("2024-03-01T00:00:00", "a", 3), ("2024-03-01T00:00:00", "b", 1), ("2024-03-02T00:00:00", "b", 1),
+        (None, "b", 1),
+    ]
+
+
+def test_bucket_over_partitions(tmp_path, events_csv_file):
+    dataset = tmp_path / "events_parts"
+    for store in ("a", "b"):
+        directory = dataset / f"store={store}"
+        directory.mkdir(parents=True)
+        lines = ["ts,price"] + [f"{ts},{price}" for ts, event_store, price in EVENTS if event_store == store]
+        (directory / "part-0.csv").write_text("\n".join(lines) + "\n", encoding="utf-8")
+    argv = ["--aggregate", "price=max", "--bucket", "ts=1w", "--workers", "1"]
+    result = CommandHandler().run(parse_arguments([str(dataset)] + argv))
+    expected = CommandHandler().run(parse_arguments([str(events_csv_file)] + argv[:-2]))
+    assert result.rows == expected.rows
+    assert result.rows[0]["ts"] == "2024-02-26T00:00:00"
+
+
+def test_bucket_unknown_column(events_csv_file):
+    with pytest.raises(KeyError):
+        CommandHandler().run(parse_arguments([str(events_csv_file), "--aggregate", "price=sum", "--bucket", "day=1d"]))
+
+
+@pytest.mark.parametrize("argv,message", [
+    (["--bucket", "ts=1h"], "только вместе с --aggregate"),
+    (["--aggregate", "price=sum", "--bucket", "ts=1y"], "Некорректный формат --bucket"),
+    (["--aggregate", "price=sum", "--bucket", "ts=1h", "--incremental"], "--bucket несовместим"),
+])
+def test_bucket_arguments_invalid(events_csv_file, argv, message):
+    with pytest.raises(ValueError, match=message):
+        parse_arguments([str(events_csv_file)] + argv)
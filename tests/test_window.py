@@ -0,0 +1,131 @@
+"""
+Тесты оконных функций (--window).
+"""
+
+import random
+
+import pytest
+
+from src.argument_parser import WindowCondition, parse_arguments, parse_window_conditions
+from src.command_handler import CommandHandler
+from src.window import apply_windows, get_window_class, window_column
+
+HEADERS = ["day", "brand", "price"]
+ROWS = [
+    {"day": "1", "brand": "a", "price": "10"},
+    {"day": "2", "brand": "b", "price": "20"},
+    {"day": "3", "brand": "a", "price": "30"},
+    {"day": "4", "brand": "a", "price": ""},
+    {"day": "5", "brand": "b", "price": "40"},
+    {"day": "6", "brand": "a", "price": "50"},
+]
+
+
+@pytest.fixture
+def window_csv_file(tmp_path):
+    file_path = tmp_path / "window.csv"
+    lines = [",".join(HEADERS)] + [",".join(row[h] for h in HEADERS) for row in ROWS]
+    file_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return file_path
+
+
+def _column(conditions, partition_by=(), rows=ROWS):
+    conditions = parse_window_conditions(conditions)
+    headers, result = apply_windows(HEADERS, rows, conditions, partition_by)
+    assert headers == HEADERS + [window_column(condition) for condition in conditions]
+    return [row[headers[-1]] for row in result]
+
+
+@pytest.mark.parametrize("conditions,partition_by,expected", [
+    ("price=moving_avg:2", (), [10, 15, 25, 30, 40, 45]),
+    ("price=moving_sum:3", (), [10, 30, 60, 50, 70, 90]),
+    ("price=moving_avg:2", ("brand",), [10, 20, 20, 30, 30, 50]),
+    ("price=moving_min:2", (), [10, 10, 20, 30, 40, 40]),
+    ("price=moving_max:2", ("brand",), [10, 20, 30, 30, 40, 50]),
+    ("price=cumsum", (), [10, 30, 60, 60, 100, 150]),
+    ("price=cumsum", ("brand",), [10, 20, 40, 40, 60, 90]),
+    ("price=cumavg", ("brand",), [10, 20, 20, 20, 30, 30]),
+    ("price=cummax", (), [10, 20, 30, 30, 40, 50]),
+    ("price=cumcount", ("brand",), [1, 1, 2, 2, 2, 3]),
+    ("price=lag", (), [None, "10", "20", "30", "", "40"]),
+    ("price=lag:2", ("brand",), [None, None, None, "10", None, "30"]),
+    ("brand=rank", (), [1, 2, 3, 3, 5, 6]),
+])
+def test_window_functions(conditions, partition_by, expected):
+    assert _column(conditions, partition_by) == expected
+
+
+def test_rank_ties_over_ordered_rows():
+    rows = [{"day": str(i), "brand": "a", "price": price} for i, price in enumerate(["5", "5", "7", "7", "7", "9"])]
+    assert _column("price=rank", rows=rows) == [1, 1, 3, 3, 3, 6]
+
+
+@pytest.mark.parametrize("function", ["moving_min", "moving_max", "moving_avg"])
+def test_moving_functions_match_brute_force(function):
+    rng = random.Random(7)
+    values = [str(rng.randint(0, 100)) if rng.random() > 0.1 else "" for _ in range(500)]
+    rows = [{"day": str(i), "brand": "a", "price": value} for i, value in enumerate(values)]
+    reference = {"moving_min": min, "moving_max": max, "moving_avg": lambda window: sum(window) / len(window)}
+    for size in (1, 3, 17):
+        expected = []
+        for i in range(len(values)):
+            window = [float(value) for value in values[max(0, i - size + 1):i + 1] if value]
+            expected.append(reference[function](window) if window else None)
+        assert _column(f"price={function}:{size}", rows=rows) == pytest.approx(expected)
+
+
+def test_window_state_is_bounded():
+    window = get_window_class("moving_max")(3)
+    for value in range(1000):
+        window.step(str(value % 50))
+    assert len(window.queue) <= 3
+    moving_avg = get_window_class("moving_avg")(5)
+    for value in range(1000):
+        moving_avg.step(str(value))
+    assert len(moving_avg.values) == 5
+
+
+def test_window_with_order_by(window_csv_file):
+    args = parse_arguments([str(window_csv_file), "--window", "price=rank,price=cumsum", "--order-by", "price=desc"])
+    result = CommandHandler().run(args)
+    assert result.headers == HEADERS + ["rank(price)", "cumsum(price)"]
+    assert [(row["day"], row["rank(price)"], row["cumsum(price)"]) for row in result.rows] == [
+        ("6", 1, 50), ("5", 2, 90), ("3", 3, 120), ("2", 4, 140), ("1", 5, 150), ("4", 6, 150),
+    ]
+
+
+@pytest.mark.parametrize("extra", [[], ["--memory-limit", "1M"]])
+def test_window_with_filter(window_csv_file, extra):
+    args = parse_arguments([str(window_csv_file), "--window", "price=lag", "--where", "brand=a"] + extra)
+    result = CommandHandler().run(args)
+    assert [row["lag(price)"] for row in result.rows] == [None, "10", "30", ""]
+
+
+def test_window_unknown_column(window_csv_file):
+    with pytest.raises(KeyError):
+        CommandHandler().run(parse_arguments([str(window_csv_file), "--window", "model=cumsum"]))
+    with pytest.raises(KeyError):
+        CommandHandler().run(parse_arguments([str(window_csv_file), "--window", "price=cumsum", "--partition-by", "x"]))
+
+
+def test_parse_window_conditions():
+    assert parse_window_conditions("price=moving_avg:7, price=CUMSUM,day=lag") == (
+        WindowCondition("price", "moving_avg", 7),
+        WindowCondition("price", "cumsum", None),
+        WindowCondition("day", "lag", None),
+    )
+
+
+@pytest.mark.parametrize("argv,message", [
+    (["--window", "price=median"], "Неподдерживаемая оконная функция"),
+    (["--window", "price=moving_avg"], "нужен размер окна"),
+    (["--window", "price=moving_avg:0"], "положительным"),
+    (["--window", "price=cumsum:3"], "не принимает параметр"),
+    (["--window", "price=moving_avg:2.5"], "Некорректный формат оконной функции"),
+    (["--window", "price=cumsum", "--aggregate", "price=avg"], "--window несовместим"),
+    (["--partition-by", "brand"], "только вместе с --window"),
+    (["--window", "price=cumsum", "--count"], "несовместимы"),
+])
+def test_window_arguments_invalid(window_csv_file, argv, message):
+    with pytest.raises(ValueError, match=message):
+        parse_arguments([str(window_csv_file)] + argv)